@@ -17,6 +17,8 @@ import math
 import pandas as pd
 from datetime import datetime
 import io
+from collections import defaultdict
+import numpy as np
 
 
 # ==================== 콘솔 리디렉션 ====================
@@ -41,6 +43,28 @@ class ConsoleRedirect:
     def flush(self):
         pass
 
+from cad_snapshot import EntitySnapshot, entity_kind
+from takeoff_rules import load_rules, evaluate_rules, apply_results_to_table
+from layer_aggregation import aggregate_layers, layer_rows
+from rebar import snapshot_bars, rebar_schedule, apply_schedule_to_table
+from similarity_index import SimilarityIndex
+from com_trace import start_recording
+from cad_highlight import push_selection, ColorOverride
+from selection_index import RowSelections
+from parallel_pairing import PAIRING_PRESETS, snapshot_pairs
+from extraction_modes import EXTRACTION_MODES, DEFAULT_EXTRACTION_MODE, ExtractionCache, extraction_values
+from rectangle_detection import rectangle_of, outline_size
+from surface_area import SURFACE_KINDS, SurfaceCache
+from block_geometry import BlockLibrary, apply_block_sizes, block_count_schedule
+from attribute_index import AttributeIndex, read_attributes
+from room_assignment import room_schedule
+from spatial_index import SpatialIndex
+from search_region import REGION_SHAPES, REGION_MODES, SearchRegion
+from result_model import FoundObjectsModel
+from group_by import GROUP_KEYS, group_selection
+from circle_schedule import circle_schedule, diameter_label
+from table_export import OPENPYXL_AVAILABLE, export_table
+
 # 간단한 계층구조 테이블 임포트
 try:
     from simple_hierarchical_table import SimpleHierarchicalTable, RowType
@@ -50,8 +74,33 @@ except ImportError:
     print("⚠️ 계층구조 테이블 모듈 없음 - 평면 테이블만 사용 가능")
 
 
+# 선택 도우미 ModelSpace 순회 중 결과 목록을 갱신하는 간격 (객체 수)
+SCAN_PUBLISH_EVERY = 200
+
+# AutoCAD GetPoint/GetEntity 입력 종료 오류 코드 (Enter/우클릭 = 빈 입력, ESC = 취소)
+USER_INPUT_END_CODES = (-2145320928, -2147352567)
+
+
+def is_user_input_end(error):
+    """COM 오류가 사용자의 Enter/ESC 입력 종료인지 (그 밖의 오류는 보고해야 함)"""
+    codes = [getattr(error, 'hresult', None)]
+    excepinfo = getattr(error, 'excepinfo', None)
+    if excepinfo and len(excepinfo) > 5:
+        codes.append(excepinfo[5])  # scode
+    return any(code in USER_INPUT_END_CODES for code in codes)
+
+
+def point_variant(point):
+    """GetPoint 기준점 등 좌표 인자용 VARIANT (VT_ARRAY | VT_R8)"""
+    return win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, [float(v) for v in point])
+
+
 # ==================== 평면 테이블 ====================
 
+# 추출 결과 항목 → 평면 테이블 컬럼
+FLAT_EXTRACTION_COLUMNS = {'count': 2, 'length': 4, 'width': 4, 'height': 5,
+                           'area': 6, 'perimeter': 7, 'layer': 13}
+
 class FlatQuantityTable(QTableWidget):
     """평면 물량 테이블"""
     
@@ -60,6 +109,8 @@ class FlatQuantityTable(QTableWidget):
         self.acad = None
         self.doc = None
         self.parent_widget = parent
+        self.row_selections = RowSelections()  # {row_index: [COM 객체]} + Handle → 행 역색인
+        self.extraction = ExtractionCache()  # Handle별 형상 + (Handle, 추출모드)별 결과 캐시
         self.setup_table()
         
     def setup_table(self):
@@ -97,7 +148,9 @@ class FlatQuantityTable(QTableWidget):
         
         # 추출모드 드롭다운
         extract_combo = QComboBox()
-        extract_combo.addItems(["선택", "전체", "면적", "둘레", "길이", "체적"])
+        extract_combo.addItems(EXTRACTION_MODES)
+        extract_combo.setCurrentText(DEFAULT_EXTRACTION_MODE)
+        extract_combo.currentTextChanged.connect(lambda mode, r=row: self.extraction_mode_changed(r, mode))
         self.setCellWidget(row, 12, extract_combo)
         
         # 버튼 (lambda에서 row 값을 캡처하도록 수정)
@@ -168,157 +221,25 @@ class FlatQuantityTable(QTableWidget):
                 selection.Delete()
                 return
                 
-            # 선택 객체 처리
-            selected_objects = []
-            total_length = 0
-            total_area = 0
-            total_perimeter = 0
-            
-            # 사각형 감지를 위한 변수
-            rectangles = []
-            
-            for i in range(selection.Count):
-                obj = selection.Item(i)
-                selected_objects.append(obj)
-                
-                # 치수 추출
-                obj_type = str(obj.ObjectName)
-                
-                if "Polyline" in obj_type:
-                    try:
-                        # 면적
-                        if hasattr(obj, 'Area'):
-                            total_area += obj.Area
-                            
-                        # 폴리라인이 사각형인지 확인
-                        if hasattr(obj, 'Closed') and obj.Closed:
-                            try:
-                                coords = obj.Coordinates
-                                # 4개 점으로 이루어진 폐합 폴리라인 = 사각형
-                                if len(coords) >= 8:  # 최소 4개 점 (8개 좌표값)
-                                    # 사각형의 가로, 세로 계산
-                                    x_coords = [coords[i] for i in range(0, len(coords), 2)]
-                                    y_coords = [coords[i] for i in range(1, len(coords), 2)]
-                                    
-                                    width = max(x_coords) - min(x_coords)
-                                    height = max(y_coords) - min(y_coords)
-                                    
-                                    # 사각형인지 확인 (4점 또는 5점)
-                                    if len(coords) in [8, 10]:
-                                        rectangles.append({
-                                            'width': width,
-                                            'height': height,
-                                            'area': width * height,
-                                            'perimeter': 2 * (width + height)
-                                        })
-                                    
-                                    total_perimeter += 2 * (width + height)
-                            except Exception as e:
-                                print(f"폴리라인 처리 오류: {e}")
-                    except:
-                        pass
-                        
-                elif "Line" in obj_type and "Polyline" not in obj_type:
-                    try:
-                        start = obj.StartPoint
-                        end = obj.EndPoint
-                        import math
-                        length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-                        total_length += length
-                    except:
-                        pass
-                        
-                elif "Circle" in obj_type:
-                    try:
-                        import math
-                        radius = obj.Radius
-                        total_area += math.pi * radius * radius
-                        total_perimeter += 2 * math.pi * radius
-                    except:
-                        pass
-            
-            # 테이블 업데이트
-            # 수량 (2번 컬럼)
-            if not self.item(row, 2):
-                self.setItem(row, 2, QTableWidgetItem(""))
-            self.item(row, 2).setText(str(selection.Count))
-            print(f"  테이블 업데이트: 행 {row}, 수량 = {selection.Count}")
-            
-            # 사각형이 감지된 경우
-            if rectangles:
-                print(f"   사각형 {len(rectangles)}개 감지됨")
-                # 첫 번째 사각형의 치수 사용
-                rect = rectangles[0]
-                print(f"   첫 번째 사각형 정보: {rect}")
-                
-                # 가로 (4번 컬럼)
-                if not self.item(row, 4):
-                    self.setItem(row, 4, QTableWidgetItem(""))
-                self.item(row, 4).setText(f"{rect['width']:.1f}")
-                print(f"   가로 설정: 행 {row}, 컬럼 4 = {rect['width']:.1f}")
-                
-                # 세로 (5번 컬럼)
-                if not self.item(row, 5):
-                    self.setItem(row, 5, QTableWidgetItem(""))
-                self.item(row, 5).setText(f"{rect['height']:.1f}")
-                print(f"   세로 설정: 행 {row}, 컬럼 5 = {rect['height']:.1f}")
-                
-                # 면적 (6번 컬럼)
-                if not self.item(row, 6):
-                    self.setItem(row, 6, QTableWidgetItem(""))
-                self.item(row, 6).setText(f"{rect['area']:.1f}")
-                print(f"   면적 설정: 행 {row}, 컬럼 6 = {rect['area']:.1f}")
-                
-                # 둘레 (7번 컬럼)
-                if not self.item(row, 7):
-                    self.setItem(row, 7, QTableWidgetItem(""))
-                self.item(row, 7).setText(f"{rect['perimeter']:.1f}")
-                print(f"   둘레 설정: 행 {row}, 컬럼 7 = {rect['perimeter']:.1f}")
-            else:
-                # 사각형이 아닌 경우
-                if total_area > 0:
-                    if not self.item(row, 6):
-                        self.setItem(row, 6, QTableWidgetItem(""))
-                    self.item(row, 6).setText(f"{total_area:.1f}")  # 면적
-                    
-                if total_perimeter > 0:
-                    if not self.item(row, 7):
-                        self.setItem(row, 7, QTableWidgetItem(""))
-                    self.item(row, 7).setText(f"{total_perimeter:.1f}")  # 둘레
-            
-            # 선택된 객체 정보 저장
-            if not hasattr(self, 'row_selections'):
-                self.row_selections = {}
-            
-            # 선택된 객체 저장 (길이별 그룹화 전에 먼저 저장)
+            # 선택 객체 저장 후 추출모드대로 계산 (길이별 그룹화 전에 먼저 저장)
+            selected_objects = [selection.Item(i) for i in range(selection.Count)]
             self.row_selections[row] = selected_objects
+            result = self.extract_row(row, refresh=True)
+            print(f"  테이블 업데이트: 행 {row}, 수량 = {selection.Count} (추출모드: {result.mode})")
             
             # Line 객체이고 여러 개인 경우 길이별로 그룹화
             if selected_objects and len(selected_objects) > 1:
-                # 모든 객체가 Line인지 확인
-                all_lines = True
-                for obj in selected_objects:
-                    obj_type = str(obj.ObjectName)
-                    if not ("Line" in obj_type and "Polyline" not in obj_type):
-                        all_lines = False
-                        break
+                # 모든 객체가 Line인지 확인 (길이를 계산하는 추출모드에서만)
+                all_lines = bool(result.lengths) and all(kind == "line" for kind in result.kinds)
                 
                 if all_lines:
                     print(f"\n📊 Line 객체 {len(selected_objects)}개 - 길이별 그룹화 시도")
                     
-                    # 길이별로 그룹화
+                    # 길이별로 그룹화 (캐시된 길이 사용)
                     groups = {}
-                    for obj in selected_objects:
-                        try:
-                            start = obj.StartPoint
-                            end = obj.EndPoint
-                            length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-                            length_key = round(length, 1)  # 0.1 단위로 반올림 (너무 세밀하면 그룹이 많아짐)
-                            if length_key not in groups:
-                                groups[length_key] = []
-                            groups[length_key].append(obj)
-                        except Exception as e:
-                            print(f"    길이 계산 오류: {e}")
+                    for obj, length in zip(selected_objects, result.lengths):
+                        length_key = round(length, 1)  # 0.1 단위로 반올림 (너무 세밀하면 그룹이 많아짐)
+                        groups.setdefault(length_key, []).append(obj)
                     
                     print(f"  그룹화 결과: {len(groups)}개 그룹")
                     for key in sorted(groups.keys()):
@@ -365,13 +286,13 @@ class FlatQuantityTable(QTableWidget):
                     else:
                         print(f"  단일 그룹 (길이가 모두 동일)")
                 else:
-                    print(f"  Line이 아닌 객체 포함 (그룹화 안 함)")
+                    print(f"  Line이 아닌 객체 포함 또는 길이를 계산하지 않는 추출모드 (그룹화 안 함)")
             
             print(f"✅ {selection.Count}개 객체 선택됨")
-            if rectangles:
-                print(f"   사각형 {len(rectangles)}개 감지")
-                for i, rect in enumerate(rectangles[:3]):  # 최대 3개만 표시
-                    print(f"   사각형{i+1}: {rect['width']:.1f} x {rect['height']:.1f}")
+            if result.rectangles:
+                print(f"   사각형 {len(result.rectangles)}개 감지")
+                for i, (width, height) in enumerate(result.rectangles[:3]):  # 최대 3개만 표시
+                    print(f"   사각형{i+1}: {width:.1f} x {height:.1f}")
             
             selection.Delete()
             
@@ -379,7 +300,54 @@ class FlatQuantityTable(QTableWidget):
             print(f"❌ CAD 선택 오류: {e}")
         finally:
             pythoncom.CoUninitialize()
-        
+            
+    def extract_row(self, row, refresh=False):
+        """행에 저장된 선택 객체를 추출모드(12번 컬럼)대로 계산해 기록
+        
+        refresh: 방금 CAD에서 고른 객체 - 캐시를 버리고 도면에서 다시 읽음
+        """
+        objects = self.row_selections.get(row, [])
+        handles = [self.row_selections.handle_of(obj) or f"id:{id(obj)}" for obj in objects]
+        if refresh:
+            self.extraction.forget(handles)
+        combo = self.cellWidget(row, 12)
+        mode = combo.currentText() if isinstance(combo, QComboBox) else "전체"
+        result = self.extraction.extract(objects, handles, mode)
+        values = extraction_values(result, FLAT_EXTRACTION_COLUMNS)
+        # 이전 추출로 채운 치수 중 이번 모드에 없는 값은 지움
+        for col in (4, 5, 6, 7):
+            item = self.item(row, col)
+            if col not in values and item and item.data(Qt.UserRole + 1):
+                self.setItem(row, col, QTableWidgetItem(""))
+        for col, text in values.items():
+            item = QTableWidgetItem(text)
+            item.setData(Qt.UserRole + 1, True)
+            self.setItem(row, col, item)
+        return result
+        
+    def extraction_mode_changed(self, row, mode):
+        """추출모드 변경 - 캐시된 형상으로 다시 계산 (COM 호출 없음)"""
+        if self.row_selections.get(row):
+            print(f"🔄 행 {row} 추출모드 변경: {mode}")
+            self.extract_row(row)
+
+    def data_columns(self):
+        """iter_data 값 목록의 컬럼 이름 (버튼 컬럼 제외)"""
+        return [self.horizontalHeaderItem(col).text() for col in range(self.columnCount() - 2)]
+
+    def iter_data(self):
+        """테이블 값을 한 행씩 (추출모드는 드롭다운 값)"""
+        for row in range(self.rowCount()):
+            row_data = []
+            for col in range(self.columnCount() - 2):
+                combo = self.cellWidget(row, col)
+                if col == 12 and isinstance(combo, QComboBox):
+                    row_data.append(combo.currentText())
+                else:
+                    item = self.item(row, col)
+                    row_data.append(item.text() if item else "")
+            yield row_data
+
     def show_selection_helper(self, row):
         """선택 도우미"""
         print(f"\n🔍 선택 도우미 호출 - 행: {row}")
@@ -436,21 +404,28 @@ class FlatQuantityTable(QTableWidget):
                             is_line_type = True
                             print(f"  타입: Line 객체 - 길이별 그룹화 적용")
                     
-                    # Line 객체인 경우 길이별로 그룹화
-                    if is_line_type:
+                    # 행 분할 키를 고른 경우 다중 키 그룹화, Line 객체인 경우 길이별로 그룹화
+                    # groups는 (키, 객체 목록) 목록 - 표시 이름이 같은 그룹도 합치지 않고 따로 둠
+                    options = dialog.group_options()
+                    if options:
+                        groups = [(group['label'], group['objects'])
+                                  for group in dialog.group_selection(*options)]
+                    elif is_line_type:
                         # dialog의 current_selection이 이미 업데이트되었으므로 그대로 사용
-                        groups = dialog.group_by_length()
+                        # 길이순 정렬
+                        groups = sorted(dialog.group_by_length().items(),
+                                        key=lambda x: (x[0] if isinstance(x[0], (int, float)) else float('inf')))
                         
                         # 그룹 정보 출력
                         print(f"\n📦 그룹화 결과: {len(groups)}개 그룹")
-                        for key, objs in sorted(groups.items(), key=lambda x: (x[0] if isinstance(x[0], (int, float)) else float('inf'))):
+                        for key, objs in groups:
                             if isinstance(key, (int, float)):
                                 print(f"  - 길이 {key:.2f}: {len(objs)}개")
                             else:
                                 print(f"  - {key}: {len(objs)}개")
                     else:
                         # Line이 아닌 경우 전체를 하나의 그룹으로
-                        groups = {'all': new_selection}
+                        groups = [('all', new_selection)]
                         print(f"  타입: {first_obj_type if new_selection else 'Unknown'} - 단일 그룹")
                     
                     # 그룹이 여러 개인 경우 행 분할
@@ -462,20 +437,20 @@ class FlatQuantityTable(QTableWidget):
                         first_group = True
                         current_row = row
                         
-                        # 길이로 정렬하여 처리
-                        sorted_groups = sorted(groups.items(), key=lambda x: (x[0] if isinstance(x[0], (int, float)) else float('inf')))
-                        
-                        for idx, (length_key, objects) in enumerate(sorted_groups):
+                        # 그룹 순서대로 처리 (길이 그룹은 이미 길이순)
+                        for idx, (length_key, objects) in enumerate(groups):
                             if first_group:
                                 # 첫 번째 그룹은 현재 행에
                                 self.row_selections[current_row] = objects
                                 if self.item(current_row, 2):
                                     self.item(current_row, 2).setText(str(len(objects)))
                                 
-                                # 규격 컬럼에 길이 표시
-                                if isinstance(length_key, (int, float)):
-                                    if self.item(current_row, 1):
+                                # 규격 컬럼에 길이 (또는 그룹 이름) 표시
+                                if self.item(current_row, 1):
+                                    if isinstance(length_key, (int, float)):
                                         self.item(current_row, 1).setText(f"L={length_key:.2f}")
+                                    else:
+                                        self.item(current_row, 1).setText(str(length_key))
                                 
                                 print(f"  행 {current_row}: 길이={length_key}, 수량={len(objects)}개")
                                 first_group = False
@@ -547,6 +522,11 @@ class SelectionHelperDialog(QDialog):
         self.current_selection = current_selection
         self.row = row
         self.found_objects = []
+        self.found_indices = []  # found_objects의 스냅샷 인덱스 (-1 = 스냅샷에 없음)
+        self.searching = False  # ModelSpace 순회 중
+        self.stop_requested = False  # 순회 중단 요청 (중단 버튼/확인)
+        self.accept_after_search = False  # 순회 중 확인을 누르면 멈춘 뒤 적용
+        self.color_override = ColorOverride()
         self.setup_ui()
         
     def setup_ui(self):
@@ -620,6 +600,24 @@ class SelectionHelperDialog(QDialog):
         else:
             self.same_block = None
             
+        # 속성이 있는 블록이면 같은 속성 값 찾기 (W1, D3 등)
+        self.same_attribute = None
+        base_attributes = []
+        if self.same_block is not None:
+            try:
+                base_attributes = read_attributes(self.current_selection[0])
+            except Exception as e:
+                print(f"  기준 블록 속성 읽기 오류: {e}")
+        if base_attributes:
+            attribute_layout = QHBoxLayout()
+            self.same_attribute = QCheckBox("같은 속성 값")
+            attribute_layout.addWidget(self.same_attribute)
+            self.attribute_combo = QComboBox()
+            for tag, value in base_attributes:
+                self.attribute_combo.addItem(f"{tag} = {value}", (tag, value))
+            attribute_layout.addWidget(self.attribute_combo)
+            option_layout.addLayout(attribute_layout)
+            
         option_group.setLayout(option_layout)
         layout.addWidget(option_group)
         
@@ -630,10 +628,22 @@ class SelectionHelperDialog(QDialog):
         self.use_area = QCheckBox("특정 영역 내에서만 검색")
         area_layout.addWidget(self.use_area)
         
+        # 영역 모양 / 판정 기준
+        area_shape_layout = QHBoxLayout()
+        self.area_shape_combo = QComboBox()
+        for key, label in REGION_SHAPES.items():
+            self.area_shape_combo.addItem(label, key)
+        area_shape_layout.addWidget(self.area_shape_combo)
+        self.area_mode_combo = QComboBox()
+        for key, label in REGION_MODES.items():
+            self.area_mode_combo.addItem(label, key)
+        area_shape_layout.addWidget(self.area_mode_combo)
+        area_layout.addLayout(area_shape_layout)
+        
         # 영역 설정 버튼
         area_btn_layout = QHBoxLayout()
         
-        self.set_area_btn = QPushButton("📏 영역 설정 (AutoCAD에서 두 점 선택)")
+        self.set_area_btn = QPushButton("📏 영역 설정 (AutoCAD에서 지정)")
         self.set_area_btn.clicked.connect(self.set_search_area)
         self.set_area_btn.setEnabled(False)
         area_btn_layout.addWidget(self.set_area_btn)
@@ -651,10 +661,76 @@ class SelectionHelperDialog(QDialog):
         # 체크박스 상태 변경 시 버튼 활성화
         self.use_area.stateChanged.connect(lambda state: self.set_area_btn.setEnabled(state == Qt.Checked))
         
+        # 주변 검색 옵션 (기준 객체 중심에서 거리, 공간 색인 조회)
+        nearby_group = QGroupBox("📍 주변 검색 (선택사항)")
+        nearby_layout = QFormLayout()
+        
+        self.use_radius = QCheckBox("반경 이내")
+        self.radius_spin = QDoubleSpinBox()
+        self.radius_spin.setRange(1, 1e7)
+        self.radius_spin.setValue(1000)
+        self.radius_spin.setSuffix(" mm")
+        nearby_layout.addRow(self.use_radius, self.radius_spin)
+        
+        self.use_nearest = QCheckBox("가까운 순")
+        self.nearest_spin = QSpinBox()
+        self.nearest_spin.setRange(1, 100000)
+        self.nearest_spin.setValue(10)
+        self.nearest_spin.setSuffix(" 개")
+        nearby_layout.addRow(self.use_nearest, self.nearest_spin)
+        
+        nearby_group.setLayout(nearby_layout)
+        layout.addWidget(nearby_group)
+        
+        # 행 분할 옵션 (확인 후 결과를 키 조합별 행으로 나눔)
+        split_group = QGroupBox("📦 행 분할 (선택사항)")
+        split_layout = QVBoxLayout()
+        
+        key_layout = QGridLayout()
+        self.group_key_checks = {}
+        for i, (key, label) in enumerate(GROUP_KEYS.items()):
+            check = QCheckBox(label)
+            key_layout.addWidget(check, i // 4, i % 4)
+            self.group_key_checks[key] = check
+        split_layout.addLayout(key_layout)
+        
+        split_form = QFormLayout()
+        self.group_tolerance_spin = QDoubleSpinBox()
+        self.group_tolerance_spin.setRange(0, 1000)
+        self.group_tolerance_spin.setValue(1.0)
+        self.group_tolerance_spin.setSuffix(" mm")
+        split_form.addRow("길이/치수/반지름 허용오차:", self.group_tolerance_spin)
+        self.group_tag_edit = QLineEdit()
+        self.group_tag_edit.setPlaceholderText("속성 태그 (예: NO)")
+        if base_attributes:
+            self.group_tag_edit.setText(base_attributes[0][0])
+        split_form.addRow("속성 태그:", self.group_tag_edit)
+        split_layout.addLayout(split_form)
+        
+        split_group.setLayout(split_layout)
+        layout.addWidget(split_group)
+        
         # 찾기 버튼
-        find_btn = QPushButton("🔍 유사 객체 찾기")
-        find_btn.clicked.connect(self.find_similar)
-        layout.addWidget(find_btn)
+        find_layout = QHBoxLayout()
+        self.find_btn = QPushButton("🔍 유사 객체 찾기")
+        self.find_btn.clicked.connect(self.find_similar)
+        find_layout.addWidget(self.find_btn)
+        
+        self.stop_btn = QPushButton("⏹ 검색 중단")
+        self.stop_btn.setToolTip("지금까지 찾은 객체로 검색을 끝냅니다")
+        self.stop_btn.clicked.connect(self.stop_search)
+        self.stop_btn.setEnabled(False)
+        find_layout.addWidget(self.stop_btn)
+        
+        refresh_btn = QPushButton("🔄 도면 다시 읽기")
+        refresh_btn.setToolTip("도면이 변경된 경우 검색 색인을 새로 만듭니다")
+        refresh_btn.clicked.connect(self.refresh_index)
+        find_layout.addWidget(refresh_btn)
+        layout.addLayout(find_layout)
+        
+        self.index_label = QLabel("")
+        self.index_label.setStyleSheet("color: gray;")
+        layout.addWidget(self.index_label)
         
         # 결과
         result_group = QGroupBox("찾기 결과")
@@ -663,15 +739,21 @@ class SelectionHelperDialog(QDialog):
         self.result_label = QLabel("찾기를 클릭하세요")
         result_layout.addWidget(self.result_label)
         
-        # 결과 스크롤 영역에 체크박스 리스트 추가
-        result_scroll_area = QScrollArea()
-        result_scroll_widget = QWidget()
-        self.result_layout = QVBoxLayout(result_scroll_widget)
-        self.checkboxes = []
-        
-        result_scroll_area.setWidget(result_scroll_widget)
-        result_scroll_area.setWidgetResizable(True)
-        result_layout.addWidget(result_scroll_area)
+        # 결과 목록 (모델/뷰 - 보이는 행만 그리므로 결과 수와 관계없이 전체 표시)
+        self.result_model = FoundObjectsModel(self.describe_found, self)
+        self.result_model.dataChanged.connect(self.update_result_label)
+        self.result_model.modelReset.connect(self.update_result_label)
+        self.result_model.rowsInserted.connect(self.update_result_label)
+        self.result_view = QTableView()
+        self.result_view.setModel(self.result_model)
+        self.result_view.setSortingEnabled(True)
+        self.result_view.sortByColumn(0, Qt.AscendingOrder)
+        self.result_view.verticalHeader().setVisible(False)
+        self.result_view.verticalHeader().setDefaultSectionSize(20)
+        self.result_view.horizontalHeader().setStretchLastSection(True)
+        self.result_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.result_view.setMinimumHeight(200)
+        result_layout.addWidget(self.result_view)
         
         result_group.setLayout(result_layout)
         layout.addWidget(result_group)
@@ -707,6 +789,28 @@ class SelectionHelperDialog(QDialog):
         mode_group.setLayout(mode_layout)
         layout.addWidget(mode_group)
         
+        # AutoCAD 표시 옵션
+        display_group = QGroupBox("🖥️ AutoCAD 표시")
+        display_layout = QVBoxLayout()
+        
+        self.highlight_on_apply = QCheckBox("확인 시 AutoCAD에서 선택 표시")
+        self.highlight_on_apply.setChecked(True)
+        display_layout.addWidget(self.highlight_on_apply)
+        
+        display_btn_layout = QHBoxLayout()
+        highlight_btn = QPushButton("💡 결과 강조")
+        highlight_btn.clicked.connect(self.highlight_results)
+        display_btn_layout.addWidget(highlight_btn)
+        
+        self.color_btn = QPushButton("🎨 임시 색상")
+        self.color_btn.setToolTip("찾은 객체를 빨간색으로 표시 (대화상자를 닫으면 원래 색상으로 복원)")
+        self.color_btn.clicked.connect(self.toggle_color_override)
+        display_btn_layout.addWidget(self.color_btn)
+        display_layout.addLayout(display_btn_layout)
+        
+        display_group.setLayout(display_layout)
+        layout.addWidget(display_group)
+        
         # 메인 스크롤 위젯 설정 및 메인 레이아웃에 추가
         main_scroll_area.setWidget(main_scroll_widget)
         main_layout.addWidget(main_scroll_area)
@@ -724,123 +828,349 @@ class SelectionHelperDialog(QDialog):
         
         main_layout.addLayout(dialog_btn_layout)
         
+    def pick_region_points(self, closed):
+        """AutoCAD에서 점을 연속 선택 (Enter/ESC로 종료, 그 밖의 오류는 그대로 올림)"""
+        points = []
+        minimum = 3 if closed else 2
+        print(f"  점을 차례로 클릭하세요 (최소 {minimum}개, Enter로 종료)...")
+        while True:
+            try:
+                if points:
+                    point = self.doc.Utility.GetPoint(point_variant(points[-1]), "다음 점 (Enter로 종료): ")
+                else:
+                    point = self.doc.Utility.GetPoint()
+            except Exception as e:
+                if is_user_input_end(e):
+                    break  # Enter/ESC 입력 시 GetPoint가 예외를 냄
+                raise
+            points.append(point)
+            print(f"  점 {len(points)}: {point[0]:.1f}, {point[1]:.1f}")
+        return points
+        
     def set_search_area(self):
-        """검색 영역 설정"""
+        """검색 영역 설정 (사각/다각형/울타리/기존 폴리라인)"""
         try:
             import pythoncom
             pythoncom.CoInitialize()
             
-            print("\n📏 영역 설정 모드")
-            print("  AutoCAD에서 대각선 모서리 두 점을 선택하세요...")
-            
-            # AutoCAD에서 두 점 선택
-            # 첫 번째 점 선택
-            print("  첫 번째 모서리 점을 클릭하세요...")
-            point1 = self.doc.Utility.GetPoint()
-            print(f"  첫 번째 점: {point1[0]:.1f}, {point1[1]:.1f}")
-            
-            # 두 번째 점 선택 - GetPoint를 다시 사용
-            print("  두 번째 모서리 점을 클릭하세요...")
-            point2 = self.doc.Utility.GetPoint()
-            print(f"  두 번째 점: {point2[0]:.1f}, {point2[1]:.1f}")
-            
-            # 영역 좌표 저장
-            self.search_area = {
-                'x1': min(point1[0], point2[0]),
-                'y1': min(point1[1], point2[1]),
-                'x2': max(point1[0], point2[0]),
-                'y2': max(point1[1], point2[1])
-            }
+            shape = self.area_shape_combo.currentData()
+            mode = self.area_mode_combo.currentData()
+            print(f"\n📏 영역 설정 모드: {REGION_SHAPES[shape]}")
+            
+            if shape == "window":
+                # 대각선 모서리 두 점
+                print("  첫 번째 모서리 점을 클릭하세요...")
+                point1 = self.doc.Utility.GetPoint()
+                print(f"  첫 번째 점: {point1[0]:.1f}, {point1[1]:.1f}")
+                print("  두 번째 모서리 점을 클릭하세요...")
+                point2 = self.doc.Utility.GetPoint(point_variant(point1), "두 번째 모서리: ")
+                print(f"  두 번째 점: {point2[0]:.1f}, {point2[1]:.1f}")
+                region = SearchRegion(shape, [point1[:2], point2[:2]], mode)
+            elif shape == "boundary":
+                print("  경계로 쓸 폐합 폴리라인을 선택하세요...")
+                obj, _ = self.doc.Utility.GetEntity()
+                region = SearchRegion.from_polyline(obj, mode)
+            else:
+                points = self.pick_region_points(closed=shape != "fence")
+                region = SearchRegion(shape, [p[:2] for p in points], mode)
+                
+            self.search_region = region
             
             # 영역 정보 표시
-            width = self.search_area['x2'] - self.search_area['x1']
-            height = self.search_area['y2'] - self.search_area['y1']
-            self.area_info_label.setText(
-                f"영역 설정됨: {width:.1f} x {height:.1f}\n"
-                f"X: {self.search_area['x1']:.1f} ~ {self.search_area['x2']:.1f}\n"
-                f"Y: {self.search_area['y1']:.1f} ~ {self.search_area['y2']:.1f}"
-            )
+            self.area_info_label.setText(f"영역 설정됨: {region.describe()}")
             self.area_info_label.setStyleSheet("color: green; font-weight: bold;")
             
-            print(f"  ✅ 영역 설정: {width:.1f} x {height:.1f}")
+            x1, y1, x2, y2 = region.bounds
+            print(f"  ✅ 영역 설정: {x2 - x1:.1f} x {y2 - y1:.1f} ({REGION_MODES[region.mode]})")
             
-            # 시각적 표시를 위한 사각형 그리기 (선택사항)
+            # 시각적 표시: 임시 폴리라인을 그리고 잠시 후 타이머로 삭제 (UI를 멈추지 않음)
             try:
-                # 임시 폴리라인으로 영역 표시
-                points = [
-                    self.search_area['x1'], self.search_area['y1'], 0,
-                    self.search_area['x2'], self.search_area['y1'], 0,
-                    self.search_area['x2'], self.search_area['y2'], 0,
-                    self.search_area['x1'], self.search_area['y2'], 0,
-                    self.search_area['x1'], self.search_area['y1'], 0
-                ]
                 import win32com.client
-                points_var = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, points)
+                points_var = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8,
+                                                     region.preview_points())
                 temp_rect = self.doc.ModelSpace.AddPolyline(points_var)
                 temp_rect.Color = 1  # 빨간색
                 temp_rect.LineWeight = 30  # 두께
-                
-                # 잠시 후 삭제
-                import time
-                time.sleep(1)
-                temp_rect.Delete()
-            except:
-                pass
+                QTimer.singleShot(1000, lambda: self.remove_area_preview(temp_rect))
+            except Exception as e:
+                print(f"  영역 표시 생략: {e}")
                 
         except Exception as e:
+            if is_user_input_end(e):
+                print("  영역 설정 취소")
+                return
             print(f"  ❌ 영역 설정 오류: {e}")
             QMessageBox.warning(self, "오류", f"영역 설정 중 오류:\n{str(e)}")
         finally:
             pythoncom.CoUninitialize()
+            
+    def remove_area_preview(self, temp_rect):
+        """영역 미리보기 폴리라인 삭제"""
+        try:
+            temp_rect.Delete()
+        except Exception as e:
+            print(f"  영역 표시 삭제 실패: {e}")
     
     def is_in_area(self, obj):
         """객체가 설정된 영역 내에 있는지 확인"""
-        if not hasattr(self, 'search_area'):
+        if not hasattr(self, 'search_region'):
             return True  # 영역이 설정되지 않으면 모든 객체 포함
             
         try:
-            obj_type = str(obj.ObjectName)
-            x1, y1 = self.search_area['x1'], self.search_area['y1']
-            x2, y2 = self.search_area['x2'], self.search_area['y2']
-            
-            # 점 기반 객체
-            if hasattr(obj, 'InsertionPoint'):
-                pt = obj.InsertionPoint
-                return x1 <= pt[0] <= x2 and y1 <= pt[1] <= y2
-                
-            # LINE
-            elif "Line" in obj_type and "Polyline" not in obj_type:
-                start = obj.StartPoint
-                end = obj.EndPoint
-                # 양 끝점이 영역 내에 있는지
-                return (x1 <= start[0] <= x2 and y1 <= start[1] <= y2 and
-                       x1 <= end[0] <= x2 and y1 <= end[1] <= y2)
-                
-            # CIRCLE
-            elif "Circle" in obj_type:
-                center = obj.Center
-                return x1 <= center[0] <= x2 and y1 <= center[1] <= y2
-                
-            # POLYLINE
-            elif "Polyline" in obj_type:
-                coords = obj.Coordinates
-                # 모든 점이 영역 내에 있는지
-                for i in range(0, len(coords), 2):
-                    x, y = coords[i], coords[i+1]
-                    if not (x1 <= x <= x2 and y1 <= y <= y2):
-                        return False
-                return True
-                
-            # BLOCK
-            elif "BlockReference" in obj_type:
-                pt = obj.InsertionPoint
-                return x1 <= pt[0] <= x2 and y1 <= pt[1] <= y2
+            return self.search_region.contains_object(obj)
+        except Exception:
+            return True  # 확인할 수 없는 객체는 포함
+    
+    def get_similarity_index(self):
+        """메인 윈도우의 유사 객체 색인 (없으면 None)"""
+        main_window = getattr(self.parent(), 'parent_widget', None)
+        if main_window is None or not hasattr(main_window, 'get_similarity_index'):
+            return None
+        try:
+            return main_window.get_similarity_index()
+        except Exception as e:
+            print(f"  색인 생성 실패 - 전체 검색으로 진행: {e}")
+            return None
+            
+    def attribute_condition(self):
+        """'같은 속성 값' 조건 (태그, 값), 선택하지 않았으면 None"""
+        if self.same_attribute is None or not self.same_attribute.isChecked():
+            return None
+        return self.attribute_combo.currentData()
+        
+    def refresh_index(self):
+        """도면을 다시 읽어 색인 갱신"""
+        main_window = getattr(self.parent(), 'parent_widget', None)
+        if main_window is None or not hasattr(main_window, 'get_snapshot'):
+            return
+        main_window.get_snapshot(refresh=True)
+        self.index_label.setText("색인 갱신됨")
+        
+    def block_library(self):
+        """메인 윈도우의 블록 정의 캐시 (없으면 None)"""
+        main_window = getattr(self.parent(), 'parent_widget', None)
+        return getattr(main_window, 'block_library', None)
+        
+    def surface_area_of(self, obj, kind):
+        """해치/영역 면적 - 메인 윈도우의 Handle별 캐시 사용 (다시 검색해도 COM 재조회 없음)"""
+        main_window = getattr(self.parent(), 'parent_widget', None)
+        cache = getattr(main_window, 'surface_cache', None)
+        if cache is None:
+            if not hasattr(self, '_surface_cache'):
+                self._surface_cache = SurfaceCache()
+            cache = self._surface_cache
+        return cache.measure([obj], [str(obj.Handle)], [kind])[0]['area']
+        
+    def query_similar(self, index, base_index):
+        """색인 조회로 유사 객체 추가 (기준 객체 제외), 추가된 개수 반환"""
+        snapshot = index.snapshot
+        found = index.query(
+            base_index,
+            same_type=self.same_type.isChecked(),
+            same_layer=self.same_layer.isChecked(),
+            same_color=self.same_color.isChecked(),
+            same_block=bool(self.same_block and self.same_block.isChecked()),
+            size_tolerance=0.1 if self.same_size.isChecked() else None,
+        )
+        found = found[found != base_index]
+        
+        # 같은 속성 값: 속성 역색인 조회 (블록마다 GetAttributes를 호출하지 않음)
+        condition = self.attribute_condition()
+        if condition:
+            main_window = getattr(self.parent(), 'parent_widget', None)
+            matches = main_window.get_attribute_index().query(*condition)
+            found = found[np.isin(found, matches)]
+            
+        # 영역 체크 (is_in_area와 같은 기준, 후보만 배열로 판정)
+        if self.use_area.isChecked() and hasattr(self, 'search_region'):
+            main_window = getattr(self.parent(), 'parent_widget', None)
+            spatial = main_window.get_spatial_index() if self.search_region.mode == "inside" else None
+            found = found[self.search_region.mask(snapshot, spatial)[found]]
+            
+        # 주변 검색: 기준 객체 중심에서 반경 이내 / 가까운 순 k개
+        if self.use_radius.isChecked() or self.use_nearest.isChecked():
+            main_window = getattr(self.parent(), 'parent_widget', None)
+            spatial = main_window.get_spatial_index()
+            center = spatial.center_of(base_index)
+            candidates = np.zeros(snapshot.count, dtype=bool)
+            candidates[found] = True
+            if self.use_radius.isChecked():
+                found = spatial.radius(center, self.radius_spin.value(), candidates)
+                candidates[:] = False
+                candidates[found] = True
+            if self.use_nearest.isChecked():
+                found = spatial.nearest(center, self.nearest_spin.value(), candidates)
                 
-        except:
-            pass
+        self.found_objects.extend(snapshot.objects[i] for i in found)
+        self.found_indices.extend(int(i) for i in found)
+        print(f"  색인 조회: {len(found)}개 (ModelSpace 순회 없음)")
+        return len(found)
+        
+    def scan_similar(self, base_handle, base_type, base_layer, base_color, base_block_name, base_size,
+                     base_center=None, publish=False):
+        """ModelSpace 전체를 순회하며 유사 객체 추가 (색인에 없는 객체용), 추가된 개수 반환
+        
+        base_center: 반경 조건에 쓰는 기준 객체 bbox 중심
+        publish: 순회 중 SCAN_PUBLISH_EVERY개마다 찾은 객체를 결과 목록에 바로 추가
+        """
+        count = 0
+        total = self.doc.ModelSpace.Count
+        published = len(self.found_objects)
+        for i in range(total):
+            if publish and i and i % SCAN_PUBLISH_EVERY == 0:
+                published = self.publish_found(published, i, total)
+                if self.stop_requested:
+                    print(f"  ⏹ 검색 중단: {i}/{total}개 확인")
+                    break
+                    
+            obj = self.doc.ModelSpace.Item(i)
             
-        return True  # 확인할 수 없는 객체는 포함
-    
+            # 기준 객체 자신은 이미 추가했으므로 제외
+            if obj.Handle == base_handle:
+                continue
+            
+            # 각 조건을 순차적으로 확인하고 하나라도 만족하지 않으면 건너뛰기
+            should_include = True
+            
+            # 영역 체크 (영역이 설정된 경우만)
+            if should_include and self.use_area.isChecked() and hasattr(self, 'search_region'):
+                if not self.is_in_area(obj):
+                    should_include = False
+            
+            # 같은 타입 체크
+            if self.same_type.isChecked():
+                if str(obj.ObjectName) != base_type:
+                    should_include = False
+                    
+            # 같은 레이어 체크
+            if should_include and self.same_layer.isChecked():
+                if str(obj.Layer) != base_layer:
+                    should_include = False
+                    
+            # 같은 색상 체크
+            if should_include and self.same_color.isChecked():
+                if base_color is not None:
+                    obj_color = obj.color if hasattr(obj, 'color') else None
+                    if obj_color != base_color:
+                        should_include = False
+                else:
+                    # 기준 객체에 색상이 없으면 색상 비교 건너뛰기
+                    pass
+                        
+            # 같은 블록 체크 (블록일 때만)
+            if should_include and self.same_block and self.same_block.isChecked():
+                # 블록이 아닌 객체는 제외
+                if "BlockReference" not in str(obj.ObjectName):
+                    should_include = False
+                else:
+                    # 블록 이름 비교
+                    if str(obj.Name) != base_block_name:
+                        should_include = False
+                        
+            # 같은 속성 값 체크 (색인에 없는 기준 객체일 때만 객체별로 읽음)
+            if should_include and self.attribute_condition():
+                if "BlockReference" not in str(obj.ObjectName):
+                    should_include = False
+                else:
+                    try:
+                        should_include = tuple(self.attribute_condition()) in read_attributes(obj)
+                    except Exception:
+                        should_include = False
+                        
+            # 같은 크기 체크
+            if should_include and self.same_size.isChecked():
+                if base_size is not None:
+                    obj_size = None
+                    try:
+                        # 폴리라인의 경우 면적 계산
+                        if "Polyline" in str(obj.ObjectName):
+                            if hasattr(obj, 'Closed') and obj.Closed:
+                                coords = obj.Coordinates
+                                if len(coords) >= 8:
+                                    width, height = outline_size(coords)
+                                    obj_size = width * height
+                        elif "Circle" in str(obj.ObjectName) and hasattr(obj, 'Radius'):
+                            # 원의 경우 면적 계산
+                            obj_size = 3.14159 * obj.Radius * obj.Radius
+                        elif "BlockReference" in str(obj.ObjectName) and self.block_library() is not None:
+                            obj_size = self.block_library().reference_size(obj)
+                        elif entity_kind(str(obj.ObjectName)) in SURFACE_KINDS:
+                            # 해치/영역은 면적 (섬 제외)
+                            obj_size = self.surface_area_of(obj, entity_kind(str(obj.ObjectName)))
+                        elif hasattr(obj, 'Length'):
+                            obj_size = obj.Length
+                        elif hasattr(obj, 'Area'):
+                            obj_size = obj.Area
+                    except:
+                        pass
+                    
+                    if obj_size is None:
+                        # 크기를 측정할 수 없는 객체는 제외
+                        should_include = False
+                    else:
+                        # ±10% 허용
+                        if abs(obj_size - base_size) / base_size > 0.1:
+                            should_include = False
+                else:
+                    # 기준 객체에 크기 정보가 없으면 크기 비교 건너뛰기
+                    pass
+            
+            # 반경 체크 (bbox 중심 거리)
+            if should_include and base_center is not None and self.use_radius.isChecked():
+                try:
+                    distance = float(np.hypot(*(self.bbox_center(obj) - base_center)))
+                    should_include = distance <= self.radius_spin.value()
+                except Exception:
+                    should_include = False
+            
+            # 모든 조건을 만족하면 추가
+            if should_include:
+                self.found_objects.append(obj)
+                count += 1
+                
+        if publish:
+            self.publish_found(published, total, total)
+        return count
+        
+    def publish_found(self, start, scanned, total):
+        """순회 중 찾은 객체(start 이후)를 결과 목록에 추가하고 화면 갱신, 다음 시작 위치 반환"""
+        self.result_model.append_results(self.found_objects[start:])
+        self.result_label.setText(f"검색 중... {scanned}/{total}개 확인, "
+                                  f"찾은 객체 {len(self.found_objects)}개")
+        QApplication.processEvents()  # 목록 갱신, 중단/확인 버튼 처리
+        return len(self.found_objects)
+        
+    def stop_search(self):
+        """순회 중단 (지금까지 찾은 객체는 유지)"""
+        if self.searching:
+            self.stop_requested = True
+            
+    @staticmethod
+    def bbox_center(obj):
+        """객체 bbox 중심 (x, y)"""
+        min_pt, max_pt = obj.GetBoundingBox()
+        return np.array([(min_pt[0] + max_pt[0]) / 2, (min_pt[1] + max_pt[1]) / 2])
+        
+    def filter_nearby_objects(self, base_obj):
+        """색인 없이 찾은 객체에 주변 검색 조건 적용 (bbox 중심 거리), 남은 개수 반환"""
+        if not (self.use_radius.isChecked() or self.use_nearest.isChecked()):
+            return len(self.found_objects)
+            
+        base_center = self.bbox_center(base_obj)
+        others = []
+        for obj in self.found_objects[1:]:
+            try:
+                others.append((float(np.hypot(*(self.bbox_center(obj) - base_center))), obj))
+            except Exception:
+                pass
+        others.sort(key=lambda item: item[0])
+        if self.use_radius.isChecked():
+            others = [item for item in others if item[0] <= self.radius_spin.value()]
+        if self.use_nearest.isChecked():
+            others = others[:self.nearest_spin.value()]
+        self.found_objects = [base_obj] + [obj for _, obj in others]
+        return len(self.found_objects)
+        
     def find_similar(self):
         """유사 객체 찾기"""
         if not self.current_selection:
@@ -848,6 +1178,8 @@ class SelectionHelperDialog(QDialog):
             
         base_obj = self.current_selection[0]
         self.found_objects = []
+        self.found_indices = []
+        self.result_view.sortByColumn(0, Qt.AscendingOrder)  # 새 결과는 찾은 순서로 표시
         
         try:
             pythoncom.CoInitialize()
@@ -876,12 +1208,17 @@ class SelectionHelperDialog(QDialog):
                     if hasattr(base_obj, 'Closed') and base_obj.Closed:
                         coords = base_obj.Coordinates
                         if len(coords) >= 8:
-                            x_coords = [coords[i] for i in range(0, len(coords), 2)]
-                            y_coords = [coords[i] for i in range(1, len(coords), 2)]
-                            width = max(x_coords) - min(x_coords)
-                            height = max(y_coords) - min(y_coords)
+                            width, height = outline_size(coords)
                             base_size = width * height
                             print(f"  기준 폴리라인 크기: {width:.2f} x {height:.2f} = {base_size:.2f}")
+                elif "BlockReference" in base_type and self.block_library() is not None:
+                    # 블록의 경우 정의 외곽 x 축척/회전 (분해 없이 정의 캐시로 계산)
+                    base_size = self.block_library().reference_size(base_obj)
+                    print(f"  기준 블록 크기: {base_size}")
+                elif entity_kind(base_type) in SURFACE_KINDS:
+                    # 해치/영역의 경우 (섬 제외 면적)
+                    base_size = self.surface_area_of(base_obj, entity_kind(base_type))
+                    print(f"  기준 해치/영역 면적: {base_size:.2f}")
                 elif hasattr(base_obj, 'Radius'):
                     # 원의 경우
                     base_size = 3.14159 * base_obj.Radius * base_obj.Radius
@@ -906,91 +1243,41 @@ class SelectionHelperDialog(QDialog):
             self.found_objects.append(base_obj)
             count = 1
             
-            for i in range(self.doc.ModelSpace.Count):
-                obj = self.doc.ModelSpace.Item(i)
-                
-                # 기준 객체 자신은 이미 추가했으므로 제외
-                if obj.Handle == base_handle:
-                    continue
-                
-                # 각 조건을 순차적으로 확인하고 하나라도 만족하지 않으면 건너뛰기
-                should_include = True
-                
-                # 영역 체크 (영역이 설정된 경우만)
-                if should_include and self.use_area.isChecked() and hasattr(self, 'search_area'):
-                    if not self.is_in_area(obj):
-                        should_include = False
-                
-                # 같은 타입 체크
-                if self.same_type.isChecked():
-                    if str(obj.ObjectName) != base_type:
-                        should_include = False
-                        
-                # 같은 레이어 체크
-                if should_include and self.same_layer.isChecked():
-                    if str(obj.Layer) != base_layer:
-                        should_include = False
-                        
-                # 같은 색상 체크
-                if should_include and self.same_color.isChecked():
-                    if base_color is not None:
-                        obj_color = obj.color if hasattr(obj, 'color') else None
-                        if obj_color != base_color:
-                            should_include = False
-                    else:
-                        # 기준 객체에 색상이 없으면 색상 비교 건너뛰기
-                        pass
-                            
-                # 같은 블록 체크 (블록일 때만)
-                if should_include and self.same_block and self.same_block.isChecked():
-                    # 블록이 아닌 객체는 제외
-                    if "BlockReference" not in str(obj.ObjectName):
-                        should_include = False
-                    else:
-                        # 블록 이름 비교
-                        if str(obj.Name) != base_block_name:
-                            should_include = False
-                            
-                # 같은 크기 체크
-                if should_include and self.same_size.isChecked():
-                    if base_size is not None:
-                        obj_size = None
-                        try:
-                            # 폴리라인의 경우 면적 계산
-                            if "Polyline" in str(obj.ObjectName):
-                                if hasattr(obj, 'Closed') and obj.Closed:
-                                    coords = obj.Coordinates
-                                    if len(coords) >= 8:
-                                        x_coords = [coords[i] for i in range(0, len(coords), 2)]
-                                        y_coords = [coords[i] for i in range(1, len(coords), 2)]
-                                        width = max(x_coords) - min(x_coords)
-                                        height = max(y_coords) - min(y_coords)
-                                        obj_size = width * height
-                            elif "Circle" in str(obj.ObjectName) and hasattr(obj, 'Radius'):
-                                # 원의 경우 면적 계산
-                                obj_size = 3.14159 * obj.Radius * obj.Radius
-                            elif hasattr(obj, 'Length'):
-                                obj_size = obj.Length
-                            elif hasattr(obj, 'Area'):
-                                obj_size = obj.Area
-                        except:
-                            pass
-                        
-                        if obj_size is None:
-                            # 크기를 측정할 수 없는 객체는 제외
-                            should_include = False
-                        else:
-                            # ±10% 허용
-                            if abs(obj_size - base_size) / base_size > 0.1:
-                                should_include = False
-                    else:
-                        # 기준 객체에 크기 정보가 없으면 크기 비교 건너뛰기
-                        pass
-                
-                # 모든 조건을 만족하면 추가
-                if should_include:
-                    self.found_objects.append(obj)
-                    count += 1
+            # 스냅샷 색인에 기준 객체가 있으면 색인 조회, 없으면 ModelSpace 검색
+            index = self.get_similarity_index()
+            base_index = index.snapshot.handle_index.get(str(base_handle)) if index else None
+            snapshot = index.snapshot if index else None
+            if base_index is not None:
+                self.found_indices = [base_index]
+                count += self.query_similar(index, base_index)
+                self.result_model.set_results(self.found_objects, self.found_indices, snapshot)
+            else:
+                # 순회 중 찾은 객체를 바로 목록에 보여줌 (가까운 순 k개는 끝까지 봐야 하므로 제외)
+                stream = not self.use_nearest.isChecked()
+                self.result_model.set_results([base_obj])
+                base_center = None
+                if self.use_radius.isChecked():
+                    try:
+                        base_center = self.bbox_center(base_obj)
+                    except Exception as e:
+                        print(f"  기준 객체 중심 계산 오류: {e}")
+                self.searching, self.stop_requested = True, False
+                self.find_btn.setEnabled(False)
+                self.stop_btn.setEnabled(True)
+                try:
+                    count += self.scan_similar(base_handle, base_type, base_layer, base_color,
+                                               base_block_name, base_size, base_center, publish=stream)
+                finally:
+                    self.searching = False
+                    self.find_btn.setEnabled(True)
+                    self.stop_btn.setEnabled(False)
+                if stream:
+                    # 반경 조건은 순회 중 적용됨 - 이미 보여준 목록 순서를 그대로 유지
+                    count = len(self.found_objects)
+                else:
+                    count = self.filter_nearby_objects(base_obj)  # 가까운 순 k개
+                    self.result_model.set_results(self.found_objects)
+                self.found_indices = [-1] * len(self.found_objects)
                 
             # 결과 표시
             print(f"\n✅ 찾기 완료: 총 {count}개 객체")
@@ -1003,106 +1290,97 @@ class SelectionHelperDialog(QDialog):
                 print(f"    - 같은 색상: {base_color}")
             if self.same_block and self.same_block.isChecked():
                 print(f"    - 같은 블록: {base_block_name}")
+            if self.attribute_condition():
+                print(f"    - 같은 속성 값: {self.attribute_condition()[0]} = {self.attribute_condition()[1]}")
+            if self.use_radius.isChecked():
+                print(f"    - 반경 이내: {self.radius_spin.value():.0f}mm")
+            if self.use_nearest.isChecked():
+                print(f"    - 가까운 순: {self.nearest_spin.value()}개")
             if self.same_size.isChecked():
                 print(f"    - 같은 크기 (±10%): {base_size}")
-            if self.use_area.isChecked() and hasattr(self, 'search_area'):
-                print(f"    - 영역 제한: X({self.search_area['x1']:.1f}~{self.search_area['x2']:.1f}), Y({self.search_area['y1']:.1f}~{self.search_area['y2']:.1f})")
-            
-            self.result_label.setText(f"찾은 객체: {count}개")
+            if self.use_area.isChecked() and hasattr(self, 'search_region'):
+                print(f"    - 영역 제한: {self.search_region.describe()}")
             
-            # 기존 체크박스 제거
-            for checkbox in self.checkboxes:
-                checkbox.setParent(None)
-            self.checkboxes.clear()
+            self.update_result_label()
             
-            # 새 체크박스 생성
-            for i, obj in enumerate(self.found_objects[:100]):  # 최대 100개 표시
-                try:
-                    obj_type = str(obj.ObjectName).replace("AcDb", "")
-                    layer = str(obj.Layer)
-                    
-                    # 치수 정보 추출
-                    size_info = ""
-                    
-                    # 폴리라인인 경우
-                    if "Polyline" in obj_type:
-                        try:
-                            # 폐합된 폴리라인이면 사각형 검사
-                            if hasattr(obj, 'Closed') and obj.Closed:
-                                coords = obj.Coordinates
-                                if len(coords) >= 8:
-                                    x_coords = [coords[j] for j in range(0, len(coords), 2)]
-                                    y_coords = [coords[j] for j in range(1, len(coords), 2)]
-                                    width = max(x_coords) - min(x_coords)
-                                    height = max(y_coords) - min(y_coords)
-                                    
-                                    if len(coords) in [8, 10]:  # 사각형
-                                        size_info = f" | 📐 {width:.1f} x {height:.1f}"
-                                    else:
-                                        area = obj.Area if hasattr(obj, 'Area') else 0
-                                        size_info = f" | 면적: {area:.1f}"
-                            else:
-                                # 열린 폴리라인
-                                length = obj.Length if hasattr(obj, 'Length') else 0
-                                size_info = f" | 길이: {length:.1f}"
-                        except:
-                            pass
-                    
-                    # 원인 경우
-                    elif "Circle" in obj_type:
-                        try:
-                            radius = obj.Radius
-                            size_info = f" | 반지름: {radius:.1f}"
-                        except:
-                            pass
-                    
-                    # 선인 경우
-                    elif "Line" in obj_type and "Polyline" not in obj_type:
-                        try:
-                            start = obj.StartPoint
-                            end = obj.EndPoint
-                            import math
-                            length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-                            size_info = f" | 길이: {length:.1f}"
-                        except:
-                            pass
-                    
-                    # 블록인 경우
-                    elif "BlockReference" in obj_type:
-                        try:
-                            block_name = str(obj.Name)
-                            size_info = f" | 블록: {block_name}"
-                            # 스케일 정보가 있으면 추가
-                            if hasattr(obj, 'XScaleFactor'):
-                                scale = obj.XScaleFactor
-                                if scale != 1.0:
-                                    size_info += f" (스케일: {scale:.2f})"
-                        except:
-                            pass
-                    
-                    # 체크박스 생성
-                    checkbox_text = f"{i+1}. {obj_type} [{layer}]{size_info}"
-                    checkbox = QCheckBox(checkbox_text)
-                    checkbox.setChecked(True)  # 기본적으로 체크
-                    self.checkboxes.append(checkbox)
-                    self.result_layout.addWidget(checkbox)
-                except Exception as e:
-                    print(f"항목 생성 오류: {e}")
-                    
-            if count > 100:
-                label = QLabel(f"... 외 {count-100}개 (최대 100개만 표시)")
-                self.result_layout.addWidget(label)
-                
         except Exception as e:
             QMessageBox.warning(self, "오류", f"검색 중 오류: {str(e)}")
         finally:
             pythoncom.CoUninitialize()
             
+        # 순회 중 확인을 눌렀으면 찾은 데까지 적용하고 닫기
+        if self.accept_after_search:
+            self.accept_after_search = False
+            self.accept_and_apply()
+            
+    def describe_found(self, obj):
+        """스냅샷에 없는 찾기 결과 표시 정보 (타입, 레이어, 크기 문자열, 정렬용 크기)"""
+        obj_type = str(obj.ObjectName).replace("AcDb", "")
+        layer = str(obj.Layer)
+        size_info, size = "", 0.0
+        
+        # 폴리라인인 경우
+        if "Polyline" in obj_type:
+            # 폐합된 폴리라인이면 사각형 검사
+            if hasattr(obj, 'Closed') and obj.Closed:
+                coords = obj.Coordinates
+                rectangle = rectangle_of(np.asarray(coords, dtype=float).reshape(-1, 2)) \
+                    if len(coords) in [8, 10] else None
+                size = obj.Area if hasattr(obj, 'Area') else 0
+                if rectangle:  # 사각형 (회전 포함 실제 변 길이)
+                    size_info = f"📐 {rectangle[0]:.1f} x {rectangle[1]:.1f}"
+                else:
+                    size_info = f"면적: {size:.1f}"
+            else:
+                # 열린 폴리라인
+                size = obj.Length if hasattr(obj, 'Length') else 0
+                size_info = f"길이: {size:.1f}"
+                
+        # 원인 경우
+        elif "Circle" in obj_type:
+            size = obj.Radius
+            size_info = f"반지름: {size:.1f}"
+            
+        # 선인 경우
+        elif "Line" in obj_type:
+            start = obj.StartPoint
+            end = obj.EndPoint
+            size = math.hypot(end[0] - start[0], end[1] - start[1])
+            size_info = f"길이: {size:.1f}"
+            
+        # 해치/영역인 경우
+        elif entity_kind("AcDb" + obj_type) in SURFACE_KINDS:
+            size = self.surface_area_of(obj, entity_kind("AcDb" + obj_type))
+            size_info = f"면적: {size:.1f}"
+            
+        # 블록인 경우
+        elif "BlockReference" in obj_type:
+            size_info = f"블록: {obj.Name}"
+            # 스케일 정보가 있으면 추가
+            if hasattr(obj, 'XScaleFactor'):
+                scale = obj.XScaleFactor
+                if scale != 1.0:
+                    size_info += f" (스케일: {scale:.2f})"
+                    
+        return obj_type, layer, size_info, float(size)
+        
+    def update_result_label(self, *args):
+        """찾은 개수 / 체크된 개수 표시"""
+        total = self.result_model.rowCount()
+        self.result_label.setText(f"찾은 객체: {total}개 (체크 {self.result_model.checked_count()}개)")
+        
     def accept_and_apply(self):
         """확인 버튼 - 체크된 항목 적용 후 닫기"""
-        # 체크박스가 없으면 (유사 객체 찾기를 하지 않은 경우) found_objects를 그대로 사용
-        if not self.checkboxes and self.found_objects:
-            print(f"  체크박스 없음 - found_objects 그대로 사용: {len(self.found_objects)}개")
+        if self.searching:
+            # 순회 중이면 멈추게 하고, 순회가 끝난 뒤 find_similar에서 다시 호출
+            self.stop_requested = True
+            self.accept_after_search = True
+            return
+            
+        # 결과 목록이 비어 있으면 (유사 객체 찾기를 하지 않은 경우) found_objects를 그대로 사용
+        has_results = self.result_model.rowCount() > 0
+        if not has_results and self.found_objects:
+            print(f"  결과 목록 없음 - found_objects 그대로 사용: {len(self.found_objects)}개")
             if self.replace_mode.isChecked():
                 self.current_selection = self.found_objects[:]
             else:
@@ -1119,14 +1397,11 @@ class SelectionHelperDialog(QDialog):
                             self.current_selection.append(obj)
                     except:
                         self.current_selection.append(obj)
-        elif self.checkboxes:
-            # 체크박스가 있는 경우 기존 로직 사용
+        elif has_results:
+            # 결과 목록이 있으면 체크된 항목 사용
             if self.replace_mode.isChecked():
                 # 대체 모드: 체크된 항목으로 선택 대체
-                self.current_selection = []
-                for i, checkbox in enumerate(self.checkboxes):
-                    if checkbox.isChecked() and i < len(self.found_objects):
-                        self.current_selection.append(self.found_objects[i])
+                self.current_selection = self.result_model.checked_objects()
             else:
                 # 추가 모드: 체크된 항목을 현재 선택에 추가 (중복 제거)
                 # 현재 선택된 객체의 Handle 목록 생성
@@ -1138,109 +1413,960 @@ class SelectionHelperDialog(QDialog):
                         pass
                 
                 # 체크된 항목 추가 (중복 제거)
-                for i, checkbox in enumerate(self.checkboxes):
-                    if checkbox.isChecked() and i < len(self.found_objects):
-                        obj = self.found_objects[i]
-                        try:
-                            if obj.Handle not in existing_handles:
-                                self.current_selection.append(obj)
-                                existing_handles.add(obj.Handle)
-                        except:
-                            # Handle이 없는 경우 그냥 추가
+                for obj in self.result_model.checked_objects():
+                    try:
+                        if obj.Handle not in existing_handles:
                             self.current_selection.append(obj)
+                            existing_handles.add(obj.Handle)
+                    except:
+                        # Handle이 없는 경우 그냥 추가
+                        self.current_selection.append(obj)
         
         print(f"  최종 current_selection: {len(self.current_selection)}개")
         
+        # AutoCAD에 선택 결과 표시 (선택 세트 한 번에 반영)
+        if self.highlight_on_apply.isChecked() and self.current_selection:
+            try:
+                pythoncom.CoInitialize()
+                push_selection(self.doc, self.current_selection, pickfirst=True)
+            except Exception as e:
+                print(f"  AutoCAD 선택 표시 오류: {e}")
+            finally:
+                pythoncom.CoUninitialize()
+        
         # 다이얼로그 닫기
         self.accept()
+        
+    def checked_objects(self):
+        """체크된 찾기 결과 (결과 목록이 비어 있으면 찾은 객체 전체)"""
+        if self.result_model.rowCount() == 0:
+            return list(self.found_objects)
+        return self.result_model.checked_objects()
+        
+    def highlight_results(self):
+        """체크된 찾기 결과를 AutoCAD에서 강조"""
+        objects = self.checked_objects()
+        if not objects:
+            return
+        try:
+            pythoncom.CoInitialize()
+            push_selection(self.doc, objects)
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"강조 표시 오류: {str(e)}")
+        finally:
+            pythoncom.CoUninitialize()
+            
+    def toggle_color_override(self):
+        """체크된 찾기 결과에 임시 색상 적용/복원"""
+        try:
+            pythoncom.CoInitialize()
+            progress = lambda done, total: QApplication.processEvents()
+            if self.color_override.active:
+                self.color_override.revert(progress)
+                self.color_btn.setText("🎨 임시 색상")
+            else:
+                self.color_override.apply(self.checked_objects(), progress=progress)
+                self.color_btn.setText("↩️ 색상 복원")
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"임시 색상 오류: {str(e)}")
+        finally:
+            pythoncom.CoUninitialize()
+            
+    def done(self, result):
+        """대화상자 종료 시 임시 색상 복원"""
+        self.stop_requested = True  # 순회 중 닫으면 검색도 중단
+        if self.color_override.active:
+            try:
+                pythoncom.CoInitialize()
+                self.color_override.revert()
+            except Exception as e:
+                print(f"  색상 복원 오류: {e}")
+            finally:
+                pythoncom.CoUninitialize()
+        super().done(result)
             
     def select_all(self):
         """전체 선택"""
-        for checkbox in self.checkboxes:
-            checkbox.setChecked(True)
+        self.result_model.set_all_checked(True)
             
     def deselect_all(self):
         """전체 해제"""
-        for checkbox in self.checkboxes:
-            checkbox.setChecked(False)
+        self.result_model.set_all_checked(False)
             
     def invert_selection(self):
         """선택 반전"""
-        for checkbox in self.checkboxes:
-            checkbox.setChecked(not checkbox.isChecked())
+        self.result_model.invert_checked()
         
     def get_final_selection(self):
         """최종 선택 반환"""
         return self.current_selection
     
+    def group_options(self):
+        """행 분할 옵션 (키 목록, 허용오차, 속성 태그), 키를 고르지 않았으면 None"""
+        keys = [key for key, check in self.group_key_checks.items() if check.isChecked()]
+        if not keys:
+            return None
+        return keys, self.group_tolerance_spin.value(), self.group_tag_edit.text().strip()
+        
+    def group_selection(self, keys, tolerance=1.0, attribute_tag="", objects=None):
+        """객체를 키 조합별로 그룹화 - 스냅샷 배열로 계산 (객체마다 COM 호출 없음)
+        
+        반환: group_by.group_selection 결과에 'objects'를 더한 목록,
+              스냅샷에 없는 객체는 마지막 '스냅샷에 없음' 그룹
+        """
+        objects = self.current_selection if objects is None else objects
+        main_window = getattr(self.parent(), 'parent_widget', None)
+        snapshot = main_window.get_snapshot()
+        
+        # Handle → 스냅샷 인덱스 (테이블의 Handle 캐시 사용)
+        row_selections = getattr(self.parent(), 'row_selections', None)
+        positions, missing = [], []
+        for obj in objects:
+            handle = row_selections.handle_of(obj) if row_selections is not None else str(obj.Handle)
+            index = snapshot.handle_index.get(handle)
+            if index is None:
+                missing.append(obj)
+            else:
+                positions.append(index)
+                
+        attribute_index = main_window.get_attribute_index() if "attribute" in keys else None
+        groups = group_selection(snapshot, positions, keys, tolerance, attribute_index, attribute_tag)
+        for group in groups:
+            group['objects'] = [snapshot.objects[i] for i in group['members']]
+        if missing:
+            groups.append({'values': {}, 'label': "스냅샷에 없음", 'count': len(missing),
+                           'length': 0.0, 'area': 0.0, 'radius': 0.0, 'width': 0.0, 'height': 0.0,
+                           'members': np.zeros(0, dtype=np.int64), 'objects': missing})
+            
+        print(f"\n📦 그룹화 ({', '.join(GROUP_KEYS[k] for k in keys)}): "
+              f"{len(objects)}개 → {len(groups)}개 그룹")
+        for group in groups[:20]:
+            print(f"  - {group['label']}: {group['count']}개")
+        if len(groups) > 20:
+            print(f"  ... 외 {len(groups) - 20}개 그룹")
+        return groups
+        
     def group_by_length(self):
-        """길이별로 객체 그룹화"""
-        import math
+        """길이별로 객체 그룹화 (0.01 단위) - 길이가 없는 객체는 'other'"""
         groups = {}
+        for group in self.group_selection(["length"], tolerance=0.005):
+            length = group['length'] / group['count'] if group['count'] else 0.0
+            key = round(length, 2) if length > 0 else 'other'
+            groups.setdefault(key, []).extend(group['objects'])
+        return groups
+
+
+# ==================== 레이어 일괄 처리 대화상자 ====================
+
+class LayerBatchDialog(QDialog):
+    """레이어 일괄 처리 대화상자 - 스냅샷 집계값으로 표시/처리"""
+    
+    METHODS = ["철근 중량 계산", "데크 보 체적 (장변 기준)", "노출 철근 길이", "사용자 정의 수식"]
+    
+    def __init__(self, parent, snapshot, table):
+        super().__init__(parent)
+        self.main_window = parent
+        self.snapshot = snapshot
+        self.table = table
+        self.rows = []
+        self.setup_ui()
+        self.load_layers()
         
-        print(f"\n📏 길이별 그룹화 시작 (객체 수: {len(self.current_selection)})")
-        
-        # 길이 목록 수집 (디버깅용)
-        lengths = []
+    def setup_ui(self):
+        """UI 설정"""
+        self.setWindowTitle("📊 레이어 일괄 처리")
+        self.setModal(True)
+        self.resize(900, 600)
+        
+        layout = QVBoxLayout(self)
+        
+        # 필터
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("필터:"))
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("레이어 이름 (예: REBAR)")
+        self.filter_edit.textChanged.connect(self.apply_filter)
+        filter_layout.addWidget(self.filter_edit)
+        
+        refresh_btn = QPushButton("🔄 도면 다시 읽기")
+        refresh_btn.clicked.connect(self.refresh_snapshot)
+        filter_layout.addWidget(refresh_btn)
+        layout.addLayout(filter_layout)
+        
+        # 레이어 목록
+        columns = ["선택", "레이어", "객체 수", "선 길이", "폴리라인 길이",
+                   "폐합 면적", "장변 합계", "원", "블록", "철근 단위중량"]
+        self.layer_table = QTableWidget(0, len(columns))
+        self.layer_table.setHorizontalHeaderLabels(columns)
+        self.layer_table.setColumnWidth(0, 40)
+        self.layer_table.setColumnWidth(1, 180)
+        self.layer_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.layer_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.layer_table)
+        
+        # 처리 방법
+        method_layout = QHBoxLayout()
+        method_layout.addWidget(QLabel("처리 방법:"))
+        self.method_combo = QComboBox()
+        self.method_combo.addItems(self.METHODS)
+        self.method_combo.currentIndexChanged.connect(
+            lambda i: self.formula_edit.setEnabled(self.METHODS[i] == "사용자 정의 수식"))
+        method_layout.addWidget(self.method_combo)
+        
+        method_layout.addWidget(QLabel("수식:"))
+        self.formula_edit = QLineEdit("{가로}")
+        self.formula_edit.setEnabled(False)
+        method_layout.addWidget(self.formula_edit)
+        layout.addLayout(method_layout)
+        
+        # 버튼
+        btn_layout = QHBoxLayout()
+        self.summary_label = QLabel("")
+        btn_layout.addWidget(self.summary_label)
+        btn_layout.addStretch()
+        
+        btn_layout.addWidget(QLabel("길이 허용오차(mm):"))
+        self.tolerance_spin = QDoubleSpinBox()
+        self.tolerance_spin.setRange(0, 1000)
+        self.tolerance_spin.setValue(10)
+        btn_layout.addWidget(self.tolerance_spin)
+        
+        rebar_btn = QPushButton("🧮 철근 집계표")
+        rebar_btn.clicked.connect(self.build_rebar_schedule)
+        btn_layout.addWidget(rebar_btn)
+        
+        process_btn = QPushButton("✅ 처리")
+        process_btn.clicked.connect(self.process_layers)
+        btn_layout.addWidget(process_btn)
+        
+        cancel_btn = QPushButton("❌ 닫기")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        
+    def load_layers(self):
+        """레이어 집계 표시 (스냅샷 기준 한 번의 그룹 합산)"""
+        self.rows = layer_rows(aggregate_layers(self.snapshot))
+        
+        self.layer_table.setUpdatesEnabled(False)
+        self.layer_table.setRowCount(len(self.rows))
+        for i, info in enumerate(self.rows):
+            check_item = QTableWidgetItem()
+            check_item.setFlags(check_item.flags() | Qt.ItemIsUserCheckable)
+            check_item.setCheckState(Qt.Unchecked)
+            self.layer_table.setItem(i, 0, check_item)
+            
+            values = [
+                info['layer'],
+                str(info['count']),
+                f"{info['line_length']:.1f}",
+                f"{info['polyline_length']:.1f}",
+                f"{info['closed_area']:.1f}",
+                f"{info['long_side']:.1f}",
+                str(info['circle_count']),
+                str(info['block_count']),
+                f"{info['rebar_weight']:.3f}" if info['rebar_weight'] else "",
+            ]
+            for col, text in enumerate(values, start=1):
+                self.layer_table.setItem(i, col, QTableWidgetItem(text))
+        self.layer_table.setUpdatesEnabled(True)
+        
+        self.summary_label.setText(f"레이어 {len(self.rows)}개 / 객체 {self.snapshot.count}개")
+        self.apply_filter(self.filter_edit.text())
+        
+    def apply_filter(self, text):
+        """레이어 이름 필터"""
+        text = text.strip().upper()
+        for i, info in enumerate(self.rows):
+            self.layer_table.setRowHidden(i, bool(text) and text not in info['layer'].upper())
+            
+    def refresh_snapshot(self):
+        """도면을 다시 읽어 집계 갱신"""
+        self.snapshot = self.main_window.get_snapshot(refresh=True)
+        self.load_layers()
+        
+    def checked_rows(self):
+        """체크된 (보이는) 레이어 정보 목록"""
+        checked = []
+        for i, info in enumerate(self.rows):
+            item = self.layer_table.item(i, 0)
+            if item and item.checkState() == Qt.Checked and not self.layer_table.isRowHidden(i):
+                checked.append(info)
+        return checked
+        
+    def build_rebar_schedule(self):
+        """체크한 레이어(없으면 전체)의 철근을 직경/절단 길이별로 집계하여 행 추가"""
+        checked = self.checked_rows()
+        mask = None
+        if checked:
+            codes = np.searchsorted(self.snapshot.layer_names, [info['layer'] for info in checked])
+            mask = np.isin(self.snapshot.layer_codes, codes)
+            
+        diameters, lengths, idx = snapshot_bars(self.snapshot, mask,
+                                                attributes=self.main_window.get_attribute_index())
+        if len(idx) == 0:
+            QMessageBox.information(self, "안내",
+                "철근을 찾지 못했습니다.\n레이어 이름(REBAR-D13 등) 또는 블록 속성을 확인하세요.")
+            return
+            
+        schedule = rebar_schedule(diameters, lengths, self.tolerance_spin.value())
+        apply_schedule_to_table(self.table, schedule, self.snapshot.select(idx))
+        print(f"  철근 {len(idx)}개 → {len(schedule)}개 규격/길이")
+        self.accept()
         
-        for i, obj in enumerate(self.current_selection):
-            try:
-                obj_type = str(obj.ObjectName)
-                length = None
-                
-                # LINE 객체의 길이 계산
-                if "Line" in obj_type and "Polyline" not in obj_type:
-                    start = obj.StartPoint
-                    end = obj.EndPoint
-                    length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-                    lengths.append(length)
-                    print(f"  [{i+1}] Line 길이: {length:.3f}")
-                # 폴리라인의 길이
-                elif "Polyline" in obj_type:
-                    if hasattr(obj, 'Length'):
-                        length = obj.Length
-                        lengths.append(length)
-                        print(f"  [{i+1}] Polyline 길이: {length:.3f}")
-                # 원의 둘레
-                elif "Circle" in obj_type:
-                    if hasattr(obj, 'Radius'):
-                        length = 2 * math.pi * obj.Radius
-                        lengths.append(length)
-                        print(f"  [{i+1}] Circle 둘레: {length:.3f}")
+    def process_layers(self):
+        """선택한 레이어마다 행 추가 - 집계값 사용, ModelSpace 재순회 없음"""
+        checked = self.checked_rows()
+        if not checked:
+            QMessageBox.information(self, "안내", "처리할 레이어를 선택하세요.")
+            return
+            
+        method = self.method_combo.currentText()
+        table = self.table
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            category_row = table.find_or_add_category("레이어 일괄 처리")
+            subcategory_row = table.find_or_add_subcategory(category_row, method)
+            
+            for info in checked:
+                total_length = info['line_length'] + info['polyline_length']
+                values = {2: info['layer'], 4: str(info['count']), 15: info['layer']}
                 
-                if length is not None:
-                    # 길이를 0.01 단위로 반올림하여 그룹화 (더 정밀한 그룹화)
-                    length_key = round(length, 2)
-                    if length_key not in groups:
-                        groups[length_key] = []
-                        print(f"    → 새 그룹 생성: {length_key:.2f}")
-                    groups[length_key].append(obj)
+                if method == "철근 중량 계산":
+                    values.update({5: "kg", 6: f"{total_length:.1f}",
+                                   12: "{가로}/1000*{철근중량}"})
+                elif method == "데크 보 체적 (장변 기준)":
+                    values.update({4: str(info['closed_count']), 5: "m3",
+                                   6: f"{info['long_side']:.1f}",
+                                   12: "{가로}/1000*{세로}/1000*{두께}/1000"})
+                elif method == "노출 철근 길이":
+                    values.update({5: "m", 6: f"{total_length:.1f}", 12: "{가로}/1000"})
                 else:
-                    # 길이가 없는 객체는 'other' 그룹으로
-                    if 'other' not in groups:
-                        groups['other'] = []
-                    groups['other'].append(obj)
-                    print(f"  [{i+1}] {obj_type} - 길이 없음")
+                    values.update({6: f"{total_length:.1f}", 8: f"{info['closed_area']:.1f}",
+                                   12: self.formula_edit.text()})
                     
-            except Exception as e:
-                print(f"  [{i+1}] 그룹화 오류: {e}")
-                if 'error' not in groups:
-                    groups['error'] = []
-                groups['error'].append(obj)
-        
-        # 유니크한 길이 확인
-        if lengths:
-            unique_lengths = len(set([round(l, 2) for l in lengths]))
-            print(f"\n📊 길이 분석: 총 {len(lengths)}개 중 유니크한 길이 {unique_lengths}개")
-        
-        print(f"\n📦 그룹화 완료: {len(groups)}개 그룹")
-        for key, objs in sorted(groups.items(), key=lambda x: (x[0] if isinstance(x[0], (int, float)) else float('inf'))):
-            if isinstance(key, (int, float)):
-                print(f"  - 길이 {key:.2f}: {len(objs)}개 객체")
-            else:
-                print(f"  - {key}: {len(objs)}개 객체")
+                row = table.add_item(subcategory_row)
+                table.set_row_values(row, values)
+                
+                # 레이어 객체를 행 선택으로 저장 (스냅샷 마스크)
+                code = int(np.searchsorted(self.snapshot.layer_names, info['layer']))
+                table.row_selections[row] = self.snapshot.select(self.snapshot.layer_codes == code)
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+            
+        table.recalculate_all()
+                
+        print(f"✅ 레이어 일괄 처리: {len(checked)}개 레이어 ({method})")
+        self.accept()
+
+
+# ==================== 평행선 산출 대화상자 ====================
+
+class ParallelPairingDialog(QDialog):
+    """평행선 짝짓기 대화상자 - 두 줄로 그린 벽체/데크 보의 길이, 두께, 개수 산출"""
+    
+    CUSTOM = "사용자 정의"
+    
+    def __init__(self, parent, snapshot, table):
+        super().__init__(parent)
+        self.main_window = parent
+        self.snapshot = snapshot
+        self.table = table
+        self.schedule = []
+        self.setup_ui()
         
-        return groups
+    def setup_ui(self):
+        """UI 설정"""
+        self.setWindowTitle("🧱 평행선 산출 (벽체/데크 보)")
+        self.setModal(True)
+        self.resize(600, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        # 조건
+        form = QFormLayout()
+        self.layer_edit = QLineEdit("*")
+        self.layer_edit.setPlaceholderText("레이어 패턴 (예: A-WALL*, S-BEAM*)")
+        form.addRow("레이어:", self.layer_edit)
+        
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItems(list(PAIRING_PRESETS) + [self.CUSTOM])
+        self.preset_combo.currentTextChanged.connect(self.apply_preset)
+        form.addRow("용도:", self.preset_combo)
+        
+        thickness_layout = QHBoxLayout()
+        self.min_spin = QDoubleSpinBox()
+        self.min_spin.setRange(1, 10000)
+        self.max_spin = QDoubleSpinBox()
+        self.max_spin.setRange(1, 10000)
+        thickness_layout.addWidget(self.min_spin)
+        thickness_layout.addWidget(QLabel("~"))
+        thickness_layout.addWidget(self.max_spin)
+        form.addRow("두께 범위(mm):", thickness_layout)
+        
+        self.tolerance_spin = QDoubleSpinBox()
+        self.tolerance_spin.setRange(0, 100)
+        self.tolerance_spin.setValue(5)
+        form.addRow("두께 허용오차(mm):", self.tolerance_spin)
+        
+        self.overlap_spin = QDoubleSpinBox()
+        self.overlap_spin.setRange(0, 1)
+        self.overlap_spin.setSingleStep(0.1)
+        self.overlap_spin.setValue(0.5)
+        form.addRow("최소 겹침 비율:", self.overlap_spin)
+        layout.addLayout(form)
+        self.apply_preset(self.preset_combo.currentText())
+        
+        preview_btn = QPushButton("🔍 미리보기")
+        preview_btn.clicked.connect(self.preview)
+        layout.addWidget(preview_btn)
+        
+        # 결과
+        self.result_table = QTableWidget(0, 3)
+        self.result_table.setHorizontalHeaderLabels(["두께(mm)", "개수(쌍)", "총 길이(m)"])
+        self.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.result_table)
+        
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        
+        # 버튼
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        apply_btn = QPushButton("✅ 테이블에 추가")
+        apply_btn.clicked.connect(self.apply_to_table)
+        btn_layout.addWidget(apply_btn)
+        
+        cancel_btn = QPushButton("❌ 닫기")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        
+    def apply_preset(self, name):
+        """용도별 두께 범위 적용"""
+        if name in PAIRING_PRESETS:
+            low, high = PAIRING_PRESETS[name]
+            self.min_spin.setValue(low)
+            self.max_spin.setValue(high)
+            
+    def preview(self):
+        """조건에 맞는 평행선 짝짓기 결과 표시"""
+        pattern = self.layer_edit.text().strip() or "*"
+        mask = self.snapshot.layer_mask(pattern)
+        self.schedule = snapshot_pairs(
+            self.snapshot, mask,
+            min_thickness=self.min_spin.value(),
+            max_thickness=self.max_spin.value(),
+            min_overlap=self.overlap_spin.value(),
+            thickness_tolerance=self.tolerance_spin.value())
+        
+        self.result_table.setRowCount(len(self.schedule))
+        for row, item in enumerate(self.schedule):
+            self.result_table.setItem(row, 0, QTableWidgetItem(f"{item['thickness']:.0f}"))
+            self.result_table.setItem(row, 1, QTableWidgetItem(str(item['count'])))
+            self.result_table.setItem(row, 2, QTableWidgetItem(f"{item['total_length'] / 1000:.2f}"))
+            
+        total = sum(item['total_length'] for item in self.schedule) / 1000
+        pairs = sum(item['count'] for item in self.schedule)
+        self.summary_label.setText(f"두께 {len(self.schedule)}종, {pairs}쌍, 총 길이 {total:.2f}m")
+        
+    def apply_to_table(self):
+        """두께별로 행 추가 (가로: 총 길이, 두께: 평균 두께)"""
+        if not self.schedule:
+            self.preview()
+        if not self.schedule:
+            QMessageBox.information(self, "안내", "짝지은 평행선이 없습니다.")
+            return
+            
+        preset = self.preset_combo.currentText()
+        table = self.table
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            category_row = table.find_or_add_category("평행선 산출")
+            subcategory_row = table.find_or_add_subcategory(category_row, preset)
+            for item in self.schedule:
+                row = table.add_item(subcategory_row)
+                table.set_row_values(row, {
+                    2: f"{preset} T{item['thickness']:.0f}",
+                    3: f"T{item['thickness']:.0f}",
+                    4: str(item['count']),
+                    5: "m",
+                    6: f"{item['total_length']:.1f}",
+                    10: f"{item['thickness']:.0f}",
+                    12: "{가로}/1000",
+                    15: self.layer_edit.text().strip(),
+                    16: f"{item['count']}쌍",
+                })
+                table.row_selections[row] = self.snapshot.select(item['members'])
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+            
+        table.recalculate_all()
+                
+        print(f"✅ 평행선 산출: {len(self.schedule)}개 행 ({preset})")
+        self.accept()
+
+
+# ==================== 블록 집계 대화상자 ====================
+
+class BlockCountDialog(QDialog):
+    """블록 집계 대화상자 - 중첩 블록 안의 문/창호/설비까지 정의 캐시로 개수 산출"""
+    
+    def __init__(self, parent, snapshot, library, table):
+        super().__init__(parent)
+        self.main_window = parent
+        self.snapshot = snapshot
+        self.library = library
+        self.table = table
+        self.schedule = []
+        self.setup_ui()
+        
+    def setup_ui(self):
+        """UI 설정"""
+        self.setWindowTitle("🧩 블록 집계 (중첩 포함)")
+        self.setModal(True)
+        self.resize(600, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        # 조건
+        form = QFormLayout()
+        self.layer_edit = QLineEdit("*")
+        self.layer_edit.setPlaceholderText("최상위 블록 참조의 레이어 패턴 (예: A-DOOR*)")
+        form.addRow("레이어:", self.layer_edit)
+        
+        self.block_edit = QLineEdit("*")
+        self.block_edit.setPlaceholderText("집계할 블록 이름 패턴 (예: DOOR*, W*)")
+        form.addRow("블록 이름:", self.block_edit)
+        layout.addLayout(form)
+        
+        preview_btn = QPushButton("🔍 미리보기")
+        preview_btn.clicked.connect(self.preview)
+        layout.addWidget(preview_btn)
+        
+        # 결과
+        self.result_table = QTableWidget(0, 3)
+        self.result_table.setHorizontalHeaderLabels(["블록", "직접 삽입", "개수 (중첩 포함)"])
+        self.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.result_table)
+        
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        
+        # 버튼
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        apply_btn = QPushButton("✅ 테이블에 추가")
+        apply_btn.clicked.connect(self.apply_to_table)
+        btn_layout.addWidget(apply_btn)
+        
+        cancel_btn = QPushButton("❌ 닫기")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        
+    def preview(self):
+        """조건에 맞는 블록 집계 표시 (정의는 블록마다 한 번만 읽음)"""
+        mask = self.snapshot.layer_mask(self.layer_edit.text().strip() or "*")
+        self.schedule = block_count_schedule(self.snapshot, self.library, mask,
+                                             self.block_edit.text().strip() or "*")
+        
+        self.result_table.setRowCount(len(self.schedule))
+        for row, item in enumerate(self.schedule):
+            self.result_table.setItem(row, 0, QTableWidgetItem(item['name']))
+            self.result_table.setItem(row, 1, QTableWidgetItem(str(item['direct'])))
+            self.result_table.setItem(row, 2, QTableWidgetItem(str(item['count'])))
+            
+        total = sum(item['count'] for item in self.schedule)
+        self.summary_label.setText(f"블록 {len(self.schedule)}종, 총 {total}개 "
+                                   f"(정의 {len(self.library.contents)}종 캐시)")
+        
+    def apply_to_table(self):
+        """블록 이름별로 행 추가 (수량: 중첩 포함 개수, 선택: 그 블록을 포함한 최상위 참조)"""
+        if not self.schedule:
+            self.preview()
+        if not self.schedule:
+            QMessageBox.information(self, "안내", "집계할 블록이 없습니다.")
+            return
+            
+        table = self.table
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            category_row = table.find_or_add_category("블록 집계")
+            subcategory_row = table.find_or_add_subcategory(category_row, "중첩 포함")
+            for item in self.schedule:
+                row = table.add_item(subcategory_row)
+                nested = item['count'] - item['direct']
+                table.set_row_values(row, {
+                    2: item['name'],
+                    4: str(item['count']),
+                    5: "EA",
+                    15: self.layer_edit.text().strip(),
+                    16: f"중첩 {nested}개 포함" if nested else "",
+                })
+                table.row_selections[row] = self.snapshot.select(item['members'])
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+            
+        print(f"✅ 블록 집계: {len(self.schedule)}개 행")
+        self.accept()
+
+
+# ==================== 속성 집계 대화상자 ====================
+
+class AttributeGroupDialog(QDialog):
+    """속성 집계 대화상자 - 블록 속성 값(W1, D3 등)별 개수를 속성 역색인에서 산출"""
+    
+    def __init__(self, parent, index, table):
+        super().__init__(parent)
+        self.main_window = parent
+        self.index = index
+        self.snapshot = index.snapshot
+        self.table = table
+        self.groups = []
+        self.setup_ui()
+        
+    def setup_ui(self):
+        """UI 설정"""
+        self.setWindowTitle("🏷️ 속성 집계")
+        self.setModal(True)
+        self.resize(600, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        # 조건
+        form = QFormLayout()
+        self.tag_combo = QComboBox()
+        self.tag_combo.addItems(self.index.tags())
+        form.addRow("태그:", self.tag_combo)
+        
+        self.block_edit = QLineEdit("*")
+        self.block_edit.setPlaceholderText("블록 이름 패턴 (예: WIN*, DOOR*)")
+        form.addRow("블록 이름:", self.block_edit)
+        
+        self.layer_edit = QLineEdit("*")
+        self.layer_edit.setPlaceholderText("레이어 패턴 (예: A-WIND*)")
+        form.addRow("레이어:", self.layer_edit)
+        layout.addLayout(form)
+        
+        preview_btn = QPushButton("🔍 미리보기")
+        preview_btn.clicked.connect(self.preview)
+        layout.addWidget(preview_btn)
+        
+        # 결과
+        self.result_table = QTableWidget(0, 3)
+        self.result_table.setHorizontalHeaderLabels(["값", "개수", "블록"])
+        self.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.result_table)
+        
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        
+        # 버튼
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        apply_btn = QPushButton("✅ 테이블에 추가")
+        apply_btn.clicked.connect(self.apply_to_table)
+        btn_layout.addWidget(apply_btn)
+        
+        cancel_btn = QPushButton("❌ 닫기")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        
+    def preview(self):
+        """태그 값별 개수 표시 (색인 조회만, COM 호출 없음)"""
+        mask = self.snapshot.layer_mask(self.layer_edit.text().strip() or "*")
+        self.groups = self.index.value_groups(self.tag_combo.currentText(),
+                                              self.block_edit.text().strip() or "*", mask)
+        
+        self.result_table.setRowCount(len(self.groups))
+        for row, group in enumerate(self.groups):
+            self.result_table.setItem(row, 0, QTableWidgetItem(group['value']))
+            self.result_table.setItem(row, 1, QTableWidgetItem(str(group['count'])))
+            self.result_table.setItem(row, 2, QTableWidgetItem(", ".join(sorted(group['blocks']))))
+            
+        total = sum(group['count'] for group in self.groups)
+        self.summary_label.setText(f"값 {len(self.groups)}종, 총 {total}개")
+        
+    def apply_to_table(self):
+        """속성 값별로 행 추가 (품명: 값, 규격: 블록 이름, 선택: 해당 블록 참조)"""
+        if not self.groups:
+            self.preview()
+        if not self.groups:
+            QMessageBox.information(self, "안내", "해당 태그의 속성 값이 없습니다.")
+            return
+            
+        tag = self.tag_combo.currentText()
+        table = self.table
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            category_row = table.find_or_add_category("속성 집계")
+            subcategory_row = table.find_or_add_subcategory(category_row, tag)
+            for group in self.groups:
+                row = table.add_item(subcategory_row)
+                table.set_row_values(row, {
+                    2: group['value'],
+                    3: ", ".join(sorted(group['blocks'])),
+                    4: str(group['count']),
+                    5: "EA",
+                    15: self.layer_edit.text().strip(),
+                    16: f"{tag} = {group['value']}",
+                })
+                table.row_selections[row] = self.snapshot.select(group['members'])
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+            
+        print(f"✅ 속성 집계: {tag} {len(self.groups)}개 행")
+        self.accept()
+
+
+# ==================== 실별 배정 대화상자 ====================
+
+class RoomAssignmentDialog(QDialog):
+    """실별 배정 대화상자 - 실 경계 폴리라인 안의 블록/객체를 층 → 실 → 항목으로 집계"""
+    
+    GROUP_BY = {"블록 이름 / 객체 종류": "block", "블록 이름 / 레이어": "layer"}
+    
+    def __init__(self, parent, snapshot, table):
+        super().__init__(parent)
+        self.main_window = parent
+        self.snapshot = snapshot
+        self.table = table
+        self.schedule = []
+        self.setup_ui()
+        
+    def setup_ui(self):
+        """UI 설정"""
+        self.setWindowTitle("🏠 실별 배정")
+        self.setModal(True)
+        self.resize(650, 550)
+        
+        layout = QVBoxLayout(self)
+        
+        # 조건
+        form = QFormLayout()
+        self.room_edit = QLineEdit("*ROOM*")
+        self.room_edit.setPlaceholderText("실 경계(폐합 폴리라인) 레이어 패턴 (예: A-AREA*)")
+        form.addRow("실 경계 레이어:", self.room_edit)
+        
+        self.floor_edit = QLineEdit("")
+        self.floor_edit.setPlaceholderText("층 외곽 레이어 패턴 (비우면 한 층)")
+        form.addRow("층 외곽 레이어:", self.floor_edit)
+        
+        self.item_edit = QLineEdit("*")
+        self.item_edit.setPlaceholderText("배정할 객체 레이어 패턴 (예: E-*)")
+        form.addRow("객체 레이어:", self.item_edit)
+        
+        self.group_combo = QComboBox()
+        self.group_combo.addItems(list(self.GROUP_BY))
+        form.addRow("항목 기준:", self.group_combo)
+        layout.addLayout(form)
+        
+        preview_btn = QPushButton("🔍 미리보기")
+        preview_btn.clicked.connect(self.preview)
+        layout.addWidget(preview_btn)
+        
+        # 결과
+        self.result_table = QTableWidget(0, 4)
+        self.result_table.setHorizontalHeaderLabels(["층", "실", "항목", "개수"])
+        self.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.result_table)
+        
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        
+        # 버튼
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        apply_btn = QPushButton("✅ 테이블에 추가")
+        apply_btn.clicked.connect(self.apply_to_table)
+        btn_layout.addWidget(apply_btn)
+        
+        cancel_btn = QPushButton("❌ 닫기")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        
+    @staticmethod
+    def room_label(item):
+        return f"{item['room']} ({item['room_area'] / 1e6:.2f}㎡)"
+        
+    def preview(self):
+        """실 배정 결과 표시"""
+        room_mask = self.snapshot.layer_mask(self.room_edit.text().strip() or "*")
+        floor_pattern = self.floor_edit.text().strip()
+        floor_mask = self.snapshot.layer_mask(floor_pattern) if floor_pattern else None
+        item_mask = self.snapshot.layer_mask(self.item_edit.text().strip() or "*")
+        self.schedule = room_schedule(self.snapshot, room_mask, item_mask, floor_mask,
+                                      self.GROUP_BY[self.group_combo.currentText()])
+        
+        self.result_table.setRowCount(len(self.schedule))
+        for row, item in enumerate(self.schedule):
+            self.result_table.setItem(row, 0, QTableWidgetItem(item['floor']))
+            self.result_table.setItem(row, 1, QTableWidgetItem(self.room_label(item)))
+            self.result_table.setItem(row, 2, QTableWidgetItem(item['item']))
+            self.result_table.setItem(row, 3, QTableWidgetItem(str(item['count'])))
+            
+        rooms = len({item['room_index'] for item in self.schedule})
+        total = sum(item['count'] for item in self.schedule)
+        self.summary_label.setText(f"실 {rooms}개, 항목 {len(self.schedule)}개, 객체 {total}개")
+        
+    def apply_to_table(self):
+        """대분류: 층, 중분류: 실, 항목: 블록 이름/종류별 행 추가"""
+        if not self.schedule:
+            self.preview()
+        if not self.schedule:
+            QMessageBox.information(self, "안내", "실에 배정된 객체가 없습니다.")
+            return
+            
+        table = self.table
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            for item in self.schedule:
+                category_row = table.find_or_add_category(item['floor'])
+                subcategory_row = table.find_or_add_subcategory(category_row, self.room_label(item))
+                row = table.add_item(subcategory_row)
+                values = {2: item['item'], 4: str(item['count']), 5: "EA",
+                          15: self.item_edit.text().strip()}
+                if item['length'] > 0:
+                    values[6] = f"{item['length']:.1f}"
+                if item['area'] > 0:
+                    values[8] = f"{item['area']:.1f}"
+                table.set_row_values(row, values)
+                table.row_selections[row] = self.snapshot.select(item['members'])
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+            
+        print(f"✅ 실별 배정: {len(self.schedule)}개 행")
+        self.accept()
+
+
+# ==================== 원 직경별 집계 대화상자 ====================
+
+class CircleScheduleDialog(QDialog):
+    """원 직경별 집계 대화상자 - 말뚝/원형 기둥/슬리브를 직경 허용오차로 묶어 개수 산출"""
+    
+    def __init__(self, parent, snapshot, table):
+        super().__init__(parent)
+        self.main_window = parent
+        self.snapshot = snapshot
+        self.table = table
+        self.schedule = []
+        self.setup_ui()
+        
+    def setup_ui(self):
+        """UI 설정"""
+        self.setWindowTitle("⭕ 원 직경별 집계")
+        self.setModal(True)
+        self.resize(600, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        # 조건
+        form = QFormLayout()
+        self.layer_edit = QLineEdit("*")
+        self.layer_edit.setPlaceholderText("레이어 패턴 (예: S-PILE*, S-COL*)")
+        form.addRow("레이어:", self.layer_edit)
+        
+        self.tolerance_spin = QDoubleSpinBox()
+        self.tolerance_spin.setRange(0, 100)
+        self.tolerance_spin.setValue(1.0)
+        self.tolerance_spin.setSuffix(" mm")
+        form.addRow("직경 허용오차:", self.tolerance_spin)
+        
+        self.include_arcs = QCheckBox("호도 같은 반지름의 원으로 포함")
+        self.include_arcs.setChecked(True)
+        form.addRow("", self.include_arcs)
+        
+        self.name_edit = QLineEdit("말뚝")
+        form.addRow("품명:", self.name_edit)
+        layout.addLayout(form)
+        
+        preview_btn = QPushButton("🔍 미리보기")
+        preview_btn.clicked.connect(self.preview)
+        layout.addWidget(preview_btn)
+        
+        # 결과
+        self.result_table = QTableWidget(0, 4)
+        self.result_table.setHorizontalHeaderLabels(["직경", "개수", "원/호", "레이어"])
+        self.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.result_table)
+        
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        
+        # 버튼
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        apply_btn = QPushButton("✅ 테이블에 추가")
+        apply_btn.clicked.connect(self.apply_to_table)
+        btn_layout.addWidget(apply_btn)
+        
+        cancel_btn = QPushButton("❌ 닫기")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        
+    def preview(self):
+        """직경별 개수 표시 (스냅샷 반지름 배열, COM 호출 없음)"""
+        mask = self.snapshot.layer_mask(self.layer_edit.text().strip() or "*")
+        tolerance = self.tolerance_spin.value()
+        self.schedule = circle_schedule(self.snapshot, mask, tolerance, self.include_arcs.isChecked())
+        
+        self.result_table.setRowCount(len(self.schedule))
+        for row, item in enumerate(self.schedule):
+            self.result_table.setItem(row, 0, QTableWidgetItem(diameter_label(item['diameter'], tolerance)))
+            self.result_table.setItem(row, 1, QTableWidgetItem(str(item['count'])))
+            self.result_table.setItem(row, 2, QTableWidgetItem(f"{item['circles']} / {item['arcs']}"))
+            self.result_table.setItem(row, 3, QTableWidgetItem(", ".join(item['layers'])))
+            
+        total = sum(item['count'] for item in self.schedule)
+        self.summary_label.setText(f"직경 {len(self.schedule)}종, 총 {total}개")
+        
+    def apply_to_table(self):
+        """직경별로 행 추가 (규격: 직경, 수량: 개수, 선택: 그 직경의 원/호)"""
+        if not self.schedule:
+            self.preview()
+        if not self.schedule:
+            QMessageBox.information(self, "안내", "집계할 원이 없습니다.")
+            return
+            
+        table = self.table
+        tolerance = self.tolerance_spin.value()
+        name = self.name_edit.text().strip() or "원형"
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            category_row = table.find_or_add_category("원 직경별 집계")
+            subcategory_row = table.find_or_add_subcategory(category_row, name)
+            rows = table.add_items(subcategory_row, len(self.schedule))
+            for row, item in zip(rows, self.schedule):
+                table.set_row_values(row, {
+                    2: name,
+                    3: diameter_label(item['diameter'], tolerance),
+                    4: str(item['count']),
+                    5: "EA",
+                    15: ", ".join(item['layers']),
+                    16: f"호 {item['arcs']}개 포함" if item['arcs'] else "",
+                })
+                table.row_selections[row] = self.snapshot.select(item['members'])
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+            
+        print(f"✅ 원 직경별 집계: {len(self.schedule)}개 행")
+        self.accept()
 
 
 # ==================== 메인 윈도우 ====================
@@ -1252,6 +2378,12 @@ class CADQuantityProWindow(QMainWindow):
         super().__init__()
         self.acad = None
         self.doc = None
+        self.snapshot = None  # 도면 스냅샷 (EntitySnapshot)
+        self.similarity_index = None  # 유사 객체 색인 (스냅샷 기준)
+        self.surface_cache = SurfaceCache()  # 해치/영역 Handle별 면적/둘레 (테이블, 선택 도우미 공유)
+        self.block_library = None  # 블록 정의 형상 캐시 (연결한 도면 기준)
+        self.attribute_index = None  # 블록 속성 역색인 (스냅샷 기준)
+        self.spatial_index = None  # 중심점 공간 색인 (스냅샷 기준)
         # 계층구조 모드를 기본으로 설정
         self.current_mode = "hierarchical" if HIERARCHICAL_TABLE_AVAILABLE else "flat"
         self.init_ui()
@@ -1358,6 +2490,10 @@ class CADQuantityProWindow(QMainWindow):
         
         left_layout.addWidget(self.stacked_widget)
         
+        # 해치/영역 면적 캐시는 모든 테이블이 공유
+        for table in self.tables():
+            table.extraction.surfaces = self.surface_cache
+        
         # 오른쪽: 콘솔 영역
         right_widget = QWidget()
         right_widget.setMaximumWidth(400)
@@ -1422,6 +2558,10 @@ class CADQuantityProWindow(QMainWindow):
         load_btn.clicked.connect(self.load_file)
         toolbar.addWidget(load_btn)
         
+        export_btn = QPushButton("📤 내보내기")
+        export_btn.clicked.connect(self.export_file)
+        toolbar.addWidget(export_btn)
+        
         # 행 추가
         toolbar.addWidget(QLabel(" | "))
         
@@ -1429,6 +2569,54 @@ class CADQuantityProWindow(QMainWindow):
         add_row_btn.clicked.connect(self.add_row)
         toolbar.addWidget(add_row_btn)
         
+        # 자동 산출
+        toolbar.addWidget(QLabel(" | "))
+        
+        rules_btn = QPushButton("⚙️ 규칙 자동 산출")
+        rules_btn.clicked.connect(self.run_takeoff_rules)
+        toolbar.addWidget(rules_btn)
+        
+        layer_btn = QPushButton("📊 레이어 일괄 처리")
+        layer_btn.clicked.connect(self.show_layer_batch)
+        toolbar.addWidget(layer_btn)
+        
+        pairing_btn = QPushButton("🧱 평행선 산출")
+        pairing_btn.setToolTip("두 줄로 그린 벽체/데크 보를 짝지어 길이, 두께, 개수 산출")
+        pairing_btn.clicked.connect(self.show_parallel_pairing)
+        toolbar.addWidget(pairing_btn)
+        
+        block_btn = QPushButton("🧩 블록 집계")
+        block_btn.setToolTip("중첩 블록 안의 문/창호/설비까지 블록 이름별 개수 산출 (분해 없음)")
+        block_btn.clicked.connect(self.show_block_count)
+        toolbar.addWidget(block_btn)
+        
+        attribute_btn = QPushButton("🏷️ 속성 집계")
+        attribute_btn.setToolTip("블록 속성(W1, D3 등) 값별로 개수 산출")
+        attribute_btn.clicked.connect(self.show_attribute_groups)
+        toolbar.addWidget(attribute_btn)
+        
+        room_btn = QPushButton("🏠 실별 배정")
+        room_btn.setToolTip("실 경계 폴리라인 안의 블록/객체를 층 → 실 → 항목으로 집계")
+        room_btn.clicked.connect(self.show_room_assignment)
+        toolbar.addWidget(room_btn)
+        
+        circle_btn = QPushButton("⭕ 원 직경별")
+        circle_btn.setToolTip("말뚝/원형 기둥/슬리브를 직경별 개수로 산출 (호 포함)")
+        circle_btn.clicked.connect(self.show_circle_schedule)
+        toolbar.addWidget(circle_btn)
+        
+        # 검토
+        toolbar.addWidget(QLabel(" | "))
+        
+        find_row_btn = QPushButton("🔎 객체 → 행")
+        find_row_btn.setToolTip("AutoCAD에서 고른 객체를 산출한 행 찾기")
+        find_row_btn.clicked.connect(self.find_row_for_entity)
+        toolbar.addWidget(find_row_btn)
+        
+        double_btn = QPushButton("⚠️ 중복 산출 검사")
+        double_btn.clicked.connect(self.show_double_counts)
+        toolbar.addWidget(double_btn)
+        
         toolbar.addStretch()
         
         return toolbar
@@ -1450,7 +2638,17 @@ class CADQuantityProWindow(QMainWindow):
             # AutoCAD 연결
             print("AutoCAD 연결 시도...")
             self.acad = win32com.client.Dispatch("AutoCAD.Application")
+            # CADPRO_COM_TRACE=파일경로 이면 COM 호출을 기록 (com_trace.py로 재생)
+            trace_path = os.environ.get("CADPRO_COM_TRACE")
+            if trace_path:
+                self.acad = start_recording(self.acad, trace_path)
             self.doc = self.acad.ActiveDocument
+            self.snapshot = None
+            self.surface_cache.clear()
+            # Handle은 도면 안에서만 고유 - 이전 도면의 형상/결과 캐시를 버림
+            for table in self.tables():
+                table.extraction.clear()
+            self.block_library = BlockLibrary(self.doc)
             
             # 테스트
             obj_count = self.doc.ModelSpace.Count
@@ -1526,6 +2724,285 @@ class CADQuantityProWindow(QMainWindow):
                 self.hierarchical_table.setRowCount(0)
                 self.hierarchical_table.row_types.clear()
                 self.hierarchical_table.row_levels.clear()
+                self.hierarchical_table.row_selections.clear()
+                
+    def get_snapshot(self, refresh=False):
+        """도면 스냅샷 반환 (없거나 refresh=True면 새로 생성)"""
+        if self.snapshot is None or refresh:
+            pythoncom.CoInitialize()
+            try:
+                self.snapshot = EntitySnapshot.from_doc(self.doc)
+            finally:
+                pythoncom.CoUninitialize()
+            # 스냅샷 객체의 Handle은 이미 알고 있으므로 역색인에 등록 (COM 호출 없음)
+            for table in self.tables():
+                table.row_selections.remember_handles(self.snapshot.objects, self.snapshot.handles)
+                if refresh:
+                    table.extraction.clear()  # 편집된 객체의 이전 형상/결과를 버림
+            # 스냅샷에서 읽은 해치/영역 면적도 캐시에 등록 (갱신이면 편집된 객체를 위해 먼저 비움)
+            if refresh:
+                self.surface_cache.clear()
+            surfaces = self.snapshot.kind_mask("hatch") | self.snapshot.kind_mask("region")
+            for i in np.flatnonzero(surfaces):
+                self.surface_cache.remember(self.snapshot.handles[i], self.snapshot.area[i])
+            # 블록 참조 '같은 크기'는 정의 외곽 x 축척/회전 (블록 정의는 종류마다 한 번만 읽음)
+            try:
+                if refresh:
+                    self.block_library.clear()
+                apply_block_sizes(self.snapshot, self.block_library)
+            except Exception as e:
+                print(f"  블록 정의 읽기 실패 - 블록 크기 비교 생략: {e}")
+        return self.snapshot
+        
+    def get_similarity_index(self):
+        """현재 스냅샷의 유사 객체 색인 (스냅샷이 바뀌면 다시 생성)"""
+        snapshot = self.get_snapshot()
+        if self.similarity_index is None or self.similarity_index.snapshot is not snapshot:
+            self.similarity_index = SimilarityIndex(snapshot)
+        return self.similarity_index
+        
+    def get_spatial_index(self):
+        """현재 스냅샷의 중심점 공간 색인 (스냅샷이 바뀌면 다시 생성)"""
+        snapshot = self.get_snapshot()
+        if self.spatial_index is None or self.spatial_index.snapshot is not snapshot:
+            self.spatial_index = SpatialIndex(snapshot)
+        return self.spatial_index
+        
+    def get_attribute_index(self):
+        """현재 스냅샷의 블록 속성 역색인 (스냅샷이 바뀌면 다시 생성)"""
+        snapshot = self.get_snapshot()
+        if self.attribute_index is None or self.attribute_index.snapshot is not snapshot:
+            pythoncom.CoInitialize()
+            try:
+                self.attribute_index = AttributeIndex(snapshot)
+            finally:
+                pythoncom.CoUninitialize()
+        return self.attribute_index
+        
+    def tables(self):
+        """사용 중인 테이블 목록"""
+        if HIERARCHICAL_TABLE_AVAILABLE:
+            return [self.flat_table, self.hierarchical_table]
+        return [self.flat_table]
+        
+    def current_table(self):
+        """현재 모드의 테이블"""
+        if self.current_mode == "hierarchical" and HIERARCHICAL_TABLE_AVAILABLE:
+            return self.hierarchical_table
+        return self.flat_table
+        
+    def row_label(self, table, row):
+        """행 표시 문자열 (행 번호 + 품명)"""
+        name_col = 2 if table is not self.flat_table else 0
+        item = table.item(row, name_col)
+        name = item.text() if item and item.text() else "(품명 없음)"
+        return f"{row + 1}행 {name}"
+        
+    def find_row_for_entity(self):
+        """AutoCAD에서 객체를 골라 그 객체를 산출한 행 찾기"""
+        if not self.doc:
+            QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
+            return
+        table = self.current_table()
+        
+        try:
+            pythoncom.CoInitialize()
+            print("\n🔎 AutoCAD에서 객체를 선택하세요...")
+            obj, _ = self.doc.Utility.GetEntity()
+            handle = str(obj.Handle)
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"객체 선택 오류:\n{str(e)}")
+            return
+        finally:
+            pythoncom.CoUninitialize()
+            
+        rows = table.row_selections.rows_for(handle)
+        if not rows:
+            print(f"  Handle {handle}: 산출된 행 없음")
+            QMessageBox.information(self, "객체 → 행", f"선택한 객체(Handle {handle})를 산출한 행이 없습니다.")
+            return
+            
+        # 해당 행 선택 및 스크롤
+        table.clearSelection()
+        for row in sorted(set(rows)):
+            table.setRangeSelected(QTableWidgetSelectionRange(row, 0, row, table.columnCount() - 1), True)
+        table.scrollToItem(table.item(rows[0], 0) or table.item(rows[0], 1))
+        
+        labels = [self.row_label(table, row) for row in rows]
+        print(f"  Handle {handle}: {', '.join(labels)}")
+        message = "\n".join(labels)
+        if len(rows) > 1:
+            message += f"\n\n⚠️ {len(rows)}번 산출되었습니다."
+        QMessageBox.information(self, "객체 → 행", message)
+        
+    def show_double_counts(self):
+        """두 번 이상 산출된 객체 보고"""
+        table = self.current_table()
+        duplicates = table.row_selections.double_counts()
+        if not duplicates:
+            QMessageBox.information(self, "중복 산출 검사", "중복 산출된 객체가 없습니다.")
+            return
+            
+        # 같은 행 조합끼리 묶어서 요약
+        by_rows = defaultdict(list)
+        for handle, rows in duplicates.items():
+            by_rows[tuple(rows)].append(handle)
+        summary = sorted(by_rows.items(), key=lambda x: -len(x[1]))
+        
+        print(f"\n⚠️ 중복 산출: {len(duplicates)}개 객체")
+        lines = []
+        for rows, handles in summary:
+            line = f"{' / '.join(self.row_label(table, r) for r in rows)}: {len(handles)}개"
+            lines.append(line)
+            print(f"  - {line}")
+            
+        message = f"중복 산출된 객체: {len(duplicates)}개\n\n" + "\n".join(lines[:20])
+        if len(lines) > 20:
+            message += f"\n... 외 {len(lines) - 20}건 (콘솔 참조)"
+        message += "\n\nAutoCAD에서 해당 객체를 강조할까요?"
+        reply = QMessageBox.question(self, "중복 산출 검사", message, QMessageBox.Yes | QMessageBox.No)
+        if reply == QMessageBox.Yes and self.doc:
+            objects = [table.row_selections.objects_by_handle[h] for h in duplicates
+                       if h in table.row_selections.objects_by_handle]
+            try:
+                pythoncom.CoInitialize()
+                push_selection(self.doc, objects)
+            except Exception as e:
+                QMessageBox.warning(self, "오류", f"강조 표시 오류:\n{str(e)}")
+            finally:
+                pythoncom.CoUninitialize()
+        
+    def show_layer_batch(self):
+        """레이어 일괄 처리 대화상자"""
+        if not self.doc:
+            QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
+            return
+        if not HIERARCHICAL_TABLE_AVAILABLE:
+            QMessageBox.warning(self, "경고", "계층구조 테이블 모듈이 필요합니다.")
+            return
+            
+        try:
+            dialog = LayerBatchDialog(self, self.get_snapshot(), self.hierarchical_table)
+            if dialog.exec_():
+                self.switch_to_hierarchical()
+        except Exception as e:
+            print(f"❌ 레이어 일괄 처리 오류: {e}")
+            QMessageBox.critical(self, "오류", f"레이어 일괄 처리 오류:\n{str(e)}")
+            
+    def show_parallel_pairing(self):
+        """평행선 산출 대화상자"""
+        if not self.doc:
+            QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
+            return
+        if not HIERARCHICAL_TABLE_AVAILABLE:
+            QMessageBox.warning(self, "경고", "계층구조 테이블 모듈이 필요합니다.")
+            return
+            
+        try:
+            dialog = ParallelPairingDialog(self, self.get_snapshot(), self.hierarchical_table)
+            if dialog.exec_():
+                self.switch_to_hierarchical()
+        except Exception as e:
+            print(f"❌ 평행선 산출 오류: {e}")
+            QMessageBox.critical(self, "오류", f"평행선 산출 오류:\n{str(e)}")
+            
+    def show_block_count(self):
+        """블록 집계 대화상자"""
+        if not self.doc:
+            QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
+            return
+        if not HIERARCHICAL_TABLE_AVAILABLE:
+            QMessageBox.warning(self, "경고", "계층구조 테이블 모듈이 필요합니다.")
+            return
+            
+        try:
+            dialog = BlockCountDialog(self, self.get_snapshot(), self.block_library, self.hierarchical_table)
+            if dialog.exec_():
+                self.switch_to_hierarchical()
+        except Exception as e:
+            print(f"❌ 블록 집계 오류: {e}")
+            QMessageBox.critical(self, "오류", f"블록 집계 오류:\n{str(e)}")
+            
+    def show_circle_schedule(self):
+        """원 직경별 집계 대화상자"""
+        if not self.doc:
+            QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
+            return
+        if not HIERARCHICAL_TABLE_AVAILABLE:
+            QMessageBox.warning(self, "경고", "계층구조 테이블 모듈이 필요합니다.")
+            return
+            
+        try:
+            dialog = CircleScheduleDialog(self, self.get_snapshot(), self.hierarchical_table)
+            if dialog.exec_():
+                self.switch_to_hierarchical()
+        except Exception as e:
+            print(f"❌ 원 직경별 집계 오류: {e}")
+            QMessageBox.critical(self, "오류", f"원 직경별 집계 오류:\n{str(e)}")
+            
+    def show_attribute_groups(self):
+        """블록 속성 집계 대화상자"""
+        if not self.doc:
+            QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
+            return
+        if not HIERARCHICAL_TABLE_AVAILABLE:
+            QMessageBox.warning(self, "경고", "계층구조 테이블 모듈이 필요합니다.")
+            return
+            
+        try:
+            dialog = AttributeGroupDialog(self, self.get_attribute_index(), self.hierarchical_table)
+            if dialog.exec_():
+                self.switch_to_hierarchical()
+        except Exception as e:
+            print(f"❌ 속성 집계 오류: {e}")
+            QMessageBox.critical(self, "오류", f"속성 집계 오류:\n{str(e)}")
+            
+    def show_room_assignment(self):
+        """실별 배정 대화상자"""
+        if not self.doc:
+            QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
+            return
+        if not HIERARCHICAL_TABLE_AVAILABLE:
+            QMessageBox.warning(self, "경고", "계층구조 테이블 모듈이 필요합니다.")
+            return
+            
+        try:
+            dialog = RoomAssignmentDialog(self, self.get_snapshot(), self.hierarchical_table)
+            if dialog.exec_():
+                self.switch_to_hierarchical()
+        except Exception as e:
+            print(f"❌ 실별 배정 오류: {e}")
+            QMessageBox.critical(self, "오류", f"실별 배정 오류:\n{str(e)}")
+            
+    def run_takeoff_rules(self):
+        """규칙 파일을 읽어 도면 전체를 한 번에 자동 산출"""
+        if not self.doc:
+            QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
+            return
+        if not HIERARCHICAL_TABLE_AVAILABLE:
+            QMessageBox.warning(self, "경고", "계층구조 테이블 모듈이 필요합니다.")
+            return
+            
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "산출 규칙 열기", "", "Takeoff Rules (*.json)")
+        if not file_path:
+            return
+            
+        try:
+            rules = load_rules(file_path)
+            print(f"\n⚙️ 규칙 {len(rules)}개 로드: {os.path.basename(file_path)}")
+            
+            # 도면은 항상 새로 읽음 (규칙 실행 직전 상태 기준)
+            snapshot = self.get_snapshot(refresh=True)
+            results = evaluate_rules(snapshot, rules)
+            added = apply_results_to_table(self.hierarchical_table, snapshot, results)
+            
+            self.switch_to_hierarchical()
+            QMessageBox.information(self, "자동 산출 완료",
+                f"규칙 {len(rules)}개 평가\n{added}개 행이 추가되었습니다.")
+        except Exception as e:
+            print(f"❌ 자동 산출 오류: {e}")
+            QMessageBox.critical(self, "오류", f"자동 산출 오류:\n{str(e)}")
                 
     def save_file(self):
         """파일 저장"""
@@ -1587,6 +3064,34 @@ class CADQuantityProWindow(QMainWindow):
                     self.switch_to_flat()
             
             QMessageBox.information(self, "불러오기 완료", "프로젝트를 불러왔습니다.")
+            
+    def export_file(self):
+        """현재 테이블을 Excel/CSV로 내보내기 (대분류/중분류 소계, 계층은 행 윤곽 수준)"""
+        table = self.current_table()
+        if table.rowCount() == 0:
+            QMessageBox.warning(self, "경고", "내보낼 행이 없습니다.")
+            return
+            
+        if OPENPYXL_AVAILABLE:
+            filters = "Excel Files (*.xlsx);;CSV Files (*.csv)"
+        else:
+            print("⚠️ openpyxl 없음 - CSV로만 내보낼 수 있습니다")
+            filters = "CSV Files (*.csv)"
+        file_path, selected = QFileDialog.getSaveFileName(self, "물량 내보내기", "", filters)
+        if not file_path:
+            return
+        if not os.path.splitext(file_path)[1]:
+            file_path += ".csv" if "csv" in selected.lower() else ".xlsx"
+            
+        try:
+            hierarchical = table is not self.flat_table
+            written = export_table(file_path, table.data_columns(), table.iter_data(), hierarchical)
+            print(f"📤 내보내기 완료: {file_path} ({written}행, 소계 포함)")
+            QMessageBox.information(self, "내보내기 완료",
+                f"{written}행을 내보냈습니다.\n{file_path}")
+        except Exception as e:
+            print(f"❌ 내보내기 오류: {e}")
+            QMessageBox.critical(self, "오류", f"내보내기 오류:\n{str(e)}")
 
 
 def main():
@@ -0,0 +1,109 @@
+"""
+Attribute Index - 블록 속성 역색인
+창호/문 블록의 W1, D3 같은 속성 값을 한 번에 읽어
+(블록 이름, 태그, 값) → 스냅샷 인덱스 역색인으로 보관
+
+- 블록 참조마다 GetAttributes를 한 번만 호출 (스냅샷 직후 한 번의 순회)
+- 태그 기반 행 추가, 선택 도우미의 '같은 속성 값', 철근 블록 속성 읽기는
+  모두 색인에서 답하고 ModelSpace를 다시 순회하지 않음
+- 태그는 대문자, 값은 앞뒤 공백만 제거해 비교
+"""
+
+import fnmatch
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def read_attributes(obj) -> List[Tuple[str, str]]:
+    """블록 참조 속성 [(태그, 값)] - GetAttributes 1회 + 속성마다 태그/값"""
+    pairs = []
+    for attribute in obj.GetAttributes():
+        pairs.append((str(attribute.TagString).strip().upper(), str(attribute.TextString).strip()))
+    return pairs
+
+
+class AttributeIndex:
+    """스냅샷 블록 참조의 속성 역색인"""
+
+    def __init__(self, snapshot, mask: Optional[np.ndarray] = None):
+        self.snapshot = snapshot
+        start = time.time()
+        blocks = snapshot.kind_mask("block")
+        if mask is not None:
+            blocks = blocks & mask
+
+        self.attributes: Dict[int, Dict[str, str]] = {}  # 스냅샷 인덱스 → {태그: 값}
+        postings = defaultdict(list)
+        for i in np.flatnonzero(blocks):
+            try:
+                pairs = read_attributes(snapshot.objects[i])
+            except Exception as e:
+                print(f"  속성 읽기 오류: {e}")
+                continue
+            if not pairs:
+                continue
+            block_name = snapshot.block_names[snapshot.block_codes[i]].upper()
+            values = {}
+            for tag, value in pairs:
+                values.setdefault(tag, value)  # 같은 태그가 여러 번이면 첫 값
+            self.attributes[int(i)] = values
+            for tag, value in values.items():
+                postings[(block_name, tag, value)].append(i)
+
+        # (블록, 태그, 값) → 인덱스 배열, (태그, 값) → 블록 이름 목록
+        self.postings = {key: np.array(idx, dtype=np.int64) for key, idx in postings.items()}
+        self.by_tag_value = defaultdict(list)
+        for block_name, tag, value in self.postings:
+            self.by_tag_value[(tag, value)].append(block_name)
+
+        print(f"🏷️ 속성 색인: 블록 {int(blocks.sum())}개 중 {len(self.attributes)}개, "
+              f"항목 {len(self.postings)}개 ({time.time() - start:.2f}초)")
+
+    def attributes_of(self, index: int) -> Dict[str, str]:
+        """스냅샷 인덱스의 속성 {태그: 값} (속성이 없으면 빈 딕셔너리)"""
+        return self.attributes.get(int(index), {})
+
+    def query(self, tag: str, value: str, block_name: Optional[str] = None) -> np.ndarray:
+        """태그 = 값인 블록 참조의 스냅샷 인덱스 (block_name 패턴이 있으면 그 블록만)"""
+        tag = tag.strip().upper()
+        value = value.strip()
+        names = self.by_tag_value.get((tag, value), [])
+        if block_name:
+            pattern = block_name.upper()
+            names = [n for n in names if fnmatch.fnmatchcase(n, pattern)]
+        if not names:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate([self.postings[(n, tag, value)] for n in names]))
+
+    def tags(self) -> List[str]:
+        """색인에 있는 태그 목록"""
+        return sorted({tag for _, tag, _ in self.postings})
+
+    def value_groups(self, tag: str, block_pattern: str = "*",
+                     mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """태그 값별 묶음 [{'value', 'count', 'blocks', 'members'}] - 태그 기반 행 추가용
+
+        blocks: 값별 블록 이름 개수, members: 스냅샷 인덱스
+        """
+        tag = tag.strip().upper()
+        pattern = block_pattern.upper() or "*"
+        groups = defaultdict(list)
+        names = defaultdict(Counter)
+        for (block_name, key_tag, value), idx in self.postings.items():
+            if key_tag != tag or not fnmatch.fnmatchcase(block_name, pattern):
+                continue
+            if mask is not None:
+                idx = idx[mask[idx]]
+            if len(idx):
+                groups[value].append(idx)
+                names[value][block_name] += len(idx)
+
+        result = []
+        for value in sorted(groups):
+            members = np.sort(np.concatenate(groups[value]))
+            result.append({'value': value, 'count': len(members),
+                           'blocks': dict(names[value]), 'members': members})
+        return result
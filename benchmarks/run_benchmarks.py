@@ -0,0 +1,242 @@
+"""
+CAD Quantity Pro 성능 측정
+가짜 AutoCAD(fake_autocad)의 합성 도면으로 주요 기능의
+실행 시간, COM 호출 수, 최대 메모리(tracemalloc)를 측정
+
+사용법:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --latency-us 50 --json bench.json
+    python benchmarks/run_benchmarks.py --replay slow_case.cqt.gz   (기록된 실제 도면)
+
+PyQt5가 없으면 테이블/대화상자 항목은 건너뛰고 스냅샷 기반 항목만 측정한다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import fake_autocad  # noqa: E402
+import com_trace  # noqa: E402
+
+# 실제 pywin32 대신 가짜 모듈 사용 (앱 모듈 import 전에 등록)
+fake_autocad.install()
+
+try:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox
+    PYQT_AVAILABLE = True
+except ImportError:
+    PYQT_AVAILABLE = False
+
+from cad_snapshot import EntitySnapshot  # noqa: E402
+from layer_aggregation import aggregate_layers  # noqa: E402
+from similarity_index import SimilarityIndex  # noqa: E402
+
+
+class NullWriter:
+    """print 출력 버리기 (콘솔 위젯 비용 제외용)"""
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+class ReplaySource:
+    """트레이스 재생기를 측정 대상 앱처럼 사용"""
+
+    def __init__(self, player):
+        self.player = player
+        self.stats = player.stats
+
+    @property
+    def ActiveDocument(self):
+        return self.player.root.ActiveDocument
+
+
+def measure(app, name, size, func):
+    """함수 한 번 실행의 시간/COM 호출/최대 메모리 측정"""
+    app.stats.reset()
+    tracemalloc.start()
+    start = time.perf_counter()
+    error = None
+    try:
+        func()
+    except Exception as e:
+        error = str(e)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'benchmark': name,
+        'entities': size,
+        'seconds': round(elapsed, 4),
+        'com_calls': app.stats.calls,
+        'peak_mb': round(peak / (1024 * 1024), 2),
+        'error': error,
+    }
+
+
+def snapshot_benchmarks(app, size):
+    """스냅샷 기반 기능 (PyQt5 불필요)"""
+    doc = app.ActiveDocument
+    results = []
+    holder = {}
+
+    def build_snapshot():
+        holder['snapshot'] = EntitySnapshot.from_doc(doc)
+    results.append(measure(app, "snapshot", size, build_snapshot))
+
+    snapshot = holder['snapshot']
+
+    def similarity():
+        index = SimilarityIndex(snapshot)
+        for base in range(0, snapshot.count, max(1, snapshot.count // 100)):
+            index.query(base, size_tolerance=0.1)
+    results.append(measure(app, "similarity_index+100q", size, similarity))
+    results.append(measure(app, "layer_aggregation", size, lambda: aggregate_layers(snapshot)))
+    return results
+
+
+def gui_benchmarks(app, size, entities, workdir, console=False):
+    """테이블/대화상자 기능 (PyQt5 필요)
+
+    console=False면 메인 윈도우의 콘솔 리디렉션 대신 print 출력을 버린다.
+    """
+    import CAD_Quantity_Pro as cqp
+
+    doc = app.ActiveDocument
+    window = cqp.CADQuantityProWindow()
+    if not console:
+        sys.stdout = NullWriter()
+    window.acad = app
+    window.doc = doc
+    table = window.hierarchical_table
+    table.set_cad_connection(app, doc)
+    results = []
+
+    # 확인 창은 기본 응답으로 바로 닫음
+    QMessageBox.information = staticmethod(lambda *a, **k: QMessageBox.Ok)
+    QMessageBox.question = staticmethod(lambda *a, **k: QMessageBox.Yes)
+
+    # 🎯 CAD 선택: 도면 전체를 화면 선택한 것으로 처리
+    category = table.insert_category("벤치마크")
+    subcategory = table.insert_subcategory(category, "선택")
+    row = table.add_item(subcategory)
+    doc.screen_selection = entities
+    results.append(measure(app, "select_from_cad", size, lambda: table.select_from_cad(row)))
+
+    # 🔍 유사 객체 찾기: 첫 호출은 스냅샷/색인 생성 포함, 두 번째는 색인 재사용
+    base = next(e for e in entities if e._props['objectname'] == "AcDbPolyline")
+    dialog = cqp.SelectionHelperDialog(table, doc, [base], row)
+    window.snapshot = None
+    results.append(measure(app, "find_similar (첫 호출)", size, dialog.find_similar))
+    results.append(measure(app, "find_similar (색인 재사용)", size, dialog.find_similar))
+
+    # 📏 길이별 그룹화
+    dialog.current_selection = entities
+    results.append(measure(app, "group_by_length", size, dialog.group_by_length))
+
+    # 수식 재계산 / 저장 / 불러오기: 객체 10개당 항목 1행
+    table.blockSignals(True)
+    for i in range(max(1, size // 10)):
+        item_row = table.add_item(subcategory)
+        table.set_row_values(item_row, {2: f"항목 {i}", 4: str(i % 7 + 1), 6: "1200",
+                                        12: "{수량}*{가로}/1000"})
+    table.blockSignals(False)
+
+    results.append(measure(app, "formula_recalc", size, table.recalculate_all))
+
+    path = os.path.join(workdir, f"bench_{size}.cqp")
+    QFileDialog.getSaveFileName = staticmethod(lambda *a, **k: (path, ""))
+    QFileDialog.getOpenFileName = staticmethod(lambda *a, **k: (path, ""))
+    results.append(measure(app, "save_file", size, window.save_file))
+    results.append(measure(app, "load_file", size, window.load_file))
+
+    window.close()
+    window.deleteLater()
+    return results
+
+
+def print_results(results, stream):
+    stream.write(f"\n{'benchmark':<28}{'entities':>10}{'seconds':>10}{'COM calls':>12}{'peak MB':>10}\n")
+    stream.write("-" * 70 + "\n")
+    for r in results:
+        line = f"{r['benchmark']:<28}{str(r['entities']):>10}{r['seconds']:>10.3f}{r['com_calls']:>12}{r['peak_mb']:>10.2f}"
+        if r['error']:
+            line += f"  ❌ {r['error']}"
+        stream.write(line + "\n")
+    stream.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CAD Quantity Pro 성능 측정 (가짜 AutoCAD)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="합성 도면 객체 수")
+    parser.add_argument("--latency-us", type=float, default=0.0,
+                        help="COM 호출당 지연 (마이크로초)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 도면 시드")
+    parser.add_argument("--no-gui", action="store_true", help="PyQt5 항목 건너뛰기")
+    parser.add_argument("--console", action="store_true",
+                        help="print 출력을 콘솔 위젯으로 보냄 (기본: 버림)")
+    parser.add_argument("--replay", help="합성 도면 대신 COM 트레이스 재생 (스냅샷 기반 항목)")
+    parser.add_argument("--recorded-latency", action="store_true",
+                        help="재생 시 기록된 호출 시간만큼 지연")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = sys.__stdout__
+    run_gui = PYQT_AVAILABLE and not args.no_gui
+    if not run_gui:
+        report.write("⚠️ PyQt5 없음 또는 --no-gui: 스냅샷 기반 항목만 측정\n")
+    qt_app = (QApplication.instance() or QApplication(sys.argv)) if run_gui else None
+
+    results = []
+    if args.replay:
+        latency = fake_autocad.LatencyModel(per_call=args.latency_us / 1e6)
+        player = com_trace.TracePlayer(args.replay, latency, args.recorded_latency)
+        sys.stdout = NullWriter()
+        try:
+            results.extend(snapshot_benchmarks(ReplaySource(player), "replay"))
+        finally:
+            sys.stdout = report
+        if player.misses:
+            report.write(f"⚠️ 트레이스에 없는 호출 {player.misses}회\n")
+        print_results(results, report)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            latency = fake_autocad.LatencyModel(per_call=args.latency_us / 1e6, seed=args.seed)
+            app = fake_autocad.FakeApplication(latency)
+            entities = fake_autocad.generate_drawing(app, size, seed=args.seed)
+            report.write(f"📐 합성 도면 {size}개 객체\n")
+
+            sys.stdout = NullWriter()
+            try:
+                results.extend(snapshot_benchmarks(app, size))
+                if run_gui:
+                    results.extend(gui_benchmarks(app, size, entities, workdir, args.console))
+            finally:
+                sys.stdout = report
+
+    print_results(results, report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        report.write(f"💾 결과 저장: {args.json}\n")
+    del qt_app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Block Geometry - 블록 정의 형상 캐시와 중첩 블록 전개
+블록 참조(INSERT)를 COM으로 분해(Explode)하지 않고 정의를 한 번만 읽어
+삽입 변환(축척, 회전, 중첩)으로 참조별 수량을 배열 연산으로 구함
+
+- 블록 정의마다 한 번: 직선 구간 벡터, 곡선 길이, 폐합 면적, 외곽(볼록 껍질) 점,
+  객체 종류별 개수, 중첩 블록 이름별 개수를 읽어 캐시 (중첩 정의는 변환을 합성해 펼침)
+- 참조별 길이: 균일 축척이면 |s| x 정의 길이, 아니면 직선 구간마다 변환 후 길이 합
+- 참조별 면적: |det(변환)| x 정의 면적 (아핀 변환이라 모든 모양에서 정확)
+- 곡선 길이는 비균일 축척에서 sqrt|det|로 근사
+"""
+
+import fnmatch
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from cad_snapshot import read_entity
+
+
+MAX_NESTING = 16  # 정의가 자기 자신을 참조하는 손상 도면 대비
+
+
+def insert_matrix(insertion, x_scale: float = 1.0, y_scale: float = 1.0,
+                  rotation: float = 0.0, origin=(0.0, 0.0)) -> np.ndarray:
+    """블록 삽입 변환 3x3 행렬: 삽입점 + 회전 · 축척 · (정의 좌표 - 기준점)"""
+    c, s = np.cos(rotation), np.sin(rotation)
+    linear = np.array([[c, -s], [s, c]]) @ np.diag([x_scale, y_scale])
+    matrix = np.eye(3)
+    matrix[:2, :2] = linear
+    matrix[:2, 2] = np.asarray(insertion, dtype=float)[:2] - linear @ np.asarray(origin, dtype=float)[:2]
+    return matrix
+
+
+def insert_matrices(insertions, scales, rotations) -> np.ndarray:
+    """참조 여러 개의 삽입 변환 (n, 3, 3) - 정의 기준점은 BlockContents에서 따로 반영"""
+    insertions = np.asarray(insertions, dtype=float).reshape(-1, 2)
+    scales = np.asarray(scales, dtype=float).reshape(-1, 2)
+    rotations = np.asarray(rotations, dtype=float).reshape(-1)
+    c, s = np.cos(rotations), np.sin(rotations)
+    matrices = np.zeros((len(insertions), 3, 3))
+    matrices[:, 0, 0] = c * scales[:, 0]
+    matrices[:, 0, 1] = -s * scales[:, 1]
+    matrices[:, 1, 0] = s * scales[:, 0]
+    matrices[:, 1, 1] = c * scales[:, 1]
+    matrices[:, :2, 2] = insertions
+    matrices[:, 2, 2] = 1.0
+    return matrices
+
+
+def _turn(a, b, c) -> float:
+    """a → b → c 회전 방향 (양수: 반시계)"""
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def convex_hull(points) -> np.ndarray:
+    """볼록 껍질 꼭짓점 (모노톤 체인) - 변환 후 외곽 계산용으로 점 수를 줄임"""
+    points = np.unique(np.asarray(points, dtype=float).reshape(-1, 2), axis=0)
+    if len(points) < 3:
+        return points
+
+    def half(sequence):
+        chain = []
+        for p in sequence:
+            while len(chain) >= 2 and _turn(chain[-2], chain[-1], p) <= 0:
+                chain.pop()
+            chain.append(p)
+        return chain[:-1]
+
+    return np.array(half(points) + half(points[::-1]))
+
+
+class BlockContents:
+    """블록 정의 하나의 펼친 형상 (정의 좌표, 중첩 블록 포함)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.segments = np.zeros((0, 2))  # 직선 구간 벡터 (dx, dy)
+        self.curve_length = 0.0  # 호, 원, 곡선 구간 길이
+        self.area = 0.0  # 폐합 객체 면적 합
+        self.hull = np.zeros((0, 2))  # 외곽 점 (볼록 껍질)
+        self.kinds: Counter = Counter()  # 객체 종류별 개수 (모든 중첩 단계)
+        self.blocks: Counter = Counter()  # 중첩 블록 이름별 개수 (모든 중첩 단계)
+
+    @property
+    def length(self) -> float:
+        return float(np.hypot(self.segments[:, 0], self.segments[:, 1]).sum()) + self.curve_length
+
+    def add_record(self, record: Dict[str, Any]):
+        """스냅샷 레코드(블록이 아닌 객체) 추가"""
+        self.kinds[record['kind']] += 1
+        self.area += record['area']
+        vertices = record['vertices']
+        straight = 0.0
+        points = []
+        if vertices is not None and len(vertices) >= 2:
+            vertices = np.asarray(vertices, dtype=float)[:, :2]
+            if record['closed'] and len(vertices) > 2:
+                vertices = np.vstack([vertices, vertices[:1]])
+            segments = np.diff(vertices, axis=0)
+            self.segments = np.vstack([self.segments, segments])
+            straight = float(np.hypot(segments[:, 0], segments[:, 1]).sum())
+            points.append(vertices)
+        # 폴리라인 bulge 구간, 호, 원 등 직선으로 표현되지 않은 길이
+        self.curve_length += max(record['length'] - straight, 0.0)
+        if record['bbox'] is not None and not points:
+            x1, y1, x2, y2 = record['bbox']
+            points.append(np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]]))
+        if points:
+            self.hull = convex_hull(np.vstack([self.hull] + points))
+
+    def add_nested(self, child: "BlockContents", matrix: np.ndarray):
+        """중첩 블록 정의를 변환해 합침"""
+        linear = matrix[:2, :2]
+        det = abs(float(np.linalg.det(linear)))
+        self.blocks[child.name] += 1
+        self.blocks.update(child.blocks)
+        self.kinds.update(child.kinds)
+        self.segments = np.vstack([self.segments, child.segments @ linear.T])
+        self.curve_length += child.curve_length * np.sqrt(det)
+        self.area += child.area * det
+        if len(child.hull):
+            self.hull = convex_hull(np.vstack([self.hull, child.hull @ linear.T + matrix[:2, 2]]))
+
+    def shifted(self, origin) -> "BlockContents":
+        """정의 기준점을 원점으로 옮긴 형상 (삽입점 기준 변환용)"""
+        origin = np.asarray(origin, dtype=float)[:2]
+        if not origin.any():
+            return self
+        moved = BlockContents(self.name)
+        moved.segments = self.segments
+        moved.curve_length = self.curve_length
+        moved.area = self.area
+        moved.hull = self.hull - origin if len(self.hull) else self.hull
+        moved.kinds = self.kinds
+        moved.blocks = self.blocks
+        return moved
+
+
+class BlockLibrary:
+    """블록 정의 캐시 - 정의마다 COM으로 한 번만 읽음"""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.contents: Dict[str, BlockContents] = {}
+
+    def clear(self):
+        self.contents.clear()
+
+    def definition(self, name: str, depth: int = 0) -> BlockContents:
+        """블록 정의의 펼친 형상 (기준점을 원점으로 옮긴 좌표)"""
+        cached = self.contents.get(name)
+        if cached is not None:
+            return cached
+        contents = BlockContents(name)
+        self.contents[name] = contents  # 자기 참조 정의가 무한 반복하지 않도록 먼저 등록
+        if depth > MAX_NESTING:
+            return contents
+        try:
+            block = self.doc.Blocks.Item(name)
+            origin = block.Origin
+            for obj in block:
+                record = read_entity(obj)
+                if record['kind'] == "block":
+                    child = self.definition(record['block_name'], depth + 1)
+                    matrix = insert_matrix(record['bbox'][:2], *record['scale'], record['rotation'])
+                    contents.add_nested(child, matrix)
+                else:
+                    contents.add_record(record)
+        except Exception as e:
+            print(f"  블록 정의 읽기 오류 ({name}): {e}")
+            return contents
+        contents = contents.shifted(origin)
+        self.contents[name] = contents
+        return contents
+
+    def reference_measures(self, names, matrices) -> Dict[str, np.ndarray]:
+        """블록 참조별 길이, 면적, 외곽 가로/세로 (같은 정의끼리 묶어 배열 연산)
+
+        names: 참조별 블록 이름, matrices: 참조별 삽입 변환 (n, 3, 3)
+        """
+        names = np.asarray(names, dtype=str)
+        matrices = np.asarray(matrices, dtype=float).reshape(-1, 3, 3)
+        count = len(names)
+        result = {
+            'length': np.zeros(count),
+            'area': np.zeros(count),
+            'width': np.full(count, np.nan),
+            'height': np.full(count, np.nan),
+        }
+        for name in np.unique(names):
+            idx = np.flatnonzero(names == name)
+            contents = self.definition(str(name))
+            linear = matrices[idx, :2, :2]
+            det = np.abs(np.linalg.det(linear))
+
+            # 균일 축척(회전 포함)이면 길이는 축척배, 아니면 직선 구간을 변환해 다시 잼
+            scale_x = np.hypot(linear[:, 0, 0], linear[:, 1, 0])
+            scale_y = np.hypot(linear[:, 0, 1], linear[:, 1, 1])
+            uniform = np.isclose(scale_x, scale_y)
+            result['length'][idx[uniform]] = scale_x[uniform] * contents.length
+            if (~uniform).any() and len(contents.segments):
+                transformed = np.einsum('nij,mj->nmi', linear[~uniform], contents.segments)
+                straight = np.hypot(transformed[..., 0], transformed[..., 1]).sum(axis=1)
+                result['length'][idx[~uniform]] = straight + contents.curve_length * np.sqrt(det[~uniform])
+            result['area'][idx] = det * contents.area
+
+            if len(contents.hull):
+                hull = np.einsum('nij,kj->nki', linear, contents.hull) + matrices[idx, None, :2, 2]
+                extent = hull.max(axis=1) - hull.min(axis=1)
+                result['width'][idx] = extent[:, 0]
+                result['height'][idx] = extent[:, 1]
+        return result
+
+    def nested_counts(self, names) -> Counter:
+        """블록 참조 목록 안에 들어 있는 중첩 블록 이름별 개수 (참조 자신 포함)"""
+        totals = Counter()
+        for name, count in Counter(str(n) for n in names).items():
+            totals[name] += count
+            for child, child_count in self.definition(name).blocks.items():
+                totals[child] += child_count * count
+        return totals
+
+    def reference_size(self, obj) -> Optional[float]:
+        """블록 참조 하나의 '같은 크기' 비교값 (외곽 가로 x 세로, 스냅샷과 같은 기준)"""
+        matrix = insert_matrices([obj.InsertionPoint[:2]],
+                                 [(float(obj.XScaleFactor), float(obj.YScaleFactor))],
+                                 [float(obj.Rotation)])
+        measures = self.reference_measures([str(obj.Name)], matrix)
+        width, height = measures['width'][0], measures['height'][0]
+        return None if np.isnan(width) else float(width * height)
+
+
+def snapshot_block_measures(snapshot, library: BlockLibrary, indices=None) -> Dict[str, np.ndarray]:
+    """스냅샷 블록 참조의 정의 기반 수량 (indices: 스냅샷 인덱스, 없으면 모든 블록)"""
+    if indices is None:
+        indices = np.flatnonzero(snapshot.kind_mask("block"))
+    indices = np.asarray(indices, dtype=np.int64)
+    names = snapshot.block_names[snapshot.block_codes[indices]] if len(indices) else np.array([], dtype=str)
+    matrices = insert_matrices(np.stack([snapshot.cx[indices], snapshot.cy[indices]], axis=1),
+                               snapshot.block_scale[indices], snapshot.rotation[indices])
+    measures = library.reference_measures(names, matrices)
+    measures['indices'] = indices
+    measures['names'] = names
+    return measures
+
+
+def apply_block_sizes(snapshot, library: BlockLibrary):
+    """블록 참조의 '같은 크기' 값을 정의 외곽(축척/회전 반영) 가로 x 세로로 채움
+
+    유사 객체 색인이 블록을 이름뿐 아니라 크기(축척)로도 구분할 수 있게 된다.
+    """
+    measures = snapshot_block_measures(snapshot, library)
+    indices = measures['indices']
+    snapshot.size[indices] = measures['width'] * measures['height']
+    print(f"🧩 블록 정의 {len(library.contents)}종으로 참조 {len(indices)}개 수량 계산")
+
+
+def block_count_schedule(snapshot, library: BlockLibrary, mask: Optional[np.ndarray] = None,
+                         pattern: str = "*") -> List[Dict[str, Any]]:
+    """블록 참조(중첩 포함) 이름별 개수 집계
+
+    members: 그 블록을 (직접 또는 중첩으로) 포함한 최상위 참조의 스냅샷 인덱스
+    pattern: 집계할 블록 이름 패턴 (대소문자 무시)
+    """
+    blocks = snapshot.kind_mask("block")
+    if mask is not None:
+        blocks &= mask
+    indices = np.flatnonzero(blocks)
+    top_names = snapshot.block_names[snapshot.block_codes[indices]] if len(indices) else np.array([], dtype=str)
+
+    schedule = {}
+    for name in np.unique(top_names):
+        members = indices[top_names == name]
+        nested = Counter({str(name): 1})
+        nested.update(library.definition(str(name)).blocks)
+        for child, per_reference in nested.items():
+            if not fnmatch.fnmatch(child.upper(), pattern.upper()):
+                continue
+            item = schedule.setdefault(child, {'name': child, 'direct': 0, 'count': 0, 'members': []})
+            if child == name:
+                item['direct'] += len(members)
+            item['count'] += per_reference * len(members)
+            item['members'].append(members)
+
+    result = []
+    for item in sorted(schedule.values(), key=lambda x: x['name']):
+        item['members'] = np.unique(np.concatenate(item['members']))
+        result.append(item)
+    total = sum(item['count'] for item in result)
+    print(f"🧩 블록 집계: 참조 {len(indices)}개 → {len(result)}종 {total}개 (중첩 포함)")
+    return result
@@ -0,0 +1,121 @@
+"""
+CAD Highlight - AutoCAD 객체 일괄 강조/선택 반영
+객체 목록을 VARIANT 배열 하나로 묶어 선택 세트에 한 번에 추가하고 강조
+(객체 수와 관계없이 AddItems + Highlight 두 번의 COM 호출)
+"""
+
+from typing import Callable, List, Optional
+
+import win32com.client
+import pythoncom
+
+
+HIGHLIGHT_SET_NAME = "CQP_Highlight"
+OVERRIDE_COLOR = 1  # 빨강 (ACI)
+
+
+def object_array(objects):
+    """COM 객체 목록 → VT_ARRAY | VT_DISPATCH VARIANT"""
+    return win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_DISPATCH, list(objects))
+
+
+def clear_selection(doc, name: str = HIGHLIGHT_SET_NAME):
+    """이전 강조 선택 세트 해제/삭제 (없으면 무시)"""
+    try:
+        selection = doc.SelectionSets.Item(name)
+    except Exception:
+        return
+    try:
+        selection.Highlight(False)
+    except Exception:
+        pass
+    selection.Delete()
+
+
+def push_selection(doc, objects, highlight: bool = True, pickfirst: bool = False,
+                   name: str = HIGHLIGHT_SET_NAME):
+    """객체 목록을 AutoCAD 선택 세트로 한 번에 반영
+
+    - highlight: 선택 세트 전체를 한 번에 강조
+    - pickfirst: 현재 선택(PICKFIRST)에도 추가해 AutoCAD 명령에서 바로 사용
+    반환: 선택 세트 (다음 호출 또는 clear_selection에서 삭제)
+    """
+    objects = list(objects)
+    clear_selection(doc, name)
+    selection = doc.SelectionSets.Add(name)
+    if not objects:
+        return selection
+
+    array = object_array(objects)
+    selection.AddItems(array)
+    if highlight:
+        selection.Highlight(True)
+    if pickfirst:
+        try:
+            pickfirst_set = doc.PickfirstSelectionSet
+            pickfirst_set.Clear()
+            pickfirst_set.AddItems(array)
+        except Exception as e:
+            print(f"  PICKFIRST 선택 반영 실패: {e}")
+    print(f"💡 AutoCAD 선택 반영: {len(objects)}개 객체")
+    return selection
+
+
+class ColorOverride:
+    """임시 색상 표시 - 원래 색상을 기억했다가 일괄 복원
+
+    COM에는 여러 객체의 속성을 한 번에 바꾸는 방법이 없으므로 객체당 쓰기 1회가 필요하다.
+    원래 색상을 알고 있으면(스냅샷 등) original_colors로 넘겨 읽기 호출을 생략한다.
+    """
+
+    def __init__(self, color: int = OVERRIDE_COLOR, batch_size: int = 500):
+        self.color = color
+        self.batch_size = batch_size
+        self.overrides = {}  # id(obj) → (obj, 원래 색상)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.overrides)
+
+    def apply(self, objects, original_colors: Optional[List[int]] = None,
+              progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """객체 색상을 임시 색상으로 변경, 변경한 객체 수 반환"""
+        objects = list(objects)
+        changed = 0
+        for start in range(0, len(objects), self.batch_size):
+            for offset, obj in enumerate(objects[start:start + self.batch_size]):
+                key = id(obj)
+                if key in self.overrides:
+                    continue
+                try:
+                    if original_colors is not None:
+                        original = int(original_colors[start + offset])
+                    else:
+                        original = obj.color
+                    obj.color = self.color
+                    self.overrides[key] = (obj, original)
+                    changed += 1
+                except Exception as e:
+                    print(f"  색상 변경 오류: {e}")
+            if progress:
+                progress(min(start + self.batch_size, len(objects)), len(objects))
+        print(f"🎨 임시 색상 적용: {changed}개 객체")
+        return changed
+
+    def revert(self, progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """임시 색상을 원래 색상으로 복원"""
+        entries = list(self.overrides.values())
+        reverted = 0
+        for start in range(0, len(entries), self.batch_size):
+            for obj, original in entries[start:start + self.batch_size]:
+                try:
+                    obj.color = original if original is not None and original >= 0 else 256
+                    reverted += 1
+                except Exception as e:
+                    print(f"  색상 복원 오류: {e}")
+            if progress:
+                progress(min(start + self.batch_size, len(entries)), len(entries))
+        self.overrides.clear()
+        if reverted:
+            print(f"↩️ 색상 복원: {reverted}개 객체")
+        return reverted
@@ -0,0 +1,347 @@
+"""
+CAD Snapshot - 도면 객체 일괄 스냅샷
+ModelSpace를 한 번만 순회하여 객체 속성을 NumPy 배열로 보관
+"""
+
+import fnmatch
+import math
+import time
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from curve_geometry import read_curve
+from rectangle_detection import polyline_rectangles
+
+
+# ObjectName → 내부 객체 종류
+OBJECT_KINDS = {
+    "AcDbLine": "line",
+    "AcDbPolyline": "polyline",
+    "AcDb2dPolyline": "polyline",
+    "AcDb3dPolyline": "polyline",
+    "AcDbCircle": "circle",
+    "AcDbArc": "arc",
+    "AcDbEllipse": "ellipse",
+    "AcDbSpline": "spline",
+    "AcDbBlockReference": "block",
+    "AcDbHatch": "hatch",
+    "AcDbRegion": "region",
+}
+
+
+def entity_kind(obj_type: str) -> str:
+    """ObjectName을 객체 종류 문자열로 변환"""
+    kind = OBJECT_KINDS.get(obj_type)
+    if kind:
+        return kind
+    # 기존 판정 방식과 동일한 폴백
+    if "Polyline" in obj_type:
+        return "polyline"
+    if "Line" in obj_type:
+        return "line"
+    if "BlockReference" in obj_type:
+        return "block"
+    return "other"
+
+
+def polyline_vertices(obj, obj_type: str) -> np.ndarray:
+    """폴리라인 정점 (N, 2) 배열 - LWPOLYLINE은 2D, 구형 폴리라인은 3D 좌표"""
+    coords = np.asarray(obj.Coordinates, dtype=float)
+    stride = 2 if obj_type == "AcDbPolyline" else 3
+    return coords.reshape(-1, stride)[:, :2]
+
+
+def read_entity(obj) -> Dict[str, Any]:
+    """COM 객체 하나에서 스냅샷 레코드 읽기 (객체당 필요한 속성만 조회)"""
+    obj_type = str(obj.ObjectName)
+    kind = entity_kind(obj_type)
+    record = {
+        'obj': obj,
+        'handle': str(obj.Handle),
+        'type': obj_type,
+        'kind': kind,
+        'layer': str(obj.Layer),
+        'color': -1,
+        'block_name': "",
+        'length': 0.0,
+        'area': 0.0,
+        'radius': 0.0,
+        'closed': False,
+        'vertices': None,
+        'bbox': None,
+        'scale': (1.0, 1.0),  # 블록 참조 X/Y 축척
+        'rotation': 0.0,  # 블록 참조 회전 (라디안)
+    }
+    try:
+        record['color'] = int(obj.color)
+    except Exception:
+        pass
+
+    try:
+        if kind == "line":
+            start = obj.StartPoint
+            end = obj.EndPoint
+            record['length'] = math.hypot(end[0] - start[0], end[1] - start[1])
+            record['bbox'] = (min(start[0], end[0]), min(start[1], end[1]),
+                              max(start[0], end[0]), max(start[1], end[1]))
+            record['vertices'] = np.array([[start[0], start[1]], [end[0], end[1]]])
+
+        elif kind == "polyline":
+            vertices = polyline_vertices(obj, obj_type)
+            record['vertices'] = vertices
+            record['closed'] = bool(obj.Closed)
+            record['length'] = float(obj.Length)
+            if record['closed']:
+                record['area'] = float(obj.Area)
+            if len(vertices):
+                record['bbox'] = (vertices[:, 0].min(), vertices[:, 1].min(),
+                                  vertices[:, 0].max(), vertices[:, 1].max())
+
+        elif kind in ("circle", "arc"):
+            center = obj.Center
+            radius = float(obj.Radius)
+            record['radius'] = radius
+            if kind == "circle":
+                record['closed'] = True
+                record['length'] = 2 * math.pi * radius
+                record['area'] = math.pi * radius * radius
+            else:
+                record['length'] = float(obj.ArcLength)
+            record['bbox'] = (center[0] - radius, center[1] - radius,
+                              center[0] + radius, center[1] + radius)
+
+        elif kind in ("ellipse", "spline"):
+            record.update(read_curve(obj, kind))
+
+        elif kind == "block":
+            pt = obj.InsertionPoint
+            record['block_name'] = str(obj.Name)
+            record['bbox'] = (pt[0], pt[1], pt[0], pt[1])
+            record['scale'] = (float(obj.XScaleFactor), float(obj.YScaleFactor))
+            record['rotation'] = float(obj.Rotation)
+
+        elif kind in ("hatch", "region"):
+            from surface_area import surface_area  # surface_area가 이 모듈을 가져오므로 지연 임포트
+            record['closed'] = True
+            record['area'] = surface_area(obj)  # Area를 못 읽으면 경계 루프(섬 제외)로 계산
+
+        if record['bbox'] is None:
+            min_pt, max_pt = obj.GetBoundingBox()
+            record['bbox'] = (min_pt[0], min_pt[1], max_pt[0], max_pt[1])
+    except Exception as e:
+        print(f"  스냅샷 읽기 오류 ({obj_type}): {e}")
+
+    return record
+
+
+def iter_model_space(doc):
+    """ModelSpace 순회 - Item(i) 반복 대신 열거자로 일괄 조회"""
+    model_space = doc.ModelSpace
+    try:
+        for obj in model_space:
+            yield obj
+    except TypeError:
+        # 열거자를 지원하지 않는 경우 인덱스 접근
+        for i in range(model_space.Count):
+            yield model_space.Item(i)
+
+
+def select_filtered(doc, filters: Dict[int, str], name: str = "Snap_Filter"):
+    """DXF 필터로 도면 전체에서 객체를 한 번에 선택 (예: {0: "LWPOLYLINE", 8: "A-WIND*"})
+
+    반환된 선택 세트는 호출한 쪽에서 Delete() 해야 한다.
+    """
+    import win32com.client
+    import pythoncom
+
+    try:
+        doc.SelectionSets.Item(name).Delete()
+    except Exception:
+        pass
+    selection = doc.SelectionSets.Add(name)
+
+    codes = list(filters.keys())
+    values = [filters[c] for c in codes]
+    filter_type = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_I2, codes)
+    filter_data = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_VARIANT, values)
+    selection.Select(5, None, None, filter_type, filter_data)  # 5 = acSelectionSetAll
+    return selection
+
+
+class EntitySnapshot:
+    """도면 객체 스냅샷 - 속성별 NumPy 배열과 마스크 캐시"""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.objects = [r['obj'] for r in records]
+        self.handles = [r['handle'] for r in records]
+        self.handle_index = {h: i for i, h in enumerate(self.handles)}
+        self.vertices = [r['vertices'] for r in records]
+
+        count = len(records)
+        self.count = count
+
+        # 문자열 속성은 (고유값, 코드) 형태로 저장
+        self.type_names, self.type_codes = self._encode([r['type'] for r in records])
+        self.kind_names, self.kind_codes = self._encode([r['kind'] for r in records])
+        self.layer_names, self.layer_codes = self._encode([r['layer'] for r in records])
+        self.block_names, self.block_codes = self._encode([r['block_name'] for r in records])
+
+        self.colors = np.fromiter((r['color'] for r in records), dtype=np.int64, count=count)
+        self.length = np.fromiter((r['length'] for r in records), dtype=float, count=count)
+        self.area = np.fromiter((r['area'] for r in records), dtype=float, count=count)
+        self.radius = np.fromiter((r['radius'] for r in records), dtype=float, count=count)
+        self.closed = np.fromiter((r['closed'] for r in records), dtype=bool, count=count)
+        self.block_scale = np.array([r['scale'] for r in records], dtype=float).reshape(-1, 2)
+        self.rotation = np.fromiter((r['rotation'] for r in records), dtype=float, count=count)
+        self.vertex_count = np.fromiter(
+            (len(v) if v is not None else 0 for v in self.vertices), dtype=np.int64, count=count)
+
+        bbox = np.full((count, 4), np.nan)
+        for i, r in enumerate(records):
+            if r['bbox'] is not None:
+                bbox[i] = r['bbox']
+        self.bbox = bbox
+        self.width = bbox[:, 2] - bbox[:, 0]
+        self.height = bbox[:, 3] - bbox[:, 1]
+        self.cx = (bbox[:, 0] + bbox[:, 2]) / 2
+        self.cy = (bbox[:, 1] + bbox[:, 3]) / 2
+
+        # 둘레: 폐합 객체의 곡선 길이
+        self.perimeter = np.where(self.closed, self.length, 0.0)
+        self.size = self._size_measure()
+
+        self._mask_cache = {}
+
+    @staticmethod
+    def _encode(values):
+        """문자열 목록을 고유값 배열과 정수 코드 배열로 변환"""
+        if not values:
+            return np.array([], dtype=str), np.array([], dtype=np.int64)
+        names, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+        return names, codes.astype(np.int64)
+
+    def _size_measure(self) -> np.ndarray:
+        """'같은 크기' 비교용 크기 - 선택 도우미와 동일한 기준"""
+        kinds = self.kind_names[self.kind_codes] if self.count else np.array([], dtype=str)
+        size = np.full(self.count, np.nan)
+        rect_like = (kinds == "polyline") & self.closed & (self.vertex_count >= 4)
+        size[rect_like] = (self.width * self.height)[rect_like]
+        # 회전된 사각형은 bbox 대신 실제 가로 x 세로
+        idx = np.flatnonzero(rect_like & (self.vertex_count <= 5))
+        if len(idx):
+            positions, width, height, _ = polyline_rectangles(
+                [self.vertices[i] for i in idx], None, areas=self.area[idx])
+            size[idx[positions]] = width * height
+        circles = kinds == "circle"
+        size[circles] = self.area[circles]
+        curves = ~rect_like & ~circles & (self.length > 0)
+        size[curves] = self.length[curves]
+        surfaces = np.isnan(size) & (self.area > 0)
+        size[surfaces] = self.area[surfaces]
+        return size
+
+    @classmethod
+    def from_objects(cls, objects, progress_every: int = 10000) -> "EntitySnapshot":
+        """COM 객체 목록에서 스냅샷 생성"""
+        start = time.time()
+        records = []
+        for i, obj in enumerate(objects):
+            try:
+                records.append(read_entity(obj))
+            except Exception as e:
+                print(f"  객체 읽기 실패: {e}")
+            if progress_every and (i + 1) % progress_every == 0:
+                print(f"  스냅샷 진행: {i + 1}개")
+        snapshot = cls(records)
+        print(f"📸 스냅샷 완료: {snapshot.count}개 객체 ({time.time() - start:.2f}초)")
+        return snapshot
+
+    @classmethod
+    def from_doc(cls, doc) -> "EntitySnapshot":
+        """ModelSpace 전체 스냅샷"""
+        print("\n📸 도면 스냅샷 생성 중...")
+        return cls.from_objects(iter_model_space(doc))
+
+    # ==================== 마스크 ====================
+
+    def _category_mask(self, key, names, codes, pattern):
+        """고유값 단위로 패턴을 평가한 뒤 코드 배열로 펼친 마스크"""
+        cache_key = (key, pattern)
+        mask = self._mask_cache.get(cache_key)
+        if mask is None:
+            pattern_upper = pattern.upper()
+            matches = np.array([fnmatch.fnmatchcase(str(n).upper(), pattern_upper) for n in names],
+                               dtype=bool)
+            mask = matches[codes] if len(names) else np.zeros(0, dtype=bool)
+            self._mask_cache[cache_key] = mask
+        return mask
+
+    def layer_mask(self, pattern: str) -> np.ndarray:
+        """레이어 이름 패턴 (glob, 대소문자 무시)"""
+        return self._category_mask('layer', self.layer_names, self.layer_codes, pattern)
+
+    def type_mask(self, pattern: str) -> np.ndarray:
+        """ObjectName 패턴 (예: AcDbLine, AcDb*Polyline)"""
+        return self._category_mask('type', self.type_names, self.type_codes, pattern)
+
+    def kind_mask(self, kind: str) -> np.ndarray:
+        """객체 종류 (line, polyline, circle, block ...)"""
+        return self._category_mask('kind', self.kind_names, self.kind_codes, kind)
+
+    def block_mask(self, pattern: str) -> np.ndarray:
+        """블록 이름 패턴"""
+        return self.kind_mask("block") & self._category_mask(
+            'block', self.block_names, self.block_codes, pattern)
+
+    def size_mask(self, min_size: Optional[float] = None,
+                  max_size: Optional[float] = None) -> np.ndarray:
+        """크기 범위 (크기를 알 수 없는 객체는 제외)"""
+        mask = ~np.isnan(self.size)
+        if min_size is not None:
+            mask &= self.size >= min_size
+        if max_size is not None:
+            mask &= self.size <= max_size
+        return mask
+
+    def region_mask(self, x1: float, y1: float, x2: float, y2: float,
+                    inside: bool = True) -> np.ndarray:
+        """사각 영역 - inside=True면 완전 포함, False면 걸침 포함"""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        bbox = self.bbox
+        with np.errstate(invalid='ignore'):
+            if inside:
+                return ((bbox[:, 0] >= x1) & (bbox[:, 2] <= x2) &
+                        (bbox[:, 1] >= y1) & (bbox[:, 3] <= y2))
+            return ((bbox[:, 2] >= x1) & (bbox[:, 0] <= x2) &
+                    (bbox[:, 3] >= y1) & (bbox[:, 1] <= y2))
+
+    # ==================== 조회 ====================
+
+    def indices(self, mask: np.ndarray) -> np.ndarray:
+        """마스크의 인덱스 배열"""
+        return np.flatnonzero(mask)
+
+    def select(self, mask_or_indices) -> List[Any]:
+        """마스크 또는 인덱스에 해당하는 COM 객체 목록"""
+        idx = np.asarray(mask_or_indices)
+        if idx.dtype == bool:
+            idx = np.flatnonzero(idx)
+        return [self.objects[i] for i in idx]
+
+    def layer_of(self, index: int) -> str:
+        """인덱스의 레이어 이름"""
+        return str(self.layer_names[self.layer_codes[index]])
+
+    def type_of(self, index: int) -> str:
+        """인덱스의 ObjectName"""
+        return str(self.type_names[self.type_codes[index]])
+
+    def kind_of(self, index: int) -> str:
+        """인덱스의 객체 종류"""
+        return str(self.kind_names[self.kind_codes[index]])
+
+    def block_of(self, index: int) -> str:
+        """인덱스의 블록 이름"""
+        return str(self.block_names[self.block_codes[index]])
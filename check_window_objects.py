@@ -89,11 +89,9 @@ def analyze_window_objects():
                         if vertex_count == 4 or vertex_count == 5:
                             print(f"  → 사각형 가능성")
                             
-                            # 크기 계산
-                            x_coords = [coords[j] for j in range(0, len(coords), 2)]
-                            y_coords = [coords[j] for j in range(1, len(coords), 2)]
-                            width = max(x_coords) - min(x_coords)
-                            height = max(y_coords) - min(y_coords)
+                            # 크기 계산 (사각형이면 회전과 관계없이 실제 변 길이)
+                            from rectangle_detection import outline_size
+                            width, height = outline_size(coords)
                             print(f"  크기: {width:.1f} x {height:.1f}mm")
                     except Exception as e:
                         print(f"  오류: {e}")
@@ -135,8 +133,61 @@ def analyze_window_objects():
         pythoncom.CoUninitialize()
 
 
-def find_all_rectangles():
-    """도면의 모든 사각형 찾기 (POLYLINE과 LINE 모두)"""
+def rectangle_candidates(snapshot, tolerance=1.0):
+    """스냅샷의 4~5점 폐합 폴리라인 중 사각형 판정 (회전된 사각형 포함, 배열 연산)
+
+    반환: (스냅샷 인덱스, 가로, 세로) - 가로/세로는 bbox가 아닌 실제 변 길이
+    """
+    import numpy as np
+    from rectangle_detection import polyline_rectangles
+
+    idx = np.flatnonzero(snapshot.closed & snapshot.kind_mask("polyline") &
+                         np.isin(snapshot.vertex_count, [4, 5]))
+    if len(idx) == 0:
+        return idx, np.zeros(0), np.zeros(0)
+    positions, width, height, _ = polyline_rectangles(
+        [snapshot.vertices[i] for i in idx], None, tolerance, snapshot.area[idx])
+    return idx[positions], width, height
+
+
+def rectangle_schedule(widths, heights, layer_codes, layer_names, tolerance=5.0):
+    """사각형 크기 집계표 (크기 → 수량 → 레이어)
+
+    W x H와 H x W는 같은 크기로 보고, 허용오차 내의 크기는 하나로 묶는다.
+    """
+    import numpy as np
+    from clustering import cluster_labels, cluster_summary
+
+    if len(widths) == 0:
+        return []
+    long_side = np.maximum(widths, heights)
+    short_side = np.minimum(widths, heights)
+
+    long_labels = cluster_labels(long_side, tolerance)
+    labels = cluster_labels(short_side, tolerance, groups=long_labels)
+    counts, long_means, _ = cluster_summary(long_side, labels)
+    _, short_means, _ = cluster_summary(short_side, labels)
+
+    # 클러스터 x 레이어 개수 (한 번의 bincount)
+    n_layers = len(layer_names)
+    per_layer = np.bincount(labels * n_layers + layer_codes,
+                            minlength=len(counts) * n_layers).reshape(len(counts), n_layers)
+
+    schedule = []
+    for k in np.argsort(-counts, kind='stable'):
+        layers = {str(layer_names[j]): int(per_layer[k, j]) for j in np.flatnonzero(per_layer[k])}
+        schedule.append({
+            'width': float(long_means[k]),
+            'height': float(short_means[k]),
+            'count': int(counts[k]),
+            'layers': layers,
+        })
+    return schedule
+
+
+def find_all_rectangles(tolerance=5.0, min_size=100.0):
+    """도면의 모든 사각형 찾기 및 창호 집계표 (POLYLINE 전체 + LINE 개수)"""
+    from cad_snapshot import EntitySnapshot, select_filtered
     
     print("\n" + "=" * 60)
     print("전체 도면에서 사각형 찾기")
@@ -145,86 +196,47 @@ def find_all_rectangles():
     try:
         pythoncom.CoInitialize()
         
-        acad = win32com.client.dynamic.Dispatch("AutoCAD.Application")
+        acad = win32com.client.Dispatch("AutoCAD.Application")
         doc = acad.ActiveDocument
-        model_space = doc.ModelSpace
         
-        polyline_rectangles = []
-        line_count = 0
+        print(f"전체 객체 수: {doc.ModelSpace.Count}개 분석 중...\n")
         
-        print(f"전체 객체 수: {model_space.Count}개 분석 중...\n")
+        # LWPOLYLINE과 구형 2D POLYLINE을 필터로 한 번에 선택 (전체 객체를 하나씩 조회하지 않음)
+        selection = select_filtered(doc, {0: "LWPOLYLINE,POLYLINE"}, "Rect_Survey")
+        try:
+            snapshot = EntitySnapshot.from_objects(selection)
+        finally:
+            selection.Delete()
         
-        # 빠른 스캔 (처음 1000개만)
-        scan_count = min(1000, model_space.Count)
+        # LINE은 개수만 필요 - 선택 세트 Count 한 번
+        line_selection = select_filtered(doc, {0: "LINE"}, "Line_Survey")
+        line_count = line_selection.Count
+        line_selection.Delete()
         
-        for i in range(scan_count):
-            try:
-                obj = model_space.Item(i)
-                obj = win32com.client.dynamic.Dispatch(obj)
-                obj_type = str(obj.ObjectName)
-                
-                # POLYLINE 사각형
-                if "Polyline" in obj_type:
-                    try:
-                        coords = obj.Coordinates
-                        vertex_count = len(coords) // 2
-                        
-                        # 4-5개 점이면 사각형 가능성
-                        if vertex_count in [4, 5]:
-                            # 폐합 확인
-                            closed = False
-                            try:
-                                closed = obj.Closed
-                            except:
-                                # 첫점과 끝점 비교
-                                if vertex_count == 5:
-                                    if coords[0] == coords[-2] and coords[1] == coords[-1]:
-                                        closed = True
-                            
-                            if closed:
-                                x_coords = [coords[j] for j in range(0, len(coords), 2)]
-                                y_coords = [coords[j] for j in range(1, len(coords), 2)]
-                                width = max(x_coords) - min(x_coords)
-                                height = max(y_coords) - min(y_coords)
-                                
-                                if width > 100 and height > 100:  # 최소 크기
-                                    polyline_rectangles.append({
-                                        'width': width,
-                                        'height': height,
-                                        'obj': obj
-                                    })
-                    except:
-                        pass
-                
-                # LINE 카운트
-                elif "Line" in obj_type and "Polyline" not in obj_type:
-                    line_count += 1
-                    
-            except:
-                continue
+        idx, widths, heights = rectangle_candidates(snapshot)
+        large = (widths > min_size) & (heights > min_size)  # 최소 크기
+        idx, widths, heights = idx[large], widths[large], heights[large]
         
         # 결과 출력
-        print(f"발견된 POLYLINE 사각형: {len(polyline_rectangles)}개")
+        print(f"발견된 POLYLINE 사각형: {len(idx)}개")
         print(f"발견된 LINE: {line_count}개\n")
         
-        if polyline_rectangles:
-            # 크기별 그룹화
-            size_groups = {}
-            for rect in polyline_rectangles:
-                key = f"{int(rect['width'])}x{int(rect['height'])}"
-                if key not in size_groups:
-                    size_groups[key] = 0
-                size_groups[key] += 1
-            
-            print("POLYLINE 사각형 크기별 분포:")
-            for size, count in sorted(size_groups.items()):
-                print(f"  {size}mm: {count}개")
+        schedule = rectangle_schedule(widths, heights, snapshot.layer_codes[idx],
+                                      snapshot.layer_names, tolerance)
+        if schedule:
+            print(f"창호 집계표 (허용오차 ±{tolerance}mm, W x H = H x W):")
+            for entry in schedule:
+                print(f"  {entry['width']:.0f} x {entry['height']:.0f}mm: {entry['count']}개")
+                for layer, count in sorted(entry['layers'].items(), key=lambda x: -x[1]):
+                    print(f"      [{layer}] {count}개")
         
         if line_count > 100:
             print(f"\n💡 LINE이 많습니다 ({line_count}개)")
             print("   창호가 LINE으로 구성되어 있을 가능성이 높습니다.")
             print("   → LINE 그룹화 방식을 사용해야 합니다.")
         
+        return schedule
+        
     except Exception as e:
         print(f"오류: {e}")
     finally:
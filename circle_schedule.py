@@ -0,0 +1,73 @@
+"""
+Circle Schedule - 원 직경별 집계 (말뚝, 원형 기둥, 슬리브/개구부)
+원(호는 같은 반지름의 원으로 간주)을 직경 허용오차로 묶어 직경별 개수 산출
+
+- 반지름은 스냅샷 배열 또는 추출 캐시의 형상에서 가져옴 (객체마다 COM 호출 없음)
+- 직경 묶기는 clustering.cluster_labels (정렬 한 번 + 간격 분할)
+- 대표 직경은 클러스터 평균 (표시는 diameter_label)
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from clustering import cluster_labels, cluster_members
+
+CIRCLE_KINDS = ("circle", "arc")
+
+
+def diameter_groups(radii, tolerance: float = 1.0) -> List[Dict]:
+    """반지름 목록 → 직경별 묶음 [{'diameter', 'count', 'positions'}] (직경 오름차순)
+
+    positions: 입력 목록에서의 위치 배열
+    """
+    diameters = 2 * np.asarray(radii, dtype=float)
+    valid = np.flatnonzero(diameters > 0)
+    if not len(valid):
+        return []
+    labels = cluster_labels(diameters[valid], tolerance)
+    count = int(labels.max()) + 1
+    sums = np.bincount(labels, weights=diameters[valid], minlength=count)
+    counts = np.bincount(labels, minlength=count)
+    groups = []
+    for label, members in enumerate(cluster_members(labels, count)):
+        groups.append({'diameter': float(sums[label] / counts[label]),
+                       'count': int(counts[label]),
+                       'positions': valid[members]})
+    return groups
+
+
+def diameter_label(diameter: float, tolerance: float = 1.0) -> str:
+    """직경 표시 (허용오차가 1 미만이면 소수 한 자리)"""
+    return f"Ø{diameter:.1f}" if tolerance < 1 else f"Ø{diameter:.0f}"
+
+
+def circle_schedule(snapshot, mask: Optional[np.ndarray] = None, tolerance: float = 1.0,
+                    include_arcs: bool = True) -> List[Dict]:
+    """스냅샷 원(호)의 직경별 집계
+
+    반환: [{'diameter', 'count', 'circles', 'arcs', 'layers', 'members'}]
+          layers: 레이어별 개수, members: 스냅샷 인덱스
+    """
+    targets = snapshot.kind_mask("circle")
+    if include_arcs:
+        targets = targets | snapshot.kind_mask("arc")
+    if mask is not None:
+        targets = targets & mask
+    indices = np.flatnonzero(targets & (snapshot.radius > 0))
+    arcs = snapshot.kind_mask("arc")
+
+    schedule = []
+    for group in diameter_groups(snapshot.radius[indices], tolerance):
+        members = indices[group['positions']]
+        layer_codes, layer_counts = np.unique(snapshot.layer_codes[members], return_counts=True)
+        arc_count = int(arcs[members].sum())
+        schedule.append({
+            'diameter': group['diameter'],
+            'count': group['count'],
+            'circles': group['count'] - arc_count,
+            'arcs': arc_count,
+            'layers': {str(snapshot.layer_names[c]): int(n) for c, n in zip(layer_codes, layer_counts)},
+            'members': members,
+        })
+    return schedule
@@ -0,0 +1,65 @@
+"""
+Clustering - 허용오차 기반 값 묶기
+길이/치수/반지름 등을 정렬 한 번과 배열 연산으로 그룹화
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def cluster_labels(values, tolerance: float, groups=None) -> np.ndarray:
+    """허용오차 내의 값을 같은 클러스터로 묶은 라벨 배열 반환
+
+    - 정렬 후 인접 값의 간격이 tolerance를 넘으면 새 클러스터
+    - 간격이 작은 값이 길게 이어져도 한 클러스터의 폭은 2 * tolerance를 넘지 않도록 분할
+      (클러스터 중앙값 기준 ±tolerance)
+    - groups가 주어지면 그룹(예: 철근 직경 코드)이 다른 값은 항상 다른 클러스터
+    라벨은 (그룹, 값) 오름차순으로 0부터 매겨진다.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    groups = np.zeros(n, dtype=np.int64) if groups is None else np.asarray(groups)
+
+    order = np.lexsort((values, groups))
+    v = values[order]
+    g = groups[order]
+
+    if tolerance <= 0:
+        breaks = (np.diff(v) != 0) | (g[1:] != g[:-1])
+        sorted_labels = np.concatenate(([0], np.cumsum(breaks)))
+    else:
+        # 1단계: 간격 기준 분할
+        gap_breaks = (np.diff(v) > tolerance) | (g[1:] != g[:-1])
+        run_id = np.concatenate(([0], np.cumsum(gap_breaks)))
+        run_start = np.concatenate(([0], np.flatnonzero(gap_breaks) + 1))
+        # 2단계: 각 구간의 최소값 기준으로 2 * tolerance 폭씩 분할 (연쇄 방지)
+        width = 2 * tolerance
+        sub = np.floor((v - v[run_start][run_id]) / width * (1 - 1e-12)).astype(np.int64)
+        breaks = gap_breaks | (np.diff(sub) != 0)
+        sorted_labels = np.concatenate(([0], np.cumsum(breaks)))
+
+    labels = np.empty(n, dtype=np.int64)
+    labels[order] = sorted_labels
+    return labels
+
+
+def cluster_summary(values, labels: np.ndarray, weights: Optional[np.ndarray] = None):
+    """클러스터별 (개수, 평균값, 합계) 배열 반환"""
+    values = np.asarray(values, dtype=float)
+    n_clusters = int(labels.max()) + 1 if len(labels) else 0
+    counts = np.bincount(labels, minlength=n_clusters)
+    sums = np.bincount(labels, weights=values, minlength=n_clusters)
+    means = np.divide(sums, counts, out=np.zeros(n_clusters), where=counts > 0)
+    if weights is not None:
+        sums = np.bincount(labels, weights=weights, minlength=n_clusters)
+    return counts, means, sums
+
+
+def cluster_members(labels: np.ndarray, n_clusters: int):
+    """클러스터별 원소 인덱스 배열 목록 (정렬 한 번)"""
+    order = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[order], np.arange(n_clusters + 1))
+    return [order[bounds[k]:bounds[k + 1]] for k in range(n_clusters)]
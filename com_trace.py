@@ -0,0 +1,319 @@
+"""
+COM Trace - AutoCAD COM 세션 기록/재생
+실제 AutoCAD 세션의 COM 호출과 결과를 압축 트레이스 파일로 저장하고,
+AutoCAD 없이(리눅스 포함) 같은 결과를 결정적으로 재생
+
+트레이스 형식 (gzip JSON):
+    {"version": 1, "objects": 객체 수, "events": [[op, obj, name, args, result, us], ...]}
+    op: "g" 속성 조회, "c" 메서드 호출, "s" 속성 설정, "i" 열거
+    COM 객체 결과는 {"$obj": id}, 예외는 {"$error": 타입, "message": 내용}
+"""
+
+import atexit
+import gzip
+import json
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from fake_autocad import ComStats, LatencyModel, FakeVariant, FakeComObject
+
+
+TRACE_VERSION = 1
+
+
+class TraceMiss(AttributeError):
+    """재생 중 트레이스에 없는 호출"""
+
+
+class ReplayComError(Exception):
+    """기록된 COM 오류 재생"""
+
+
+def is_com_object(value) -> bool:
+    """COM 객체 여부 (pywin32 CDispatch 또는 가짜 AutoCAD 객체)"""
+    return hasattr(value, '_oleobj_') or isinstance(value, FakeComObject)
+
+
+# ==================== 기록 ====================
+
+class TraceRecorder:
+    """COM 호출 기록기"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.events: List[list] = []
+        self.object_count = 0
+        self.saved = False
+
+    def wrap(self, target) -> "RecordingProxy":
+        obj_id = self.object_count
+        self.object_count += 1
+        return RecordingProxy(target, self, obj_id)
+
+    def encode(self, value):
+        """결과/인자를 JSON 값으로 변환 (COM 객체는 프록시로 감싸 참조 기록)"""
+        if isinstance(value, RecordingProxy):
+            return {"$obj": value._obj_id}, value
+        if is_com_object(value):
+            proxy = self.wrap(value)
+            return {"$obj": proxy._obj_id}, proxy
+        if isinstance(value, (tuple, list)):
+            pairs = [self.encode(v) for v in value]
+            return [p[0] for p in pairs], type(value)(p[1] for p in pairs)
+        if hasattr(value, 'varianttype') and hasattr(value, 'value'):
+            encoded, _ = self.encode(value.value)
+            return {"$variant": int(value.varianttype), "value": encoded}, value
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value, value
+        return str(value), value
+
+    def encode_args(self, args):
+        return [self.encode(a)[0] for a in args]
+
+    def record(self, op, obj_id, name, args, result, started):
+        micros = int((time.perf_counter() - started) * 1e6)
+        self.events.append([op, obj_id, name, args, result, micros])
+
+    def save(self, path: Optional[str] = None):
+        """트레이스 파일 저장"""
+        path = path or self.path
+        data = {"version": TRACE_VERSION, "objects": self.object_count, "events": self.events}
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        self.saved = True
+        print(f"💾 COM 트레이스 저장: {path} ({len(self.events)}개 호출)")
+
+
+def _error_value(error: Exception) -> Dict[str, str]:
+    return {"$error": type(error).__name__, "message": str(error)}
+
+
+class RecordingProxy:
+    """실제 COM 객체를 감싸 모든 호출을 기록하는 프록시"""
+
+    def __init__(self, target, recorder: TraceRecorder, obj_id: int):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_recorder', recorder)
+        object.__setattr__(self, '_obj_id', obj_id)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            return getattr(self._target, name)
+        recorder = self._recorder
+        started = time.perf_counter()
+        try:
+            value = getattr(self._target, name)
+        except Exception as e:
+            recorder.record("g", self._obj_id, name, None, _error_value(e), started)
+            raise
+        if callable(value) and not is_com_object(value):
+            return self._method(name, value)
+        encoded, wrapped = recorder.encode(value)
+        recorder.record("g", self._obj_id, name, None, encoded, started)
+        return wrapped
+
+    def _method(self, name, method):
+        recorder = self._recorder
+        obj_id = self._obj_id
+
+        def recorded_call(*args):
+            real_args = [a._target if isinstance(a, RecordingProxy) else a for a in args]
+            real_args = [_unwrap_variant(a) for a in real_args]
+            started = time.perf_counter()
+            try:
+                result = method(*real_args)
+            except Exception as e:
+                recorder.record("c", obj_id, name, recorder.encode_args(args), _error_value(e), started)
+                raise
+            encoded, wrapped = recorder.encode(result)
+            recorder.record("c", obj_id, name, recorder.encode_args(args), encoded, started)
+            return wrapped
+        return recorded_call
+
+    def __setattr__(self, name, value):
+        started = time.perf_counter()
+        real = value._target if isinstance(value, RecordingProxy) else value
+        setattr(self._target, name, real)
+        self._recorder.record("s", self._obj_id, name, [self._recorder.encode(value)[0]], None, started)
+
+    def __iter__(self):
+        started = time.perf_counter()
+        items = [self._recorder.encode(item) for item in self._target]
+        self._recorder.record("i", self._obj_id, None, None, [p[0] for p in items], started)
+        return iter([p[1] for p in items])
+
+
+def _unwrap_variant(value):
+    """VARIANT 안의 프록시를 실제 COM 객체로 교체"""
+    if hasattr(value, 'varianttype') and isinstance(getattr(value, 'value', None), (tuple, list)):
+        inner = [v._target if isinstance(v, RecordingProxy) else v for v in value.value]
+        if any(isinstance(v, RecordingProxy) for v in value.value):
+            return type(value)(value.varianttype, inner)
+    return value
+
+
+def start_recording(app, path: str) -> RecordingProxy:
+    """AutoCAD.Application을 기록 프록시로 감싸고 종료 시 자동 저장"""
+    recorder = TraceRecorder(path)
+    proxy = recorder.wrap(app)
+    atexit.register(lambda: recorder.saved or recorder.save())
+    print(f"⏺️ COM 기록 시작: {path}")
+    return proxy
+
+
+def recorder_of(proxy: RecordingProxy) -> TraceRecorder:
+    return object.__getattribute__(proxy, '_recorder')
+
+
+# ==================== 재생 ====================
+
+class TracePlayer:
+    """트레이스 파일 재생기
+
+    (객체, 종류, 이름, 인자)별로 기록된 결과를 순서대로 돌려주고,
+    기록보다 많이 호출되면 마지막 결과를 반복한다.
+    인자가 기록과 다르면(예: 시각이 들어간 선택 세트 이름) 인자를 무시하고
+    같은 이름의 호출 결과를 순서대로 사용한다.
+    """
+
+    def __init__(self, path: str, latency: Optional[LatencyModel] = None,
+                 recorded_latency: bool = False):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != TRACE_VERSION:
+            raise ValueError(f"지원하지 않는 트레이스 버전: {data.get('version')}")
+        self.latency = latency or LatencyModel()
+        self.recorded_latency = recorded_latency
+        self.stats = ComStats()
+        self.misses = 0
+
+        self._results: Dict[tuple, List[tuple]] = defaultdict(list)
+        self._loose: Dict[tuple, List[tuple]] = defaultdict(list)
+        self._cursor: Dict[tuple, int] = defaultdict(int)
+        self._methods: Dict[int, set] = defaultdict(set)
+        self._objects: Dict[int, "ReplayObject"] = {}
+        for op, obj_id, name, args, result, micros in data["events"]:
+            key = (op, obj_id, name.lower() if name else None, _args_key(args))
+            self._results[key].append((result, micros))
+            self._loose[key[:3]].append((result, micros))
+            if op == "c":
+                self._methods[obj_id].add(name.lower())
+        print(f"▶️ COM 트레이스 불러옴: {path} ({len(data['events'])}개 호출)")
+
+    @property
+    def root(self) -> "ReplayObject":
+        """기록 시작 객체 (AutoCAD.Application)"""
+        return self.object(0)
+
+    def object(self, obj_id: int) -> "ReplayObject":
+        if obj_id not in self._objects:
+            self._objects[obj_id] = ReplayObject(self, obj_id)
+        return self._objects[obj_id]
+
+    def has_method(self, obj_id: int, name: str) -> bool:
+        return name.lower() in self._methods[obj_id]
+
+    def next_result(self, op, obj_id, name, args=None):
+        key = (op, obj_id, name.lower() if name else None, _args_key(args))
+        self.stats.record(name or "_NewEnum")
+        entries = self._results.get(key)
+        if not entries:
+            key = key[:3]
+            entries = self._loose.get(key)
+        if not entries:
+            self.misses += 1
+            raise TraceMiss(f"트레이스에 없는 호출: {op} #{obj_id}.{name}")
+        cursor = self._cursor[key]
+        result, micros = entries[min(cursor, len(entries) - 1)]
+        self._cursor[key] = cursor + 1
+        if self.recorded_latency:
+            time.sleep(micros / 1e6)
+        else:
+            self.latency.delay(name or "_NewEnum")
+        return self.decode(result)
+
+    def decode(self, value):
+        if isinstance(value, dict):
+            if "$obj" in value:
+                return self.object(value["$obj"])
+            if "$error" in value:
+                if value["$error"] == "AttributeError":
+                    raise AttributeError(value["message"])
+                raise ReplayComError(value["message"])
+            if "$variant" in value:
+                return FakeVariant(value["$variant"], self.decode(value["value"]))
+        if isinstance(value, list):
+            return tuple(self.decode(v) for v in value)
+        return value
+
+
+def _args_key(args) -> str:
+    return json.dumps(args, ensure_ascii=False, separators=(',', ':')) if args else ""
+
+
+def _encode_replay_arg(value):
+    """재생 중 받은 인자를 기록 때와 같은 형태로 변환"""
+    if isinstance(value, ReplayObject):
+        return {"$obj": value._obj_id}
+    if isinstance(value, (tuple, list)):
+        return [_encode_replay_arg(v) for v in value]
+    if hasattr(value, 'varianttype') and hasattr(value, 'value'):
+        return {"$variant": int(value.varianttype), "value": _encode_replay_arg(value.value)}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+class ReplayObject:
+    """트레이스 재생 COM 객체"""
+
+    def __init__(self, player: TracePlayer, obj_id: int):
+        object.__setattr__(self, '_player', player)
+        object.__setattr__(self, '_obj_id', obj_id)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        player = self._player
+        obj_id = self._obj_id
+        if player.has_method(obj_id, name):
+            def replayed_call(*args):
+                encoded = [_encode_replay_arg(a) for a in args]
+                return player.next_result("c", obj_id, name, encoded)
+            return replayed_call
+        return player.next_result("g", obj_id, name)
+
+    def __setattr__(self, name, value):
+        # 설정은 결과가 없으므로 호출 수만 집계
+        self._player.stats.record(name)
+
+    def __iter__(self):
+        return iter(self._player.next_result("i", self._obj_id, None))
+
+    def __repr__(self):
+        return f"<ReplayObject #{self._obj_id}>"
+
+
+def install_replay(path: str, latency: Optional[LatencyModel] = None,
+                   recorded_latency: bool = False) -> TracePlayer:
+    """트레이스 재생기를 win32com.client.Dispatch 대상으로 등록"""
+    import fake_autocad
+    player = TracePlayer(path, latency, recorded_latency)
+    fake_autocad.install(player.root)
+    return player
+
+
+def main():
+    """트레이스 재생으로 프로그램 실행: python com_trace.py trace.cqt.gz"""
+    import sys
+    if len(sys.argv) < 2:
+        print("사용법: python com_trace.py <트레이스 파일> [--recorded-latency]")
+        return
+    install_replay(sys.argv[1], recorded_latency="--recorded-latency" in sys.argv)
+    import CAD_Quantity_Pro
+    CAD_Quantity_Pro.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Curve Geometry - 곡선 길이/면적 일괄 계산
+폴리라인 bulge(호 구간), 호, 타원, 스플라인의 정확한 길이와 면적을 배열 연산으로 계산
+
+- 폴리라인: 모든 구간을 하나의 배열로 펼쳐 현(chord) 길이/신발끈 면적에
+  bulge 호 길이와 활꼴 면적을 더함 (객체 수와 관계없이 배열 연산 몇 번)
+- bulge 읽기: 객체의 Length(COM 1회)가 직선 길이와 같으면 GetBulge를 건너뛰고
+  호 구간이 있는 폴리라인만 정점별 GetBulge 호출
+- 타원: 가우스-르장드르 적분을 노드 수를 두 배씩 늘리며 수렴할 때까지 (전체 타원 일괄)
+- 스플라인: NURBS 기저 함수로 점을 구해 샘플 수를 두 배씩 늘리며 길이 수렴
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+DEFAULT_RELATIVE_TOLERANCE = 1e-6
+MAX_GAUSS_NODES = 512
+MAX_SPLINE_SAMPLES = 1 << 14
+
+
+# ==================== 폴리라인 bulge ====================
+
+def bulge_arcs(chord, bulge):
+    """구간별 bulge → (호 길이, 부호 있는 활꼴 면적)
+
+    bulge = tan(중심각/4), 양수면 시작점에서 끝점까지 반시계 방향 호.
+    활꼴 면적은 반시계 다각형 기준으로 더할 양 (bulge가 0이면 0).
+    """
+    chord = np.asarray(chord, dtype=float)
+    bulge = np.asarray(bulge, dtype=float)
+    curved = bulge != 0
+    safe = np.where(curved, np.abs(bulge), 1.0)
+    angle = 4 * np.arctan(safe)  # 중심각 (0, 2π)
+    radius = chord * (1 + safe * safe) / (4 * safe)
+    length = np.where(curved, radius * angle, chord)
+    segment_area = np.where(curved, np.sign(bulge) * radius * radius * (angle - np.sin(angle)) / 2, 0.0)
+    return length, segment_area
+
+
+def polyline_measures(vertices_list: Sequence, bulges_list: Optional[Sequence] = None,
+                      closed=None):
+    """폴리라인 여러 개의 길이와 면적 일괄 계산
+
+    vertices_list: 폴리라인별 (N, 2) 정점 배열
+    bulges_list: 폴리라인별 (N,) bulge 배열 (None 또는 원소가 None이면 직선)
+    closed: 폴리라인별 폐합 여부 (열린 폴리라인 면적은 0)
+    반환: (길이 (n,), 면적 (n,))
+    """
+    count = len(vertices_list)
+    closed = np.zeros(count, dtype=bool) if closed is None else np.asarray(closed, dtype=bool)
+    valid = [k for k, vertices in enumerate(vertices_list) if vertices is not None and len(vertices) >= 2]
+    if not valid:
+        return np.zeros(count), np.zeros(count)
+
+    counts = np.array([len(vertices_list[k]) for k in valid], dtype=np.int64)
+    points = np.concatenate([np.asarray(vertices_list[k], dtype=float)[:, :2] for k in valid])
+    if bulges_list is None:
+        bulge = np.zeros(len(points))
+    else:
+        bulge = np.concatenate([np.zeros(n) if bulges_list[k] is None else
+                                np.asarray(bulges_list[k], dtype=float)[:n]
+                                for k, n in zip(valid, counts)])
+
+    # 정점 i → i+1 구간, 각 폴리라인의 마지막 정점은 폐합일 때만 첫 정점으로 잇는 구간
+    offsets = np.cumsum(counts) - counts
+    last = offsets + counts - 1
+    owner = np.repeat(np.asarray(valid, dtype=np.int64), counts)
+    end = np.arange(1, len(points) + 1)
+    end[last] = offsets
+    keep = np.ones(len(points), dtype=bool)
+    keep[last] = closed[valid]
+    p1, p2 = points[keep], points[end[keep]]
+    owner, bulge = owner[keep], bulge[keep]
+
+    chord = np.hypot(p2[:, 0] - p1[:, 0], p2[:, 1] - p1[:, 1])
+    arc_length, segment_area = bulge_arcs(chord, bulge)
+    shoelace = (p1[:, 0] * p2[:, 1] - p2[:, 0] * p1[:, 1]) / 2
+
+    length = np.bincount(owner, weights=arc_length, minlength=count)
+    signed_area = np.bincount(owner, weights=shoelace + segment_area, minlength=count)
+    return length, np.where(closed, np.abs(signed_area), 0.0)
+
+
+def read_polyline_bulges(objects, vertices_list, closed, tolerance: float = 1e-6) -> List[Optional[np.ndarray]]:
+    """폴리라인 bulge 일괄 읽기
+
+    COM에는 bulge 배열을 한 번에 주는 속성이 없으므로,
+    Length(객체당 1회)를 직선 길이와 비교해 호 구간이 있는 객체만 GetBulge를 정점별로 호출한다.
+    반환: 객체별 bulge 배열 (직선뿐이면 None)
+    """
+    straight, _ = polyline_measures(vertices_list, None, closed)
+    bulges: List[Optional[np.ndarray]] = [None] * len(objects)
+    for k, obj in enumerate(objects):
+        vertices = vertices_list[k]
+        if vertices is None or len(vertices) < 2:
+            continue
+        try:
+            reported = float(obj.Length)
+            if abs(reported - straight[k]) <= tolerance * max(1.0, straight[k]):
+                continue
+            bulges[k] = np.array([float(obj.GetBulge(i)) for i in range(len(vertices))])
+        except Exception as e:
+            print(f"  bulge 읽기 오류: {e}")
+    return bulges
+
+
+# ==================== 호 ====================
+
+def arc_measures(radius, start_angle, end_angle):
+    """호 길이와 활꼴 면적 (현으로 닫은 면적, AutoCAD Arc.Area와 같은 기준)"""
+    radius = np.asarray(radius, dtype=float)
+    sweep = np.mod(np.asarray(end_angle, dtype=float) - np.asarray(start_angle, dtype=float), 2 * np.pi)
+    sweep = np.where(sweep == 0, 2 * np.pi, sweep)
+    return radius * sweep, radius * radius * (sweep - np.sin(sweep)) / 2
+
+
+# ==================== 타원 ====================
+
+def ellipse_measures(major_radius, ratio, start_param=None, end_param=None,
+                     rel_tol: float = DEFAULT_RELATIVE_TOLERANCE):
+    """타원(호) 여러 개의 길이와 면적 일괄 계산
+
+    major_radius: 장반경, ratio: 단반경/장반경
+    start_param, end_param: 매개변수 구간 (없으면 전체 타원)
+    길이는 가우스-르장드르 적분의 노드 수를 두 배씩 늘리며 수렴한 객체부터 확정.
+    면적은 전체 타원이면 πab, 타원 호면 현으로 닫은 면적.
+    """
+    a = np.atleast_1d(np.asarray(major_radius, dtype=float))
+    b = a * np.atleast_1d(np.asarray(ratio, dtype=float))
+    t1 = np.zeros_like(a) if start_param is None else np.atleast_1d(np.asarray(start_param, dtype=float))
+    t2 = np.full_like(a, 2 * np.pi) if end_param is None else np.atleast_1d(np.asarray(end_param, dtype=float))
+    sweep = np.mod(t2 - t1, 2 * np.pi)
+    sweep = np.where(np.isclose(sweep, 0), 2 * np.pi, sweep)
+
+    def integrate(nodes, index):
+        x, w = np.polynomial.legendre.leggauss(nodes)
+        half = sweep[index, None] / 2
+        t = t1[index, None] + half * (x + 1)
+        speed = np.hypot(a[index, None] * np.sin(t), b[index, None] * np.cos(t))
+        return (speed * w).sum(axis=1) * half[:, 0]
+
+    length = np.zeros_like(a)
+    pending = np.arange(len(a))
+    nodes = 16
+    previous = integrate(nodes, pending)
+    while len(pending) and nodes < MAX_GAUSS_NODES:
+        nodes *= 2
+        current = integrate(nodes, pending)
+        done = np.abs(current - previous) <= rel_tol * np.maximum(current, 1e-12)
+        length[pending[done]] = current[done]
+        pending, previous = pending[~done], current[~done]
+    length[pending] = previous
+
+    area = a * b * (sweep - np.sin(sweep)) / 2
+    return length, area
+
+
+# ==================== 스플라인 (NURBS) ====================
+
+def bspline_basis(knots, degree: int, u) -> np.ndarray:
+    """B-스플라인 기저 함수 값 (len(u), 제어점 수) - Cox-de Boor 점화식을 배열로"""
+    knots = np.asarray(knots, dtype=float)
+    u = np.asarray(u, dtype=float)
+    n = len(knots) - degree - 1
+    basis = ((knots[:-1] <= u[:, None]) & (u[:, None] < knots[1:])).astype(float)
+    # 구간 끝점(u = 마지막 유효 매듭)은 마지막 비어 있지 않은 구간에 포함
+    end_span = int(np.searchsorted(knots, knots[n], side='left')) - 1
+    at_end = u >= knots[n]
+    if at_end.any():
+        basis[at_end] = 0.0
+        basis[at_end, end_span] = 1.0
+    for p in range(1, degree + 1):
+        m = len(knots) - 1 - p
+        d1 = knots[p:p + m] - knots[:m]
+        d2 = knots[p + 1:p + 1 + m] - knots[1:1 + m]
+        left = np.where(d1 > 0, (u[:, None] - knots[:m]) / np.where(d1 > 0, d1, 1.0), 0.0)
+        right = np.where(d2 > 0, (knots[p + 1:p + 1 + m] - u[:, None]) / np.where(d2 > 0, d2, 1.0), 0.0)
+        basis = left * basis[:, :m] + right * basis[:, 1:m + 1]
+    return basis[:, :n]
+
+
+def nurbs_points(control_points, knots, degree: int, weights=None, u=None) -> np.ndarray:
+    """NURBS 곡선 위의 점 (len(u), 2)"""
+    control_points = np.asarray(control_points, dtype=float)[:, :2]
+    basis = bspline_basis(knots, degree, u)
+    if weights is not None and len(weights) == len(control_points):
+        basis = basis * np.asarray(weights, dtype=float)
+        basis = basis / basis.sum(axis=1, keepdims=True)
+    return basis @ control_points
+
+
+def spline_measures(control_points, knots, degree: int, weights=None, closed: bool = False,
+                    rel_tol: float = DEFAULT_RELATIVE_TOLERANCE):
+    """스플라인 길이와 면적 (면적은 폐합일 때만)
+
+    매듭 구간마다 같은 수의 점을 찍고, 샘플 수를 두 배로 늘려도
+    길이 변화가 rel_tol 이하가 될 때까지 반복한다.
+    """
+    knots = np.asarray(knots, dtype=float)
+    n = len(knots) - degree - 1
+    spans = np.unique(knots[degree:n + 1])
+    if len(spans) < 2:
+        return 0.0, 0.0
+
+    def sample(per_span):
+        steps = np.linspace(0, 1, per_span, endpoint=False)
+        u = (spans[:-1, None] + (spans[1:] - spans[:-1])[:, None] * steps).ravel()
+        u = np.append(u, spans[-1])
+        return nurbs_points(control_points, knots, degree, weights, u)
+
+    def polyline_length(points):
+        return float(np.hypot(*np.diff(points, axis=0).T).sum())
+
+    per_span = 8
+    points = sample(per_span)
+    length = polyline_length(points)
+    while per_span * (len(spans) - 1) < MAX_SPLINE_SAMPLES:
+        per_span *= 2
+        finer = sample(per_span)
+        finer_length = polyline_length(finer)
+        converged = abs(finer_length - length) <= rel_tol * max(finer_length, 1e-12)
+        points, length = finer, finer_length
+        if converged:
+            break
+
+    area = 0.0
+    if closed:
+        x, y = points[:, 0], points[:, 1]
+        area = float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+    return length, area
+
+
+# ==================== COM 읽기 ====================
+
+def read_curve(obj, kind: str) -> Dict[str, Any]:
+    """호/타원/스플라인 COM 객체 → {'length', 'area', 'closed'}"""
+    if kind == "arc":
+        length, area = arc_measures(float(obj.Radius), float(obj.StartAngle), float(obj.EndAngle))
+        return {'length': float(length), 'area': float(area), 'closed': False}
+
+    if kind == "ellipse":
+        major = np.asarray(obj.MajorAxis, dtype=float)
+        t1, t2 = float(obj.StartParameter), float(obj.EndParameter)
+        full = math.isclose(math.fmod(t2 - t1, 2 * math.pi), 0.0, abs_tol=1e-9)
+        length, area = ellipse_measures(float(np.hypot(major[0], major[1])), float(obj.RadiusRatio),
+                                        None if full else t1, None if full else t2)
+        return {'length': float(length[0]), 'area': float(area[0]), 'closed': full}
+
+    if kind == "spline":
+        degree = int(obj.Degree)
+        control = np.asarray(obj.ControlPoints, dtype=float).reshape(-1, 3)
+        knots = np.asarray(obj.Knots, dtype=float)
+        try:
+            weights = np.asarray(obj.Weights, dtype=float)
+        except Exception:
+            weights = None  # 유리 스플라인이 아니면 Weights 조회 오류
+        closed = bool(obj.Closed)
+        length, area = spline_measures(control, knots, degree, weights, closed)
+        return {'length': length, 'area': area, 'closed': closed}
+
+    raise ValueError(f"곡선이 아닌 객체: {kind}")
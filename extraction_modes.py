@@ -0,0 +1,338 @@
+"""
+Extraction Modes - 추출모드별 물량 추출
+행의 추출모드(선택/전체/면적/둘레/길이/체적)에 필요한 값만 계산
+
+- 객체 형상(정점, 폐합 여부, 반지름 등)은 Handle별로 한 번만 COM에서 읽고
+- 계산 결과는 (Handle, 모드)별로 캐시해
+행의 추출모드를 바꾸면 COM 호출 없이 캐시된 형상으로 다시 계산한다.
+폴리라인 bulge, 타원, 스플라인 길이/면적은 curve_geometry로,
+해치/영역 면적과 둘레(섬 포함)는 surface_area로 일괄 계산.
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from cad_snapshot import entity_kind, polyline_vertices
+from curve_geometry import polyline_measures, read_polyline_bulges, read_curve
+from rectangle_detection import polyline_rectangles
+from surface_area import SURFACE_KINDS, SurfaceCache
+
+
+EXTRACTION_MODES = ["선택", "전체", "면적", "둘레", "길이", "체적"]
+
+# 새 행의 추출모드 - '선택'은 개수만 세므로 기본은 모든 값을 채우는 '전체'
+DEFAULT_EXTRACTION_MODE = "전체"
+
+# 추출모드별 계산 항목
+# length: 열린 선(LINE, 호, 열린 폴리라인) 길이, perimeter: 폐합 객체 둘레
+# rectangle: 4점 폐합 폴리라인(회전 포함)의 실제 가로/세로 (전체 모드에서만 판정)
+MODE_MEASURES = {
+    "선택": (),
+    "전체": ('length', 'area', 'perimeter', 'rectangle'),
+    "면적": ('area',),
+    "둘레": ('perimeter',),
+    "길이": ('length',),
+    "체적": ('area',),
+}
+
+
+def read_geometry(obj) -> Dict[str, Any]:
+    """COM 객체에서 계산에 필요한 형상만 읽기
+
+    폴리라인 길이/면적은 bulge와 함께 read_geometries에서 일괄 계산한다.
+    해치/영역은 정점이 없어 면적/둘레를 ExtractionCache.complete_surfaces에서 채운다.
+    """
+    obj_type = str(obj.ObjectName)
+    kind = entity_kind(obj_type)
+    geometry = {
+        'obj': obj,
+        'kind': kind,
+        'layer': None,
+        'vertices': None,
+        'bulges': None,
+        'closed': False,
+        'radius': 0.0,
+        'length': None,
+        'area': None,
+    }
+    try:
+        if kind == "line":
+            start = obj.StartPoint
+            end = obj.EndPoint
+            geometry['vertices'] = np.array([[start[0], start[1]], [end[0], end[1]]])
+
+        elif kind == "polyline":
+            geometry['vertices'] = polyline_vertices(obj, obj_type)
+            geometry['closed'] = bool(obj.Closed)
+
+        elif kind == "circle":
+            radius = float(obj.Radius)
+            geometry['radius'] = radius
+            geometry['closed'] = True
+            geometry['length'] = 2 * math.pi * radius
+            geometry['area'] = math.pi * radius * radius
+
+        elif kind == "arc":
+            geometry['radius'] = float(obj.Radius)
+            geometry['length'] = float(obj.ArcLength)
+            geometry['area'] = 0.0
+
+        elif kind in ("ellipse", "spline"):
+            geometry.update(read_curve(obj, kind))
+
+        elif kind in SURFACE_KINDS:
+            geometry['closed'] = True
+    except Exception as e:
+        print(f"  형상 읽기 오류 ({obj_type}): {e}")
+    return geometry
+
+
+def read_geometries(objects) -> List[Dict[str, Any]]:
+    """여러 객체 형상 읽기 - 폴리라인은 bulge를 일괄로 읽어 길이/면적을 한 번에 계산"""
+    geometries = [read_geometry(obj) for obj in objects]
+    polylines = [g for g in geometries if g['kind'] == "polyline" and g['vertices'] is not None]
+    if polylines:
+        vertices = [g['vertices'] for g in polylines]
+        closed = [g['closed'] for g in polylines]
+        bulges = read_polyline_bulges([g['obj'] for g in polylines], vertices, closed)
+        lengths, areas = polyline_measures(vertices, bulges, closed)
+        for geometry, bulge, length, area in zip(polylines, bulges, lengths, areas):
+            geometry['bulges'] = bulge
+            geometry['length'] = float(length)
+            geometry['area'] = float(area)
+    return geometries
+
+
+def vertex_length(vertices, closed: bool) -> float:
+    """정점 배열의 선 길이 (폐합이면 마지막 점 → 첫 점 포함)"""
+    if vertices is None or len(vertices) < 2:
+        return 0.0
+    if closed:
+        vertices = np.vstack([vertices, vertices[:1]])
+    return float(np.hypot(*np.diff(vertices, axis=0).T).sum())
+
+
+def vertex_area(vertices) -> float:
+    """정점 배열의 다각형 면적 (신발끈 공식)"""
+    if vertices is None or len(vertices) < 3:
+        return 0.0
+    x, y = vertices[:, 0], vertices[:, 1]
+    return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+
+
+class ExtractionResult:
+    """선택 객체 묶음의 추출 결과"""
+
+    def __init__(self, mode: str, count: int):
+        self.mode = mode
+        self.count = count
+        self.length = 0.0
+        self.area = 0.0
+        self.perimeter = 0.0
+        self.rectangles: List[tuple] = []  # [(가로, 세로)]
+        self.lengths: List[float] = []  # 객체별 길이 (length를 계산하는 모드에서만)
+        self.radii: List[float] = []  # 객체별 반지름 (원/호가 아니면 0, 형상을 읽은 모드에서만)
+        self.kinds: List[str] = []  # 객체별 종류 (형상을 읽은 모드에서만)
+        self.layer: Optional[str] = None  # 첫 객체 레이어
+
+
+def extraction_values(result: ExtractionResult, columns: Dict[str, int]) -> Dict[int, str]:
+    """추출 결과 → {컬럼: 텍스트}
+
+    columns: 항목(count, length, width, height, area, perimeter, layer) → 테이블 컬럼
+    사각형이 있으면 첫 사각형의 가로/세로와 사각형 면적/둘레 합계를 기록한다.
+    """
+    values = {columns['count']: str(result.count)}
+    if result.rectangles:
+        width, height = result.rectangles[0]
+        values[columns['width']] = f"{width:.1f}"
+        values[columns['height']] = f"{height:.1f}"
+        values[columns['area']] = f"{sum(w * h for w, h in result.rectangles):.1f}"
+        values[columns['perimeter']] = f"{sum(2 * (w + h) for w, h in result.rectangles):.1f}"
+    else:
+        if result.length > 0:
+            values[columns['length']] = f"{result.length:.1f}"
+        if result.area > 0:
+            values[columns['area']] = f"{result.area:.1f}"
+        if result.perimeter > 0:
+            values[columns['perimeter']] = f"{result.perimeter:.1f}"
+    if result.layer and 'layer' in columns:
+        values[columns['layer']] = result.layer
+    return values
+
+
+class ExtractionCache:
+    """Handle별 형상 캐시 + (Handle, 모드)별 계산 결과 캐시
+
+    surfaces: 해치/영역 면적 캐시 (여러 테이블, 선택 도우미와 공유할 수 있음)
+    """
+
+    def __init__(self, tolerance: float = 1.0, surfaces: Optional[SurfaceCache] = None):
+        self.tolerance = tolerance
+        self.geometry: Dict[str, Dict[str, Any]] = {}
+        self.measures: Dict[tuple, Dict[str, Any]] = {}
+        self.surfaces = surfaces if surfaces is not None else SurfaceCache(tolerance)
+
+    def clear(self):
+        self.geometry.clear()
+        self.measures.clear()
+
+    def forget(self, handles):
+        """Handle들의 형상/결과 캐시 삭제 (방금 다시 고른 객체는 도면에서 새로 읽도록)"""
+        handles = set(handles)
+        for handle in handles:
+            self.geometry.pop(handle, None)
+        self.measures = {key: values for key, values in self.measures.items() if key[0] not in handles}
+        self.surfaces.forget(handles)
+
+    def remember_snapshot(self, snapshot, indices):
+        """스냅샷에 이미 있는 형상 등록 (COM 호출 없음)"""
+        for i in indices:
+            handle = snapshot.handles[i]
+            if handle in self.geometry:
+                continue
+            kind = snapshot.kind_of(i)
+            surface = kind in SURFACE_KINDS
+            if surface:
+                self.surfaces.remember(handle, snapshot.area[i])
+            self.geometry[handle] = {
+                'obj': snapshot.objects[i],
+                'kind': kind,
+                'layer': snapshot.layer_of(i),
+                'vertices': snapshot.vertices[i],
+                'bulges': None,  # 스냅샷 길이/면적은 COM 값이라 bulge가 이미 반영됨
+                'closed': bool(snapshot.closed[i]),
+                'radius': float(snapshot.radius[i]),
+                'length': None if surface else float(snapshot.length[i]),  # 해치 둘레는 필요할 때 계산
+                'area': float(snapshot.area[i]),
+            }
+
+    def read_missing(self, objects, handles):
+        """아직 형상이 없는 Handle만 일괄로 읽기"""
+        missing = {}
+        for obj, handle in zip(objects, handles):
+            if handle not in self.geometry and handle not in missing:
+                missing[handle] = obj
+        if missing:
+            for handle, geometry in zip(missing, read_geometries(list(missing.values()))):
+                self.geometry[handle] = geometry
+
+    def detect_rectangles(self, handles):
+        """아직 판정하지 않은 폴리라인을 한 번에 사각형 판정 (bulge가 있으면 면적 비교로 제외)"""
+        pending = [h for h in dict.fromkeys(handles)
+                   if self.geometry[h]['kind'] == "polyline" and 'rectangle' not in self.geometry[h]]
+        if not pending:
+            return
+        geometries = [self.geometry[h] for h in pending]
+        for geometry in geometries:
+            geometry['rectangle'] = None
+        positions, widths, heights, _ = polyline_rectangles(
+            [g['vertices'] for g in geometries], [g['closed'] for g in geometries],
+            self.tolerance, [g['area'] or 0.0 for g in geometries])
+        for k, width, height in zip(positions, widths, heights):
+            geometries[k]['rectangle'] = (float(width), float(height))
+
+    def complete_surfaces(self, handles, with_area: bool, with_perimeter: bool):
+        """해치/영역 중 모드에 필요한 면적/둘레가 아직 없는 것만 SurfaceCache로 일괄 계산
+
+        면적만 필요하면 Area만 읽고, 둘레가 필요할 때만 경계 루프를 읽는다.
+        """
+        pending = [h for h in dict.fromkeys(handles)
+                   if self.geometry[h]['kind'] in SURFACE_KINDS and
+                   ((with_area and self.geometry[h]['area'] is None) or
+                    (with_perimeter and self.geometry[h]['length'] is None))]
+        if not pending:
+            return
+        geometries = [self.geometry[h] for h in pending]
+        results = self.surfaces.measure([g['obj'] for g in geometries], pending,
+                                        [g['kind'] for g in geometries], with_perimeter)
+        for geometry, values in zip(geometries, results):
+            geometry['area'] = values['area']
+            if values['perimeter'] is not None:
+                geometry['length'] = values['perimeter']
+            if values['islands'] is not None:
+                geometry['islands'] = values['islands']
+
+    def geometry_of(self, obj, handle: str) -> Dict[str, Any]:
+        geometry = self.geometry.get(handle)
+        if geometry is None:
+            geometry = read_geometry(obj)
+            self.geometry[handle] = geometry
+        return geometry
+
+    def layer_of(self, obj, handle: str) -> Optional[str]:
+        geometry = self.geometry.get(handle)
+        if geometry is not None and geometry['layer'] is not None:
+            return geometry['layer']
+        try:
+            layer = str(obj.Layer)
+        except Exception:
+            return None
+        if geometry is not None:
+            geometry['layer'] = layer
+        return layer
+
+    def measure(self, handle: str, mode: str) -> Dict[str, Any]:
+        """캐시된 형상으로 모드에 필요한 값만 계산 ((Handle, 모드)별 캐시)"""
+        key = (handle, mode)
+        cached = self.measures.get(key)
+        if cached is not None:
+            return cached
+
+        geometry = self.geometry[handle]
+        kind = geometry['kind']
+        closed = geometry['closed']
+        needs = MODE_MEASURES[mode]
+        values = {}
+        if 'length' in needs or 'perimeter' in needs:
+            if geometry['length'] is None and kind not in SURFACE_KINDS:
+                geometry['length'] = vertex_length(geometry['vertices'], closed)
+            length = geometry['length'] or 0.0  # 해치 둘레는 둘레가 필요한 모드에서만 채워짐
+            if 'length' in needs:
+                values['length'] = 0.0 if closed else length
+            if 'perimeter' in needs:
+                values['perimeter'] = length if closed else 0.0
+        if 'area' in needs:
+            if geometry['area'] is None:
+                geometry['area'] = vertex_area(geometry['vertices']) if closed else 0.0
+            values['area'] = geometry['area']
+        if 'rectangle' in needs and kind == "polyline":
+            if 'rectangle' not in geometry:
+                self.detect_rectangles([handle])
+            values['rectangle'] = geometry['rectangle']
+
+        self.measures[key] = values
+        return values
+
+    def extract(self, objects, handles, mode: str) -> ExtractionResult:
+        """선택 객체를 모드에 맞게 집계
+
+        이미 형상을 읽은 Handle은 COM을 다시 호출하지 않는다.
+        ('선택' 모드는 개수만 세므로 형상을 읽지 않음)
+        """
+        if mode not in MODE_MEASURES:
+            mode = "전체"
+        result = ExtractionResult(mode, len(objects))
+        needs = MODE_MEASURES[mode]
+        if needs:
+            self.read_missing(objects, handles)
+            self.complete_surfaces(handles, 'area' in needs, 'perimeter' in needs)
+        if 'rectangle' in needs:
+            self.detect_rectangles(handles)
+        for obj, handle in zip(objects, handles) if needs else ():
+            geometry = self.geometry_of(obj, handle)
+            values = self.measure(handle, mode)
+            result.kinds.append(geometry['kind'])
+            result.radii.append(geometry['radius'])
+            result.length += values.get('length', 0.0)
+            result.area += values.get('area', 0.0)
+            result.perimeter += values.get('perimeter', 0.0)
+            if 'length' in values:
+                result.lengths.append(values['length'])
+            if values.get('rectangle'):
+                result.rectangles.append(values['rectangle'])
+        if objects:
+            result.layer = self.layer_of(objects[0], handles[0])
+        return result
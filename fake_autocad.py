@@ -0,0 +1,775 @@
+"""
+Fake AutoCAD - AutoCAD COM 대체 객체
+Windows/AutoCAD 없이 합성 도면으로 기능과 성능을 측정하기 위한 순수 Python 구현
+
+- AutoCAD.Application / ActiveDocument / ModelSpace / SelectionSets / Utility
+- 속성 조회와 메서드 호출을 모두 COM 호출 1회로 집계
+- 호출당 지연 시간(LatencyModel)으로 실제 COM 왕복 비용을 흉내
+"""
+
+import fnmatch
+import math
+import random
+import sys
+import time
+import types
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+# DXF 이름 → ObjectName (선택 세트 필터용)
+DXF_OBJECT_NAMES = {
+    "LINE": "AcDbLine",
+    "LWPOLYLINE": "AcDbPolyline",
+    "POLYLINE": "AcDb2dPolyline",
+    "CIRCLE": "AcDbCircle",
+    "ARC": "AcDbArc",
+    "ELLIPSE": "AcDbEllipse",
+    "SPLINE": "AcDbSpline",
+    "INSERT": "AcDbBlockReference",
+    "HATCH": "AcDbHatch",
+    "REGION": "AcDbRegion",
+}
+
+# VARIANT 타입 상수 (pythoncom 값과 동일)
+VT_I2 = 2
+VT_R8 = 5
+VT_DISPATCH = 9
+VT_VARIANT = 12
+VT_ARRAY = 8192
+
+
+class LatencyModel:
+    """COM 호출 지연 모델
+
+    - per_call: 모든 호출의 기본 지연 (초)
+    - overrides: 이름별 지연 {"SelectOnScreen": 0.0, "GetAttributes": 0.0005}
+    - jitter: 기본 지연 대비 무작위 변동 비율 (0.2 → ±20%)
+    """
+
+    def __init__(self, per_call: float = 0.0, overrides: Optional[Dict[str, float]] = None,
+                 jitter: float = 0.0, seed: int = 0):
+        self.per_call = per_call
+        self.overrides = {k.lower(): v for k, v in (overrides or {}).items()}
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    def delay(self, name: str):
+        """호출 하나의 지연 적용"""
+        seconds = self.overrides.get(name.lower(), self.per_call)
+        if self.jitter and seconds:
+            seconds *= 1 + self._random.uniform(-self.jitter, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class ComStats:
+    """COM 호출 통계"""
+
+    def __init__(self):
+        self.calls = 0
+        self.by_name = Counter()
+
+    def record(self, name: str):
+        self.calls += 1
+        self.by_name[name] += 1
+
+    def reset(self):
+        self.calls = 0
+        self.by_name.clear()
+
+
+class FakeBackend:
+    """호출 집계와 지연을 담당하는 공용 백엔드"""
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.latency = latency or LatencyModel()
+        self.stats = ComStats()
+        self._next_handle = 0x100
+
+    def call(self, name: str):
+        self.stats.record(name)
+        self.latency.delay(name)
+
+    def new_handle(self) -> str:
+        self._next_handle += 1
+        return format(self._next_handle, "X")
+
+
+class FakeComObject:
+    """COM 객체 흉내 - 대소문자 무시 속성, 호출마다 집계
+
+    _props의 값은 속성으로, COM_METHODS에 등록된 이름은 메서드로 노출된다.
+    """
+
+    COM_METHODS: Dict[str, str] = {}
+
+    def __init__(self, backend: FakeBackend, **props):
+        object.__setattr__(self, '_backend', backend)
+        object.__setattr__(self, '_props', {k.lower(): v for k, v in props.items()})
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        backend = object.__getattribute__(self, '_backend')
+        key = name.lower()
+        props = object.__getattribute__(self, '_props')
+        if key in props:
+            backend.call(name)
+            return props[key]
+        method_name = type(self).COM_METHODS.get(key)
+        if method_name:
+            method = getattr(self, method_name)
+
+            def com_method(*args, **kwargs):
+                backend.call(name)
+                return method(*args, **kwargs)
+            return com_method
+        # 실제 COM도 없는 이름 조회에 왕복이 발생
+        backend.call(name)
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+            return
+        self._backend.call(name)
+        self._props[name.lower()] = value
+
+
+# ==================== 도면 객체 ====================
+
+class FakeEntity(FakeComObject):
+    """도면 객체 공통"""
+
+    COM_METHODS = {
+        'getboundingbox': '_get_bounding_box',
+        'delete': '_delete',
+        'highlight': '_highlight',
+        'update': '_update',
+    }
+
+    def __init__(self, backend, object_name, layer="0", color=256, **props):
+        super().__init__(backend, ObjectName=object_name, Layer=layer, color=color,
+                         Handle=backend.new_handle(), **props)
+        object.__setattr__(self, '_owner', None)
+
+    def _bbox(self):
+        raise NotImplementedError
+
+    def _get_bounding_box(self):
+        x1, y1, x2, y2 = self._bbox()
+        return (x1, y1, 0.0), (x2, y2, 0.0)
+
+    def _delete(self):
+        if self._owner is not None:
+            self._owner._remove(self)
+
+    def _highlight(self, flag=True):
+        self._props['_highlighted'] = bool(flag)
+
+    def _update(self):
+        pass
+
+
+class FakeLine(FakeEntity):
+    def __init__(self, backend, start, end, **kw):
+        length = math.hypot(end[0] - start[0], end[1] - start[1])
+        super().__init__(backend, "AcDbLine", StartPoint=tuple(start), EndPoint=tuple(end),
+                         Length=length, Angle=math.atan2(end[1] - start[1], end[0] - start[0]), **kw)
+
+    def _bbox(self):
+        s, e = self._props['startpoint'], self._props['endpoint']
+        return min(s[0], e[0]), min(s[1], e[1]), max(s[0], e[0]), max(s[1], e[1])
+
+
+class FakePolyline(FakeEntity):
+    """LWPOLYLINE (2D 좌표, 선택적 bulge - Length/Area는 호 구간 포함)"""
+
+    COM_METHODS = dict(FakeEntity.COM_METHODS, getbulge='_get_bulge', setbulge='_set_bulge')
+
+    def __init__(self, backend, points, closed=True, bulges=None, **kw):
+        coords = tuple(float(v) for p in points for v in p[:2])
+        super().__init__(backend, "AcDbPolyline", Coordinates=coords, Closed=closed, **kw)
+        object.__setattr__(self, '_bulges', list(bulges) if bulges else [0.0] * len(points))
+        self._measure()
+
+    def _measure(self):
+        c = self._props['coordinates']
+        points = list(zip(c[0::2], c[1::2]))
+        closed = self._props['closed']
+        n = len(points)
+        length = 0.0
+        area = 0.0
+        for i in range(n if closed else n - 1):
+            (x1, y1), (x2, y2) = points[i], points[(i + 1) % n]
+            chord = math.hypot(x2 - x1, y2 - y1)
+            area += (x1 * y2 - x2 * y1) / 2
+            bulge = self._bulges[i]
+            if bulge == 0:
+                length += chord
+                continue
+            angle = 4 * math.atan(abs(bulge))
+            radius = chord * (1 + bulge * bulge) / (4 * abs(bulge))
+            length += radius * angle
+            area += math.copysign(radius * radius * (angle - math.sin(angle)) / 2, bulge)
+        self._props['length'] = length
+        self._props['area'] = abs(area) if closed else 0.0
+
+    def _bbox(self):
+        c = self._props['coordinates']
+        xs, ys = c[0::2], c[1::2]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _get_bulge(self, index):
+        return self._bulges[index]
+
+    def _set_bulge(self, index, value):
+        self._bulges[index] = value
+        self._measure()
+
+
+class FakeArc(FakeEntity):
+    def __init__(self, backend, center, radius, start_angle, end_angle, **kw):
+        sweep = (end_angle - start_angle) % (2 * math.pi) or 2 * math.pi
+        super().__init__(backend, "AcDbArc", Center=tuple(center), Radius=float(radius),
+                         StartAngle=float(start_angle), EndAngle=float(end_angle),
+                         ArcLength=radius * sweep,
+                         Area=radius * radius * (sweep - math.sin(sweep)) / 2, **kw)
+
+    def _bbox(self):
+        c, r = self._props['center'], self._props['radius']
+        return c[0] - r, c[1] - r, c[0] + r, c[1] + r
+
+
+class FakeEllipse(FakeEntity):
+    """ELLIPSE (장축 벡터, 단축 비율, 매개변수 구간) - AutoCAD처럼 Length 속성 없음"""
+
+    def __init__(self, backend, center, major_axis, ratio, start_param=0.0,
+                 end_param=2 * math.pi, **kw):
+        a = math.hypot(major_axis[0], major_axis[1])
+        sweep = (end_param - start_param) % (2 * math.pi) or 2 * math.pi
+        super().__init__(backend, "AcDbEllipse", Center=tuple(center), MajorAxis=tuple(major_axis),
+                         RadiusRatio=float(ratio), StartParameter=float(start_param),
+                         EndParameter=float(end_param),
+                         Area=a * a * ratio * (sweep - math.sin(sweep)) / 2, **kw)
+
+    def _bbox(self):
+        c = self._props['center']
+        ux, uy = self._props['majoraxis'][:2]
+        ratio = self._props['radiusratio']
+        dx = math.hypot(ux, uy * ratio)
+        dy = math.hypot(uy, ux * ratio)
+        return c[0] - dx, c[1] - dy, c[0] + dx, c[1] + dy
+
+
+class FakeSpline(FakeEntity):
+    """SPLINE (제어점, 매듭, 차수, 선택적 가중치) - 가중치가 없으면 Weights 조회 오류"""
+
+    def __init__(self, backend, control_points, knots, degree, weights=None, closed=False, **kw):
+        coords = tuple(float(v) for p in control_points for v in (p[0], p[1], p[2] if len(p) > 2 else 0.0))
+        props = dict(ControlPoints=coords, Knots=tuple(float(k) for k in knots),
+                     Degree=int(degree), Closed=bool(closed), NumberOfControlPoints=len(control_points))
+        if weights is not None:
+            props['Weights'] = tuple(float(w) for w in weights)
+        super().__init__(backend, "AcDbSpline", **props, **kw)
+
+    def _bbox(self):
+        c = self._props['controlpoints']
+        xs, ys = c[0::3], c[1::3]
+        return min(xs), min(ys), max(xs), max(ys)
+
+
+class FakeCircle(FakeEntity):
+    def __init__(self, backend, center, radius, **kw):
+        super().__init__(backend, "AcDbCircle", Center=tuple(center), Radius=float(radius),
+                         Area=math.pi * radius * radius, Circumference=2 * math.pi * radius, **kw)
+
+    def _bbox(self):
+        c, r = self._props['center'], self._props['radius']
+        return c[0] - r, c[1] - r, c[0] + r, c[1] + r
+
+
+class FakeHatch(FakeEntity):
+    """HATCH (경계 루프 = 경계 객체 목록) - 첫 루프가 바깥 경계, 나머지는 섬
+
+    Area는 AutoCAD처럼 섬을 뺀 값. area=None을 주면 Area 조회 오류 (비연관 해치 손상 등)
+    """
+
+    COM_METHODS = dict(FakeEntity.COM_METHODS, getloopat='_get_loop_at')
+
+    def __init__(self, backend, loops, pattern="SOLID", area=None, **kw):
+        props = dict(PatternName=pattern, NumberOfLoops=len(loops))
+        if area is not None:
+            props['Area'] = float(area)
+        super().__init__(backend, "AcDbHatch", **props, **kw)
+        object.__setattr__(self, '_loops', [tuple(loop) for loop in loops])
+
+    def _bbox(self):
+        boxes = [item._bbox() for item in self._loops[0]]
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+    def _get_loop_at(self, index):
+        return self._loops[index]
+
+
+class FakeRegion(FakeEntity):
+    """REGION (면적, 둘레, bbox만)"""
+
+    def __init__(self, backend, area, perimeter, bbox, **kw):
+        super().__init__(backend, "AcDbRegion", Area=float(area), Perimeter=float(perimeter), **kw)
+        object.__setattr__(self, '_box', tuple(bbox))
+
+    def _bbox(self):
+        return self._box
+
+
+class FakeAttribute(FakeComObject):
+    def __init__(self, backend, tag, text):
+        super().__init__(backend, TagString=tag, TextString=text)
+
+
+class FakeBlockReference(FakeEntity):
+    COM_METHODS = dict(FakeEntity.COM_METHODS, getattributes='_get_attributes')
+
+    def __init__(self, backend, name, insertion, attributes=None, scale=1.0, rotation=0.0, **kw):
+        attributes = attributes or {}
+        super().__init__(backend, "AcDbBlockReference", Name=name, EffectiveName=name,
+                         InsertionPoint=tuple(insertion), XScaleFactor=scale, YScaleFactor=scale,
+                         ZScaleFactor=scale, Rotation=rotation, HasAttributes=bool(attributes), **kw)
+        object.__setattr__(self, '_attributes',
+                           tuple(FakeAttribute(backend, t, v) for t, v in attributes.items()))
+
+    def _bbox(self):
+        p = self._props['insertionpoint']
+        return p[0], p[1], p[0], p[1]
+
+    def _get_attributes(self):
+        return self._attributes
+
+
+# ==================== 컬렉션 ====================
+
+class FakeModelSpace(FakeComObject):
+    COM_METHODS = {
+        'item': '_item',
+        'addline': '_add_line',
+        'addpolyline': '_add_polyline',
+        'addlightweightpolyline': '_add_lw_polyline',
+        'addcircle': '_add_circle',
+        'addarc': '_add_arc',
+        'addellipse': '_add_ellipse',
+    }
+
+    def __init__(self, backend):
+        super().__init__(backend)
+        object.__setattr__(self, '_entities', [])
+
+    def __getattr__(self, name):
+        if name.lower() == 'count':
+            self._backend.call(name)
+            return len(self._entities)
+        return super().__getattr__(name)
+
+    def __iter__(self):
+        # 열거자도 객체마다 한 번씩 왕복한다고 가정
+        for entity in list(self._entities):
+            self._backend.call("_NewEnum.Next")
+            yield entity
+
+    def _append(self, entity):
+        object.__setattr__(entity, '_owner', self)
+        self._entities.append(entity)
+        return entity
+
+    def _remove(self, entity):
+        self._entities.remove(entity)
+
+    def _item(self, index):
+        return self._entities[index]
+
+    def _add_line(self, start, end):
+        return self._append(FakeLine(self._backend, _values(start), _values(end)))
+
+    def _add_polyline(self, points):
+        values = _values(points)
+        pts = [values[i:i + 3] for i in range(0, len(values), 3)]
+        closed = len(pts) > 2 and pts[0] == pts[-1]
+        return self._append(FakePolyline(self._backend, pts[:-1] if closed else pts, closed=closed))
+
+    def _add_lw_polyline(self, points):
+        values = _values(points)
+        pts = [values[i:i + 2] for i in range(0, len(values), 2)]
+        return self._append(FakePolyline(self._backend, pts, closed=False))
+
+    def _add_circle(self, center, radius):
+        return self._append(FakeCircle(self._backend, _values(center), radius))
+
+    def _add_arc(self, center, radius, start_angle, end_angle):
+        return self._append(FakeArc(self._backend, _values(center), radius, start_angle, end_angle))
+
+    def _add_ellipse(self, center, major_axis, ratio):
+        return self._append(FakeEllipse(self._backend, _values(center), _values(major_axis), ratio))
+
+
+class FakeBlockDefinition(FakeModelSpace):
+    """블록 정의 (이름, 기준점, 객체 목록) - ModelSpace와 같은 열거/추가 메서드"""
+
+    def __init__(self, backend, name, origin=(0.0, 0.0, 0.0)):
+        super().__init__(backend)
+        self._props.update(name=name, origin=tuple(origin))
+
+
+class FakeBlocks(FakeComObject):
+    COM_METHODS = {'item': '_item', 'add': '_add'}
+
+    def __init__(self, backend):
+        super().__init__(backend)
+        object.__setattr__(self, '_definitions', {})
+
+    def _item(self, name):
+        definition = self._definitions.get(str(name).upper())
+        if definition is None:
+            raise KeyError(name)  # 실제 COM: 키를 찾을 수 없음
+        return definition
+
+    def _add(self, origin, name):
+        definition = FakeBlockDefinition(self._backend, name, _values(origin))
+        self._definitions[str(name).upper()] = definition
+        return definition
+
+
+def _values(value):
+    """VARIANT 또는 시퀀스에서 값 목록 꺼내기"""
+    return list(getattr(value, 'value', value))
+
+
+class FakeSelectionSet(FakeComObject):
+    COM_METHODS = {
+        'item': '_item',
+        'selectonscreen': '_select_on_screen',
+        'select': '_select',
+        'additems': '_add_items',
+        'removeitems': '_remove_items',
+        'clear': '_clear',
+        'delete': '_delete',
+        'highlight': '_highlight',
+    }
+
+    def __init__(self, backend, name, document):
+        super().__init__(backend, Name=name)
+        object.__setattr__(self, '_items', [])
+        object.__setattr__(self, '_document', document)
+
+    def __getattr__(self, name):
+        if name.lower() == 'count':
+            self._backend.call(name)
+            return len(self._items)
+        return super().__getattr__(name)
+
+    def __iter__(self):
+        for entity in list(self._items):
+            self._backend.call("_NewEnum.Next")
+            yield entity
+
+    def _item(self, index):
+        return self._items[index]
+
+    def _select_on_screen(self, *args):
+        # 사용자가 고를 객체는 document.screen_selection으로 지정
+        picked = self._document.screen_selection
+        if callable(picked):
+            picked = picked()
+        self._items.extend(picked or [])
+
+    def _select(self, mode, point1=None, point2=None, filter_type=None, filter_data=None):
+        entities = self._document.model_space._entities
+        if mode in (0, 1) and point1 is not None and point2 is not None:
+            p1, p2 = _values(point1), _values(point2)
+            x1, x2 = sorted((p1[0], p2[0]))
+            y1, y2 = sorted((p1[1], p2[1]))
+            picked = []
+            for e in entities:
+                ex1, ey1, ex2, ey2 = e._bbox()
+                if mode == 0:  # window
+                    hit = x1 <= ex1 and ex2 <= x2 and y1 <= ey1 and ey2 <= y2
+                else:  # crossing
+                    hit = ex2 >= x1 and ex1 <= x2 and ey2 >= y1 and ey1 <= y2
+                if hit:
+                    picked.append(e)
+            entities = picked
+        if filter_type is not None:
+            codes = _values(filter_type)
+            data = _values(filter_data)
+            for code, value in zip(codes, data):
+                entities = [e for e in entities if _dxf_match(e, code, value)]
+        self._items.extend(entities)
+
+    def _add_items(self, items):
+        self._items.extend(_values(items))
+
+    def _remove_items(self, items):
+        remove = set(id(e) for e in _values(items))
+        object.__setattr__(self, '_items', [e for e in self._items if id(e) not in remove])
+
+    def _clear(self):
+        self._items.clear()
+
+    def _delete(self):
+        self._document.selection_sets._sets.pop(self._props['name'], None)
+
+    def _highlight(self, flag=True):
+        for e in self._items:
+            e._props['_highlighted'] = bool(flag)
+
+
+def _dxf_match(entity, code, value):
+    """DXF 그룹 코드 필터 하나 평가 (0: 타입, 8: 레이어, 2: 블록 이름, 62: 색상)"""
+    props = entity._props
+    if code == 0:
+        names = {DXF_OBJECT_NAMES.get(v.strip().upper(), v.strip()) for v in str(value).split(",")}
+        return props['objectname'] in names
+    if code == 8:
+        return any(fnmatch.fnmatchcase(props['layer'].upper(), p.strip().upper())
+                   for p in str(value).split(","))
+    if code == 2:
+        return any(fnmatch.fnmatchcase(str(props.get('name', '')).upper(), p.strip().upper())
+                   for p in str(value).split(","))
+    if code == 62:
+        return props.get('color') == int(value)
+    return True
+
+
+class FakeSelectionSets(FakeComObject):
+    COM_METHODS = {'add': '_add', 'item': '_item'}
+
+    def __init__(self, backend, document):
+        super().__init__(backend)
+        object.__setattr__(self, '_sets', {})
+        object.__setattr__(self, '_document', document)
+
+    def __getattr__(self, name):
+        if name.lower() == 'count':
+            self._backend.call(name)
+            return len(self._sets)
+        return super().__getattr__(name)
+
+    def _add(self, name):
+        if name in self._sets:
+            raise RuntimeError(f"선택 세트가 이미 존재함: {name}")
+        selection = FakeSelectionSet(self._backend, name, self._document)
+        self._sets[name] = selection
+        return selection
+
+    def _item(self, key):
+        if isinstance(key, int):
+            return list(self._sets.values())[key]
+        return self._sets[key]
+
+
+class FakeComError(Exception):
+    """pywintypes.com_error 흉내 (hresult, excepinfo)"""
+
+    def __init__(self, hresult, message):
+        super().__init__(hresult, message)
+        self.hresult = hresult
+        self.excepinfo = (0, "AutoCAD", message, None, 0, hresult)
+
+
+# 빈 입력(Enter), 인자 형식 오류
+E_NULL_INPUT = -2145320928
+DISP_E_TYPEMISMATCH = -2147352571
+
+
+class FakeUtility(FakeComObject):
+    COM_METHODS = {'getpoint': '_get_point', 'getentity': '_get_entity', 'prompt': '_prompt'}
+
+    def __init__(self, backend, document):
+        super().__init__(backend)
+        object.__setattr__(self, '_document', document)
+
+    def _get_point(self, base=None, prompt=None):
+        # 실제 AutoCAD처럼 기준점은 VARIANT 배열만 받음
+        if base is not None and not isinstance(base, FakeVariant):
+            raise FakeComError(DISP_E_TYPEMISMATCH, "Type mismatch")
+        if not self._document.point_queue:
+            raise FakeComError(E_NULL_INPUT, "User input is a keyword")  # 점이 더 없으면 Enter
+        return tuple(self._document.point_queue.pop(0))
+
+    def _get_entity(self, *args):
+        entity = self._document.entity_queue.pop(0)
+        return entity, (0.0, 0.0, 0.0)
+
+    def _prompt(self, message):
+        pass
+
+
+class FakeDocument(FakeComObject):
+    COM_METHODS = {'sendcommand': '_send_command', 'getvariable': '_get_variable',
+                   'setvariable': '_set_variable', 'regen': '_regen'}
+
+    def __init__(self, backend, name="Synthetic.dwg"):
+        super().__init__(backend, Name=name)
+        model_space = FakeModelSpace(backend)
+        selection_sets = FakeSelectionSets(backend, self)
+        utility = FakeUtility(backend, self)
+        pickfirst = FakeSelectionSet(backend, "PICKFIRST", self)
+        blocks = FakeBlocks(backend)
+        self._props.update(modelspace=model_space, selectionsets=selection_sets, utility=utility,
+                           pickfirstselectionset=pickfirst, blocks=blocks)
+        object.__setattr__(self, 'model_space', model_space)
+        object.__setattr__(self, 'blocks', blocks)
+        object.__setattr__(self, 'selection_sets', selection_sets)
+        # 테스트/벤치마크 제어용 (COM 호출로 집계하지 않음)
+        object.__setattr__(self, 'screen_selection', [])
+        object.__setattr__(self, 'point_queue', [])
+        object.__setattr__(self, 'entity_queue', [])
+        object.__setattr__(self, 'commands', [])
+        object.__setattr__(self, '_variables', {})
+
+    # 테스트/벤치마크 제어용 속성 - 대입해도 COM 속성(_props)으로 가지 않음
+    CONTROL_ATTRIBUTES = ('screen_selection', 'point_queue', 'entity_queue', 'commands')
+
+    def __setattr__(self, name, value):
+        if name in self.CONTROL_ATTRIBUTES:
+            object.__setattr__(self, name, value)
+            return
+        super().__setattr__(name, value)
+
+    def _send_command(self, command):
+        self.commands.append(command)
+
+    def _get_variable(self, name):
+        return self._variables.get(name.upper())
+
+    def _set_variable(self, name, value):
+        self._variables[name.upper()] = value
+
+    def _regen(self, *args):
+        pass
+
+
+class FakeApplication(FakeComObject):
+    """AutoCAD.Application 대체"""
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        backend = FakeBackend(latency)
+        super().__init__(backend, Visible=True, Version="Fake")
+        document = FakeDocument(backend)
+        self._props['activedocument'] = document
+        object.__setattr__(self, 'document', document)
+
+    @property
+    def stats(self) -> ComStats:
+        return self._backend.stats
+
+    @property
+    def backend(self) -> FakeBackend:
+        return self._backend
+
+
+# ==================== 합성 도면 ====================
+
+DEFAULT_LAYERS = ["A-WALL", "A-WIND", "A-DOOR", "S-COLS", "S-PILE", "REBAR-D13",
+                  "REBAR-D16", "E-OUTLET", "0"]
+
+
+def generate_drawing(app: FakeApplication, count: int, seed: int = 0,
+                     layers: Optional[List[str]] = None,
+                     mix: Optional[Dict[str, float]] = None,
+                     extent: float = 100000.0) -> List[FakeEntity]:
+    """시드 고정 합성 도면 생성 (선, 사각형, 원, 블록을 여러 레이어에 분포)
+
+    mix: 종류별 비율 {"line": 0.4, "rectangle": 0.3, "circle": 0.2, "block": 0.1}
+    """
+    rng = random.Random(seed)
+    layers = layers or DEFAULT_LAYERS
+    mix = mix or {"line": 0.4, "rectangle": 0.3, "circle": 0.2, "block": 0.1}
+    kinds = list(mix.keys())
+    weights = list(mix.values())
+    backend = app.backend
+    model_space = app.document.model_space
+
+    line_lengths = [900, 1200, 1500, 2400, 3000, 3600, 6000]
+    rect_sizes = [(900, 1200), (1200, 1500), (1500, 1500), (2100, 900), (600, 600)]
+    radii = [150, 200, 250, 300, 400]
+    blocks = {"DOOR": "D", "WINDOW": "W", "OUTLET": "E", "REBAR": "R"}
+
+    created = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        layer = rng.choice(layers)
+        color = rng.choice([256, 1, 2, 3, 7])
+        x = rng.uniform(0, extent)
+        y = rng.uniform(0, extent)
+        if kind == "line":
+            length = rng.choice(line_lengths)
+            angle = rng.choice([0.0, math.pi / 2])
+            entity = FakeLine(backend, (x, y, 0.0),
+                              (x + length * math.cos(angle), y + length * math.sin(angle), 0.0),
+                              layer=layer, color=color)
+        elif kind == "rectangle":
+            w, h = rng.choice(rect_sizes)
+            if rng.random() < 0.5:
+                w, h = h, w
+            entity = FakePolyline(backend, [(x, y), (x + w, y), (x + w, y + h), (x, y + h)],
+                                  closed=True, layer=layer, color=color)
+        elif kind == "circle":
+            entity = FakeCircle(backend, (x, y, 0.0), rng.choice(radii), layer=layer, color=color)
+        else:
+            name = rng.choice(list(blocks))
+            tag = f"{blocks[name]}{rng.randint(1, 5)}"
+            entity = FakeBlockReference(backend, name, (x, y, 0.0), attributes={"TAG": tag},
+                                        layer=layer, color=color)
+        model_space._append(entity)
+        created.append(entity)
+    return created
+
+
+# ==================== 모듈 대체 ====================
+
+class FakeVariant:
+    """win32com.client.VARIANT 대체"""
+
+    def __init__(self, varianttype, value):
+        self.varianttype = varianttype
+        self.value = value
+
+
+def install(app: Optional[FakeApplication] = None) -> FakeApplication:
+    """win32com.client / pythoncom 대신 가짜 모듈을 sys.modules에 등록
+
+    이후 import 되는 CAD_Quantity_Pro 등은 Dispatch("AutoCAD.Application")로
+    이 FakeApplication을 받는다.
+    """
+    app = app or FakeApplication()
+
+    def dispatch(target, *args, **kwargs):
+        return app if isinstance(target, str) else target
+
+    pythoncom = types.ModuleType("pythoncom")
+    pythoncom.CoInitialize = lambda *a: None
+    pythoncom.CoUninitialize = lambda *a: None
+    pythoncom.PumpWaitingMessages = lambda *a: 0
+    pythoncom.VT_I2 = VT_I2
+    pythoncom.VT_R8 = VT_R8
+    pythoncom.VT_DISPATCH = VT_DISPATCH
+    pythoncom.VT_VARIANT = VT_VARIANT
+    pythoncom.VT_ARRAY = VT_ARRAY
+
+    win32com = types.ModuleType("win32com")
+    client = types.ModuleType("win32com.client")
+    dynamic = types.ModuleType("win32com.client.dynamic")
+    client.Dispatch = dispatch
+    client.GetActiveObject = dispatch
+    client.VARIANT = FakeVariant
+    dynamic.Dispatch = dispatch
+    client.dynamic = dynamic
+    win32com.client = client
+
+    sys.modules["pythoncom"] = pythoncom
+    sys.modules["win32com"] = win32com
+    sys.modules["win32com.client"] = client
+    sys.modules["win32com.client.dynamic"] = dynamic
+    return app
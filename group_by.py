@@ -0,0 +1,139 @@
+"""
+Group By - 선택 객체 다중 키 그룹화
+타입, 레이어, 블록 이름, 길이(허용오차), W×H(허용오차), 반지름(허용오차), 속성 값을
+아무 조합으로 묶어 그룹별 행을 만듦
+
+- 스냅샷 배열(코드/길이/치수/반지름)로 키마다 정수 라벨을 만들고
+  라벨 조합을 np.unique 한 번으로 그룹 번호로 바꿈 (객체마다 COM 호출 없음)
+- 길이/치수/반지름은 clustering.cluster_labels (정렬 한 번 + 간격 분할)
+- W×H는 사각형이면 실제 변 길이(회전 포함), 아니면 bbox 가로/세로, 긴 변을 W로
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from clustering import cluster_labels, cluster_members
+from rectangle_detection import polyline_rectangles
+
+GROUP_KEYS = {
+    "type": "타입",
+    "layer": "레이어",
+    "block": "블록 이름",
+    "length": "길이",
+    "size": "W×H",
+    "radius": "반지름",
+    "attribute": "속성 값",
+}
+
+
+def outline_dimensions(snapshot, indices: np.ndarray):
+    """객체별 (W, H) - 사각형 폴리라인은 실제 변 길이, 나머지는 bbox, W >= H"""
+    width = snapshot.width[indices].copy()
+    height = snapshot.height[indices].copy()
+    kinds = snapshot.kind_names[snapshot.kind_codes[indices]] if len(indices) else np.array([], dtype=str)
+    rect_like = np.flatnonzero((kinds == "polyline") & snapshot.closed[indices] &
+                               (snapshot.vertex_count[indices] >= 4) & (snapshot.vertex_count[indices] <= 5))
+    if len(rect_like):
+        positions, w, h, _ = polyline_rectangles(
+            [snapshot.vertices[i] for i in indices[rect_like]], None,
+            areas=snapshot.area[indices[rect_like]])
+        width[rect_like[positions]] = w
+        height[rect_like[positions]] = h
+    width, height = np.nan_to_num(width), np.nan_to_num(height)
+    return np.maximum(width, height), np.minimum(width, height)
+
+
+def _numeric_key(values: np.ndarray, tolerance: float):
+    """허용오차 라벨과 라벨별 평균값"""
+    labels = cluster_labels(values, tolerance)
+    count = int(labels.max()) + 1 if len(labels) else 0
+    means = np.bincount(labels, weights=values, minlength=count) / np.maximum(
+        np.bincount(labels, minlength=count), 1)
+    return labels, means
+
+
+def group_selection(snapshot, indices, keys: Sequence[str], tolerance: float = 1.0,
+                    attribute_index=None, attribute_tag: Optional[str] = None) -> List[Dict]:
+    """스냅샷 인덱스 목록을 keys 조합으로 그룹화
+
+    반환: [{'values': {키: 표시 문자열}, 'label', 'count', 'length', 'area', 'width', 'height',
+            'radius', 'members'}] - 키 값 순서로 정렬 (members는 스냅샷 인덱스)
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    n = len(indices)
+    if n == 0:
+        return []
+    keys = [k for k in keys if k in GROUP_KEYS] or ["type"]
+
+    columns = []  # 키별 정수 라벨 (정렬 순서 = 라벨 순서)
+    displays = []  # 키별 라벨 → 표시 문자열 함수
+    width = height = None
+    for key in keys:
+        if key in ("type", "layer", "block"):
+            names, codes = {"type": (snapshot.type_names, snapshot.type_codes),
+                            "layer": (snapshot.layer_names, snapshot.layer_codes),
+                            "block": (snapshot.block_names, snapshot.block_codes)}[key]
+            columns.append(codes[indices])  # 이름은 np.unique로 정렬되어 코드 순서 = 이름 순서
+            if key == "type":
+                displays.append(lambda c, names=names: str(names[c]).replace("AcDb", ""))
+            else:
+                displays.append(lambda c, names=names: str(names[c]) or "-")
+        elif key == "length":
+            labels, means = _numeric_key(snapshot.length[indices], tolerance)
+            columns.append(labels)
+            displays.append(lambda c, means=means: f"L={means[c]:.1f}")
+        elif key == "radius":
+            labels, means = _numeric_key(snapshot.radius[indices], tolerance)
+            columns.append(labels)
+            displays.append(lambda c, means=means: f"R={means[c]:.1f}" if means[c] > 0 else "-")
+        elif key == "size":
+            width, height = outline_dimensions(snapshot, indices)
+            w_labels, w_means = _numeric_key(width, tolerance)
+            h_labels, h_means = _numeric_key(height, tolerance)
+            columns.append(w_labels)
+            columns.append(h_labels)
+            displays.append(lambda c, means=w_means: f"{means[c]:.0f}")
+            displays.append(lambda c, means=h_means: f"{means[c]:.0f}")
+        elif key == "attribute":
+            tag = (attribute_tag or "").strip().upper()
+            values = [attribute_index.attributes_of(i).get(tag, "") if attribute_index else ""
+                      for i in indices]
+            names, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+            columns.append(codes.astype(np.int64))
+            displays.append(lambda c, names=names, tag=tag: f"{tag}={names[c]}" if names[c] else f"{tag} 없음")
+
+    table = np.stack(columns, axis=1)
+    combos, group_of = np.unique(table, axis=0, return_inverse=True)
+    group_of = np.asarray(group_of).reshape(-1)
+    members = cluster_members(group_of, len(combos))
+
+    lengths = np.bincount(group_of, weights=snapshot.length[indices], minlength=len(combos))
+    areas = np.bincount(group_of, weights=snapshot.area[indices], minlength=len(combos))
+    counts = np.bincount(group_of, minlength=len(combos))
+
+    groups = []
+    for g, combo in enumerate(combos):
+        parts = [display(int(c)) for display, c in zip(displays, combo)]
+        values, p = {}, 0
+        for key in keys:
+            if key == "size":
+                values[key] = f"{parts[p]}x{parts[p + 1]}"
+                p += 2
+            else:
+                values[key] = parts[p]
+                p += 1
+        local = members[g]
+        group = {
+            'values': values,
+            'label': " / ".join(values.values()),
+            'count': int(counts[g]),
+            'length': float(lengths[g]),
+            'area': float(areas[g]),
+            'radius': float(snapshot.radius[indices[local]].mean()),
+            'width': float(width[local].mean()) if width is not None else 0.0,
+            'height': float(height[local].mean()) if height is not None else 0.0,
+            'members': indices[local],
+        }
+        groups.append(group)
+    return groups
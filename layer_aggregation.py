@@ -0,0 +1,69 @@
+"""
+Layer Aggregation - 레이어별 집계
+스냅샷의 레이어 코드 배열로 모든 레이어를 한 번에 그룹 합산
+"""
+
+from typing import Dict, List, Any
+
+import numpy as np
+
+from cad_snapshot import EntitySnapshot
+from rebar import rebar_unit_weight
+
+
+# 집계 컬럼 (표시 순서)
+AGGREGATE_COLUMNS = [
+    'count',            # 객체 수
+    'line_length',      # LINE 길이 합계
+    'polyline_length',  # 폴리라인 길이 합계
+    'closed_area',      # 폐합 도형 면적 합계
+    'closed_count',     # 폐합 도형 수
+    'long_side',        # 폐합 폴리라인 장변 합계
+    'short_side',       # 폐합 폴리라인 단변 합계
+    'circle_count',     # 원 개수
+    'block_count',      # 블록 참조 개수
+]
+
+
+def aggregate_layers(snapshot: EntitySnapshot) -> Dict[str, np.ndarray]:
+    """모든 레이어의 집계값을 한 번의 그룹 합산(bincount)으로 계산
+
+    반환값은 컬럼별 배열이며 'layer' 배열과 같은 순서를 가진다.
+    """
+    n_layers = len(snapshot.layer_names)
+    codes = snapshot.layer_codes
+    kind = {name: snapshot.kind_mask(name) for name in ("line", "polyline", "circle", "block")}
+    closed_polylines = snapshot.closed & kind["polyline"] & ~np.isnan(snapshot.width)
+    long_side = np.where(closed_polylines, np.fmax(snapshot.width, snapshot.height), 0.0)
+    short_side = np.where(closed_polylines, np.fmin(snapshot.width, snapshot.height), 0.0)
+
+    def group_sum(weights):
+        return np.bincount(codes, weights=weights, minlength=n_layers)
+
+    result = {
+        'layer': snapshot.layer_names,
+        'count': np.bincount(codes, minlength=n_layers),
+        'line_length': group_sum(np.where(kind["line"], snapshot.length, 0.0)),
+        'polyline_length': group_sum(np.where(kind["polyline"], snapshot.length, 0.0)),
+        'closed_area': group_sum(np.where(snapshot.closed, snapshot.area, 0.0)),
+        'closed_count': np.bincount(codes, weights=snapshot.closed, minlength=n_layers).astype(int),
+        'long_side': group_sum(long_side),
+        'short_side': group_sum(short_side),
+        'circle_count': np.bincount(codes, weights=kind["circle"], minlength=n_layers).astype(int),
+        'block_count': np.bincount(codes, weights=kind["block"], minlength=n_layers).astype(int),
+    }
+    result['rebar_weight'] = np.array([rebar_unit_weight(str(name)) or 0.0
+                                       for name in snapshot.layer_names])
+    return result
+
+
+def layer_rows(aggregate: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """집계 배열을 레이어별 딕셔너리 목록으로 변환 (다이얼로그 표시용)"""
+    rows = []
+    for i, name in enumerate(aggregate['layer']):
+        row = {'layer': str(name)}
+        for col in AGGREGATE_COLUMNS:
+            row[col] = aggregate[col][i].item()
+        row['rebar_weight'] = float(aggregate['rebar_weight'][i])
+        rows.append(row)
+    return rows
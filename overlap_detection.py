@@ -0,0 +1,187 @@
+"""
+Overlap Detection - 중복/겹침 선분 검출
+중복 LINE, 겹친 폴리라인이 수량을 부풀리는 것을 막기 위한 검사
+
+1. 정규화한 끝점의 격자 해시로 완전 중복 선분 검출
+2. 같은 직선(각도, 원점 거리) 위의 선분끼리 묶어 직선 방향 구간을 정렬 후
+   누적 최대값으로 앞선 선분에 덮인 길이를 계산 (허용오차 내 겹침)
+"""
+
+import numpy as np
+
+from clustering import cluster_labels
+
+
+DEFAULT_TOLERANCE = 1.0  # mm
+DEFAULT_ANGLE_TOLERANCE = 1e-3  # rad
+
+
+def entity_segments(snapshot, indices=None):
+    """스냅샷의 LINE/폴리라인을 선분 배열로 변환
+
+    반환: (segments (m, 4) [x1, y1, x2, y2], owner (m,) - indices 내 위치)
+    폐합 폴리라인은 마지막 점 → 첫 점 선분 포함 (bulge는 현 단계에서 직선으로 취급)
+    """
+    if indices is None:
+        indices = np.arange(snapshot.count)
+    indices = np.asarray(indices, dtype=np.int64)
+    kinds = snapshot.kind_mask("line") | snapshot.kind_mask("polyline")
+
+    point_blocks = []
+    owners = []
+    for position, i in enumerate(indices):
+        vertices = snapshot.vertices[i]
+        if not kinds[i] or vertices is None or len(vertices) < 2:
+            continue
+        vertices = np.asarray(vertices, dtype=float)[:, :2]
+        if snapshot.closed[i] and len(vertices) > 2:
+            vertices = np.vstack([vertices, vertices[:1]])
+        point_blocks.append(vertices)
+        owners.append(np.full(len(vertices), position, dtype=np.int64))
+
+    if not point_blocks:
+        return np.zeros((0, 4)), np.zeros(0, dtype=np.int64)
+
+    points = np.concatenate(point_blocks)
+    point_owner = np.concatenate(owners)
+    # 같은 객체 안에서 이어지는 점끼리만 선분
+    same = point_owner[1:] == point_owner[:-1]
+    segments = np.hstack([points[:-1][same], points[1:][same]])
+    return segments, point_owner[:-1][same]
+
+
+def line_parameters(segments, tolerance: float = DEFAULT_TOLERANCE,
+                    angle_tolerance: float = DEFAULT_ANGLE_TOLERANCE):
+    """선분의 직선 매개변수 (같은 직선 묶기, 평행선 짝짓기 공용)
+
+    반환 딕셔너리:
+    - normalized: 끝점 순서를 정규화한 선분 (m, 4)
+    - length: 선분 길이
+    - angle_group: 방향(0~π) 허용오차 묶음, theta: 묶음 평균 방향
+    - rho: 평균 방향 기준 원점에서의 수직 거리 (부호 있음)
+    - line_group: 같은 직선 묶음 (각도 묶음 안에서 rho 허용오차)
+    - t1, t2: 평균 방향으로 투영한 구간 (t1 <= t2)
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+    x1, y1, x2, y2 = segments.T.copy()
+    swap = (x1 > x2) | ((x1 == x2) & (y1 > y2))
+    x1[swap], x2[swap] = x2[swap], x1[swap].copy()
+    y1[swap], y2[swap] = y2[swap], y1[swap].copy()
+
+    theta = np.mod(np.arctan2(y2 - y1, x2 - x1), np.pi)
+    theta = np.where(theta > np.pi - angle_tolerance, theta - np.pi, theta)
+    angle_group = cluster_labels(theta, angle_tolerance)
+    n_angle = int(angle_group.max()) + 1 if len(theta) else 0
+    # 원점에서 먼 선분도 같은 기준으로 비교하도록 묶음 평균 방향 사용
+    mean_theta = (np.bincount(angle_group, weights=theta, minlength=n_angle) /
+                  np.maximum(np.bincount(angle_group, minlength=n_angle), 1))[angle_group]
+    c, s = np.cos(mean_theta), np.sin(mean_theta)
+    rho = -s * x1 + c * y1
+    t1 = c * x1 + s * y1
+    t2 = c * x2 + s * y2
+    return {
+        'normalized': np.stack([x1, y1, x2, y2], axis=1),
+        'length': np.hypot(x2 - x1, y2 - y1),
+        'angle_group': angle_group,
+        'theta': mean_theta,
+        'rho': rho,
+        'line_group': cluster_labels(rho, tolerance, groups=angle_group),
+        't1': np.minimum(t1, t2),
+        't2': np.maximum(t1, t2),
+    }
+
+
+class OverlapReport:
+    """중복/겹침 검사 결과 (입력 객체 위치 기준)"""
+
+    def __init__(self, entity_count, duplicate, contained, partial, overlap_length, segment_count):
+        self.entity_count = entity_count
+        self.duplicate = duplicate  # 모든 선분이 다른 선분과 완전히 같은 객체
+        self.contained = contained  # 모든 선분이 다른 선분에 덮인 객체 (중복 제외)
+        self.partial = partial  # 일부만 겹친 객체
+        self.overlap_length = overlap_length  # 객체별 겹친 길이
+        self.segment_count = segment_count
+
+    @property
+    def redundant(self) -> np.ndarray:
+        """수량에서 빼도 되는 객체 (완전 중복 + 완전히 덮인 객체)"""
+        return self.duplicate | self.contained
+
+    @property
+    def has_overlaps(self) -> bool:
+        return bool(self.redundant.any() or self.partial.any())
+
+    def summary(self) -> str:
+        lines = [f"선분 {self.segment_count}개 검사"]
+        lines.append(f"완전 중복 객체: {int(self.duplicate.sum())}개")
+        lines.append(f"다른 객체에 덮인 객체: {int(self.contained.sum())}개")
+        partial_length = self.overlap_length[self.partial].sum()
+        lines.append(f"일부 겹침 객체: {int(self.partial.sum())}개 (겹친 길이 {partial_length:.1f})")
+        return "\n".join(lines)
+
+
+def find_overlaps(segments, owner, entity_count: int,
+                  tolerance: float = DEFAULT_TOLERANCE,
+                  angle_tolerance: float = DEFAULT_ANGLE_TOLERANCE) -> OverlapReport:
+    """선분 배열에서 중복/겹침 검출
+
+    먼저 입력된 선분을 기준으로 보고, 뒤에 오는 선분이 덮인 길이를 센다.
+    (같은 선분 두 개면 앞의 것은 남기고 뒤의 것이 중복)
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+    owner = np.asarray(owner, dtype=np.int64)
+    m = len(segments)
+    empty = np.zeros(entity_count, dtype=bool)
+    if m == 0:
+        return OverlapReport(entity_count, empty, empty.copy(), empty.copy(),
+                             np.zeros(entity_count), 0)
+
+    params = line_parameters(segments, tolerance, angle_tolerance)
+    length = params['length']
+    line_group = params['line_group']
+    t1, t2 = params['t1'], params['t2']
+
+    # 1) 완전 중복: 정규화한 끝점 격자 해시
+    keys = np.round(params['normalized'] / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    duplicate_segment = np.arange(m) != first[inverse]
+
+    # 2) 스윕: 직선별 시작점 순 정렬 (같으면 긴 것, 먼저 입력된 것 우선)
+    # 해시에서 남긴 선분만 스윕 - 중복 쌍이 서로를 덮은 것으로 보고 둘 다 빠지지 않게
+    survivors = np.flatnonzero(~duplicate_segment)
+    order = survivors[np.lexsort((survivors, -t2[survivors], t1[survivors], line_group[survivors]))]
+    g = line_group[order]
+    a = t1[order]
+    b = t2[order]
+    unit = (b.max() - a.min()) + 1.0
+    cummax = np.maximum.accumulate(b + g * unit)
+    previous = np.concatenate(([-np.inf], cummax[:-1])) - g * unit
+    covered_sorted = np.clip(np.minimum(b, previous) - a, 0.0, None)
+    covered = np.empty(m)
+    covered[order] = covered_sorted
+    covered[duplicate_segment] = length[duplicate_segment]
+
+    fully_covered = covered >= length - tolerance
+    overlapping = covered > tolerance
+
+    # 객체 단위 집계
+    segment_count = np.bincount(owner, minlength=entity_count)
+    has_segments = segment_count > 0
+    duplicate = has_segments & (
+        np.bincount(owner, weights=duplicate_segment, minlength=entity_count) == segment_count)
+    redundant = has_segments & (
+        np.bincount(owner, weights=fully_covered, minlength=entity_count) == segment_count)
+    overlap_length = np.bincount(owner, weights=np.where(overlapping, covered, 0.0),
+                                 minlength=entity_count)
+    contained = redundant & ~duplicate
+    partial = ~redundant & (overlap_length > tolerance)
+    return OverlapReport(entity_count, duplicate, contained, partial, overlap_length, m)
+
+
+def snapshot_overlaps(snapshot, indices=None, tolerance: float = DEFAULT_TOLERANCE,
+                      angle_tolerance: float = DEFAULT_ANGLE_TOLERANCE) -> OverlapReport:
+    """스냅샷(또는 그 일부 인덱스)의 중복/겹침 검사"""
+    count = snapshot.count if indices is None else len(indices)
+    segments, owner = entity_segments(snapshot, indices)
+    return find_overlaps(segments, owner, count, tolerance, angle_tolerance)
@@ -0,0 +1,159 @@
+"""
+Parallel Pairing - 평행선 짝짓기 (데크 보, 벽체)
+두 줄의 평행선으로 그려진 보/벽을 찾아 길이, 두께, 개수를 산출
+
+- 선분을 (방향, 원점 거리) 순으로 정렬해 두고
+  각 선분에서 두께 범위 안의 평행선을 이진 탐색으로 찾음
+- 길이 방향으로 겹치는 후보 중 두께가 가장 얇은 짝부터 한 번씩만 사용
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from clustering import cluster_labels, cluster_summary, cluster_members
+from overlap_detection import line_parameters, entity_segments
+
+
+# 용도별 두께 범위 (mm)
+PAIRING_PRESETS = {
+    "벽체": (100.0, 400.0),
+    "데크 보": (200.0, 1000.0),
+}
+
+
+class PairingResult:
+    """짝지은 평행선 결과 (선분 기준)"""
+
+    def __init__(self, first, second, thickness, length, start, end):
+        self.first = first  # 짝의 한쪽 선분 인덱스
+        self.second = second  # 다른 쪽 선분 인덱스
+        self.thickness = thickness  # 두 선 사이 거리
+        self.length = length  # 길이 방향으로 겹친 길이 (보/벽 길이)
+        self.start = start  # 겹친 구간의 중심선 시작점 (x, y)
+        self.end = end  # 중심선 끝점
+
+    @property
+    def count(self) -> int:
+        return len(self.first)
+
+
+def pair_parallel_segments(segments, min_thickness: float, max_thickness: float,
+                           min_overlap: float = 0.5, angle_tolerance: float = 1e-3,
+                           tolerance: float = 1.0) -> PairingResult:
+    """두께 범위 안의 평행 선분 짝짓기
+
+    min_overlap: 짧은 쪽 길이 대비 길이 방향 겹침 비율 (0.5면 절반 이상 겹쳐야 짝)
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+    m = len(segments)
+    if m < 2:
+        empty = np.zeros(0, dtype=np.int64)
+        return PairingResult(empty, empty, np.zeros(0), np.zeros(0), np.zeros((0, 2)), np.zeros((0, 2)))
+
+    params = line_parameters(segments, tolerance, angle_tolerance)
+    group = params['angle_group']
+    rho, t1, t2 = params['rho'], params['t1'], params['t2']
+    length = params['length']
+
+    # (방향 묶음, rho) 정렬 색인
+    order = np.lexsort((rho, group))
+    sorted_group = group[order]
+    sorted_rho = rho[order]
+    # 방향 묶음을 넘지 않도록 묶음 번호를 큰 간격으로 더한 키로 이진 탐색
+    # (탐색 창 끝 = key + max_thickness + tolerance 가 다음 묶음에 닿지 않게 그보다 크게)
+    span = (sorted_rho.max() - sorted_rho.min()) + max_thickness + 2 * tolerance + 1.0
+    key = sorted_rho + sorted_group * span
+    lo = np.searchsorted(key, key + min_thickness - tolerance, side='left')
+    hi = np.searchsorted(key, key + max_thickness + tolerance, side='right')
+
+    # 후보 짝 펼치기 (i: 정렬 위치, j: i보다 rho가 큰 쪽)
+    counts = hi - lo
+    i_sorted = np.repeat(np.arange(m), counts)
+    starts = np.cumsum(counts) - counts
+    j_sorted = np.arange(counts.sum()) - np.repeat(starts - lo, counts)
+    i = order[i_sorted]
+    j = order[j_sorted]
+
+    # 같은 방향 묶음, 두께 범위 안인 후보만 (순위를 매기기 전에 거름)
+    thickness = rho[j] - rho[i]
+    ok = ((group[i] == group[j]) & (i != j) &
+          (thickness >= min_thickness - tolerance) & (thickness <= max_thickness + tolerance))
+
+    # 길이 방향 겹침 확인
+    overlap = np.minimum(t2[i], t2[j]) - np.maximum(t1[i], t1[j])
+    shorter = np.minimum(length[i], length[j])
+    ok &= overlap >= np.maximum(shorter * min_overlap, tolerance)
+    i, j, overlap, thickness = i[ok], j[ok], overlap[ok], thickness[ok]
+
+    # 얇은 두께 → 긴 겹침 순으로 한 선분당 한 짝만 사용
+    priority = np.lexsort((-overlap, thickness))
+    used = np.zeros(m, dtype=bool)
+    chosen = []
+    for k in priority:
+        a, b = i[k], j[k]
+        if used[a] or used[b]:
+            continue
+        used[a] = used[b] = True
+        chosen.append(k)
+    chosen = np.array(chosen, dtype=np.int64)
+
+    i, j = i[chosen], j[chosen]
+    thickness = thickness[chosen]
+    overlap = overlap[chosen]
+
+    # 중심선 (평균 방향 기준)
+    theta = params['theta'][i]
+    c, s = np.cos(theta), np.sin(theta)
+    mid_rho = (rho[i] + rho[j]) / 2
+    t_start = np.maximum(t1[i], t1[j])
+    t_end = np.minimum(t2[i], t2[j])
+    start = np.stack([c * t_start - s * mid_rho, s * t_start + c * mid_rho], axis=1)
+    end = np.stack([c * t_end - s * mid_rho, s * t_end + c * mid_rho], axis=1)
+    return PairingResult(i, j, thickness, overlap, start, end)
+
+
+def pairing_schedule(result: PairingResult, owner=None,
+                     thickness_tolerance: float = 5.0) -> List[Dict[str, Any]]:
+    """두께별 집계 (두께 허용오차로 묶음)
+
+    owner(선분 → 객체 위치)가 주어지면 항목마다 관련 객체 위치(members) 포함
+    """
+    if result.count == 0:
+        return []
+    labels = cluster_labels(result.thickness, thickness_tolerance)
+    counts, mean_thickness, _ = cluster_summary(result.thickness, labels)
+    _, _, total_length = cluster_summary(result.thickness, labels, weights=result.length)
+    members = cluster_members(labels, len(counts))
+
+    schedule = []
+    for k in range(len(counts)):
+        item = {
+            'thickness': float(mean_thickness[k]),
+            'count': int(counts[k]),
+            'total_length': float(total_length[k]),
+            'pairs': members[k],
+        }
+        if owner is not None:
+            segs = np.concatenate([result.first[members[k]], result.second[members[k]]])
+            item['members'] = np.unique(np.asarray(owner)[segs])
+        schedule.append(item)
+    return schedule
+
+
+def snapshot_pairs(snapshot, mask: Optional[np.ndarray] = None, min_thickness: float = 100.0,
+                   max_thickness: float = 400.0, min_overlap: float = 0.5,
+                   thickness_tolerance: float = 5.0) -> List[Dict[str, Any]]:
+    """스냅샷의 LINE/폴리라인 선분으로 평행선 짝짓기 후 두께별 집계
+
+    members는 스냅샷 인덱스
+    """
+    indices = np.flatnonzero(mask) if mask is not None else np.arange(snapshot.count)
+    segments, owner = entity_segments(snapshot, indices)
+    result = pair_parallel_segments(segments, min_thickness, max_thickness, min_overlap)
+    schedule = pairing_schedule(result, indices[owner] if len(owner) else owner,
+                                thickness_tolerance)
+    total = sum(item['total_length'] for item in schedule)
+    print(f"🧱 평행선 짝짓기: 선분 {len(segments)}개 → {result.count}쌍, "
+          f"두께 {len(schedule)}종, 총 길이 {total / 1000:.2f}m")
+    return schedule
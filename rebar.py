@@ -0,0 +1,189 @@
+"""
+Rebar - 철근 규격, 단위중량 및 철근 집계표
+"""
+
+import re
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from attribute_index import read_attributes
+from clustering import cluster_labels, cluster_summary, cluster_members
+
+
+# 철근 규격별 단위중량 (kg/m)
+REBAR_UNIT_WEIGHTS = {
+    10: 0.560,
+    13: 0.995,
+    16: 1.560,
+    19: 2.250,
+    22: 3.040,
+    25: 3.980,
+    29: 5.040,
+    32: 6.230,
+    35: 7.510,
+    38: 8.950,
+    41: 10.40,
+    51: 15.90,
+}
+
+# REBAR-D13, S-REBAR_D16, HD25 등에서 직경 추출
+REBAR_DIAMETER_PATTERN = re.compile(r'(?:^|[^A-Z])H?D(\d{2})(?!\d)', re.IGNORECASE)
+
+
+def parse_rebar_diameter(text: str) -> Optional[int]:
+    """문자열(레이어 이름 등)에서 철근 직경 추출, 등록된 규격이 아니면 None"""
+    if not text:
+        return None
+    for match in REBAR_DIAMETER_PATTERN.finditer(text):
+        diameter = int(match.group(1))
+        if diameter in REBAR_UNIT_WEIGHTS:
+            return diameter
+    return None
+
+
+def rebar_unit_weight(text: str) -> Optional[float]:
+    """레이어 이름에서 철근 단위중량(kg/m) 조회"""
+    diameter = parse_rebar_diameter(text)
+    if diameter is None:
+        return None
+    return REBAR_UNIT_WEIGHTS[diameter]
+
+
+# ==================== 철근 집계표 ====================
+
+# 블록 속성 태그 (대문자 비교)
+DIAMETER_TAGS = {"DIA", "DIAMETER", "SIZE", "BAR", "직경", "규격"}
+LENGTH_TAGS = {"L", "LEN", "LENGTH", "길이"}
+
+
+def rebar_from_attributes(pairs):
+    """블록 속성 [(태그(대문자), 값)]에서 (직경, 길이), 없으면 None"""
+    diameter = None
+    length = None
+    for tag, value in pairs:
+        if tag in DIAMETER_TAGS and diameter is None:
+            diameter = parse_rebar_diameter(value)
+            if diameter is None and value.isdigit() and int(value) in REBAR_UNIT_WEIGHTS:
+                diameter = int(value)
+        elif tag in LENGTH_TAGS and length is None:
+            match = re.search(r'[\d.]+', value)
+            if match:
+                length = float(match.group())
+    return diameter, length
+
+
+def read_block_rebar(obj):
+    """철근 블록 속성에서 (직경, 길이) 읽기, 없으면 None"""
+    try:
+        return rebar_from_attributes(read_attributes(obj))
+    except Exception as e:
+        print(f"  철근 블록 속성 읽기 오류: {e}")
+    return None, None
+
+
+def snapshot_bars(snapshot, mask=None, read_blocks: bool = True, attributes=None):
+    """스냅샷에서 철근 (직경, 길이, 인덱스) 배열 추출
+
+    - LINE/폴리라인: 레이어 이름에서 직경 추출 (레이어별 한 번만 파싱)
+    - 블록 참조: 속성(DIA, L 등)에서 직경/길이를 읽고, 직경이 없으면 레이어 이름 사용
+    - attributes(AttributeIndex)가 주어지면 COM 대신 색인의 속성 사용
+    """
+    diameter_by_layer = np.array([parse_rebar_diameter(str(name)) or 0
+                                  for name in snapshot.layer_names], dtype=np.int64)
+    diameters = diameter_by_layer[snapshot.layer_codes] if snapshot.count else np.zeros(0, np.int64)
+    lengths = snapshot.length.copy()
+
+    candidates = np.ones(snapshot.count, dtype=bool) if mask is None else mask.copy()
+    segments = candidates & (snapshot.kind_mask("line") | snapshot.kind_mask("polyline"))
+
+    blocks = candidates & snapshot.kind_mask("block")
+    if read_blocks and blocks.any():
+        for i in np.flatnonzero(blocks):
+            if attributes is not None:
+                diameter, length = rebar_from_attributes(attributes.attributes_of(i).items())
+            else:
+                diameter, length = read_block_rebar(snapshot.objects[i])
+            if diameter:
+                diameters[i] = diameter
+            if length:
+                lengths[i] = length
+    else:
+        blocks[:] = False
+
+    bars = (segments | blocks) & (diameters > 0) & (lengths > 0)
+    idx = np.flatnonzero(bars)
+    return diameters[idx], lengths[idx], idx
+
+
+def rebar_schedule(diameters, lengths, tolerance: float = 10.0) -> List[Dict[str, Any]]:
+    """직경별, 절단 길이별(허용오차) 철근 집계
+
+    길이 단위는 mm, 중량은 kg. 반환 항목은 직경 → 길이 오름차순.
+    """
+    diameters = np.asarray(diameters, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=float)
+    if len(lengths) == 0:
+        return []
+
+    labels = cluster_labels(lengths, tolerance, groups=diameters)
+    counts, means, totals = cluster_summary(lengths, labels)
+
+    # 클러스터별 직경 (클러스터 내에서는 모두 같음)
+    cluster_diameter = np.zeros(len(counts), dtype=np.int64)
+    cluster_diameter[labels] = diameters
+    unit_weights = np.array([REBAR_UNIT_WEIGHTS.get(int(d), 0.0) for d in cluster_diameter])
+    weights = totals / 1000.0 * unit_weights
+
+    members = cluster_members(labels, len(counts))
+
+    schedule = []
+    for k in range(len(counts)):
+        schedule.append({
+            'diameter': int(cluster_diameter[k]),
+            'length': float(means[k]),
+            'count': int(counts[k]),
+            'total_length': float(totals[k]),
+            'unit_weight': float(unit_weights[k]),
+            'weight': float(weights[k]),
+            'members': members[k],  # 입력 배열 기준 위치
+        })
+    return schedule
+
+
+def apply_schedule_to_table(table, schedule: List[Dict[str, Any]], objects=None,
+                            category: str = "철근") -> int:
+    """집계표를 계층구조 테이블에 추가 (대분류 철근 / 중분류 직경 / 항목 절단 길이)
+
+    objects(집계 입력과 같은 순서의 COM 객체)가 주어지면 각 행의 선택 객체로 저장한다.
+    """
+    added = 0
+    table.setUpdatesEnabled(False)
+    table.blockSignals(True)
+    try:
+        category_row = table.find_or_add_category(category)
+        for item in schedule:
+            subcategory_row = table.find_or_add_subcategory(category_row, f"D{item['diameter']}")
+            row = table.add_item(subcategory_row)
+            table.set_row_values(row, {
+                2: f"철근 D{item['diameter']}",
+                3: f"D{item['diameter']}",
+                4: str(item['count']),
+                5: "kg",
+                6: f"{item['length']:.0f}",
+                12: "{수량}*{가로}/1000*{철근중량}",
+                16: f"총 길이 {item['total_length'] / 1000:.2f}m",
+            })
+            if objects is not None:
+                table.row_selections[row] = [objects[i] for i in item['members']]
+            added += 1
+    finally:
+        table.blockSignals(False)
+        table.setUpdatesEnabled(True)
+
+    # 신호를 막은 동안 건너뛴 수식 계산
+    table.recalculate_all()
+
+    total_weight = sum(item['weight'] for item in schedule)
+    print(f"✅ 철근 집계표: {added}개 행, 총 중량 {total_weight:.1f}kg")
+    return added
@@ -0,0 +1,121 @@
+"""
+Rectangle Detection - 회전된 사각형 판정
+4점(또는 첫 점으로 닫힌 5점) 폐합 폴리라인을 한 번의 배열 연산으로 사각형 판정하고
+최소 면적 외접 사각형으로 실제 가로/세로를 구함 (회전된 창호/슬래브도 bbox로 부풀지 않음)
+
+판정: 네 변이 허용오차 이상 길고, 이웃한 변이 직각이며, 마주 보는 변의 길이가 같음
+치수: 네 변 방향 각각으로 투영한 외접 사각형 중 면적이 가장 작은 것
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def corner_array(vertices_list: Sequence, closed=None, tolerance: float = 1.0):
+    """사각형 후보의 네 꼭짓점 배열
+
+    반환: (후보 위치 (m,), 꼭짓점 (m, 4, 2))
+    5점은 마지막 점이 첫 점과 허용오차 안에서 같을 때만 후보.
+    """
+    count = len(vertices_list)
+    closed = np.ones(count, dtype=bool) if closed is None else np.asarray(closed, dtype=bool)
+    positions = [k for k, vertices in enumerate(vertices_list)
+                 if closed[k] and vertices is not None and len(vertices) in (4, 5)]
+    if not positions:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 4, 2))
+
+    positions = np.asarray(positions, dtype=np.int64)
+    points = [np.asarray(vertices_list[k], dtype=float)[:, :2] for k in positions]
+    five = np.array([len(p) == 5 for p in points])
+    corners = np.empty((len(points), 4, 2))
+    if (~five).any():
+        corners[~five] = np.stack([p for p, f in zip(points, five) if not f])
+    keep = np.ones(len(points), dtype=bool)
+    if five.any():
+        closing = np.stack([p for p, f in zip(points, five) if f])
+        corners[five] = closing[:, :4]
+        keep[five] = np.all(np.abs(closing[:, 4] - closing[:, 0]) <= tolerance, axis=1)
+    return positions[keep], corners[keep]
+
+
+def rectangle_dimensions(corners, tolerance: float = 1.0, areas=None):
+    """꼭짓점 (m, 4, 2) → (사각형 여부, 가로, 세로, 각도)
+
+    가로는 x축에 가까운(±45° 이내) 변 방향의 길이, 각도는 그 방향 (라디안, -π/4 ~ π/4).
+    areas: 실제 면적(bulge 반영)이 주어지면 가로 x 세로와 다른 객체(호 구간 포함)는 제외.
+    """
+    corners = np.asarray(corners, dtype=float).reshape(-1, 4, 2)
+    m = len(corners)
+    if m == 0:
+        empty = np.zeros(0)
+        return np.zeros(0, dtype=bool), empty, empty.copy(), empty.copy()
+
+    edges = np.roll(corners, -1, axis=1) - corners  # (m, 4, 2): k → k+1
+    lengths = np.hypot(edges[..., 0], edges[..., 1])
+    safe = np.maximum(lengths, 1e-12)
+    units = edges / safe[..., None]
+
+    # 직각: 다음 변 방향으로 투영한 길이가 허용오차 이내
+    next_units = np.roll(units, -1, axis=1)
+    projection = np.abs((edges * next_units).sum(axis=2))
+    right_angles = np.all(projection <= tolerance, axis=1)
+    opposite_equal = (np.abs(lengths[:, 0] - lengths[:, 2]) <= tolerance) & \
+                     (np.abs(lengths[:, 1] - lengths[:, 3]) <= tolerance)
+    is_rect = right_angles & opposite_equal & np.all(lengths > tolerance, axis=1)
+
+    # 최소 면적 외접 사각형: 변 방향 4개 각각으로 네 점을 투영 (m, 방향, 점)
+    normals = np.stack([-units[..., 1], units[..., 0]], axis=-1)
+    along = np.einsum('mdk,mpk->mdp', units, corners)
+    across = np.einsum('mdk,mpk->mdp', normals, corners)
+    extent_along = along.max(axis=2) - along.min(axis=2)
+    extent_across = across.max(axis=2) - across.min(axis=2)
+    best = np.argmin(extent_along * extent_across, axis=1)
+    rows = np.arange(m)
+    side_a = extent_along[rows, best]
+    side_b = extent_across[rows, best]
+    direction = units[rows, best]
+
+    # 가로 = x축에 가까운 방향의 변
+    angle = np.arctan2(direction[:, 1], direction[:, 0])
+    angle = np.mod(angle + np.pi / 4, np.pi / 2) - np.pi / 4
+    steep = np.abs(direction[:, 0]) < np.abs(direction[:, 1])
+    width = np.where(steep, side_b, side_a)
+    height = np.where(steep, side_a, side_b)
+
+    if areas is not None:
+        areas = np.asarray(areas, dtype=float)
+        is_rect &= np.abs(areas - width * height) <= tolerance * (width + height)
+    return is_rect, width, height, angle
+
+
+def polyline_rectangles(vertices_list: Sequence, closed=None, tolerance: float = 1.0, areas=None):
+    """폴리라인 목록에서 사각형 찾기
+
+    반환: (사각형인 폴리라인 위치, 가로, 세로, 각도)
+    areas: 폴리라인별 실제 면적 (목록 전체 기준, 없으면 면적 비교 생략)
+    """
+    positions, corners = corner_array(vertices_list, closed, tolerance)
+    candidate_areas = None if areas is None else np.asarray(areas, dtype=float)[positions]
+    is_rect, width, height, angle = rectangle_dimensions(corners, tolerance, candidate_areas)
+    return positions[is_rect], width[is_rect], height[is_rect], angle[is_rect]
+
+
+def rectangle_of(vertices, tolerance: float = 1.0, area: Optional[float] = None):
+    """폐합 폴리라인 하나가 사각형이면 (가로, 세로), 아니면 None"""
+    positions, width, height, _ = polyline_rectangles(
+        [vertices], None, tolerance, None if area is None else [area])
+    return (float(width[0]), float(height[0])) if len(positions) else None
+
+
+def outline_size(coords, tolerance: float = 1.0):
+    """폐합 폴리라인 Coordinates(x, y 반복) → (가로, 세로)
+
+    사각형이면 실제 변 길이, 아니면 bbox 가로/세로 (스냅샷 '같은 크기' 기준과 동일)
+    """
+    vertices = np.asarray(coords, dtype=float).reshape(-1, 2)
+    rectangle = rectangle_of(vertices, tolerance)
+    if rectangle:
+        return rectangle
+    extent = vertices.max(axis=0) - vertices.min(axis=0)
+    return float(extent[0]), float(extent[1])
@@ -0,0 +1,195 @@
+"""
+Result Model - 선택 도우미 찾기 결과 목록 모델
+찾은 객체를 QTableView에 가상화해서 보여줌 (화면에 보이는 행만 그림)
+
+- 체크 상태는 numpy bool 배열 하나 (행마다 위젯을 만들지 않음)
+- 크기 표시 문자열은 행이 처음 그려질 때 만들고 캐시
+- 스냅샷 객체는 스냅샷 배열에서 표시/정렬 (COM 호출 없음),
+  스냅샷에 없는 객체만 describe 콜백으로 COM 조회
+- 정렬은 표시 순서(order)만 바꾸고 결과 순서/체크 배열은 그대로
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from rectangle_detection import rectangle_of
+from surface_area import SURFACE_KINDS
+
+RESULT_COLUMNS = ["번호", "타입", "레이어", "크기"]
+
+
+def snapshot_summary(snapshot, index: int) -> Tuple[str, str, str, float]:
+    """스냅샷 객체 표시 정보 (타입, 레이어, 크기 문자열, 정렬용 크기)"""
+    kind = snapshot.kind_of(index)
+    size = float(snapshot.size[index])
+    if kind == "polyline" and snapshot.closed[index]:
+        rectangle = rectangle_of(snapshot.vertices[index]) \
+            if snapshot.vertex_count[index] in (4, 5) else None
+        if rectangle:
+            text = f"📐 {rectangle[0]:.1f} x {rectangle[1]:.1f}"
+        else:
+            text = f"면적: {snapshot.area[index]:.1f}"
+    elif kind in ("circle", "arc"):
+        text = f"반지름: {snapshot.radius[index]:.1f}"
+    elif kind in SURFACE_KINDS:
+        text = f"면적: {snapshot.area[index]:.1f}"
+    elif kind == "block":
+        text = f"블록: {snapshot.block_of(index)}"
+        scale = snapshot.block_scale[index, 0]
+        if scale != 1.0:
+            text += f" (스케일: {scale:.2f})"
+    else:
+        text = f"길이: {snapshot.length[index]:.1f}"
+    return snapshot.type_of(index).replace("AcDb", ""), snapshot.layer_of(index), text, size
+
+
+class FoundObjectsModel(QAbstractTableModel):
+    """찾기 결과 (체크 가능한 행, 가상화 목록)"""
+
+    def __init__(self, describe: Optional[Callable] = None, parent=None):
+        super().__init__(parent)
+        # describe(obj) → (타입, 레이어, 크기 문자열, 정렬용 크기) - 스냅샷에 없는 객체용
+        self.describe = describe
+        self.snapshot = None
+        self.objects: List = []
+        self.indices = np.zeros(0, dtype=np.int64)  # 결과 위치 → 스냅샷 인덱스 (-1 = 없음)
+        self.checked = np.zeros(0, dtype=bool)
+        self.order = np.zeros(0, dtype=np.int64)  # 표시 행 → 결과 위치
+        self._summary = {}
+
+    # ==================== 결과 설정 ====================
+
+    def set_results(self, objects, indices=None, snapshot=None):
+        """결과 전체 교체 (모두 체크)"""
+        self.beginResetModel()
+        self.snapshot = snapshot
+        self.objects = list(objects)
+        if indices is None:
+            indices = np.full(len(self.objects), -1)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.checked = np.ones(len(self.objects), dtype=bool)
+        self.order = np.arange(len(self.objects))
+        self._summary = {}
+        self.endResetModel()
+
+    def append_results(self, objects, indices=None):
+        """결과 뒤에 추가 (추가된 행은 체크, 정렬 상태와 관계없이 맨 아래에 표시)"""
+        objects = list(objects)
+        if not objects:
+            return
+        if indices is None:
+            indices = np.full(len(objects), -1)
+        first = len(self.objects)
+        self.beginInsertRows(QModelIndex(), len(self.order), len(self.order) + len(objects) - 1)
+        self.objects.extend(objects)
+        self.indices = np.concatenate([self.indices, np.asarray(indices, dtype=np.int64)])
+        self.checked = np.concatenate([self.checked, np.ones(len(objects), dtype=bool)])
+        self.order = np.concatenate([self.order, np.arange(first, first + len(objects))])
+        self.endInsertRows()
+
+    def summary(self, position: int) -> Tuple[str, str, str, float]:
+        """결과 위치의 표시 정보 (처음 요청될 때 만들어 캐시)"""
+        info = self._summary.get(position)
+        if info is None:
+            index = self.indices[position]
+            try:
+                if index >= 0 and self.snapshot is not None:
+                    info = snapshot_summary(self.snapshot, int(index))
+                elif self.describe is not None:
+                    info = self.describe(self.objects[position])
+                else:
+                    info = ("", "", "", 0.0)
+            except Exception as e:
+                info = ("?", "?", f"읽기 오류: {e}", 0.0)
+            self._summary[position] = info
+        return info
+
+    # ==================== 체크 ====================
+
+    def set_all_checked(self, checked: bool):
+        self.checked[:] = checked
+        self._checks_changed()
+
+    def invert_checked(self):
+        np.logical_not(self.checked, out=self.checked)
+        self._checks_changed()
+
+    def _checks_changed(self):
+        if len(self.order):
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.order) - 1, 0),
+                                  [Qt.CheckStateRole])
+
+    def checked_count(self) -> int:
+        return int(self.checked.sum())
+
+    def checked_objects(self) -> List:
+        """체크된 객체 (결과 순서)"""
+        return [self.objects[i] for i in np.flatnonzero(self.checked)]
+
+    # ==================== Qt 모델 ====================
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(RESULT_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return RESULT_COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        position = int(self.order[index.row()])
+        column = index.column()
+        if role == Qt.CheckStateRole and column == 0:
+            return Qt.Checked if self.checked[position] else Qt.Unchecked
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(position + 1)
+            return self.summary(position)[column - 1]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        self.checked[self.order[index.row()]] = value == Qt.Checked
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def sort(self, column, sort_order=Qt.AscendingOrder):
+        """표시 순서 정렬 (번호/타입/레이어/크기)"""
+        positions = np.arange(len(self.objects))
+        snapshot = self.snapshot
+        if column == 0 or not len(positions):
+            keys = positions
+        elif snapshot is not None and (self.indices >= 0).all():
+            # 모두 스냅샷 객체면 배열로 정렬
+            if column in (1, 2):
+                names, codes = ((snapshot.type_names, snapshot.type_codes) if column == 1 else
+                                (snapshot.layer_names, snapshot.layer_codes))
+                rank = np.empty(len(names), dtype=np.int64)  # 코드 → 이름 순위
+                rank[np.argsort(np.array(names, dtype=object), kind='stable')] = np.arange(len(names))
+                keys = rank[codes[self.indices]]
+            else:
+                keys = snapshot.size[self.indices]
+        else:
+            keys = [self.summary(p)[3] if column == 3 else self.summary(p)[column - 1] for p in positions]
+            keys = np.array(keys, dtype=float if column == 3 else object)
+
+        self.layoutAboutToBeChanged.emit()
+        order = np.argsort(keys, kind='stable')
+        self.order = order[::-1].copy() if sort_order == Qt.DescendingOrder else order
+        self.layoutChanged.emit()
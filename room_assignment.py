@@ -0,0 +1,228 @@
+"""
+Room Assignment - 실(방)/구역별 물량 배정
+폐합 폴리라인(실 경계)에 블록/객체 중심점을 배열 연산 점-다각형 판정으로 배정해
+층 → 실 → 항목 계층으로 집계 (예: 실별 콘센트 개수)
+
+1. 실 경계 bbox를 격자 셀에 등록해 두고 (셀 키 정렬 + 이진 탐색)
+2. 점이 속한 셀의 실만 후보로 골라 bbox 확인
+3. 후보 (점, 실) 쌍과 실의 변을 펼쳐 짝홀 교차 판정을 한 번에 계산
+   (변 수가 많은 경계도 메모리가 넘치지 않도록 묶음 단위로 처리)
+겹친 실 안의 점은 가장 작은 실에 배정. 경계의 bulge(호 구간)는 현으로 취급.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+CHUNK_PAIR_EDGES = 1 << 21  # 한 번에 판정할 (점, 변) 쌍 수
+
+
+class RoomIndex:
+    """실 경계 다각형 색인 - 한 번 만들고 여러 점 묶음에 반복 조회"""
+
+    def __init__(self, polygons: List[np.ndarray], cell_size: Optional[float] = None):
+        polygons = [np.asarray(p, dtype=float)[:, :2] for p in polygons]
+        self.count = len(polygons)
+        counts = np.array([len(p) for p in polygons], dtype=np.int64)
+        self.edge_count = counts
+        self.edge_offset = np.cumsum(counts) - counts
+        points = np.concatenate(polygons) if polygons else np.zeros((0, 2))
+        # 각 다각형의 변: 정점 i → i+1 (마지막은 첫 정점으로)
+        following = np.arange(1, len(points) + 1)
+        following[self.edge_offset + counts - 1] = self.edge_offset
+        self.x1, self.y1 = points[:, 0], points[:, 1]
+        self.x2, self.y2 = points[following, 0], points[following, 1]
+
+        self.bbox = np.array([[p[:, 0].min(), p[:, 1].min(), p[:, 0].max(), p[:, 1].max()]
+                              for p in polygons]).reshape(-1, 4)
+        x, y = points[:, 0], points[:, 1]
+        shoelace = np.bincount(np.repeat(np.arange(self.count), counts),
+                               weights=x * self.y2 - self.x2 * y, minlength=self.count)
+        self.area = np.abs(shoelace) / 2
+
+        # 격자 셀 크기: 실 bbox 긴 변의 중앙값
+        if cell_size is None:
+            sides = np.maximum(self.bbox[:, 2] - self.bbox[:, 0], self.bbox[:, 3] - self.bbox[:, 1])
+            cell_size = float(np.median(sides)) if self.count else 1.0
+        self.cell_size = max(cell_size, 1e-9)
+        self._build_grid()
+
+    def _cells(self, x, y):
+        return (np.floor(np.asarray(x) / self.cell_size).astype(np.int64),
+                np.floor(np.asarray(y) / self.cell_size).astype(np.int64))
+
+    def _key(self, ix, iy):
+        return (ix - self.origin_x) * self.span_y + (iy - self.origin_y)
+
+    def _build_grid(self):
+        """실 bbox가 걸친 셀마다 (셀 키, 실) 등록 후 셀 키 순 정렬"""
+        if self.count == 0:
+            self.origin_x = self.origin_y = 0
+            self.span_y = 1
+            self.cell_keys = np.zeros(0, dtype=np.int64)
+            self.cell_rooms = np.zeros(0, dtype=np.int64)
+            return
+        ix1, iy1 = self._cells(self.bbox[:, 0], self.bbox[:, 1])
+        ix2, iy2 = self._cells(self.bbox[:, 2], self.bbox[:, 3])
+        self.origin_x, self.origin_y = int(ix1.min()), int(iy1.min())
+        self.span_y = int(iy2.max() - self.origin_y) + 1
+        nx, ny = ix2 - ix1 + 1, iy2 - iy1 + 1
+        cells = nx * ny
+        rooms = np.repeat(np.arange(self.count), cells)
+        local = np.arange(cells.sum()) - np.repeat(np.cumsum(cells) - cells, cells)
+        ix = np.repeat(ix1, cells) + local // np.repeat(ny, cells)
+        iy = np.repeat(iy1, cells) + local % np.repeat(ny, cells)
+        keys = self._key(ix, iy)
+        order = np.argsort(keys, kind='stable')
+        self.cell_keys = keys[order]
+        self.cell_rooms = rooms[order]
+
+    def candidates(self, points):
+        """점별 후보 실 (점 위치, 실) 쌍 - 같은 셀에 등록되고 bbox 안에 있는 실"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        ix, iy = self._cells(points[:, 0], points[:, 1])
+        keys = self._key(ix, iy)
+        outside = (ix < self.origin_x) | (iy < self.origin_y) | (iy - self.origin_y >= self.span_y)
+        lo = np.searchsorted(self.cell_keys, keys, side='left')
+        hi = np.searchsorted(self.cell_keys, keys, side='right')
+        hi[outside] = lo[outside]
+        counts = hi - lo
+        point_idx = np.repeat(np.arange(len(points)), counts)
+        slot = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - lo, counts)
+        room_idx = self.cell_rooms[slot]
+
+        px, py = points[point_idx, 0], points[point_idx, 1]
+        box = self.bbox[room_idx]
+        inside = (px >= box[:, 0]) & (px <= box[:, 2]) & (py >= box[:, 1]) & (py <= box[:, 3])
+        return point_idx[inside], room_idx[inside]
+
+    def contains(self, points, point_idx, room_idx) -> np.ndarray:
+        """(점, 실) 쌍별 포함 여부 - 쌍 x 변을 펼쳐 짝홀 교차 판정"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        result = np.zeros(len(point_idx), dtype=bool)
+        edges = self.edge_count[room_idx]
+        cumulative = np.cumsum(edges)
+        start = 0
+        while start < len(edges):
+            # 누적 (쌍 x 변) 수가 CHUNK_PAIR_EDGES를 넘지 않는 묶음 (쌍 하나는 항상 포함)
+            limit = cumulative[start] - edges[start] + CHUNK_PAIR_EDGES
+            end = max(int(np.searchsorted(cumulative, limit, side='right')), start + 1)
+            pairs = slice(start, end)
+            counts = edges[pairs]
+            pair = np.repeat(np.arange(end - start), counts)
+            edge = np.repeat(self.edge_offset[room_idx[pairs]], counts) + \
+                np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            px = points[point_idx[pairs], 0][pair]
+            py = points[point_idx[pairs], 1][pair]
+            x1, y1, x2, y2 = self.x1[edge], self.y1[edge], self.x2[edge], self.y2[edge]
+            straddle = (y1 > py) != (y2 > py)
+            dy = np.where(y2 == y1, 1.0, y2 - y1)
+            crossing = straddle & (px < x1 + (py - y1) * (x2 - x1) / dy)
+            result[pairs] = np.bincount(pair, weights=crossing, minlength=end - start) % 2 == 1
+            start = end
+        return result
+
+    def assign(self, points) -> np.ndarray:
+        """점별 실 번호 (실 밖이면 -1, 겹친 실 안이면 가장 작은 실)"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        assigned = np.full(len(points), -1, dtype=np.int64)
+        if self.count == 0 or len(points) == 0:
+            return assigned
+        point_idx, room_idx = self.candidates(points)
+        if len(point_idx) == 0:
+            return assigned
+        inside = self.contains(points, point_idx, room_idx)
+        point_idx, room_idx = point_idx[inside], room_idx[inside]
+        # 면적 큰 순으로 쓰면 마지막(가장 작은 실)이 남음
+        order = np.argsort(-self.area[room_idx], kind='stable')
+        assigned[point_idx[order]] = room_idx[order]
+        return assigned
+
+
+def room_polygons(snapshot, mask: np.ndarray):
+    """스냅샷에서 실 경계 후보 (3점 이상 폐합 폴리라인) → (스냅샷 인덱스, 다각형 목록)"""
+    candidates = mask & snapshot.kind_mask("polyline") & snapshot.closed & (snapshot.vertex_count >= 3)
+    indices = np.flatnonzero(candidates)
+    return indices, [snapshot.vertices[i] for i in indices]
+
+
+def item_keys(snapshot, indices, group_by: str = "block") -> np.ndarray:
+    """항목 이름 - 블록은 블록 이름, 그 밖의 객체는 group_by에 따라 레이어 또는 종류"""
+    if len(indices) == 0:
+        return np.array([], dtype=str)
+    block_names = snapshot.block_names[snapshot.block_codes[indices]]
+    layers = snapshot.layer_names[snapshot.layer_codes[indices]]
+    kinds = snapshot.kind_names[snapshot.kind_codes[indices]]
+    other = layers if group_by == "layer" else kinds
+    return np.where(snapshot.kind_mask("block")[indices], block_names, other)
+
+
+def room_schedule(snapshot, room_mask: np.ndarray, item_mask: np.ndarray,
+                  floor_mask: Optional[np.ndarray] = None,
+                  group_by: str = "block") -> List[Dict[str, Any]]:
+    """층 → 실 → 항목 집계
+
+    room_mask: 실 경계 폴리라인 조건, item_mask: 배정할 객체 조건
+    floor_mask: 층 외곽 폴리라인 조건 (없으면 한 층). 실은 중심점이 들어 있는 층에 속함.
+    반환: [{'floor', 'room', 'room_index', 'room_area', 'item', 'count',
+            'length', 'area', 'members'}] (층, 실, 항목 순)
+    """
+    room_idx, polygons = room_polygons(snapshot, room_mask)
+    rooms = RoomIndex(polygons)
+    items = np.flatnonzero(item_mask & ~np.isin(np.arange(snapshot.count), room_idx) &
+                           ~np.isnan(snapshot.cx))
+    points = np.stack([snapshot.cx[items], snapshot.cy[items]], axis=1)
+    assigned = rooms.assign(points)
+
+    # 실 → 층 (실 bbox 중심을 층 외곽에 배정)
+    room_floor = np.zeros(rooms.count, dtype=np.int64)
+    floor_names = ["전체"]
+    if floor_mask is not None and floor_mask.any():
+        floor_idx, floor_polygons = room_polygons(snapshot, floor_mask & ~room_mask)
+        if len(floor_idx):
+            floors = RoomIndex(floor_polygons)
+            # 층 외곽은 위에서 아래, 왼쪽에서 오른쪽 순으로 번호
+            order = np.lexsort((floors.bbox[:, 0], -floors.bbox[:, 3]))
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            centers = np.stack([(rooms.bbox[:, 0] + rooms.bbox[:, 2]) / 2,
+                                (rooms.bbox[:, 1] + rooms.bbox[:, 3]) / 2], axis=1)
+            floor_of_room = floors.assign(centers)
+            room_floor = np.where(floor_of_room >= 0, rank[floor_of_room] + 1, 0)
+            floor_names = ["층 외"] + [f"{k + 1}층" for k in range(len(order))]
+
+    # 실 이름: 층 안에서 위 → 아래, 왼쪽 → 오른쪽 순 번호
+    room_order = np.lexsort((rooms.bbox[:, 0], -rooms.bbox[:, 3], room_floor))
+    room_number = np.empty(rooms.count, dtype=np.int64)
+    for floor in np.unique(room_floor):
+        in_floor = room_order[room_floor[room_order] == floor]
+        room_number[in_floor] = np.arange(1, len(in_floor) + 1)
+
+    keys = item_keys(snapshot, items, group_by)
+    groups = defaultdict(list)
+    for position in np.flatnonzero(assigned >= 0):
+        groups[(int(assigned[position]), str(keys[position]))].append(items[position])
+
+    schedule = []
+    for (room, item), members in groups.items():
+        members = np.array(members, dtype=np.int64)
+        schedule.append({
+            'floor': floor_names[room_floor[room]],
+            'floor_order': int(room_floor[room]),
+            'room': f"실 {room_number[room]}",
+            'room_order': int(room_number[room]),
+            'room_index': int(room_idx[room]),
+            'room_area': float(rooms.area[room]),
+            'item': item,
+            'count': len(members),
+            'length': float(snapshot.length[members].sum()),
+            'area': float(snapshot.area[members].sum()),
+            'members': members,
+        })
+    schedule.sort(key=lambda x: (x['floor_order'], x['room_order'], x['item']))
+    assigned_count = int((assigned >= 0).sum())
+    print(f"🏠 실 배정: 실 {rooms.count}개, 객체 {len(items)}개 중 {assigned_count}개 배정 "
+          f"→ {len(schedule)}개 항목")
+    return schedule
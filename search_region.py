@@ -0,0 +1,223 @@
+"""
+Search Region - 선택 도우미 검색 영역 (사각/다각형/울타리/기존 폴리라인)
+AutoCAD의 Window/Crossing, WPolygon/CPolygon, Fence 선택과 같은 기준으로
+스냅샷 객체를 한 번에 판정
+
+- 완전 포함(inside): 객체의 꼭짓점이 모두 영역 안에 있고 경계와 교차하지 않음
+- 걸침 포함(crossing): 꼭짓점 하나라도 안에 있거나 경계와 교차
+- 울타리(fence): 열린 선과 교차하는 객체 (항상 걸침 기준)
+- 원/호는 중심과 반지름으로 판정 (완전 포함은 기존처럼 중심 기준, 호는 원으로 간주)
+- 꼭짓점이 없는 객체(블록, 문자, 해치 등)는 외곽 사각형으로 판정
+
+후보는 스냅샷 bbox 배열(완전 포함은 중심점 공간 색인)로 먼저 줄이고,
+후보 객체의 꼭짓점/선분을 모아 점-다각형, 선분-선분 교차를 배열 연산으로 처리
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from cad_snapshot import entity_kind, polyline_vertices, read_entity
+from surface_area import points_in_polygon
+
+REGION_SHAPES = {
+    "window": "사각 영역 (두 점)",
+    "polygon": "다각형 (여러 점)",
+    "fence": "울타리 (선)",
+    "boundary": "기존 폐합 폴리라인",
+}
+
+REGION_MODES = {
+    "inside": "완전 포함",
+    "crossing": "걸침 포함",
+}
+
+# 선분 x 경계 변 배열 한 번에 만드는 최대 크기
+CHUNK_PAIRS = 1 << 21
+
+
+def _segments_cross(segments: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """선분마다 경계 변 중 하나와 교차하는지 (끝점 접촉 포함)"""
+    result = np.zeros(len(segments), dtype=bool)
+    if not len(segments) or not len(edges):
+        return result
+    ex1, ey1, ex2, ey2 = edges.T
+    edx, edy = ex2 - ex1, ey2 - ey1
+    step = max(1, CHUNK_PAIRS // len(edges))
+    for start in range(0, len(segments), step):
+        chunk = segments[start:start + step]
+        ax, ay, bx, by = (chunk[:, k, None] for k in range(4))
+        # 변 기준 선분 양 끝의 방향, 선분 기준 변 양 끝의 방향
+        d1 = edx * (ay - ey1) - edy * (ax - ex1)
+        d2 = edx * (by - ey1) - edy * (bx - ex1)
+        sdx, sdy = bx - ax, by - ay
+        d3 = sdx * (ey1 - ay) - sdy * (ex1 - ax)
+        d4 = sdx * (ey2 - ay) - sdy * (ex2 - ax)
+        # 같은 직선 위에서 떨어져 있는 경우를 거르기 위한 외곽 사각형 겹침
+        overlap = ((np.minimum(ax, bx) <= np.maximum(ex1, ex2)) &
+                   (np.maximum(ax, bx) >= np.minimum(ex1, ex2)) &
+                   (np.minimum(ay, by) <= np.maximum(ey1, ey2)) &
+                   (np.maximum(ay, by) >= np.minimum(ey1, ey2)))
+        hit = (d1 * d2 <= 0) & (d3 * d4 <= 0) & overlap
+        result[start:start + step] = hit.any(axis=1)
+    return result
+
+
+def _distance_to_edges(points: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """점마다 가장 가까운 경계 변까지의 거리"""
+    result = np.full(len(points), np.inf)
+    if not len(points) or not len(edges):
+        return result
+    ex1, ey1, ex2, ey2 = edges.T
+    edx, edy = ex2 - ex1, ey2 - ey1
+    length2 = np.where(edx * edx + edy * edy > 0, edx * edx + edy * edy, 1.0)
+    step = max(1, CHUNK_PAIRS // len(edges))
+    for start in range(0, len(points), step):
+        px, py = points[start:start + step, 0, None], points[start:start + step, 1, None]
+        t = np.clip(((px - ex1) * edx + (py - ey1) * edy) / length2, 0.0, 1.0)
+        result[start:start + step] = np.hypot(px - (ex1 + t * edx), py - (ey1 + t * edy)).min(axis=1)
+    return result
+
+
+class SearchRegion:
+    """검색 영역 (경계 좌표 + 판정 기준)"""
+
+    def __init__(self, shape: str, points, mode: str = "inside"):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if shape == "window":
+            (x1, y1), (x2, y2) = points.min(axis=0), points.max(axis=0)
+            points = np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
+        elif shape != "fence" and len(points) > 1 and np.allclose(points[0], points[-1]):
+            points = points[:-1]  # 닫는 점 중복 제거
+
+        if shape == "fence" and len(points) < 2:
+            raise ValueError("울타리는 점이 2개 이상 필요합니다")
+        if shape != "fence" and len(points) < 3:
+            raise ValueError("영역은 점이 3개 이상 필요합니다")
+
+        self.shape = shape
+        self.mode = "crossing" if shape == "fence" else mode
+        self.points = points
+        self.closed = shape != "fence"
+        ends = np.roll(points, -1, axis=0) if self.closed else points[1:]
+        self.edges = np.hstack([points[:len(ends)], ends])
+        self.bounds = (*points.min(axis=0), *points.max(axis=0))
+
+    @classmethod
+    def from_polyline(cls, obj, mode: str = "inside") -> "SearchRegion":
+        """기존 폐합 폴리라인을 경계로 (호 구간은 꼭짓점 연결로 근사)"""
+        obj_type = str(obj.ObjectName)
+        if entity_kind(obj_type) != "polyline":
+            raise ValueError(f"폴리라인이 아닙니다: {obj_type}")
+        return cls("boundary", polyline_vertices(obj, obj_type), mode)
+
+    def describe(self) -> str:
+        """영역 정보 표시용 문자열"""
+        x1, y1, x2, y2 = self.bounds
+        return (f"{REGION_SHAPES[self.shape]}, {REGION_MODES[self.mode]}, 점 {len(self.points)}개\n"
+                f"X: {x1:.1f} ~ {x2:.1f}\nY: {y1:.1f} ~ {y2:.1f}")
+
+    def preview_points(self) -> List[float]:
+        """미리보기 폴리라인 좌표 (x, y, z 나열, 닫힌 영역은 첫 점으로 돌아옴)"""
+        points = np.vstack([self.points, self.points[:1]]) if self.closed else self.points
+        return [float(v) for x, y in points for v in (x, y, 0.0)]
+
+    # ==================== 판정 ====================
+
+    def evaluate(self, kinds: List[str], vertices: List[Optional[np.ndarray]], bbox: np.ndarray,
+                 closed: np.ndarray, radius: np.ndarray) -> np.ndarray:
+        """객체 목록 판정 (종류, 꼭짓점, bbox, 폐합, 반지름 배열) → 포함 여부"""
+        count = len(kinds)
+        result = np.zeros(count, dtype=bool)
+        bbox = np.asarray(bbox, dtype=float).reshape(-1, 4)
+        closed = np.asarray(closed, dtype=bool).copy()
+        circle = np.array([k in ("circle", "arc") for k in kinds], dtype=bool)
+
+        # 꼭짓점이 없으면 외곽 사각형을 닫힌 꼭짓점으로
+        outlines = []
+        for j in range(count):
+            points = vertices[j]
+            if circle[j] or (np.isnan(bbox[j]).any() and (points is None or not len(points))):
+                points = np.zeros((0, 2))
+            elif points is None or not len(points):
+                x1, y1, x2, y2 = bbox[j]
+                points = np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
+                closed[j] = True
+            outlines.append(np.asarray(points, dtype=float)[:, :2])
+
+        lengths = np.fromiter((len(v) for v in outlines), dtype=np.int64, count=count)
+        has_points = lengths > 0
+        if has_points.any():
+            flat = np.concatenate([v for v in outlines if len(v)])
+            owner = np.repeat(np.arange(count), lengths)
+            starts = np.cumsum(lengths) - lengths
+            # 다음 꼭짓점: 객체의 마지막 점은 폐합이면 첫 점, 아니면 선분 없음
+            following = np.arange(len(flat)) + 1
+            last = (starts + lengths - 1)[has_points]
+            following[last] = starts[has_points]
+            valid = np.ones(len(flat), dtype=bool)
+            valid[last] = closed[has_points] & (lengths[has_points] > 1)
+            segments = np.hstack([flat[valid], flat[following[valid]]])
+            crossed = np.bincount(owner[valid], weights=_segments_cross(segments, self.edges),
+                                  minlength=count) > 0
+
+            if self.closed:
+                inside = points_in_polygon(flat, self.points)
+                inside_count = np.bincount(owner, weights=inside, minlength=count)
+                if self.mode == "inside":
+                    result |= has_points & (inside_count == lengths) & ~crossed
+                else:
+                    result |= has_points & ((inside_count > 0) | crossed)
+            else:
+                result |= has_points & crossed
+
+        circles = np.flatnonzero(circle & ~np.isnan(bbox).any(axis=1))
+        if len(circles):
+            centers = np.stack([(bbox[circles, 0] + bbox[circles, 2]) / 2,
+                                (bbox[circles, 1] + bbox[circles, 3]) / 2], axis=1)
+            distance = _distance_to_edges(centers, self.edges)
+            if self.closed:
+                center_in = points_in_polygon(centers, self.points)
+                hit = center_in if self.mode == "inside" else center_in | (distance <= radius[circles])
+            else:
+                hit = distance <= radius[circles]
+            result[circles] = hit
+        return result
+
+    def candidates(self, snapshot, spatial=None) -> np.ndarray:
+        """bbox로 먼저 거른 후보 스냅샷 인덱스"""
+        x1, y1, x2, y2 = self.bounds
+        if self.mode == "inside" and spatial is not None:
+            # 완전 포함이면 중심점도 영역 외곽 사각형 안 → 공간 색인 반경 조회
+            center = ((x1 + x2) / 2, (y1 + y2) / 2)
+            near = spatial.radius(center, float(np.hypot(x2 - x1, y2 - y1)) / 2)
+            bbox = snapshot.bbox[near]
+            with np.errstate(invalid='ignore'):
+                keep = ((bbox[:, 0] >= x1) & (bbox[:, 2] <= x2) &
+                        (bbox[:, 1] >= y1) & (bbox[:, 3] <= y2))
+            circles = snapshot.kind_mask("circle")[near] | snapshot.kind_mask("arc")[near]
+            return np.sort(near[keep | circles])
+        if not self.closed:
+            # 울타리는 선분별 외곽 사각형과 겹치는 객체만
+            mask = np.zeros(snapshot.count, dtype=bool)
+            for ex1, ey1, ex2, ey2 in self.edges:
+                mask |= snapshot.region_mask(ex1, ey1, ex2, ey2, inside=False)
+            return np.flatnonzero(mask)
+        return np.flatnonzero(snapshot.region_mask(x1, y1, x2, y2, inside=False))
+
+    def mask(self, snapshot, spatial=None) -> np.ndarray:
+        """스냅샷 크기의 영역 판정 마스크"""
+        result = np.zeros(snapshot.count, dtype=bool)
+        candidates = self.candidates(snapshot, spatial)
+        kinds = [snapshot.kind_names[code] for code in snapshot.kind_codes[candidates]]
+        result[candidates] = self.evaluate(kinds, [snapshot.vertices[i] for i in candidates],
+                                           snapshot.bbox[candidates], snapshot.closed[candidates],
+                                           snapshot.radius[candidates])
+        return result
+
+    def contains_object(self, obj) -> bool:
+        """COM 객체 하나 판정 (스냅샷에 없는 객체용)"""
+        record = read_entity(obj)
+        bbox = np.array(record['bbox'] if record['bbox'] is not None else [np.nan] * 4, dtype=float)
+        return bool(self.evaluate([record['kind']], [record['vertices']], bbox,
+                                  [record['closed']], np.array([record['radius']]))[0])
@@ -0,0 +1,132 @@
+"""
+Selection Index - 선택 객체 → 테이블 행 역색인
+row_selections({행: [COM 객체]})를 대체하는 딕셔너리로,
+값이 바뀔 때마다 Handle → 행 색인을 함께 갱신해
+'이 객체를 어느 행에서 산출했나', '두 번 이상 산출됐나'를 객체당 O(1)로 조회
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+
+class RowSelections(dict):
+    """Handle 역색인을 유지하는 row_selections
+
+    행 번호는 삽입/삭제로 바뀌므로 선택 목록마다 고정 토큰을 두고
+    Handle → 토큰, 토큰 → 행 두 단계로 색인한다. 행 이동(shift_rows)은 행 수에만 비례.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._next_token = 0
+        self._row_token: Dict[int, int] = {}
+        self._token_row: Dict[int, int] = {}
+        self._token_handles: Dict[int, List[str]] = {}
+        self.handle_tokens = defaultdict(list)  # Handle → [토큰] (같은 행 중복 포함)
+        self.duplicates = set()  # 두 번 이상 산출된 Handle
+        self._handle_cache = {}  # id(obj) → (obj, Handle)
+        self.objects_by_handle = {}  # Handle → COM 객체
+
+    # ---------- Handle 조회 ----------
+
+    def remember_handles(self, objects, handles):
+        """이미 알고 있는 Handle 등록 (스냅샷 등, COM 호출 없이 색인)"""
+        for obj, handle in zip(objects, handles):
+            handle = str(handle)
+            self._handle_cache[id(obj)] = (obj, handle)
+            self.objects_by_handle.setdefault(handle, obj)
+
+    def handle_of(self, obj) -> Optional[str]:
+        cached = self._handle_cache.get(id(obj))
+        if cached is not None and cached[0] is obj:
+            return cached[1]
+        try:
+            handle = str(obj.Handle)
+        except Exception:
+            return None
+        self._handle_cache[id(obj)] = (obj, handle)
+        self.objects_by_handle.setdefault(handle, obj)
+        return handle
+
+    # ---------- dict 갱신 ----------
+
+    def __setitem__(self, row, objects):
+        if row in self:
+            self._unindex(row)
+        super().__setitem__(row, objects)
+
+        token = self._next_token
+        self._next_token += 1
+        handles = [h for h in (self.handle_of(obj) for obj in objects) if h is not None]
+        self._row_token[row] = token
+        self._token_row[token] = row
+        self._token_handles[token] = handles
+        for handle in handles:
+            tokens = self.handle_tokens[handle]
+            tokens.append(token)
+            if len(tokens) == 2:
+                self.duplicates.add(handle)
+
+    def __delitem__(self, row):
+        self._unindex(row)
+        super().__delitem__(row)
+
+    def pop(self, row, *default):
+        if row in self:
+            self._unindex(row)
+        return super().pop(row, *default)
+
+    def clear(self):
+        super().clear()
+        self._row_token.clear()
+        self._token_row.clear()
+        self._token_handles.clear()
+        self.handle_tokens.clear()
+        self.duplicates.clear()
+
+    def update(self, *args, **kwargs):
+        for row, objects in dict(*args, **kwargs).items():
+            self[row] = objects
+
+    def setdefault(self, row, default=None):
+        if row not in self:
+            self[row] = default if default is not None else []
+        return self[row]
+
+    def _unindex(self, row):
+        token = self._row_token.pop(row)
+        del self._token_row[token]
+        for handle in self._token_handles.pop(token):
+            tokens = self.handle_tokens[handle]
+            tokens.remove(token)
+            if len(tokens) < 2:
+                self.duplicates.discard(handle)
+            if not tokens:
+                del self.handle_tokens[handle]
+
+    def shift_rows(self, start: int, delta: int):
+        """start 이후 행 번호를 delta만큼 이동 (행 삽입 +1, 삭제 -1)"""
+        items = list(self.items())
+        super().clear()
+        row_token = {}
+        for row, objects in items:
+            new_row = row + delta if row >= start else row
+            super().__setitem__(new_row, objects)
+            token = self._row_token[row]
+            row_token[new_row] = token
+            self._token_row[token] = new_row
+        self._row_token = row_token
+
+    # ---------- 조회 ----------
+
+    def rows_for(self, handle) -> List[int]:
+        """Handle을 산출한 행 번호 목록 (같은 행에 두 번 들어 있으면 두 번)"""
+        return sorted(self._token_row[t] for t in self.handle_tokens.get(str(handle), ()))
+
+    def rows_for_object(self, obj) -> List[int]:
+        handle = self.handle_of(obj)
+        return self.rows_for(handle) if handle is not None else []
+
+    def double_counts(self) -> Dict[str, List[int]]:
+        """두 번 이상 산출된 Handle → 행 번호 목록"""
+        return {handle: self.rows_for(handle) for handle in self.duplicates}
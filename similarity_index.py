@@ -0,0 +1,92 @@
+"""
+Similarity Index - 유사 객체 검색 색인
+(타입, 레이어, 색상, 블록 이름) 버킷별로 크기를 정렬해 두고
+'같은 크기 (±10%)' 조회를 이진 탐색 두 번으로 처리
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from cad_snapshot import EntitySnapshot
+
+
+# 버킷 키 컬럼 순서
+KEY_TYPE, KEY_LAYER, KEY_COLOR, KEY_BLOCK = range(4)
+
+
+class SimilarityIndex:
+    """스냅샷 기반 유사 객체 색인"""
+
+    def __init__(self, snapshot: EntitySnapshot):
+        self.snapshot = snapshot
+        keys = np.stack([snapshot.type_codes, snapshot.layer_codes,
+                         snapshot.colors, snapshot.block_codes], axis=1) \
+            if snapshot.count else np.zeros((0, 4), dtype=np.int64)
+
+        # 키 → 크기 순으로 정렬 (크기를 모르는 객체(NaN)는 버킷 끝으로)
+        self.order = np.lexsort((snapshot.size, keys[:, 3], keys[:, 2], keys[:, 1], keys[:, 0]))
+        sorted_keys = keys[self.order]
+        self.sorted_size = snapshot.size[self.order]
+
+        if len(sorted_keys):
+            changes = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+            self.bucket_start = np.concatenate(([0], np.flatnonzero(changes) + 1))
+        else:
+            self.bucket_start = np.zeros(0, dtype=np.int64)
+        self.bucket_end = np.append(self.bucket_start[1:], len(sorted_keys)).astype(np.int64)
+        self.bucket_keys = sorted_keys[self.bucket_start]
+        # 블록 참조 ObjectName 코드 (same_block 조회용)
+        self.block_type_codes = np.unique(snapshot.type_codes[snapshot.kind_mask("block")])
+
+        print(f"🗂️ 유사 객체 색인: {snapshot.count}개 객체, {len(self.bucket_start)}개 버킷")
+
+    def query(self, base_index: int, same_type: bool = True, same_layer: bool = True,
+              same_color: bool = False, same_block: bool = False,
+              size_tolerance: Optional[float] = None) -> np.ndarray:
+        """기준 객체와 유사한 객체의 스냅샷 인덱스 (기준 객체 포함)
+
+        - same_color: 기준 객체의 색상을 모르면 무시
+        - same_block: 블록이 아닌 객체는 제외
+        - size_tolerance: 0.1이면 ±10%, 기준 크기를 모르면 무시하고 크기를 모르는 객체는 제외
+        """
+        snapshot = self.snapshot
+        base_key = np.array([snapshot.type_codes[base_index], snapshot.layer_codes[base_index],
+                             snapshot.colors[base_index], snapshot.block_codes[base_index]])
+
+        # 조건에 맞는 버킷 선택 (버킷 수만큼의 배열 비교)
+        buckets = np.ones(len(self.bucket_start), dtype=bool)
+        if same_type:
+            buckets &= self.bucket_keys[:, KEY_TYPE] == base_key[KEY_TYPE]
+        if same_layer:
+            buckets &= self.bucket_keys[:, KEY_LAYER] == base_key[KEY_LAYER]
+        if same_color and base_key[KEY_COLOR] >= 0:
+            buckets &= self.bucket_keys[:, KEY_COLOR] == base_key[KEY_COLOR]
+        if same_block:
+            buckets &= np.isin(self.bucket_keys[:, KEY_TYPE], self.block_type_codes)
+            buckets &= self.bucket_keys[:, KEY_BLOCK] == base_key[KEY_BLOCK]
+
+        base_size = snapshot.size[base_index]
+        use_size = size_tolerance is not None and not np.isnan(base_size) and base_size != 0
+        if use_size:
+            lo = base_size - abs(base_size) * size_tolerance
+            hi = base_size + abs(base_size) * size_tolerance
+
+        parts = []
+        for b in np.flatnonzero(buckets):
+            start, end = self.bucket_start[b], self.bucket_end[b]
+            if use_size:
+                sizes = self.sorted_size[start:end]
+                first = start + np.searchsorted(sizes, lo, side='left')
+                last = start + np.searchsorted(sizes, hi, side='right')
+                if first < last:
+                    parts.append(self.order[first:last])
+            else:
+                parts.append(self.order[start:end])
+
+        if not parts:
+            return np.array([base_index], dtype=np.int64)
+        found = np.concatenate(parts)
+        if base_index not in found:
+            found = np.append(found, base_index)
+        return found
@@ -12,6 +12,23 @@ from enum import Enum
 import win32com.client
 import pythoncom
 import time
+import numpy as np
+
+from rebar import rebar_unit_weight
+from cad_highlight import push_selection, clear_selection
+from selection_index import RowSelections
+from cad_snapshot import EntitySnapshot, entity_kind
+from overlap_detection import snapshot_overlaps
+from extraction_modes import EXTRACTION_MODES, DEFAULT_EXTRACTION_MODE, ExtractionCache, extraction_values
+from circle_schedule import CIRCLE_KINDS, diameter_groups, diameter_label
+
+
+# 추출 결과 항목 → 컬럼
+EXTRACTION_COLUMNS = {'count': 4, 'length': 6, 'width': 6, 'height': 7,
+                      'area': 8, 'perimeter': 9, 'layer': 15}
+# 추출 결과로 채운 치수 셀 표시 (추출모드 변경 시 이 셀만 다시 씀)
+EXTRACTED_ROLE = Qt.UserRole + 1
+EXTRACTED_COLUMNS = (6, 7, 8, 9)
 
 
 class RowType(Enum):
@@ -35,6 +52,9 @@ class SimpleHierarchicalTable(QTableWidget):
         # 행 타입 추적
         self.row_types = {}  # {row_index: RowType}
         self.row_levels = {}  # {row_index: level_string} e.g., "1", "1-1", "1-1-1"
+        self.row_selections = RowSelections()  # {row_index: [COM 객체]} + Handle → 행 역색인
+        self.check_overlaps = True  # 선택 시 중복/겹침 선분 검사
+        self.extraction = ExtractionCache()  # Handle별 형상 + (Handle, 추출모드)별 결과 캐시
         
     def setup_table(self):
         """테이블 설정"""
@@ -128,56 +148,101 @@ class SimpleHierarchicalTable(QTableWidget):
                 
             menu.addSeparator()
             
+            # 선택 객체 AutoCAD 표시
+            if self.row_selections.get(current_row):
+                highlight = menu.addAction("💡 CAD에서 강조")
+                highlight.triggered.connect(lambda: self.highlight_row(current_row))
+                clear_highlight = menu.addAction("↩️ CAD 강조 해제")
+                clear_highlight.triggered.connect(self.clear_highlight)
+                menu.addSeparator()
+            
             # 행 삭제
             delete_row = menu.addAction("🗑️ 행 삭제")
             delete_row.triggered.connect(lambda: self.delete_row(current_row))
             
         menu.addSeparator()
         
+        # 중복/겹침 검사 옵션
+        overlap_action = menu.addAction("🧹 선택 시 중복/겹침 검사")
+        overlap_action.setCheckable(True)
+        overlap_action.setChecked(self.check_overlaps)
+        overlap_action.toggled.connect(lambda checked: setattr(self, 'check_overlaps', checked))
+        
         # 일반 행 추가
         add_row = menu.addAction("➕ 행 추가")
         add_row.triggered.connect(self.add_row)
         
         menu.exec_(self.mapToGlobal(position))
         
+    def insert_table_row(self, row):
+        """행 삽입 - 행 번호 기반 딕셔너리(row_types 등)도 함께 밀어줌"""
+        self.insert_table_rows(row, 1)
+        
+    def insert_table_rows(self, row, count):
+        """행 여러 개를 한 번에 삽입 - 행 번호 기반 딕셔너리는 한 번만 밀어줌"""
+        if count == 1:
+            self.insertRow(row)
+        else:
+            self.model().insertRows(row, count)
+        for row_map in (self.row_types, self.row_levels):
+            shifted = {(r + count if r >= row else r): v for r, v in row_map.items()}
+            row_map.clear()
+            row_map.update(shifted)
+        self.row_selections.shift_rows(row, count)
+        
+    def remove_table_row(self, row):
+        """행 삭제 - 행 번호 기반 딕셔너리도 함께 당겨줌"""
+        self.removeRow(row)
+        for row_map in (self.row_types, self.row_levels):
+            shifted = {(r - 1 if r > row else r): v for r, v in row_map.items() if r != row}
+            row_map.clear()
+            row_map.update(shifted)
+        self.row_selections.pop(row, None)
+        self.row_selections.shift_rows(row + 1, -1)
+            
     def add_category(self):
         """대분류 추가"""
         text, ok = QInputDialog.getText(self, "대분류 추가", "대분류 이름:")
         if ok and text:
-            row = self.rowCount()
-            self.insertRow(row)
+            self.insert_category(text)
             
-            # 대분류 번호 생성 (1, 2, 3...)
-            category_count = sum(1 for t in self.row_types.values() if t == RowType.CATEGORY)
-            level_num = str(category_count + 1)
-            
-            # 번호 설정
-            num_item = QTableWidgetItem(level_num)
-            num_item.setFlags(num_item.flags() & ~Qt.ItemIsEditable)
-            self.setItem(row, 0, num_item)
-            
-            # 구분 설정
-            type_item = QTableWidgetItem("대분류")
-            type_item.setBackground(QColor(200, 200, 255))
-            type_item.setFlags(type_item.flags() & ~Qt.ItemIsEditable)
-            self.setItem(row, 1, type_item)
-            
-            # 품명 설정 - 편집 불가능하게 설정
-            name_item = QTableWidgetItem(text)
-            name_item.setFont(QFont("", 10, QFont.Bold))
-            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)  # 편집 불가
-            self.setItem(row, 2, name_item)
+    def insert_category(self, text):
+        """대분류 행 생성 (입력창 없이), 생성된 행 번호 반환"""
+        row = self.rowCount()
+        self.insertRow(row)
+        
+        # 대분류 번호 생성 (1, 2, 3...)
+        category_count = sum(1 for t in self.row_types.values() if t == RowType.CATEGORY)
+        level_num = str(category_count + 1)
+        
+        # 번호 설정
+        num_item = QTableWidgetItem(level_num)
+        num_item.setFlags(num_item.flags() & ~Qt.ItemIsEditable)
+        self.setItem(row, 0, num_item)
+        
+        # 구분 설정
+        type_item = QTableWidgetItem("대분류")
+        type_item.setBackground(QColor(200, 200, 255))
+        type_item.setFlags(type_item.flags() & ~Qt.ItemIsEditable)
+        self.setItem(row, 1, type_item)
+        
+        # 품명 설정 - 편집 불가능하게 설정
+        name_item = QTableWidgetItem(text)
+        name_item.setFont(QFont("", 10, QFont.Bold))
+        name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)  # 편집 불가
+        self.setItem(row, 2, name_item)
+        
+        # 나머지 컬럼 비활성화
+        for col in range(3, self.columnCount()-2):  # 버튼 컬럼 제외
+            empty_item = QTableWidgetItem("")
+            empty_item.setFlags(empty_item.flags() & ~Qt.ItemIsEditable)
+            empty_item.setBackground(QColor(230, 230, 230))
+            self.setItem(row, col, empty_item)
             
-            # 나머지 컬럼 비활성화
-            for col in range(3, self.columnCount()-2):  # 버튼 컬럼 제외
-                empty_item = QTableWidgetItem("")
-                empty_item.setFlags(empty_item.flags() & ~Qt.ItemIsEditable)
-                empty_item.setBackground(QColor(230, 230, 230))
-                self.setItem(row, col, empty_item)
-                
-            # 행 타입 저장
-            self.row_types[row] = RowType.CATEGORY
-            self.row_levels[row] = level_num
+        # 행 타입 저장
+        self.row_types[row] = RowType.CATEGORY
+        self.row_levels[row] = level_num
+        return row
             
     def add_subcategory(self, parent_row):
         """중분류 추가"""
@@ -186,62 +251,93 @@ class SimpleHierarchicalTable(QTableWidget):
             
         text, ok = QInputDialog.getText(self, "중분류 추가", "중분류 이름:")
         if ok and text:
-            # 부모 대분류의 번호
-            parent_level = self.row_levels.get(parent_row, "1")
-            
-            # 같은 대분류 아래의 중분류 개수 계산
-            subcategory_count = 0
-            for i in range(parent_row + 1, self.rowCount()):
-                if self.row_types.get(i) == RowType.CATEGORY:
-                    break  # 다음 대분류를 만나면 중단
-                if self.row_types.get(i) == RowType.SUBCATEGORY:
-                    if self.row_levels.get(i, "").startswith(parent_level + "-"):
-                        subcategory_count += 1
-                        
-            # 중분류 번호 생성 (1-1, 1-2, ...)
-            level_num = f"{parent_level}-{subcategory_count + 1}"
-            
-            # 삽입 위치 찾기 (현재 대분류의 마지막 항목 다음)
-            insert_row = parent_row + 1
-            for i in range(parent_row + 1, self.rowCount()):
-                if self.row_types.get(i) == RowType.CATEGORY:
-                    break
-                insert_row = i + 1
-                
-            self.insertRow(insert_row)
+            self.insert_subcategory(parent_row, text)
             
-            # 번호 설정 - 편집 불가
-            num_item = QTableWidgetItem(level_num)
-            num_item.setFlags(num_item.flags() & ~Qt.ItemIsEditable)
-            self.setItem(insert_row, 0, num_item)
-            
-            # 구분 설정
-            type_item = QTableWidgetItem("중분류")
-            type_item.setBackground(QColor(220, 220, 255))
-            type_item.setFlags(type_item.flags() & ~Qt.ItemIsEditable)
-            self.setItem(insert_row, 1, type_item)
+    def insert_subcategory(self, parent_row, text):
+        """중분류 행 생성 (입력창 없이), 생성된 행 번호 반환"""
+        # 부모 대분류의 번호
+        parent_level = self.row_levels.get(parent_row, "1")
+        
+        # 같은 대분류 아래의 중분류 개수 계산
+        subcategory_count = 0
+        for i in range(parent_row + 1, self.rowCount()):
+            if self.row_types.get(i) == RowType.CATEGORY:
+                break  # 다음 대분류를 만나면 중단
+            if self.row_types.get(i) == RowType.SUBCATEGORY:
+                if self.row_levels.get(i, "").startswith(parent_level + "-"):
+                    subcategory_count += 1
+                    
+        # 중분류 번호 생성 (1-1, 1-2, ...)
+        level_num = f"{parent_level}-{subcategory_count + 1}"
+        
+        # 삽입 위치 찾기 (현재 대분류의 마지막 항목 다음)
+        insert_row = parent_row + 1
+        for i in range(parent_row + 1, self.rowCount()):
+            if self.row_types.get(i) == RowType.CATEGORY:
+                break
+            insert_row = i + 1
             
-            # 품명 설정 - 편집 불가
-            name_item = QTableWidgetItem("  " + text)  # 들여쓰기
-            name_item.setFont(QFont("", 9, QFont.Bold))
-            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)  # 편집 불가
-            self.setItem(insert_row, 2, name_item)
+        self.insert_table_row(insert_row)
+        
+        # 번호 설정 - 편집 불가
+        num_item = QTableWidgetItem(level_num)
+        num_item.setFlags(num_item.flags() & ~Qt.ItemIsEditable)
+        self.setItem(insert_row, 0, num_item)
+        
+        # 구분 설정
+        type_item = QTableWidgetItem("중분류")
+        type_item.setBackground(QColor(220, 220, 255))
+        type_item.setFlags(type_item.flags() & ~Qt.ItemIsEditable)
+        self.setItem(insert_row, 1, type_item)
+        
+        # 품명 설정 - 편집 불가
+        name_item = QTableWidgetItem("  " + text)  # 들여쓰기
+        name_item.setFont(QFont("", 9, QFont.Bold))
+        name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)  # 편집 불가
+        self.setItem(insert_row, 2, name_item)
+        
+        # 나머지 컬럼 비활성화
+        for col in range(3, self.columnCount()-2):  # 버튼 컬럼 제외
+            empty_item = QTableWidgetItem("")
+            empty_item.setFlags(empty_item.flags() & ~Qt.ItemIsEditable)
+            empty_item.setBackground(QColor(240, 240, 240))
+            self.setItem(insert_row, col, empty_item)
             
-            # 나머지 컬럼 비활성화
-            for col in range(3, self.columnCount()-2):  # 버튼 컬럼 제외
-                empty_item = QTableWidgetItem("")
-                empty_item.setFlags(empty_item.flags() & ~Qt.ItemIsEditable)
-                empty_item.setBackground(QColor(240, 240, 240))
-                self.setItem(insert_row, col, empty_item)
-                
-            # 행 타입 저장
-            self.row_types[insert_row] = RowType.SUBCATEGORY
-            self.row_levels[insert_row] = level_num
+        # 행 타입 저장
+        self.row_types[insert_row] = RowType.SUBCATEGORY
+        self.row_levels[insert_row] = level_num
+        return insert_row
+        
+    def find_or_add_category(self, text):
+        """이름이 같은 대분류 행을 찾고 없으면 생성"""
+        for row, row_type in self.row_types.items():
+            if row_type == RowType.CATEGORY:
+                item = self.item(row, 2)
+                if item and item.text().strip() == text:
+                    return row
+        return self.insert_category(text)
+        
+    def find_or_add_subcategory(self, parent_row, text):
+        """대분류 아래에서 이름이 같은 중분류 행을 찾고 없으면 생성"""
+        for i in range(parent_row + 1, self.rowCount()):
+            row_type = self.row_types.get(i)
+            if row_type == RowType.CATEGORY:
+                break
+            if row_type == RowType.SUBCATEGORY:
+                item = self.item(i, 2)
+                if item and item.text().strip() == text:
+                    return i
+        return self.insert_subcategory(parent_row, text)
             
     def add_item(self, parent_row):
         """중분류 아래에 일반 항목 추가"""
-        if parent_row < 0 or self.row_types.get(parent_row) != RowType.SUBCATEGORY:
-            return
+        rows = self.add_items(parent_row, 1)
+        return rows[0] if rows else None
+        
+    def add_items(self, parent_row, count):
+        """중분류 아래에 항목 count개를 한 번에 추가 (행 삽입/번호 계산 한 번), 새 행 번호 목록 반환"""
+        if parent_row < 0 or self.row_types.get(parent_row) != RowType.SUBCATEGORY or count < 1:
+            return []
             
         # 부모 중분류의 번호
         parent_level = self.row_levels.get(parent_row, "1-1")
@@ -256,9 +352,6 @@ class SimpleHierarchicalTable(QTableWidget):
                 if self.row_levels.get(i, "").startswith(parent_level + "-"):
                     item_count += 1
                     
-        # 항목 번호 생성 (1-1-1, 1-1-2, ...)
-        level_num = f"{parent_level}-{item_count + 1}"
-        
         # 삽입 위치 찾기 (현재 중분류의 마지막 항목 다음)
         insert_row = parent_row + 1
         for i in range(parent_row + 1, self.rowCount()):
@@ -267,8 +360,15 @@ class SimpleHierarchicalTable(QTableWidget):
                 break
             insert_row = i + 1
             
-        self.insertRow(insert_row)
+        self.insert_table_rows(insert_row, count)
+        
+        # 항목 번호 생성 (1-1-1, 1-1-2, ...)
+        for k in range(count):
+            self.init_item_row(insert_row + k, f"{parent_level}-{item_count + k + 1}")
+        return list(range(insert_row, insert_row + count))
         
+    def init_item_row(self, insert_row, level_num):
+        """새로 삽입한 행을 항목 행으로 초기화 (번호, 빈 셀, 버튼)"""
         # 번호 설정
         self.setItem(insert_row, 0, QTableWidgetItem(level_num))
         
@@ -306,6 +406,15 @@ class SimpleHierarchicalTable(QTableWidget):
         self.row_types[insert_row] = RowType.ITEM
         self.row_levels[insert_row] = level_num
         
+    def set_row_values(self, row, values):
+        """여러 컬럼 값을 한 번에 설정 {컬럼: 텍스트}"""
+        for col, text in values.items():
+            item = self.item(row, col)
+            if item:
+                item.setText(str(text))
+            else:
+                self.setItem(row, col, QTableWidgetItem(str(text)))
+        
     def add_row(self):
         """일반 행 추가 (기존 평면 테이블처럼)"""
         # 현재 선택된 행 찾기
@@ -330,7 +439,7 @@ class SimpleHierarchicalTable(QTableWidget):
         # 중분류가 없으면 기본 구조 생성
         if target_subcategory_row < 0:
             # 대분류와 중분류 자동 생성
-            self.insertRow(0)
+            self.insert_table_row(0)
             
             # 대분류
             num_item = QTableWidgetItem("1")
@@ -357,7 +466,7 @@ class SimpleHierarchicalTable(QTableWidget):
                 self.setItem(0, col, empty_item)
             
             # 중분류
-            self.insertRow(1)
+            self.insert_table_row(1)
             
             num_item = QTableWidgetItem("1-1")
             num_item.setFlags(num_item.flags() & ~Qt.ItemIsEditable)
@@ -391,25 +500,31 @@ class SimpleHierarchicalTable(QTableWidget):
         """선택 및 돋보기 버튼 추가"""
         # 추출모드 드롭다운 추가
         extract_combo = QComboBox()
-        extract_combo.addItems(["선택", "전체", "면적", "둘레", "길이", "체적"])
+        extract_combo.addItems(EXTRACTION_MODES)
+        extract_combo.setCurrentText(DEFAULT_EXTRACTION_MODE)
+        extract_combo.currentTextChanged.connect(
+            lambda mode, c=extract_combo: self.extraction_mode_changed(self.widget_row(c), mode))
         self.setCellWidget(row, 14, extract_combo)
         
         # 선택 버튼
         select_btn = QPushButton("🎯")
         select_btn.setMaximumWidth(40)
-        # 람다에서 row 값을 캡처하도록 수정
-        select_btn.clicked.connect(lambda checked, r=row: self.select_from_cad(r))
+        # 행 삽입으로 번호가 밀릴 수 있으므로 클릭 시점의 행을 조회
+        select_btn.clicked.connect(lambda checked, b=select_btn: self.select_from_cad(self.widget_row(b)))
         self.setCellWidget(row, 17, select_btn)
         
         # 돋보기 버튼
         magnifier_btn = QPushButton("🔍")
         magnifier_btn.setMaximumWidth(40)
-        # 람다에서 row 값을 캡처하도록 수정
-        magnifier_btn.clicked.connect(lambda checked, r=row: self.show_selection_helper(r))
+        magnifier_btn.clicked.connect(lambda checked, b=magnifier_btn: self.show_selection_helper(self.widget_row(b)))
         self.setCellWidget(row, 18, magnifier_btn)
         
+    def widget_row(self, widget):
+        """셀 위젯이 현재 위치한 행 번호"""
+        return self.indexAt(widget.pos()).row()
+        
     def select_from_cad(self, row):
-        """CAD에서 객체 선택 - 평면 테이블과 동일한 로직"""
+        """CAD에서 객체 선택 - 행의 추출모드에 필요한 값만 계산"""
         if not self.doc:
             QMessageBox.warning(self, "경고", "먼저 AutoCAD를 연결하세요")
             return
@@ -430,242 +545,36 @@ class SimpleHierarchicalTable(QTableWidget):
                 return
                 
             # 선택 객체 처리
-            selected_objects = []
-            total_length = 0
-            total_area = 0
-            total_perimeter = 0
-            
-            # 사각형 감지를 위한 변수
-            rectangles = []
+            selected_objects = [selection.Item(i) for i in range(selection.Count)]
+            selected_objects = self.exclude_overlaps(selected_objects)
             
-            for i in range(selection.Count):
-                obj = selection.Item(i)
-                selected_objects.append(obj)
-                
-                # 치수 추출
-                obj_type = str(obj.ObjectName)
-                
-                if "Polyline" in obj_type:
-                    try:
-                        # 면적
-                        if hasattr(obj, 'Area'):
-                            total_area += obj.Area
-                            
-                        # 폴리라인이 사각형인지 확인
-                        if hasattr(obj, 'Closed') and obj.Closed:
-                            try:
-                                coords = obj.Coordinates
-                                # 4개 점으로 이루어진 폐합 폴리라인 = 사각형
-                                if len(coords) >= 8:  # 최소 4개 점 (8개 좌표값)
-                                    # 사각형의 가로, 세로 계산
-                                    x_coords = [coords[i] for i in range(0, len(coords), 2)]
-                                    y_coords = [coords[i] for i in range(1, len(coords), 2)]
-                                    
-                                    width = max(x_coords) - min(x_coords)
-                                    height = max(y_coords) - min(y_coords)
-                                    
-                                    # 사각형인지 확인 (4점 또는 5점)
-                                    if len(coords) in [8, 10]:
-                                        rectangles.append({
-                                            'width': width,
-                                            'height': height,
-                                            'area': width * height,
-                                            'perimeter': 2 * (width + height)
-                                        })
-                                    
-                                    total_perimeter += 2 * (width + height)
-                            except Exception as e:
-                                print(f"폴리라인 처리 오류: {e}")
-                                
-                        # 일반 폴리라인 둘레
-                        try:
-                            coords = obj.Coordinates
-                            perimeter = 0
-                            for j in range(0, len(coords)-2, 2):
-                                x1, y1 = coords[j], coords[j+1]
-                                x2, y2 = coords[j+2], coords[j+3]
-                                import math
-                                perimeter += math.sqrt((x2-x1)**2 + (y2-y1)**2)
-                            # 폐합된 경우 마지막 변도 추가
-                            if hasattr(obj, 'Closed') and obj.Closed and len(coords) >= 4:
-                                x1, y1 = coords[-2], coords[-1]
-                                x2, y2 = coords[0], coords[1]
-                                perimeter += math.sqrt((x2-x1)**2 + (y2-y1)**2)
-                            if perimeter > 0 and not rectangles:  # 사각형이 아닌 경우만
-                                total_perimeter += perimeter
-                        except:
-                            pass
-                            
-                    except:
-                        pass
-                        
-                elif "Line" in obj_type and "Polyline" not in obj_type:
-                    try:
-                        start = obj.StartPoint
-                        end = obj.EndPoint
-                        import math
-                        length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-                        total_length += length
-                    except:
-                        pass
-                        
-                elif "Circle" in obj_type:
-                    try:
-                        import math
-                        radius = obj.Radius
-                        total_area += math.pi * radius * radius
-                        total_perimeter += 2 * math.pi * radius
-                    except:
-                        pass
-                        
-            # 테이블 업데이트 - 항목이 없으면 생성
-            # 개수
-            if not self.item(row, 4):
-                self.setItem(row, 4, QTableWidgetItem(""))
-            self.item(row, 4).setText(str(selection.Count))
-            
-            # 사각형이 감지된 경우
-            if rectangles:
-                print(f"   사각형 {len(rectangles)}개 감지됨")
-                # 첫 번째 사각형의 치수 사용
-                rect = rectangles[0]
-                
-                # 가로
-                if not self.item(row, 6):
-                    self.setItem(row, 6, QTableWidgetItem(""))
-                self.item(row, 6).setText(f"{rect['width']:.1f}")
-                print(f"   가로: {rect['width']:.1f}")
-                    
-                # 세로
-                if not self.item(row, 7):
-                    self.setItem(row, 7, QTableWidgetItem(""))
-                self.item(row, 7).setText(f"{rect['height']:.1f}")
-                print(f"   세로: {rect['height']:.1f}")
-                
-                # 여러 사각형인 경우 합계
-                if len(rectangles) > 1:
-                    total_rect_area = sum(r['area'] for r in rectangles)
-                    total_rect_perimeter = sum(r['perimeter'] for r in rectangles)
-                    
-                    if not self.item(row, 8):
-                        self.setItem(row, 8, QTableWidgetItem(""))
-                    self.item(row, 8).setText(f"{total_rect_area:.1f}")  # 면적
-                    
-                    if not self.item(row, 9):
-                        self.setItem(row, 9, QTableWidgetItem(""))
-                    self.item(row, 9).setText(f"{total_rect_perimeter:.1f}")  # 둘레
-                else:
-                    if not self.item(row, 8):
-                        self.setItem(row, 8, QTableWidgetItem(""))
-                    self.item(row, 8).setText(f"{rect['area']:.1f}")  # 면적
-                    
-                    if not self.item(row, 9):
-                        self.setItem(row, 9, QTableWidgetItem(""))
-                    self.item(row, 9).setText(f"{rect['perimeter']:.1f}")  # 둘레
-                    print(f"   둘레: {rect['perimeter']:.1f}")
-                    
-            else:
-                # 사각형이 아닌 경우
-                if total_area > 0:
-                    if not self.item(row, 8):
-                        self.setItem(row, 8, QTableWidgetItem(""))
-                    self.item(row, 8).setText(f"{total_area:.1f}")  # 면적
-                    
-                if total_length > 0:
-                    if not self.item(row, 6):
-                        self.setItem(row, 6, QTableWidgetItem(""))
-                    self.item(row, 6).setText(f"{total_length:.1f}")  # 가로(길이)
-                    
-                if total_perimeter > 0:
-                    if not self.item(row, 9):
-                        self.setItem(row, 9, QTableWidgetItem(""))
-                    self.item(row, 9).setText(f"{total_perimeter:.1f}")  # 둘레
-                    
-            # 레이어
-            if selected_objects:
-                if not self.item(row, 17):
-                    self.setItem(row, 17, QTableWidgetItem(""))
-                self.item(row, 17).setText(str(selected_objects[0].Layer))
-                
-            # 선택 객체 저장 (행 데이터로)
-            if not hasattr(self, 'row_selections'):
-                self.row_selections = {}
+            # 선택 객체 저장 (행 데이터로) 후 추출모드대로 계산
             self.row_selections[row] = selected_objects
+            result = self.extract_row(row, refresh=True)
             
-            # Line 객체가 여러 개인 경우 길이별 그룹화
-            if len(selected_objects) > 1:
-                all_lines = True
-                for obj in selected_objects:
-                    obj_type = str(obj.ObjectName)
-                    if not ("Line" in obj_type and "Polyline" not in obj_type):
-                        all_lines = False
-                        break
+            # Line 객체가 여러 개인 경우 길이별 그룹화 (길이를 계산하는 모드에서만)
+            if len(selected_objects) > 1 and result.lengths and \
+                    all(kind == "line" for kind in result.kinds):
+                self.split_by_length(row, selected_objects, result.lengths)
                 
-                if all_lines:
-                    print(f"\n📊 Line 객체 {len(selected_objects)}개 - 길이별 그룹화")
-                    
-                    # 길이별로 그룹화
-                    groups = {}
-                    for obj in selected_objects:
-                        try:
-                            start = obj.StartPoint
-                            end = obj.EndPoint
-                            length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-                            length_key = round(length, 1)
-                            if length_key not in groups:
-                                groups[length_key] = []
-                            groups[length_key].append(obj)
-                        except:
-                            pass
-                    
-                    if len(groups) > 1:
-                        print(f"  {len(groups)}개 그룹으로 분할 필요")
-                        
-                        # 현재 행의 부모 찾기 (중분류)
-                        parent_row = -1
-                        for i in range(row - 1, -1, -1):
-                            if self.row_types.get(i) == RowType.SUBCATEGORY:
-                                parent_row = i
-                                break
-                        
-                        # 첫 번째 그룹은 현재 행에
-                        sorted_groups = sorted(groups.items())
-                        first_key, first_objects = sorted_groups[0]
-                        self.row_selections[row] = first_objects
-                        self.setItem(row, 4, QTableWidgetItem(str(len(first_objects))))
-                        self.setItem(row, 6, QTableWidgetItem(f"{first_key:.1f}"))
-                        print(f"  행 {row}: 길이={first_key:.1f}, 수량={len(first_objects)}")
-                        
-                        # 품명 가져오기
-                        original_name = self.item(row, 2).text() if self.item(row, 2) else ""
-                        
-                        # 나머지 그룹은 새 행에 추가
-                        for length_key, objects in sorted_groups[1:]:
-                            if parent_row >= 0:
-                                self.add_item(parent_row)
-                                new_row = self.rowCount() - 1
-                                
-                                # 데이터 설정
-                                self.setItem(new_row, 2, QTableWidgetItem(original_name))  # 품명
-                                self.setItem(new_row, 4, QTableWidgetItem(str(len(objects))))  # 수량
-                                self.setItem(new_row, 5, QTableWidgetItem("개"))  # 단위
-                                self.setItem(new_row, 6, QTableWidgetItem(f"{length_key:.1f}"))  # 가로에 길이
-                                
-                                # 선택 객체 저장
-                                self.row_selections[new_row] = objects
-                                
-                                print(f"  행 {new_row}: 길이={length_key:.1f}, 수량={len(objects)}")
+            # 원/호만 여러 개인 경우 직경별 분할 (추출모드와 관계없이 객체 종류로 판정)
+            elif len(selected_objects) > 1:
+                radii = self.circle_radii(selected_objects)
+                if radii:
+                    self.split_by_diameter(row, selected_objects, radii)
             
             # 결과 메시지
-            print(f"✅ {selection.Count}개 객체 선택됨")
-            if rectangles:
-                print(f"   사각형 {len(rectangles)}개 감지")
-                for i, rect in enumerate(rectangles[:3]):  # 최대 3개만 표시
-                    print(f"   사각형{i+1}: {rect['width']:.1f} x {rect['height']:.1f}")
-            if total_length > 0:
-                print(f"   총 길이: {total_length:.3f}mm")
-            if total_area > 0:
-                print(f"   총 면적: {total_area:.3f}mm²")
+            print(f"✅ {len(selected_objects)}개 객체 선택됨 (추출모드: {result.mode})")
+            if result.rectangles:
+                print(f"   사각형 {len(result.rectangles)}개 감지")
+                for i, (width, height) in enumerate(result.rectangles[:3]):  # 최대 3개만 표시
+                    print(f"   사각형{i+1}: {width:.1f} x {height:.1f}")
+            if result.length > 0:
+                print(f"   총 길이: {result.length:.3f}mm")
+            if result.area > 0:
+                print(f"   총 면적: {result.area:.3f}mm²")
+            if result.perimeter > 0:
+                print(f"   총 둘레: {result.perimeter:.3f}mm")
                 
             selection.Delete()
             
@@ -674,6 +583,181 @@ class SimpleHierarchicalTable(QTableWidget):
         finally:
             pythoncom.CoUninitialize()
             
+    def row_mode(self, row):
+        """행의 추출모드 (드롭다운이 없으면 전체)"""
+        combo = self.cellWidget(row, 14)
+        return combo.currentText() if isinstance(combo, QComboBox) else "전체"
+        
+    def extract_row(self, row, refresh=False):
+        """행에 저장된 선택 객체를 추출모드대로 계산해 테이블에 기록
+        
+        형상은 Handle별로 캐시되므로 같은 객체를 다시 계산할 때는 COM을 호출하지 않음
+        refresh: 방금 CAD에서 고른 객체 - 캐시(스냅샷 포함)를 버리고 도면에서 다시 읽음 (편집된 객체 반영)
+        """
+        objects = self.row_selections.get(row, [])
+        handles = [self.row_selections.handle_of(obj) or f"id:{id(obj)}" for obj in objects]
+        if refresh:
+            self.extraction.forget(handles)
+        
+        # 메인 스냅샷에 있는 객체는 스냅샷 형상을 그대로 사용
+        snapshot = getattr(self.parent_widget, 'snapshot', None)
+        if snapshot is not None and not refresh:
+            known = [snapshot.handle_index[h] for h in handles
+                     if h in snapshot.handle_index and h not in self.extraction.geometry]
+            self.extraction.remember_snapshot(snapshot, known)
+            
+        result = self.extraction.extract(objects, handles, self.row_mode(row))
+        self.apply_extraction(row, result)
+        return result
+        
+    def apply_extraction(self, row, result):
+        """추출 결과를 행에 기록 - 이전 추출로 채운 치수 컬럼 중 이번 모드에 없는 값은 지움"""
+        values = extraction_values(result, EXTRACTION_COLUMNS)
+        for col in EXTRACTED_COLUMNS:
+            item = self.item(row, col)
+            if col not in values and item and item.data(EXTRACTED_ROLE):
+                item.setData(EXTRACTED_ROLE, None)
+                item.setText("")
+        self.set_row_values(row, values)
+        for col in EXTRACTED_COLUMNS:
+            if col in values:
+                self.item(row, col).setData(EXTRACTED_ROLE, True)
+                
+    def extraction_mode_changed(self, row, mode):
+        """추출모드 변경 - 캐시된 형상으로 다시 계산 (COM 호출 없음)"""
+        if row < 0 or not self.row_selections.get(row):
+            return
+        print(f"🔄 행 {row} 추출모드 변경: {mode}")
+        self.extract_row(row)
+        
+    def split_by_length(self, row, objects, lengths):
+        """LINE 선택을 길이별 행으로 분할 (첫 그룹은 현재 행, 나머지는 새 행)"""
+        groups = {}
+        for obj, length in zip(objects, lengths):
+            groups.setdefault(round(length, 1), []).append(obj)
+        if len(groups) < 2:
+            return
+            
+        print(f"\n📊 Line 객체 {len(objects)}개 - {len(groups)}개 그룹으로 분할")
+        
+        # 현재 행의 부모 찾기 (중분류)
+        parent_row = -1
+        for i in range(row - 1, -1, -1):
+            if self.row_types.get(i) == RowType.SUBCATEGORY:
+                parent_row = i
+                break
+                
+        # 첫 번째 그룹은 현재 행에
+        sorted_groups = sorted(groups.items())
+        first_key, first_objects = sorted_groups[0]
+        self.row_selections[row] = first_objects
+        self.set_row_values(row, {4: str(len(first_objects)), 6: f"{first_key:.1f}"})
+        print(f"  행 {row}: 길이={first_key:.1f}, 수량={len(first_objects)}")
+        if parent_row < 0:
+            return
+            
+        # 품명, 추출모드 가져오기
+        original_name = self.item(row, 2).text() if self.item(row, 2) else ""
+        mode = self.row_mode(row)
+        
+        # 나머지 그룹은 새 행에 추가
+        for length_key, group_objects in sorted_groups[1:]:
+            new_row = self.add_item(parent_row)
+            self.cellWidget(new_row, 14).setCurrentText(mode)
+            self.row_selections[new_row] = group_objects
+            self.set_row_values(new_row, {2: original_name, 4: str(len(group_objects)),
+                                          5: "개", 6: f"{length_key:.1f}"})
+            self.item(new_row, 6).setData(EXTRACTED_ROLE, True)
+            print(f"  행 {new_row}: 길이={length_key:.1f}, 수량={len(group_objects)}")
+            
+    def circle_radii(self, objects):
+        """선택이 모두 원/호면 객체별 반지름, 아니면 None
+        
+        형상 캐시(스냅샷 객체 포함)에 있으면 캐시 값, 없는 객체만 COM에서 종류/반지름을 읽음
+        """
+        radii = []
+        for obj in objects:
+            handle = self.row_selections.handle_of(obj) or f"id:{id(obj)}"
+            geometry = self.extraction.geometry.get(handle)
+            if geometry is not None:
+                kind, radius = geometry['kind'], geometry['radius']
+            else:
+                kind = entity_kind(str(obj.ObjectName))
+                radius = float(obj.Radius) if kind in CIRCLE_KINDS else 0.0
+            if kind not in CIRCLE_KINDS:
+                return None  # 원/호가 아닌 객체가 나오면 바로 중단
+            radii.append(radius)
+        return radii
+        
+    def split_by_diameter(self, row, objects, radii, tolerance=1.0):
+        """원/호 선택을 직경별 행으로 분할 (첫 직경은 현재 행, 나머지는 새 행을 한 번에 삽입)
+        
+        각 행은 split_by_groups가 캐시된 형상으로 다시 추출 (면적/둘레도 직경별로, COM 호출 없음)
+        """
+        groups = diameter_groups(radii, tolerance)
+        if len(groups) < 2:
+            return
+        print(f"\n⭕ 원 {len(objects)}개 - 직경 {len(groups)}종으로 분할")
+        self.split_by_groups(row, [
+            {'label': diameter_label(group['diameter'], tolerance), 'count': group['count'],
+             'values': {}, 'objects': [objects[i] for i in group['positions']]}
+            for group in groups])
+            
+    def split_by_groups(self, row, groups):
+        """그룹별 행 분할 (첫 그룹은 현재 행, 나머지는 새 행을 한 번에 삽입)
+        
+        groups: SelectionHelperDialog.group_selection 결과 [{'label', 'count', 'values', 'objects', ...}]
+        반환: 값을 기록한 행 번호 목록 (분할하지 않았으면 빈 목록, 행의 선택은 그대로)
+        값을 기록한 행은 그룹의 객체로 다시 추출 (추출모드 컬럼이 그룹별 값이 되도록)
+        """
+        if not groups:
+            return []
+            
+        # 현재 행의 부모 찾기 (중분류)
+        parent_row = -1
+        for i in range(row - 1, -1, -1):
+            if self.row_types.get(i) == RowType.SUBCATEGORY:
+                parent_row = i
+                break
+        if parent_row < 0 and len(groups) > 1:
+            print("  ⚠️ 중분류가 없어 행 분할 안 함 (선택 유지)")
+            QMessageBox.warning(self, "경고",
+                "중분류 아래 항목만 행 분할할 수 있습니다.\n선택한 객체는 그대로 현재 행에 유지합니다.")
+            return []
+        print(f"\n📦 {sum(g['count'] for g in groups)}개 객체 - {len(groups)}개 그룹으로 분할")
+                
+        original_name = self.item(row, 2).text() if self.item(row, 2) else ""
+        mode = self.row_mode(row)
+        rest = groups[1:]
+        
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            new_rows = self.add_items(parent_row, len(rest)) if rest else []
+            for target, group in zip([row] + new_rows, groups[:1] + rest):
+                values = {3: group['label'], 4: str(group['count'])}
+                if target != row:
+                    values.update({2: original_name, 5: "개"})
+                    self.cellWidget(target, 14).setCurrentText(mode)
+                if 'length' in group['values'] and group['count']:
+                    values[6] = f"{group['length'] / group['count']:.1f}"  # 가로에 평균 길이
+                if 'size' in group['values']:
+                    values[6] = f"{group['width']:.1f}"
+                    values[7] = f"{group['height']:.1f}"
+                self.row_selections[target] = group['objects']
+                self.set_row_values(target, values)
+                for col in (6, 7):
+                    if col in values:
+                        self.item(target, col).setData(EXTRACTED_ROLE, True)
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+        rows = [row] + new_rows
+        for target in rows:
+            self.extract_row(target)
+        print(f"  ✅ 행 {len(rows)}개에 반영")
+        return rows
+        
     def show_selection_helper(self, row):
         """선택 도우미 표시"""
         if not hasattr(self, 'row_selections') or row not in self.row_selections:
@@ -699,8 +783,19 @@ class SimpleHierarchicalTable(QTableWidget):
                 # 선택 결과 업데이트
                 new_selection = dialog.get_final_selection()
                 if new_selection:
+                    new_selection = self.exclude_overlaps(new_selection)
                     print(f"\n📊 선택 도우미 결과: {len(new_selection)}개 객체")
                     
+                    # 행 분할 키를 고른 경우 다중 키 그룹화로 분할
+                    options = dialog.group_options()
+                    if options and len(new_selection) > 1:
+                        if not self.split_by_groups(row, dialog.group_selection(*options, objects=new_selection)):
+                            # 분할하지 않았으면 선택 전체를 현재 행에
+                            self.row_selections[row] = new_selection
+                            self.setItem(row, 4, QTableWidgetItem(str(len(new_selection))))
+                            self.extract_row(row)
+                        return
+                    
                     # Line 객체인 경우 길이별 그룹화 확인
                     all_lines = True
                     for obj in new_selection:
@@ -742,6 +837,7 @@ class SimpleHierarchicalTable(QTableWidget):
                             # Line 길이는 가로(6번)에 넣기
                             self.setItem(row, 6, QTableWidgetItem(f"{first_key:.1f}"))  # 가로에 길이
                             self.setItem(row, 4, QTableWidgetItem(str(len(first_objects))))  # 수량
+                            self.extract_row(row)
                             print(f"    행 {row}: 길이={first_key:.1f}, 수량={len(first_objects)}")
                             
                             # 품명 가져오기
@@ -758,8 +854,7 @@ class SimpleHierarchicalTable(QTableWidget):
                             for length_key, objects in sorted_groups[1:]:
                                 if parent_row >= 0:
                                     # 중분류 아래에 새 항목 추가
-                                    self.add_item(parent_row)
-                                    new_row = self.rowCount() - 1
+                                    new_row = self.add_item(parent_row)
                                     
                                     # 데이터 설정
                                     self.setItem(new_row, 2, QTableWidgetItem(original_name))  # 품명
@@ -769,8 +864,9 @@ class SimpleHierarchicalTable(QTableWidget):
                                     self.setItem(new_row, 5, QTableWidgetItem("개"))  # 단위
                                     self.setItem(new_row, 6, QTableWidgetItem(f"{length_key:.1f}"))  # 가로에 길이
                                     
-                                    # 선택 객체 저장
+                                    # 선택 객체 저장 후 추출
                                     self.row_selections[new_row] = objects
+                                    self.extract_row(new_row)
                                     
                                     print(f"    행 {new_row}: 길이={length_key:.1f}, 수량={len(objects)}")
                             
@@ -779,11 +875,13 @@ class SimpleHierarchicalTable(QTableWidget):
                             # 단일 그룹
                             self.row_selections[row] = new_selection
                             self.setItem(row, 4, QTableWidgetItem(str(len(new_selection))))
+                            self.extract_row(row)
                             print(f"  단일 그룹 (길이 동일)")
                     else:
                         # Line이 아니거나 단일 객체
                         self.row_selections[row] = new_selection
                         self.setItem(row, 4, QTableWidgetItem(str(len(new_selection))))
+                        self.extract_row(row)
                         print(f"✅ 선택 업데이트: {len(new_selection)}개")
         else:
             # 기본 정보 표시 (폴백)
@@ -836,6 +934,12 @@ class SimpleHierarchicalTable(QTableWidget):
                     '층고': self.get_float_value(row, 11),
                 }
                 
+                # 레이어 이름 또는 규격의 철근 단위중량 (REBAR-D13 → 0.995 kg/m)
+                layer_item = self.item(row, 15)
+                spec_item = self.item(row, 3)
+                variables['철근중량'] = (rebar_unit_weight(layer_item.text() if layer_item else "") or
+                                      rebar_unit_weight(spec_item.text() if spec_item else "") or 0.0)
+                
                 # 영문 변수명도 지원
                 variables.update({
                     'qty': variables['수량'],
@@ -845,8 +949,12 @@ class SimpleHierarchicalTable(QTableWidget):
                     'perimeter': variables['둘레'],
                     'thickness': variables['두께'],
                     'floor': variables['층고'],
+                    'rebar_weight': variables['철근중량'],
                 })
                 
+                # {수량} 형식의 변수 표기도 허용
+                formula = formula.replace("{", "").replace("}", "")
+                
                 # 수식 평가
                 result = eval(formula, {"__builtins__": {}}, variables)
                 
@@ -862,6 +970,13 @@ class SimpleHierarchicalTable(QTableWidget):
                     self.item(row, 13).setText("")
                 print(f"  수식 계산 오류 (행 {row}): {e}")
     
+    def recalculate_all(self):
+        """계산식이 있는 모든 행 다시 계산 (신호를 막고 값을 넣은 뒤 호출)"""
+        for row in range(self.rowCount()):
+            formula_item = self.item(row, 12)
+            if formula_item and formula_item.text():
+                self.calculate_formula(formula_item)
+                
     def get_float_value(self, row, col):
         """셀 값을 float로 변환"""
         item = self.item(row, col)
@@ -900,11 +1015,7 @@ class SimpleHierarchicalTable(QTableWidget):
                 
             # 역순으로 삭제
             for r in reversed(rows_to_delete):
-                self.removeRow(r)
-                if r in self.row_types:
-                    del self.row_types[r]
-                if r in self.row_levels:
-                    del self.row_levels[r]
+                self.remove_table_row(r)
                     
         elif row_type == RowType.SUBCATEGORY:
             reply = QMessageBox.question(self, "확인", 
@@ -922,20 +1033,76 @@ class SimpleHierarchicalTable(QTableWidget):
                 
             # 역순으로 삭제
             for r in reversed(rows_to_delete):
-                self.removeRow(r)
-                if r in self.row_types:
-                    del self.row_types[r]
-                if r in self.row_levels:
-                    del self.row_levels[r]
+                self.remove_table_row(r)
                     
         else:
             # 일반 항목 삭제
-            self.removeRow(row)
-            if row in self.row_types:
-                del self.row_types[row]
-            if row in self.row_levels:
-                del self.row_levels[row]
+            self.remove_table_row(row)
                 
+    def selection_snapshot(self, objects):
+        """선택 객체의 스냅샷과 인덱스 (메인 스냅샷에 모두 있으면 재사용, 없으면 새로 읽음)"""
+        snapshot = getattr(self.parent_widget, 'snapshot', None)
+        if snapshot is not None:
+            indices = [snapshot.handle_index.get(self.row_selections.handle_of(obj)) for obj in objects]
+            if None not in indices:
+                return snapshot, np.array(indices, dtype=np.int64)
+        snapshot = EntitySnapshot.from_objects(objects)
+        return snapshot, np.arange(snapshot.count)
+        
+    def exclude_overlaps(self, objects):
+        """중복/겹침 선분 검사 - 완전히 겹친 객체를 확인 후 선택에서 제외"""
+        if not self.check_overlaps or len(objects) < 2:
+            return objects
+        try:
+            snapshot, indices = self.selection_snapshot(objects)
+            report = snapshot_overlaps(snapshot, indices)
+        except Exception as e:
+            print(f"  중복/겹침 검사 오류: {e}")
+            return objects
+        if not report.has_overlaps:
+            return objects
+            
+        print(f"\n🧹 중복/겹침 검사\n{report.summary()}")
+        redundant = int(report.redundant.sum())
+        if not redundant:
+            QMessageBox.information(self, "중복/겹침 감지",
+                f"{report.summary()}\n\n일부만 겹친 객체는 자동으로 제외하지 않습니다.")
+            return objects
+            
+        reply = QMessageBox.question(self, "중복/겹침 감지",
+            f"{report.summary()}\n\n완전히 겹친 객체 {redundant}개를 선택에서 제외할까요?",
+            QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return objects
+        kept = [obj for obj, drop in zip(objects, report.redundant) if not drop]
+        print(f"  {redundant}개 제외 → {len(kept)}개 객체")
+        return kept
+        
+    def highlight_row(self, row):
+        """행에 저장된 선택 객체를 AutoCAD에서 강조 (선택 세트 한 번에 반영)"""
+        objects = self.row_selections.get(row)
+        if not objects or not self.doc:
+            return
+        try:
+            pythoncom.CoInitialize()
+            push_selection(self.doc, objects, pickfirst=True)
+        except Exception as e:
+            QMessageBox.warning(self, "오류", f"강조 표시 오류: {str(e)}")
+        finally:
+            pythoncom.CoUninitialize()
+            
+    def clear_highlight(self):
+        """AutoCAD 강조 해제"""
+        if not self.doc:
+            return
+        try:
+            pythoncom.CoInitialize()
+            clear_selection(self.doc)
+        except Exception as e:
+            print(f"  강조 해제 오류: {e}")
+        finally:
+            pythoncom.CoUninitialize()
+            
     def set_cad_connection(self, acad, doc):
         """CAD 연결 설정"""
         self.acad = acad
@@ -943,7 +1110,14 @@ class SimpleHierarchicalTable(QTableWidget):
         
     def get_data(self):
         """테이블 데이터 가져오기"""
-        data = []
+        return list(self.iter_data())
+        
+    def data_columns(self):
+        """get_data/iter_data 값 목록의 컬럼 이름 (버튼 컬럼 제외)"""
+        return [self.horizontalHeaderItem(col).text() for col in range(self.columnCount() - 2)]
+        
+    def iter_data(self):
+        """테이블 데이터를 한 행씩 (내보내기에서 전체 목록을 만들지 않도록)"""
         for row in range(self.rowCount()):
             row_data = {
                 'level': self.row_levels.get(row, ""),
@@ -953,20 +1127,21 @@ class SimpleHierarchicalTable(QTableWidget):
             
             for col in range(self.columnCount() - 2):  # 버튼 컬럼 제외
                 item = self.item(row, col)
-                if item:
+                if col == 14 and isinstance(self.cellWidget(row, col), QComboBox):
+                    row_data['items'].append(self.row_mode(row))  # 추출모드
+                elif item:
                     row_data['items'].append(item.text())
                 else:
                     row_data['items'].append("")
                     
-            data.append(row_data)
-            
-        return data
+            yield row_data
         
     def load_data(self, data):
         """데이터 로드"""
         self.setRowCount(0)
         self.row_types.clear()
         self.row_levels.clear()
+        self.row_selections.clear()
         
         for row_data in data:
             row = self.rowCount()
@@ -995,4 +1170,6 @@ class SimpleHierarchicalTable(QTableWidget):
                 
             # 일반 항목인 경우 버튼 추가
             if row_type == RowType.ITEM:
-                self.add_buttons(row)
\ No newline at end of file
+                self.add_buttons(row)
+                if len(items) > 14 and items[14] in EXTRACTION_MODES:
+                    self.cellWidget(row, 14).setCurrentText(items[14])
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Spatial Index - 객체 중심점 공간 색인 (반경/최근접 검색)
+스냅샷의 객체 중심점(bbox 중심, 블록은 삽입점)으로 KD-트리를 만들어
+"선택 객체에서 R 이내", "가장 가까운 유사 객체 k개" 조회를 ModelSpace 순회 없이 처리
+
+- scipy가 있으면 cKDTree 사용
+- 없으면 x좌표 정렬 배열 + 이진 탐색으로 x 범위를 자르고 거리 계산
+  (최근접은 반경을 두 배씩 늘리며 k개가 찰 때까지)
+"""
+
+from typing import Optional
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+class SpatialIndex:
+    """스냅샷 중심점 공간 색인"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        valid = ~(np.isnan(snapshot.cx) | np.isnan(snapshot.cy))
+        self.indices = np.flatnonzero(valid)  # 색인 위치 → 스냅샷 인덱스
+        self.points = np.stack([snapshot.cx[valid], snapshot.cy[valid]], axis=1) \
+            if valid.any() else np.zeros((0, 2))
+
+        if SCIPY_AVAILABLE and len(self.points):
+            self.tree = cKDTree(self.points)
+        else:
+            self.tree = None
+            self.order = np.argsort(self.points[:, 0], kind='stable')
+            self.sorted_x = self.points[self.order, 0]
+            extent = np.ptp(self.points, axis=0) if len(self.points) else np.ones(2)
+            # 최근접 첫 반경: 점이 고르게 퍼져 있다고 볼 때 k개가 들어올 크기
+            self.density_radius = float(np.sqrt(max(extent[0] * extent[1], 1.0) /
+                                                max(len(self.points), 1) / np.pi))
+
+        backend = "cKDTree" if self.tree is not None else "정렬 배열"
+        print(f"📍 공간 색인: 객체 {len(self.points)}개 ({backend})")
+
+    def center_of(self, index: int) -> np.ndarray:
+        return np.array([self.snapshot.cx[index], self.snapshot.cy[index]])
+
+    def _within(self, point, radius: float) -> np.ndarray:
+        """반경 안의 색인 위치"""
+        if self.tree is not None:
+            return np.asarray(self.tree.query_ball_point(point, radius), dtype=np.int64)
+        lo = np.searchsorted(self.sorted_x, point[0] - radius, side='left')
+        hi = np.searchsorted(self.sorted_x, point[0] + radius, side='right')
+        window = self.order[lo:hi]
+        distance = np.hypot(self.points[window, 0] - point[0], self.points[window, 1] - point[1])
+        return window[distance <= radius]
+
+    def _sorted(self, positions, point) -> np.ndarray:
+        """색인 위치 → 거리 순 스냅샷 인덱스"""
+        distance = np.hypot(self.points[positions, 0] - point[0], self.points[positions, 1] - point[1])
+        return self.indices[positions[np.argsort(distance, kind='stable')]]
+
+    def radius(self, point, radius: float, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """점에서 radius 이내 객체의 스냅샷 인덱스 (가까운 순)
+
+        mask: 스냅샷 크기의 후보 마스크 (유사 객체 조건 등)
+        """
+        point = np.asarray(point, dtype=float)[:2]
+        positions = self._within(point, radius)
+        if mask is not None:
+            positions = positions[mask[self.indices[positions]]]
+        return self._sorted(positions, point)
+
+    def nearest(self, point, k: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """점에서 가장 가까운 객체 k개의 스냅샷 인덱스 (가까운 순, mask 조건 안에서)"""
+        point = np.asarray(point, dtype=float)[:2]
+        total = len(self.points) if mask is None else int(mask[self.indices].sum())
+        k = min(k, total)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        if self.tree is not None:
+            # 조건에 맞는 점이 k개 나올 때까지 조회 개수를 늘림
+            fetch = k
+            while True:
+                fetch = min(fetch, len(self.points))
+                _, positions = self.tree.query(point, k=fetch)
+                positions = np.atleast_1d(positions)
+                if mask is not None:
+                    positions = positions[mask[self.indices[positions]]]
+                if len(positions) >= k or fetch == len(self.points):
+                    return self.indices[positions[:k]]
+                fetch *= 4
+
+        radius = self.density_radius * np.sqrt(k)
+        while True:
+            positions = self._within(point, radius)
+            if mask is not None:
+                positions = positions[mask[self.indices[positions]]]
+            if len(positions) >= k:
+                return self._sorted(positions, point)[:k]
+            radius *= 2
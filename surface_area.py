@@ -0,0 +1,305 @@
+"""
+Surface Area - 해치/영역 면적 일괄 추출
+바닥 마감, 슬래브처럼 HATCH/REGION으로 그린 면의 면적과 둘레를 구함
+
+- 면적은 객체의 Area(COM 1회)를 먼저 사용 (AutoCAD가 섬(island)을 이미 뺀 값)
+- Area를 읽을 수 없거나 둘레가 필요한 해치만 경계 루프(GetLoopAt)를 읽어
+  경계 객체(선, 폴리라인, 호, 원, 타원, 스플라인)를 bulge 폴리라인으로 이어 붙이고
+  모든 루프를 curve_geometry.polyline_measures로 한 번에 계산
+- 루프의 중첩 깊이(다른 루프 안에 몇 번 들어가는지)로 바깥 경계는 더하고 섬은 뺌
+- 결과는 Handle별로 캐시해 같은 해치 레이어를 다시 검색해도 COM을 다시 부르지 않음
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from cad_snapshot import entity_kind, polyline_vertices
+from curve_geometry import polyline_measures, read_polyline_bulges, nurbs_points
+
+
+SURFACE_KINDS = ("hatch", "region")
+CURVE_SAMPLES = 256  # 타원/스플라인 경계를 한 바퀴 기준으로 나눌 점 수
+
+
+# ==================== 경계 객체 → bulge 폴리라인 ====================
+
+def boundary_piece(obj):
+    """해치 경계 객체 하나 → (정점 (n, 2), 구간 bulge, 폐합 여부)
+
+    열린 조각은 구간 bulge가 n-1개, 폐합 조각(원, 폐합 폴리라인)은 n개.
+    타원/스플라인은 점을 찍어 직선 구간으로 근사한다.
+    """
+    obj_type = str(obj.ObjectName)
+    kind = entity_kind(obj_type)
+
+    if kind == "line":
+        start, end = obj.StartPoint, obj.EndPoint
+        return np.array([[start[0], start[1]], [end[0], end[1]]]), np.zeros(1), False
+
+    if kind == "polyline":
+        vertices = polyline_vertices(obj, obj_type)
+        closed = bool(obj.Closed)
+        bulges = read_polyline_bulges([obj], [vertices], [closed])[0]
+        if bulges is None:
+            bulges = np.zeros(len(vertices))
+        return vertices, np.asarray(bulges, dtype=float)[:len(vertices) if closed else len(vertices) - 1], closed
+
+    if kind == "circle":
+        center, radius = obj.Center, float(obj.Radius)
+        vertices = np.array([[center[0] + radius, center[1]], [center[0] - radius, center[1]]])
+        return vertices, np.ones(2), True
+
+    if kind == "arc":
+        center, radius = obj.Center, float(obj.Radius)
+        start_angle, end_angle = float(obj.StartAngle), float(obj.EndAngle)
+        sweep = (end_angle - start_angle) % (2 * math.pi) or 2 * math.pi
+        vertices = np.array([[center[0] + radius * math.cos(a), center[1] + radius * math.sin(a)]
+                             for a in (start_angle, end_angle)])
+        return vertices, np.array([math.tan(sweep / 4)]), False
+
+    if kind == "ellipse":
+        center = np.asarray(obj.Center, dtype=float)[:2]
+        major = np.asarray(obj.MajorAxis, dtype=float)[:2]
+        minor = np.array([-major[1], major[0]]) * float(obj.RadiusRatio)
+        t1, t2 = float(obj.StartParameter), float(obj.EndParameter)
+        sweep = (t2 - t1) % (2 * math.pi)
+        closed = math.isclose(sweep, 0.0, abs_tol=1e-9)
+        sweep = sweep or 2 * math.pi
+        count = max(int(CURVE_SAMPLES * sweep / (2 * math.pi)), 8)
+        t = t1 + sweep * np.arange(count if closed else count + 1) / count
+        vertices = center + np.outer(np.cos(t), major) + np.outer(np.sin(t), minor)
+        return vertices, np.zeros(len(vertices) if closed else len(vertices) - 1), closed
+
+    if kind == "spline":
+        degree = int(obj.Degree)
+        control = np.asarray(obj.ControlPoints, dtype=float).reshape(-1, 3)
+        knots = np.asarray(obj.Knots, dtype=float)
+        try:
+            weights = np.asarray(obj.Weights, dtype=float)
+        except Exception:
+            weights = None
+        n = len(knots) - degree - 1
+        u = np.linspace(knots[degree], knots[n], CURVE_SAMPLES + 1)
+        vertices = nurbs_points(control, knots, degree, weights, u)
+        return vertices, np.zeros(len(vertices) - 1), False
+
+    raise ValueError(f"지원하지 않는 경계 객체: {obj_type}")
+
+
+def chain_loop(pieces, tolerance: float = 1.0):
+    """경계 조각들을 끝점으로 이어 하나의 폐합 루프로 → (정점 (n, 2), 구간 bulge (n,))
+
+    방향이 반대인 조각은 정점을 뒤집고 bulge 부호를 바꿔 잇는다.
+    끝까지 이어도 닫히지 않으면 마지막 점 → 첫 점을 직선으로 닫는다.
+    """
+    if len(pieces) == 1 and pieces[0][2]:
+        vertices, bulges, _ = pieces[0]
+        return np.asarray(vertices, dtype=float), np.asarray(bulges, dtype=float)
+
+    remaining = [(np.asarray(v, dtype=float), np.asarray(b, dtype=float)) for v, b, _ in pieces]
+    vertices, bulges = remaining.pop(0)
+    points = [vertices]
+    segments = [bulges]
+    current = vertices[-1]
+    while remaining:
+        for k, (v, b) in enumerate(remaining):
+            if np.all(np.abs(v[0] - current) <= tolerance):
+                break
+            if np.all(np.abs(v[-1] - current) <= tolerance):
+                v, b = v[::-1], -b[::-1]
+                break
+        else:
+            # 이어지는 조각이 없으면 가장 가까운 조각으로 건너뜀 (경계가 틈으로 끊긴 경우)
+            gaps = [min(np.hypot(*(v[0] - current)), np.hypot(*(v[-1] - current))) for v, _ in remaining]
+            k = int(np.argmin(gaps))
+            v, b = remaining[k]
+            if np.hypot(*(v[-1] - current)) < np.hypot(*(v[0] - current)):
+                v, b = v[::-1], -b[::-1]
+            points.append(v[:1])
+            segments.append(np.zeros(1))
+        remaining.pop(k)
+        points.append(v[1:])
+        segments.append(b)
+        current = v[-1]
+
+    vertices = np.concatenate(points)
+    bulges = np.concatenate(segments)
+    if len(vertices) > 1 and np.all(np.abs(vertices[-1] - vertices[0]) <= tolerance):
+        vertices = vertices[:-1]
+    else:
+        bulges = np.append(bulges, 0.0)
+    return vertices, bulges
+
+
+# ==================== 루프 중첩 ====================
+
+def points_in_polygon(points, polygon) -> np.ndarray:
+    """점들이 다각형 안에 있는지 (짝홀 교차 판정, 점 x 변 배열 연산)"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    polygon = np.asarray(polygon, dtype=float)[:, :2]
+    x, y = points[:, 0, None], points[:, 1, None]
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    straddle = (y1 > y) != (y2 > y)
+    dy = np.where(y2 == y1, 1.0, y2 - y1)
+    cross_x = x1 + (y - y1) * (x2 - x1) / dy
+    return np.count_nonzero(straddle & (x < cross_x), axis=1) % 2 == 1
+
+
+def loop_depths(loops) -> np.ndarray:
+    """루프별 중첩 깊이 (다른 루프 몇 개 안에 들어 있는지, 0 = 바깥 경계)"""
+    depths = np.zeros(len(loops), dtype=np.int64)
+    if len(loops) < 2:
+        return depths
+    # 대표점: 첫 구간의 중점 (꼭짓점이 다른 루프에 닿는 경우를 피함)
+    probes = np.array([(v[0] + v[1 % len(v)]) / 2 for v, _ in loops])
+    for j, (vertices, _) in enumerate(loops):
+        if len(vertices) < 3:
+            continue
+        inside = points_in_polygon(probes, vertices)
+        inside[j] = False
+        depths += inside
+    return depths
+
+
+def loop_measures(loops_list: Sequence):
+    """면(해치)별 루프 목록 → (순면적, 둘레, 섬 개수) 배열
+
+    모든 면의 루프를 한 번에 polyline_measures로 계산하고
+    중첩 깊이가 짝수인 루프는 더하고 홀수(섬)는 뺀다. 둘레는 모든 루프 길이의 합.
+    """
+    count = len(loops_list)
+    area = np.zeros(count)
+    perimeter = np.zeros(count)
+    islands = np.zeros(count, dtype=np.int64)
+    owners = [k for k, loops in enumerate(loops_list) for _ in loops]
+    if not owners:
+        return area, perimeter, islands
+
+    flat = [loop for loops in loops_list for loop in loops]
+    lengths, areas = polyline_measures([v for v, _ in flat], [b for _, b in flat],
+                                       np.ones(len(flat), dtype=bool))
+    depths = np.concatenate([loop_depths(loops) for loops in loops_list if loops])
+    owners = np.asarray(owners, dtype=np.int64)
+    sign = np.where(depths % 2 == 0, 1.0, -1.0)
+    area = np.abs(np.bincount(owners, weights=sign * areas, minlength=count))
+    perimeter = np.bincount(owners, weights=lengths, minlength=count)
+    islands = np.bincount(owners, weights=depths % 2, minlength=count).astype(np.int64)
+    return area, perimeter, islands
+
+
+def read_loops(obj, tolerance: float = 1.0) -> List[tuple]:
+    """해치 경계 루프 읽기 → [(정점, 구간 bulge)]"""
+    loops = []
+    for i in range(int(obj.NumberOfLoops)):
+        pieces = [boundary_piece(item) for item in obj.GetLoopAt(i)]
+        if pieces:
+            loops.append(chain_loop(pieces, tolerance))
+    return loops
+
+
+# ==================== Handle별 캐시 ====================
+
+class SurfaceCache:
+    """해치/영역 Handle별 면적, 둘레, 섬 개수 캐시
+
+    measure()는 없는 값만 COM에서 읽는다.
+    면적만 필요하면 Area 1회, 둘레가 필요하면 영역은 Perimeter, 해치는 경계 루프를 읽음.
+    """
+
+    def __init__(self, tolerance: float = 1.0):
+        self.tolerance = tolerance
+        self.measures: Dict[str, Dict[str, Any]] = {}
+
+    def clear(self):
+        self.measures.clear()
+
+    def forget(self, handles):
+        for handle in handles:
+            self.measures.pop(handle, None)
+
+    def remember(self, handle: str, area: float):
+        """스냅샷에서 이미 읽은 면적 등록 (COM 호출 없음)
+
+        새 스냅샷 값이 우선 - 면적이 바뀌었으면 편집된 객체이므로 둘레/섬 개수도 다시 읽게 비움
+        """
+        entry = self._entry(handle)
+        area = float(area)
+        if entry['area'] is not None and abs(entry['area'] - area) > self.tolerance:
+            entry['perimeter'] = entry['islands'] = None
+        entry['area'] = area
+
+    def _entry(self, handle: str) -> Dict[str, Any]:
+        entry = self.measures.get(handle)
+        if entry is None:
+            entry = {'area': None, 'perimeter': None, 'islands': None}
+            self.measures[handle] = entry
+        return entry
+
+    def measure(self, objects, handles, kinds: Optional[Sequence[str]] = None,
+                with_perimeter: bool = False) -> List[Dict[str, Any]]:
+        """해치/영역 면적(필요하면 둘레까지) 일괄 계산 → Handle 순서의 결과 목록"""
+        needs_loops = {}
+        for k, (obj, handle) in enumerate(zip(objects, handles)):
+            entry = self._entry(handle)
+            if entry['area'] is not None and (not with_perimeter or entry['perimeter'] is not None):
+                continue
+            if handle in needs_loops:
+                continue
+            try:
+                kind = kinds[k] if kinds is not None else entity_kind(str(obj.ObjectName))
+            except Exception:
+                kind = "hatch"
+            if entry['area'] is None:
+                try:
+                    entry['area'] = float(obj.Area)
+                except Exception as e:
+                    print(f"  면적 읽기 오류, 경계 루프로 계산: {e}")
+            if with_perimeter and entry['perimeter'] is None and kind == "region":
+                try:
+                    entry['perimeter'] = float(obj.Perimeter)
+                except Exception as e:
+                    print(f"  둘레 읽기 오류: {e}")
+            if kind == "hatch" and (entry['area'] is None or
+                                    (with_perimeter and entry['perimeter'] is None)):
+                needs_loops[handle] = obj
+
+        if needs_loops:
+            loops_list = []
+            for obj in needs_loops.values():
+                try:
+                    loops_list.append(read_loops(obj, self.tolerance))
+                except Exception as e:
+                    print(f"  경계 루프 읽기 오류: {e}")
+                    loops_list.append([])
+            areas, perimeters, islands = loop_measures(loops_list)
+            for handle, loops, area, perimeter, island in zip(
+                    needs_loops, loops_list, areas, perimeters, islands):
+                entry = self.measures[handle]
+                if not loops:
+                    continue
+                if entry['area'] is None:
+                    entry['area'] = float(area)
+                entry['perimeter'] = float(perimeter)
+                entry['islands'] = int(island)
+
+        results = []
+        for handle in handles:
+            entry = self.measures[handle]
+            for key in ('area', 'perimeter'):
+                if entry[key] is None and (key == 'area' or with_perimeter):
+                    entry[key] = 0.0  # 읽을 수 없는 값은 0으로 확정 (다시 조회하지 않음)
+            results.append(entry)
+        return results
+
+
+def surface_area(obj, tolerance: float = 1.0) -> float:
+    """해치/영역 하나의 면적 - Area를 못 읽으면 경계 루프로 계산"""
+    try:
+        return float(obj.Area)
+    except Exception:
+        pass
+    area, _, _ = loop_measures([read_loops(obj, tolerance)])
+    return float(area[0])
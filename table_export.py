@@ -0,0 +1,214 @@
+"""
+Table Export - 물량 테이블 Excel/CSV 내보내기
+계층 테이블(대분류/중분류/항목) 또는 평면 테이블 행을 하나씩 받아 바로 파일에 씀
+
+- 행은 테이블의 iter_data()에서 하나씩 받음 (전체 목록이나 DataFrame을 만들지 않음)
+- XLSX는 openpyxl 쓰기 전용(write_only) 모드 - 행을 쓰는 즉시 파일로 흘려보내 메모리 일정
+- 숫자 컬럼(수량, 가로, 세로, 면적, 둘레, 두께, 층고, 결과)은 숫자 셀 + 표시 형식
+- 대분류/중분류가 끝날 때 소계 행, 맨 끝에 합계 행 (합계 컬럼: SUBTOTAL_COLUMNS)
+  합계는 진행 중인 묶음의 누계만 들고 있음
+- 계층은 행 윤곽(outline) 수준: 대분류 0, 중분류 1, 그 아래 항목 2 (Excel에서 접기/펼치기)
+- openpyxl이 없으면 CSV만 (utf-8-sig, Excel에서 열어도 한글이 깨지지 않음)
+"""
+
+import csv
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+# 숫자로 내보낼 컬럼과 표시 형식
+NUMBER_FORMATS = {
+    "수량": "#,##0.###",
+    "가로": "#,##0.0",
+    "세로": "#,##0.0",
+    "면적": "#,##0.00",
+    "둘레": "#,##0.0",
+    "두께": "#,##0.0",
+    "층고": "#,##0.0",
+    "결과": "#,##0.00",
+}
+
+# 소계/합계를 내는 컬럼
+SUBTOTAL_COLUMNS = ("수량", "면적", "둘레", "결과")
+
+ROW_FILLS = {
+    "category": "C8C8FF",
+    "subcategory": "DCDCFF",
+    "subtotal": "F0F0F0",
+    "total": "FFF2CC",
+}
+
+
+def _number(text):
+    """셀 문자열 → 숫자 (빈 칸은 None, 숫자가 아니면 문자열 그대로)"""
+    if text is None:
+        return None
+    text = str(text).strip()
+    if not text:
+        return None
+    try:
+        return float(text.replace(",", ""))
+    except ValueError:
+        return text
+
+
+def _csv_number(value: float):
+    """CSV 숫자 표기 (정수는 소수점 없이, 지수 표기 없이)"""
+    return int(value) if value.is_integer() else round(value, 6)
+
+
+class _Group:
+    """진행 중인 대분류/중분류 (이름 + 합계 누계)"""
+
+    def __init__(self, name: str, level: str, size: int):
+        self.name = name
+        self.level = level
+        self.sums = [None] * size  # 값이 하나도 없던 컬럼은 빈 칸
+        self.items = 0
+
+
+def export_rows(columns: Sequence[str], rows: Iterable,
+                hierarchical: bool = True) -> Iterator[Tuple[str, int, List]]:
+    """테이블 행 → 내보낼 행 (종류, 윤곽 수준, 값 목록) 생성기
+
+    rows: 계층 테이블 iter_data()의 {'level', 'type', 'items'} 또는 평면 테이블의 값 목록
+    값 목록의 숫자 컬럼은 float로 바꿈, 소계/합계 행을 묶음이 끝날 때 끼워 넣음
+    """
+    columns = list(columns)
+    numeric = [i for i, name in enumerate(columns) if name in NUMBER_FORMATS]
+    summed = [i for i, name in enumerate(columns) if name in SUBTOTAL_COLUMNS]
+    name_col = columns.index("품명") if "품명" in columns else 0
+    level_col = columns.index("번호") if "번호" in columns else None
+    total = _Group("합계", "", len(summed))
+    stack: List[_Group] = []  # [대분류, 중분류]
+
+    def subtotal_row(group: _Group, kind: str):
+        values = [None] * len(columns)
+        if level_col is not None:
+            values[level_col] = group.level
+        values[name_col] = f"{group.name} 소계" if kind == "subtotal" else "합계"
+        for k, col in enumerate(summed):
+            values[col] = group.sums[k]
+        return values
+
+    def close_groups(depth: int):
+        # depth 이상인 묶음을 닫으며 소계 (항목이 없던 묶음은 생략)
+        while len(stack) > depth:
+            group = stack.pop()
+            if group.items:
+                yield "subtotal", len(stack), subtotal_row(group, "subtotal")
+
+    for row in rows:
+        if isinstance(row, dict):
+            kind = row.get('type', 'item') if hierarchical else 'item'
+            values = list(row.get('items', []))
+        else:
+            kind, values = 'item', list(row)
+        values = (values + [""] * len(columns))[:len(columns)]
+        for col in numeric:
+            values[col] = _number(values[col])
+
+        if kind == 'category':
+            yield from close_groups(0)
+            yield kind, 0, values
+            stack.append(_Group(str(values[name_col] or ""), str(row.get('level', "")), len(summed)))
+        elif kind == 'subcategory':
+            yield from close_groups(1)
+            yield kind, len(stack), values
+            stack.append(_Group(str(values[name_col] or ""), str(row.get('level', "")), len(summed)))
+        else:
+            yield 'item', len(stack), values
+            for k, col in enumerate(summed):
+                if isinstance(values[col], float):
+                    for group in stack + [total]:
+                        group.sums[k] = (group.sums[k] or 0.0) + values[col]
+            for group in stack + [total]:
+                group.items += 1
+
+    yield from close_groups(0)
+    if total.items:
+        yield "total", 0, subtotal_row(total, "total")
+
+
+def export_csv(path: str, columns: Sequence[str], rows: Iterable, hierarchical: bool = True) -> int:
+    """CSV로 내보내기 (소계/합계 포함), 쓴 행 수 반환"""
+    written = 0
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for _, _, values in export_rows(columns, rows, hierarchical):
+            writer.writerow(["" if v is None else _csv_number(v) if isinstance(v, float) else v
+                             for v in values])
+            written += 1
+    return written
+
+
+def export_xlsx(path: str, columns: Sequence[str], rows: Iterable, hierarchical: bool = True,
+                sheet_title: str = "물량", widths: Optional[Dict[str, int]] = None) -> int:
+    """XLSX로 내보내기 (쓰기 전용 모드, 숫자 형식 + 윤곽 수준 + 소계/합계), 쓴 행 수 반환"""
+    if not OPENPYXL_AVAILABLE:
+        raise RuntimeError("openpyxl이 설치되지 않아 XLSX로 내보낼 수 없습니다 (CSV로 저장하세요)")
+
+    columns = list(columns)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    ws.sheet_properties.outlinePr.summaryBelow = True
+    ws.freeze_panes = "A2"
+    for i, name in enumerate(columns, start=1):
+        width = (widths or {}).get(name, 24 if name in ("품명", "계산식", "비고") else 12)
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+    bold = Font(bold=True)
+    fills = {kind: PatternFill("solid", fgColor=color) for kind, color in ROW_FILLS.items()}
+    formats = [NUMBER_FORMATS.get(name) for name in columns]
+
+    header = []
+    for name in columns:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font = bold
+        header.append(cell)
+    ws.append(header)
+
+    written = 0
+    row_idx = 1
+    for kind, level, values in export_rows(columns, rows, hierarchical):
+        cells = []
+        for col, value in enumerate(values):
+            value = None if value == "" else value
+            number = formats[col] and isinstance(value, float)
+            if kind == 'item' and not number:
+                cells.append(value)  # 서식 없는 칸은 값 그대로 (셀 객체를 만들지 않음)
+                continue
+            cell = WriteOnlyCell(ws, value=value)
+            if number:
+                cell.number_format = formats[col]
+            if kind != 'item':
+                cell.font = bold
+                cell.fill = fills[kind]
+            cells.append(cell)
+        row_idx += 1
+        # 윤곽 수준은 행을 쓸 때 읽히므로 쓰기 전에 넣고, 쓴 뒤 바로 지워 행 수만큼 쌓이지 않게
+        if level:
+            ws.row_dimensions[row_idx].outlineLevel = level
+        ws.append(cells)
+        if level:
+            del ws.row_dimensions[row_idx]
+        written += 1
+
+    wb.save(path)
+    return written
+
+
+def export_table(path: str, columns: Sequence[str], rows: Iterable, hierarchical: bool = True) -> int:
+    """확장자(.xlsx/.csv)대로 내보내기, 쓴 행 수 반환 (머리글 제외)"""
+    if os.path.splitext(path)[1].lower() == ".csv":
+        return export_csv(path, columns, rows, hierarchical)
+    return export_xlsx(path, columns, rows, hierarchical)
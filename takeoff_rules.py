@@ -0,0 +1,187 @@
+"""
+Takeoff Rules - 규칙 기반 자동 물량 산출
+규칙(레이어/타입/블록/크기/영역 조건 → 대상 행)을 스냅샷 한 번으로 일괄 평가
+"""
+
+import json
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from cad_snapshot import EntitySnapshot
+
+
+# 추출모드별로 테이블에 기록할 값
+MODE_FIELDS = {
+    "선택": [],
+    "전체": ['length', 'width', 'height', 'area', 'perimeter'],
+    "면적": ['area'],
+    "둘레": ['perimeter'],
+    "길이": ['length'],
+    "체적": ['area'],
+}
+
+
+class TakeoffRule:
+    """자동 산출 규칙 하나
+
+    조건은 모두 AND로 결합되며 지정하지 않은 조건은 무시된다.
+    - layer: 레이어 glob 패턴 (예: "A-WALL*", 대소문자 무시)
+    - object_name: ObjectName 패턴 (예: "AcDbLine")
+    - block_name: 블록 이름 패턴
+    - min_size / max_size: 크기 범위 (선택 도우미의 '같은 크기'와 같은 기준)
+    - region: (x1, y1, x2, y2) 영역 내 완전 포함
+    """
+
+    def __init__(self, name: str, category: str = "자동 산출", subcategory: str = "일반",
+                 layer: Optional[str] = None, object_name: Optional[str] = None,
+                 block_name: Optional[str] = None, min_size: Optional[float] = None,
+                 max_size: Optional[float] = None, region: Optional[List[float]] = None,
+                 mode: str = "전체", formula: str = "", unit: str = "EA", spec: str = ""):
+        self.name = name
+        self.category = category
+        self.subcategory = subcategory
+        self.layer = layer
+        self.object_name = object_name
+        self.block_name = block_name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.region = tuple(region) if region else None
+        self.mode = mode if mode in MODE_FIELDS else "전체"
+        self.formula = formula
+        self.unit = unit
+        self.spec = spec
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TakeoffRule":
+        """딕셔너리(규칙 파일 항목)에서 생성"""
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """규칙 파일 저장용 딕셔너리"""
+        return {
+            'name': self.name,
+            'category': self.category,
+            'subcategory': self.subcategory,
+            'layer': self.layer,
+            'object_name': self.object_name,
+            'block_name': self.block_name,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'region': list(self.region) if self.region else None,
+            'mode': self.mode,
+            'formula': self.formula,
+            'unit': self.unit,
+            'spec': self.spec,
+        }
+
+    def mask(self, snapshot: EntitySnapshot) -> np.ndarray:
+        """스냅샷에 대한 조건 마스크 (레이어/타입/블록 마스크는 스냅샷에 캐시됨)"""
+        mask = np.ones(snapshot.count, dtype=bool)
+        if self.layer:
+            mask &= snapshot.layer_mask(self.layer)
+        if self.object_name:
+            mask &= snapshot.type_mask(self.object_name)
+        if self.block_name:
+            mask &= snapshot.block_mask(self.block_name)
+        if self.min_size is not None or self.max_size is not None:
+            mask &= snapshot.size_mask(self.min_size, self.max_size)
+        if self.region:
+            mask &= snapshot.region_mask(*self.region)
+        return mask
+
+
+def load_rules(file_path: str) -> List[TakeoffRule]:
+    """규칙 파일(JSON) 읽기 - {"rules": [...]} 또는 규칙 목록"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('rules', [])
+    return [TakeoffRule.from_dict(item) for item in data]
+
+
+def save_rules(file_path: str, rules: List[TakeoffRule]):
+    """규칙 파일(JSON) 저장"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump({'rules': [r.to_dict() for r in rules]}, f, ensure_ascii=False, indent=2)
+
+
+def evaluate_rules(snapshot: EntitySnapshot, rules: List[TakeoffRule]) -> List[Dict[str, Any]]:
+    """모든 규칙을 스냅샷 한 번에 대해 평가
+
+    ModelSpace는 스냅샷 생성 시 한 번만 순회하고, 각 규칙은 캐시된 마스크의
+    조합과 배열 합계만 수행한다.
+    """
+    results = []
+    for rule in rules:
+        idx = np.flatnonzero(rule.mask(snapshot))
+        result = {
+            'rule': rule,
+            'indices': idx,
+            'count': int(len(idx)),
+            'length': float(snapshot.length[idx].sum()),
+            'area': float(snapshot.area[idx].sum()),
+            'perimeter': float(snapshot.perimeter[idx].sum()),
+            'width': 0.0,
+            'height': 0.0,
+        }
+        # 모두 같은 크기의 사각형이면 가로/세로 기록
+        if len(idx):
+            widths = np.round(snapshot.width[idx], 1)
+            heights = np.round(snapshot.height[idx], 1)
+            if np.all(widths == widths[0]) and np.all(heights == heights[0]):
+                result['width'] = float(widths[0])
+                result['height'] = float(heights[0])
+        results.append(result)
+
+    matched = sum(1 for r in results if r['count'])
+    print(f"⚙️ 규칙 평가 완료: {len(rules)}개 규칙 중 {matched}개 일치")
+    return results
+
+
+def apply_results_to_table(table, snapshot: EntitySnapshot, results: List[Dict[str, Any]]) -> int:
+    """평가 결과를 계층구조 테이블(대분류/중분류/항목)에 추가, 추가된 행 수 반환"""
+    added = 0
+    table.setUpdatesEnabled(False)
+    table.blockSignals(True)
+    try:
+        for result in results:
+            if not result['count']:
+                continue
+            rule = result['rule']
+            category_row = table.find_or_add_category(rule.category)
+            subcategory_row = table.find_or_add_subcategory(category_row, rule.subcategory)
+            row = table.add_item(subcategory_row)
+
+            values = {2: rule.name, 3: rule.spec, 4: str(result['count']), 5: rule.unit,
+                      12: rule.formula}
+            fields = MODE_FIELDS[rule.mode]
+            if 'length' in fields and result['length'] > 0:
+                values[6] = f"{result['length']:.1f}"
+            if 'width' in fields and result['width'] > 0:
+                values[6] = f"{result['width']:.1f}"
+            if 'height' in fields and result['height'] > 0:
+                values[7] = f"{result['height']:.1f}"
+            if 'area' in fields and result['area'] > 0:
+                values[8] = f"{result['area']:.1f}"
+            if 'perimeter' in fields and result['perimeter'] > 0:
+                values[9] = f"{result['perimeter']:.1f}"
+            layers = sorted({snapshot.layer_of(i) for i in result['indices'][:1000]})
+            values[15] = ", ".join(layers[:3]) + (" ..." if len(layers) > 3 else "")
+            table.set_row_values(row, values)
+
+            combo = table.cellWidget(row, 14)
+            if combo:
+                combo.setCurrentText(rule.mode)
+
+            table.row_selections[row] = snapshot.select(result['indices'])
+            added += 1
+    finally:
+        table.blockSignals(False)
+        table.setUpdatesEnabled(True)
+
+    # 신호를 막은 동안 건너뛴 수식 계산
+    table.recalculate_all()
+
+    print(f"✅ 자동 산출: {added}개 행 추가")
+    return added
@@ -0,0 +1,22 @@
+"""중복/겹침 선분 검출 - 거의 같은 선분 쌍은 하나만 중복으로"""
+
+import numpy as np
+
+from overlap_detection import find_overlaps
+
+
+def test_near_duplicate_pair_keeps_one_copy():
+    # 허용오차 안에서 같은 선분이지만 시작점 순서는 입력 순서와 반대
+    segments = [[0.4, 0, 1000, 0], [-0.4, 0, 1000, 0]]
+    report = find_overlaps(segments, [0, 1], 2, tolerance=1.0)
+
+    assert report.redundant.tolist() == [False, True]
+    assert report.duplicate.tolist() == [False, True]
+
+
+def test_contained_segment_still_detected():
+    segments = [[0, 0, 1000, 0], [200, 0, 600, 0], [0, 500, 1000, 500]]
+    report = find_overlaps(segments, [0, 1, 2], 3, tolerance=1.0)
+
+    assert report.contained.tolist() == [False, True, False]
+    np.testing.assert_allclose(report.overlap_length, [0.0, 400.0, 0.0])
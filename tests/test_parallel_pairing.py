@@ -0,0 +1,33 @@
+"""평행선 짝짓기 - 방향 묶음을 넘는 가짜 짝이 생기지 않는지"""
+
+import numpy as np
+
+from parallel_pairing import pair_parallel_segments
+
+
+def test_perpendicular_walls_pair_within_each_direction():
+    # 가로 벽(두께 200)과 세로 벽(두께 200)이 직교
+    segments = [
+        [0, 0, 5000, 0], [0, 200, 5000, 200],          # 가로 벽
+        [6000, 0, 6000, 5000], [6200, 0, 6200, 5000],  # 세로 벽
+    ]
+    result = pair_parallel_segments(segments, 100.0, 400.0)
+
+    assert result.count == 2
+    np.testing.assert_allclose(np.sort(np.abs(result.thickness)), [200.0, 200.0])
+    pairs = {frozenset((int(a), int(b))) for a, b in zip(result.first, result.second)}
+    assert pairs == {frozenset((0, 1)), frozenset((2, 3))}
+
+
+def test_four_wall_plan_has_no_cross_group_thickness():
+    # 사각형 실 외곽 벽 4면 (두께 200)
+    segments = [
+        [0, 0, 12450, 0], [0, 200, 12450, 200],
+        [0, 8000, 12450, 8000], [0, 8200, 12450, 8200],
+        [0, 0, 0, 8200], [200, 0, 200, 8200],
+        [12450, 0, 12450, 8200], [12650, 0, 12650, 8200],
+    ]
+    result = pair_parallel_segments(segments, 100.0, 400.0)
+
+    assert result.count == 4
+    assert np.all((result.thickness >= 100.0) & (result.thickness <= 400.0))